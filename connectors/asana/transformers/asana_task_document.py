@@ -2,8 +2,6 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from connectors.asana.client.asana_api_models import AsanaNamedResouce, AsanaUser
 from connectors.asana.extractors.artifacts.asana_project_artifact import (
     AsanaProjectPermissionsArtifact,
@@ -13,6 +11,7 @@ from connectors.asana.extractors.artifacts.asana_task_artifact import AsanaTaskA
 from connectors.base.base_chunk import BaseChunk
 from connectors.base.base_document import BaseDocument
 from connectors.base.document_source import DocumentSource
+from connectors.base.text_splitter import get_text_splitter
 from src.permissions.models import PermissionPolicy
 from src.permissions.utils import make_email_permission_token
 
@@ -33,6 +32,9 @@ class AsanaChunkRawData(TypedDict):
 class AsanaTaskChunk(BaseChunk[AsanaChunkMetadata]):
     raw_data: AsanaChunkRawData
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data["content"]
         chunk_index = self.raw_data["chunk_index"]
@@ -44,6 +46,9 @@ class AsanaTaskChunk(BaseChunk[AsanaChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data["content"]
+
     def get_metadata(self) -> AsanaChunkMetadata:
         return AsanaChunkMetadata(
             task_gid=self.raw_data["task_gid"],
@@ -81,12 +86,7 @@ class AsanaTaskDocument(BaseDocument[AsanaTaskChunk, AsanaTaskDocumentMetadata])
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
@@ -6,6 +6,7 @@ from connectors.base.base_chunk import (
     TURBOPUFFER_CHUNK_SCHEMA,
     BaseChunk,
     TurbopufferChunkKey,
+    assign_chunk_keys,
     compute_chunk_content_hash,
     compute_deterministic_chunk_id,
 )
@@ -55,6 +56,7 @@ from connectors.base.base_ingest_artifact import (
 )
 from connectors.base.base_pruner import BasePruner
 from connectors.base.base_transformer import BaseTransformer
+from connectors.base.text_splitter import TextSplitter, get_text_splitter
 
 # NOTE: All artifacts inherit from BaseIngestArtifact
 
@@ -70,8 +72,12 @@ __all__ = [
     "TURBOPUFFER_CHUNK_SCHEMA",
     "TurbopufferChunkKey",
     # Chunk utilities
+    "assign_chunk_keys",
     "compute_chunk_content_hash",
     "compute_deterministic_chunk_id",
+    # Text splitting
+    "TextSplitter",
+    "get_text_splitter",
     # Artifact models
     "BaseIngestArtifact",
     "ArtifactEntity",
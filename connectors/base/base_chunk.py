@@ -9,10 +9,10 @@ import hashlib
 import json
 import uuid
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING, Any, Literal, cast
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, cast
 
 if TYPE_CHECKING:
     from connectors.base import BaseDocument
@@ -48,6 +48,28 @@ def compute_deterministic_chunk_id(document_id: str, unique_key: str) -> uuid.UU
     return uuid.uuid5(namespace, f"{document_id}:{unique_key}")
 
 
+def assign_chunk_keys(chunks: Sequence["BaseChunk[Any]"]) -> None:
+    """Give every chunk of one document a stable key, so its ID survives re-indexing.
+
+    Chunks keep their `get_unique_key()` anchor (message ts, block id, comment id...).
+    Chunks without one are keyed by a hash of their split text (`get_split_content()`), so
+    an edit to one part of a document only changes the keys of the chunks whose text
+    changed, even if it changes how many chunks there are. Repeated keys get an occurrence
+    suffix to keep chunk IDs unique within the document.
+    """
+    occurrences: dict[str, int] = {}
+    for chunk in chunks:
+        key = chunk.get_unique_key()
+        if key is None:
+            key = f"content:{compute_chunk_content_hash(chunk.get_split_content(), {})}"
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        if occurrence:
+            key = f"{key}#{occurrence}"
+        # Use object.__setattr__ to bypass frozen dataclass restriction
+        object.__setattr__(chunk, "_chunk_key", key)
+
+
 # Define schema keys as literal type for type safety - we'll reuse this between our schema and
 # the BaseChunk method that should match the schema.
 TurbopufferChunkKey = Literal[
@@ -134,6 +156,14 @@ class BaseChunk[ChunkMetadataT: Mapping[str, Any]](ABC):
     # Cached content hash (computed lazily)
     _content_hash: str | None = field(default=None, repr=False)
 
+    # Key assigned by assign_chunk_keys(), takes precedence over get_unique_key()
+    _chunk_key: str | None = field(default=None, repr=False)
+
+    # Metadata that changes with every revision of the document (e.g. its modified time or
+    # the chunk's position in it) rather than with this chunk. Excluded from the content hash
+    # so that touching a document doesn't re-embed chunks whose text is unchanged.
+    volatile_metadata_keys: ClassVar[frozenset[str]] = frozenset()
+
     @property
     def document_id(self) -> str:
         """Get the document ID this chunk belongs to."""
@@ -152,8 +182,9 @@ class BaseChunk[ChunkMetadataT: Mapping[str, Any]](ABC):
     def get_unique_key(self) -> str | None:
         """Get a unique key for this chunk within its document.
 
-        Override this method in subclasses to enable deterministic chunk IDs.
-        Return None to use random UUIDs (legacy behavior).
+        Override this method in subclasses to anchor chunks to a source identifier.
+        Return None to fall back to a content-based key from assign_chunk_keys(), or a
+        random UUID if keys were never assigned (legacy behavior).
 
         Examples:
             - Slack: message_ts (timestamp)
@@ -163,13 +194,19 @@ class BaseChunk[ChunkMetadataT: Mapping[str, Any]](ABC):
         """
         return None
 
+    def get_chunk_key(self) -> str | None:
+        """Get the key used for this chunk's deterministic ID, if it has one."""
+        if self._chunk_key is not None:
+            return self._chunk_key
+        return self.get_unique_key()
+
     def get_deterministic_id(self) -> uuid.UUID:
         """Get a deterministic ID for this chunk if possible.
 
-        If get_unique_key() returns a value, generates a deterministic UUID.
+        If the chunk has a key (see get_chunk_key()), generates a deterministic UUID.
         Otherwise, returns the existing (random) ID.
         """
-        unique_key = self.get_unique_key()
+        unique_key = self.get_chunk_key()
         if unique_key is not None:
             return compute_deterministic_chunk_id(self.document_id, unique_key)
         return self.id
@@ -181,11 +218,18 @@ class BaseChunk[ChunkMetadataT: Mapping[str, Any]](ABC):
         we can skip re-embedding this chunk.
         """
         if self._content_hash is None:
+            metadata: Mapping[str, Any] = self.get_metadata()
+            if self.volatile_metadata_keys:
+                metadata = {
+                    key: value
+                    for key, value in metadata.items()
+                    if key not in self.volatile_metadata_keys
+                }
             # Use object.__setattr__ to bypass frozen dataclass restriction
             object.__setattr__(
                 self,
                 "_content_hash",
-                compute_chunk_content_hash(self.get_content(), self.get_metadata()),
+                compute_chunk_content_hash(self.get_split_content(), metadata),
             )
         return self._content_hash  # type: ignore[return-value]
 
@@ -231,6 +275,15 @@ class BaseChunk[ChunkMetadataT: Mapping[str, Any]](ABC):
         """Get the text content of this chunk."""
         pass
 
+    def get_split_content(self) -> str:
+        """Get the text this chunk was split into, used for its content key and hash.
+
+        Override this in chunks whose get_content() adds position context such as
+        "[Part 2 of 5]", so that a document gaining or losing a chunk doesn't change the
+        key and hash of every other chunk.
+        """
+        return self.get_content()
+
     @abstractmethod
     def get_metadata(self) -> ChunkMetadataT:
         """Get chunk-specific metadata."""
@@ -5,13 +5,15 @@ Provides reusable patterns for processing raw data into structured documents
 across different data sources and entity types.
 """
 
+import functools
 from abc import ABC, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from connectors.base import BaseChunk
+from connectors.base.base_chunk import compute_chunk_content_hash
 from connectors.base.document_source import DocumentSource
 from src.permissions.models import PermissionPolicy
 from src.permissions.utils import is_valid_permission_token
@@ -19,6 +21,32 @@ from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Methods whose results are cached per instance once memoization is enabled
+MEMOIZED_METHODS = ("get_content", "get_metadata", "get_source_created_at")
+
+
+def _memoized[T](method: Callable[..., T]) -> Callable[..., T]:
+    """Wrap a no-argument document method so it is computed once while memoization is on.
+
+    Results are keyed by qualified name so a subclass override calling super() doesn't
+    see its own cached result.
+    """
+    if getattr(method, "_memoized", False):
+        return method
+    key = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self: "BaseDocument[Any, Any]", *args: Any, **kwargs: Any) -> T:
+        memo = self.__dict__.get("_memo")
+        if memo is None or args or kwargs:
+            return method(self, *args, **kwargs)
+        if key not in memo:
+            memo[key] = method(self)
+        return memo[key]
+
+    wrapper._memoized = True  # type: ignore[attr-defined]
+    return wrapper
+
 
 @dataclass
 class BaseDocument[
@@ -34,6 +62,38 @@ class BaseDocument[
     permission_policy: PermissionPolicy
     permission_allowed_tokens: list[str] | None
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in MEMOIZED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__isabstractmethod__", False):
+                setattr(cls, name, _memoized(method))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        memo = self.__dict__.get("_memo")
+        if memo:
+            memo.clear()
+
+    def enable_memoization(self) -> None:
+        """Compute content, metadata, source_created_at and content hash at most once.
+
+        Cached values are dropped whenever an attribute is reassigned. Callers that mutate
+        nested state (e.g. append to a list field) must call `invalidate_memoized()`.
+        Returned metadata is shared between callers, so treat it as read-only.
+        """
+        object.__setattr__(self, "_memo", {})
+
+    def disable_memoization(self) -> None:
+        """Stop caching and drop any cached values."""
+        self.__dict__.pop("_memo", None)
+
+    def invalidate_memoized(self) -> None:
+        """Drop cached values after mutating nested document state."""
+        memo = self.__dict__.get("_memo")
+        if memo:
+            memo.clear()
+
     def __post_init__(self) -> None:
         if not self.permission_allowed_tokens:
             return
@@ -71,6 +131,16 @@ class BaseDocument[
         """Get document metadata. Override in subclasses for custom metadata."""
         pass
 
+    def get_content_hash(self) -> str:
+        """Hash of the document content and metadata, used to skip unchanged documents."""
+        memo = self.__dict__.get("_memo")
+        if memo is not None and "content_hash" in memo:
+            return memo["content_hash"]
+        content_hash = compute_chunk_content_hash(self.get_content(), self.get_metadata())
+        if memo is not None:
+            memo["content_hash"] = content_hash
+        return content_hash
+
     def get_header_content(self) -> str:
         """Get the formatted header section of the document.
         Override in subclasses to provide document-specific header formatting.
@@ -89,6 +159,7 @@ class BaseDocument[
     # TODO: ideally this would be inverted, where each document's impl of source_created_at lives in this
     # method and metadata relies on that method to populate its source_created_at, instead of the other way around.
     # Things are this way right now for legacy reasons: we originally had metadata define source_created_at inline.
+    @_memoized
     def get_source_created_at(self) -> datetime:
         """Extract and parse source_created_at from document metadata."""
         metadata = self.get_metadata()
@@ -0,0 +1,161 @@
+"""
+Shared text splitting for document chunking.
+
+`TextSplitter` produces exactly the same chunks as langchain's
+`RecursiveCharacterTextSplitter` with literal separators and the default
+`keep_separator=True` / `strip_whitespace=True`, so chunk content and hashes are unchanged
+for documents that switch to it. It is faster because it:
+- checks and splits on separators with `str` operations instead of regexes
+- measures each piece once instead of on every merge step
+- keeps the current chunk in a deque instead of re-slicing a list for every dropped piece
+
+Splitters are stateless, so `get_text_splitter()` returns one shared instance per configuration.
+"""
+
+import functools
+from collections import deque
+from collections.abc import Callable, Sequence
+
+DEFAULT_SEPARATORS: tuple[str, ...] = ("\n\n", "\n", ". ", " ", "")
+DEFAULT_CHUNK_SIZE = 6000
+DEFAULT_CHUNK_OVERLAP = 100
+
+
+class TextSplitter:
+    """Recursively split text on a list of separators into chunks of at most `chunk_size`.
+
+    Each separator is kept at the start of the piece that follows it. Pieces still longer
+    than `chunk_size` are split again with the next separator; an empty separator splits
+    into characters.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        separators: Sequence[str] = DEFAULT_SEPARATORS,
+        length_function: Callable[[str], int] = len,
+    ) -> None:
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size})"
+            )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = tuple(separators)
+        self._length_function = length_function
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks."""
+        return self._split_text(text, self.separators)
+
+    def _split_text(self, text: str, separators: tuple[str, ...]) -> list[str]:
+        # Use the first separator that occurs in the text, and the rest for oversized pieces
+        separator = separators[-1]
+        remaining_separators: tuple[str, ...] = ()
+        for i, candidate in enumerate(separators):
+            if not candidate:
+                separator = candidate
+                break
+            if candidate in text:
+                separator = candidate
+                remaining_separators = separators[i + 1 :]
+                break
+
+        final_chunks: list[str] = []
+        good_splits: list[str] = []
+        good_lengths: list[int] = []
+        for split in _split_keeping_separator(text, separator):
+            length = self._length_function(split)
+            if length < self.chunk_size:
+                good_splits.append(split)
+                good_lengths.append(length)
+                continue
+
+            if good_splits:
+                final_chunks.extend(self._merge_splits(good_splits, good_lengths))
+                good_splits = []
+                good_lengths = []
+            if remaining_separators:
+                final_chunks.extend(self._split_text(split, remaining_separators))
+            else:
+                final_chunks.append(split)
+
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, good_lengths))
+        return final_chunks
+
+    def _merge_splits(self, splits: list[str], lengths: list[int]) -> list[str]:
+        """Greedily combine pieces into chunks, carrying up to `chunk_overlap` into the next."""
+        chunks: list[str] = []
+        current: deque[str] = deque()
+        current_lengths: deque[int] = deque()
+        total = 0
+        for split, length in zip(splits, lengths, strict=True):
+            if total + length > self.chunk_size and current:
+                chunk = "".join(current).strip()
+                if chunk:
+                    chunks.append(chunk)
+                # Drop pieces from the front until only the overlap is left and this piece fits
+                while total > self.chunk_overlap or (
+                    total + length > self.chunk_size and total > 0
+                ):
+                    total -= current_lengths.popleft()
+                    current.popleft()
+            current.append(split)
+            current_lengths.append(length)
+            total += length
+
+        chunk = "".join(current).strip()
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+
+def _split_keeping_separator(text: str, separator: str) -> list[str]:
+    """Split on a literal separator, keeping it at the start of each following piece."""
+    if not separator:
+        return list(text)
+    first, *rest = text.split(separator)
+    splits = [first, *(separator + piece for piece in rest)]
+    return [split for split in splits if split]
+
+
+def _token_length_function(model: str) -> Callable[[str], int]:
+    # Imported lazily so connectors don't load the OpenAI client unless token sizing is used
+    from src.clients.openai import get_embedding_encoding
+
+    encoding = get_embedding_encoding(model)
+
+    def token_length(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return token_length
+
+
+def get_text_splitter(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    separators: Sequence[str] = DEFAULT_SEPARATORS,
+    token_model: str | None = None,
+) -> TextSplitter:
+    """Get the shared splitter for a configuration.
+
+    Sizes are in characters by default. With `token_model`, they are in tokens of that
+    model's tiktoken encoding (the one the embedder uses), so chunks can be sized against
+    the embedding input limit directly.
+    """
+    return _get_text_splitter(chunk_size, chunk_overlap, tuple(separators), token_model)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_text_splitter(
+    chunk_size: int, chunk_overlap: int, separators: tuple[str, ...], token_model: str | None
+) -> TextSplitter:
+    length_function = _token_length_function(token_model) if token_model else len
+    return TextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=separators,
+        length_function=length_function,
+    )
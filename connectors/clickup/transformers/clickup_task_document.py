@@ -2,11 +2,10 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from connectors.base.base_chunk import BaseChunk
 from connectors.base.base_document import BaseDocument
 from connectors.base.document_source import DocumentSource
+from connectors.base.text_splitter import get_text_splitter
 from connectors.clickup.client.clickup_api_models import ClickupUser
 from connectors.clickup.extractors.artifacts.clickup_comment_artifact import ClickupCommentArtifact
 from connectors.clickup.extractors.artifacts.clickup_list_artifact import ClickupListArtifact
@@ -34,6 +33,9 @@ class ClickupChunkRawData(TypedDict):
 class ClickupTaskChunk(BaseChunk[ClickupChunkMetadata]):
     raw_data: ClickupChunkRawData
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data["content"]
         chunk_index = self.raw_data["chunk_index"]
@@ -45,6 +47,9 @@ class ClickupTaskChunk(BaseChunk[ClickupChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data["content"]
+
     def get_metadata(self) -> ClickupChunkMetadata:
         return ClickupChunkMetadata(
             task_id=self.raw_data["task_id"],
@@ -87,12 +92,7 @@ class ClickupTaskDocument(BaseDocument[ClickupTaskChunk, ClickupTaskDocumentMeta
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
@@ -4,9 +4,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 logger = logging.getLogger(__name__)
@@ -58,9 +56,12 @@ class CustomDataChunk(BaseChunk[CustomDataChunkMetadata]):
     """Chunk for custom data documents.
 
     Custom data documents may be split into multiple chunks for long content,
-    using RecursiveCharacterTextSplitter with overlap for context preservation.
+    using the shared text splitter with overlap for context preservation.
     """
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         """Return chunk content with position context if multi-chunk document."""
         content = self.raw_data.get("content", "")
@@ -75,6 +76,10 @@ class CustomDataChunk(BaseChunk[CustomDataChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        """Get the split text, without the position context."""
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> CustomDataChunkMetadata:
         """Return chunk metadata with user fields merged."""
         base_metadata: CustomDataChunkMetadata = {
@@ -200,7 +205,7 @@ class CustomDataDocument(BaseDocument[CustomDataChunk, CustomDataDocumentMetadat
     def to_embedding_chunks(self) -> list[CustomDataChunk]:
         """Convert document to embedding chunks with proper splitting for long content.
 
-        Uses RecursiveCharacterTextSplitter with overlap to split long documents
+        Uses the shared text splitter with overlap to split long documents
         into multiple chunks while preserving context. Each chunk includes:
         - Header content (metadata + custom fields) for the first chunk
         - Position context [Part X of Y] for multi-chunk documents
@@ -213,12 +218,7 @@ class CustomDataDocument(BaseDocument[CustomDataChunk, CustomDataDocumentMetadat
             return []
 
         # Use text splitter for long content
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=CHUNK_SIZE,
-            chunk_overlap=CHUNK_OVERLAP,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
 
         text_chunks = text_splitter.split_text(full_content)
 
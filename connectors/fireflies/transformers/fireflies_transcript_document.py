@@ -3,11 +3,10 @@ from datetime import datetime
 from functools import reduce
 from typing import TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from connectors.base.base_chunk import BaseChunk
 from connectors.base.base_document import BaseDocument
 from connectors.base.document_source import DocumentSource
+from connectors.base.text_splitter import get_text_splitter
 from connectors.fireflies.client.fireflies_models import FirefliesSentence, FirefliesSpeaker
 from connectors.fireflies.extractors.artifacts.fireflies_transcript_artifact import (
     FirefliesTranscriptArtifact,
@@ -32,6 +31,9 @@ class FirefliesTranscriptChunkRawData(TypedDict):
 class FirefliesTranscriptChunk(BaseChunk[FirefliesTranscriptChunkMetadata]):
     raw_data: FirefliesTranscriptChunkRawData
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data["content"]
         chunk_index = self.raw_data["chunk_index"]
@@ -43,6 +45,9 @@ class FirefliesTranscriptChunk(BaseChunk[FirefliesTranscriptChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data["content"]
+
     def get_metadata(self) -> FirefliesTranscriptChunkMetadata:
         return FirefliesTranscriptChunkMetadata(
             transcript_id=self.raw_data["transcript_id"],
@@ -73,12 +78,7 @@ class FirefliesTranscriptDocument(
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
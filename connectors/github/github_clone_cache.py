@@ -0,0 +1,381 @@
+"""Pod-local cache of blobless repository clones shared by GitHub file backfill jobs.
+
+The root job clones a repository to list its files, and every child batch used to clone it
+again. Clones are now cached on local disk keyed by (tenant, repo, commit_sha):
+
+- Each entry is a blobless `--no-checkout` clone. Nothing is checked out into it directly:
+  each batch adds its own `git worktree` and sparse-checks-out only its files there, so
+  concurrent batches share one object store and only fetch the blobs they need.
+- Entries are guarded by flock'd lock files, so sharing works across worker threads and
+  processes in the same pod. A job holds a shared lock on its entry for as long as it uses
+  the clone, which doubles as the entry's reference count; creating or evicting an entry
+  takes the exclusive lock.
+- After a new clone is added, least recently used entries that nobody holds are evicted
+  until the cache fits GITHUB_CLONE_CACHE_MAX_BYTES.
+- Entries are never shared between tenants, and no credentials are stored in them. Each job
+  passes its own installation token to the git commands it runs through its lease's
+  `git_env`, including the commands that lazily fetch blobs into the shared clone.
+"""
+
+import asyncio
+import fcntl
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import newrelic.agent
+
+from connectors.github.github_repo_utils import (
+    clone_repository,
+    get_git_auth_env,
+    parse_repo_url,
+)
+from src.clients.github import GitHubClient
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "github_clone_cache")
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024 * 1024
+
+# Written once an entry's clone is complete; its mtime tracks when the entry was last used
+_COMPLETE_MARKER = ".clone_complete"
+
+
+def _directory_size(path: Path) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _entry_lock_path(entry_dir: Path) -> Path:
+    # Kept next to the entry rather than in it, so an entry can be deleted while locked
+    return entry_dir.with_name(f"{entry_dir.name}.lock")
+
+
+def _open_lock_file(lock_path: Path) -> int:
+    return os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+
+
+def record_clone_cache_lookup(hit: bool) -> None:
+    """Record a cache hit or miss on the current New Relic trace."""
+    newrelic.agent.add_custom_span_attribute("clone_cache.hit", hit)
+    newrelic.agent.record_custom_metric(f"Custom/GitHubCloneCache/{'Hit' if hit else 'Miss'}", 1)
+
+
+def record_clone_bytes_fetched(bytes_fetched: int) -> None:
+    """Record bytes added to a clone's object store on the current New Relic trace."""
+    newrelic.agent.add_custom_span_attribute("clone_cache.bytes_fetched", bytes_fetched)
+    newrelic.agent.record_custom_metric("Custom/GitHubCloneCache/BytesFetched", bytes_fetched)
+
+
+async def _run_git(*args: str, env: dict[str, str] | None = None) -> str:
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown error"
+        raise RuntimeError(f"git command failed: {error_msg}")
+    return stdout.decode().strip()
+
+
+async def _run_git_exclusive(repo_path: Path, *args: str) -> str:
+    """Run a git command that writes a clone's shared config or worktree list, one job at a time."""
+    lock_fd = _open_lock_file(repo_path.parent / ".git_commands.lock")
+    try:
+        await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+        return await _run_git("-C", str(repo_path), *args)
+    finally:
+        os.close(lock_fd)
+
+
+@dataclass
+class CloneLease:
+    """A clone held by a job until it's released back to the RepoCloneCache."""
+
+    repo_path: Path
+    commit_sha: str
+    branch: str | None
+    cache_hit: bool
+    # Environment for git commands run against the clone, carrying this job's credentials
+    # for the blob fetches they trigger
+    git_env: dict[str, str] = field(default_factory=dict)
+    # Shared lock on the cache entry, or None for uncached clones (e.g. empty repositories)
+    lock_fd: int | None = None
+    # Directory to delete on release, for clones that never made it into the cache
+    owned_dir: Path | None = None
+    worktrees: list[Path] = field(default_factory=list)
+
+    async def object_store_size(self) -> int:
+        """Size in bytes of the clone's object store, to measure blobs fetched by a checkout."""
+        return await asyncio.to_thread(_directory_size, self.repo_path / ".git" / "objects")
+
+
+class RepoCloneCache:
+    """Local disk cache of blobless clones keyed by (tenant, repo, commit_sha)."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _entry_dir(self, tenant_id: str, repo_url: str, commit_sha: str) -> Path:
+        # Tenants each clone with their own installation, so that clone checks their access
+        repo_info = parse_repo_url(repo_url)
+        return (
+            self.cache_dir / f"{tenant_id}__{repo_info['owner']}__{repo_info['name']}__{commit_sha}"
+        )
+
+    async def acquire(
+        self,
+        tenant_id: str,
+        repo_url: str,
+        github_client: GitHubClient,
+        commit_sha: str | None = None,
+    ) -> CloneLease:
+        """Get a clone of a repository at a commit, cloning it if it isn't cached.
+
+        Args:
+            tenant_id: Tenant the clone is for; entries are never shared between tenants
+            repo_url: GitHub repository URL (https://github.com/owner/repo)
+            github_client: Authenticated GitHub client for repository access
+            commit_sha: Commit to get, or None to clone the default branch's HEAD
+
+        Returns:
+            A CloneLease, which callers must pass to `release` when done. Its repo_path is
+            shared with other jobs and must not be checked out into; use `add_worktree`, and
+            run git commands that may fetch blobs with the lease's `git_env`.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        git_env = {**os.environ, **get_git_auth_env(github_client)}
+        if not commit_sha:
+            return await self._clone_head(tenant_id, repo_url, github_client, git_env)
+
+        repo_name = parse_repo_url(repo_url)["name"]
+        entry_dir = self._entry_dir(tenant_id, repo_url, commit_sha)
+        lock_fd = _open_lock_file(_entry_lock_path(entry_dir))
+        try:
+            await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_SH)
+            marker = entry_dir / _COMPLETE_MARKER
+            cache_hit = True
+            if not marker.exists():
+                # Upgrade to an exclusive lock to clone, then re-check in case another job
+                # cloned it while we waited
+                await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+                if not marker.exists():
+                    await self._clone_into_entry(
+                        repo_url, github_client, git_env, entry_dir, commit_sha
+                    )
+                    cache_hit = False
+                await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_SH)
+        except BaseException:
+            os.close(lock_fd)
+            raise
+
+        os.utime(marker)
+        record_clone_cache_lookup(cache_hit)
+        logger.info(
+            f"{'Reusing cached' if cache_hit else 'Cached new'} clone of {repo_url}@{commit_sha}"
+        )
+        if not cache_hit:
+            await self._evict()
+
+        return CloneLease(
+            repo_path=entry_dir / repo_name,
+            commit_sha=commit_sha,
+            branch=marker.read_text() or None,
+            cache_hit=cache_hit,
+            git_env=git_env,
+            lock_fd=lock_fd,
+        )
+
+    async def _clone_into_entry(
+        self,
+        repo_url: str,
+        github_client: GitHubClient,
+        git_env: dict[str, str],
+        entry_dir: Path,
+        commit_sha: str,
+    ) -> None:
+        """Clone a repository into an entry directory. Requires the entry's exclusive lock."""
+        await asyncio.to_thread(shutil.rmtree, entry_dir, True)
+        entry_dir.mkdir()
+        clone_result = await clone_repository(repo_url, github_client, str(entry_dir))
+        await self._prepare_clone(clone_result.repo_path)
+
+        if clone_result.commit_sha != commit_sha:
+            try:
+                await _run_git(
+                    "-C", str(clone_result.repo_path), "cat-file", "-e", f"{commit_sha}^{{commit}}"
+                )
+            except RuntimeError:
+                # The commit isn't on the default branch anymore (e.g. after a force push)
+                await _run_git(
+                    "-C", str(clone_result.repo_path), "fetch", "origin", commit_sha, env=git_env
+                )
+
+        record_clone_bytes_fetched(
+            await asyncio.to_thread(_directory_size, clone_result.repo_path / ".git" / "objects")
+        )
+        (entry_dir / _COMPLETE_MARKER).write_text(clone_result.branch or "")
+
+    async def _clone_head(
+        self,
+        tenant_id: str,
+        repo_url: str,
+        github_client: GitHubClient,
+        git_env: dict[str, str],
+    ) -> CloneLease:
+        """Clone the default branch, then move the clone into the cache under its HEAD commit."""
+        staging_dir = self.cache_dir / f".staging-{uuid.uuid4().hex}"
+        staging_dir.mkdir()
+        try:
+            clone_result = await clone_repository(repo_url, github_client, str(staging_dir))
+        except BaseException:
+            await asyncio.to_thread(shutil.rmtree, staging_dir, True)
+            raise
+
+        record_clone_cache_lookup(False)
+        record_clone_bytes_fetched(
+            await asyncio.to_thread(_directory_size, clone_result.repo_path / ".git" / "objects")
+        )
+
+        # Empty repositories have no commit to key the cache by
+        if not clone_result.commit_sha:
+            return CloneLease(
+                repo_path=clone_result.repo_path,
+                commit_sha="",
+                branch=clone_result.branch,
+                cache_hit=False,
+                git_env=git_env,
+                owned_dir=staging_dir,
+            )
+
+        entry_dir = self._entry_dir(tenant_id, repo_url, clone_result.commit_sha)
+        lock_fd = _open_lock_file(_entry_lock_path(entry_dir))
+        try:
+            await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_EX)
+            marker = entry_dir / _COMPLETE_MARKER
+            if not marker.exists():
+                await self._prepare_clone(clone_result.repo_path)
+                await asyncio.to_thread(shutil.rmtree, entry_dir, True)
+                entry_dir.mkdir()
+                clone_result.repo_path.rename(entry_dir / clone_result.repo_path.name)
+                marker.write_text(clone_result.branch or "")
+            await asyncio.to_thread(fcntl.flock, lock_fd, fcntl.LOCK_SH)
+        except BaseException:
+            os.close(lock_fd)
+            raise
+        finally:
+            await asyncio.to_thread(shutil.rmtree, staging_dir, True)
+
+        os.utime(marker)
+        await self._evict()
+        return CloneLease(
+            repo_path=entry_dir / clone_result.repo_path.name,
+            commit_sha=clone_result.commit_sha,
+            branch=clone_result.branch,
+            cache_hit=False,
+            git_env=git_env,
+            lock_fd=lock_fd,
+        )
+
+    async def _prepare_clone(self, repo_path: Path) -> None:
+        # Keep sparse checkout settings per worktree. Enabling this up front also stops
+        # concurrent `sparse-checkout init` calls from racing to write the shared config.
+        await _run_git("-C", str(repo_path), "config", "extensions.worktreeConfig", "true")
+
+    async def add_worktree(self, lease: CloneLease, worktree_path: Path) -> Path:
+        """Add an empty (--no-checkout) worktree of the lease's commit for a job to check out into."""
+        await _run_git_exclusive(
+            lease.repo_path,
+            "worktree",
+            "add",
+            "--no-checkout",
+            "--detach",
+            str(worktree_path),
+            lease.commit_sha,
+        )
+        lease.worktrees.append(worktree_path)
+        return worktree_path
+
+    async def release(self, lease: CloneLease) -> None:
+        """Remove the lease's worktrees and drop its reference to the cached clone."""
+        try:
+            for worktree_path in lease.worktrees:
+                try:
+                    await _run_git_exclusive(
+                        lease.repo_path, "worktree", "remove", "--force", str(worktree_path)
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to remove worktree {worktree_path}: {e}")
+                    await asyncio.to_thread(shutil.rmtree, worktree_path, True)
+            if lease.worktrees:
+                await _run_git_exclusive(lease.repo_path, "worktree", "prune")
+            lease.worktrees.clear()
+        except Exception as e:
+            logger.warning(f"Failed to clean up worktrees for {lease.repo_path}: {e}")
+        finally:
+            if lease.lock_fd is not None:
+                os.close(lease.lock_fd)
+                lease.lock_fd = None
+            if lease.owned_dir is not None:
+                await asyncio.to_thread(shutil.rmtree, lease.owned_dir, True)
+
+    async def _evict(self) -> None:
+        await asyncio.to_thread(self._evict_sync)
+
+    def _evict_sync(self) -> None:
+        """Evict least recently used entries that no job holds until the cache fits its budget."""
+        entries: list[tuple[float, Path, int]] = []
+        for marker in self.cache_dir.glob(f"*/{_COMPLETE_MARKER}"):
+            try:
+                last_used = marker.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((last_used, marker.parent, _directory_size(marker.parent)))
+
+        total_bytes = sum(size for _, _, size in entries)
+        for _, entry_dir, size in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+
+            lock_fd = _open_lock_file(_entry_lock_path(entry_dir))
+            try:
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Still in use by another job
+                    continue
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total_bytes -= size
+                logger.info(f"Evicted cached clone {entry_dir.name} ({size} bytes)")
+            finally:
+                os.close(lock_fd)
+
+
+_repo_clone_cache: RepoCloneCache | None = None
+
+
+def get_repo_clone_cache() -> RepoCloneCache:
+    """Get the process-wide RepoCloneCache, configured from the environment."""
+    global _repo_clone_cache
+    if _repo_clone_cache is None:
+        _repo_clone_cache = RepoCloneCache(
+            cache_dir=get_config_value("GITHUB_CLONE_CACHE_DIR", DEFAULT_CACHE_DIR),
+            max_bytes=int(get_config_value("GITHUB_CLONE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        )
+    return _repo_clone_cache
@@ -0,0 +1,181 @@
+"""Per-file contributor index built from a single walk over a repository's history.
+
+Running `git log -- <path>` once per file is slow on large monorepos. Instead we run one
+`git log --name-only` over the clone and build a {path: contributors} map in a single
+streaming parse. Indexes are cached per (repo, commit_sha) so sibling file batches of the
+same backfill reuse the walk instead of repeating it.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import newrelic.agent
+
+from connectors.github.github_file_artifacts import GitHubFileContributor
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Marks commit header lines in the git log output, since file paths can't start with it
+_COMMIT_MARKER = "\x1e"
+
+# Contributor indexes can be large for big monorepos, so only keep a few
+DEFAULT_CONTRIBUTOR_INDEX_CACHE_SIZE = 2
+
+
+@dataclass
+class _ContributorEntry:
+    name: str
+    commit_count: int
+    last_contribution_at: str
+
+
+@dataclass
+class ContributorIndex:
+    """Contributors for every path in a repository's history, keyed by path then email."""
+
+    contributors_by_path: dict[str, dict[str, _ContributorEntry]] = field(default_factory=dict)
+    commits_walked: int = 0
+    build_duration: float = 0.0
+
+    def add_commit(self, name: str, email: str, timestamp: str, paths: list[str]) -> None:
+        """Record one commit, which must be added in reverse chronological order."""
+        self.commits_walked += 1
+        for path in paths:
+            contributors = self.contributors_by_path.setdefault(path, {})
+            entry = contributors.get(email)
+            if entry is None:
+                # The first commit seen for an author is their most recent one
+                contributors[email] = _ContributorEntry(name, 1, timestamp)
+            else:
+                entry.commit_count += 1
+
+    def get_contributors(self, path: str) -> list[GitHubFileContributor]:
+        """Get the contributors for a path, most recent contributor first."""
+        return [
+            GitHubFileContributor(
+                name=entry.name,
+                email=email,
+                commit_count=entry.commit_count,
+                last_contribution_at=entry.last_contribution_at,
+            )
+            for email, entry in self.contributors_by_path.get(path, {}).items()
+        ]
+
+
+async def build_contributor_index(repo_path: Path) -> ContributorIndex:
+    """Walk the history of HEAD once and index contributors for every path touched.
+
+    Matches `git log --format=%aN|%aE|%aI -- <path>` per file (no --follow): renames are
+    not detected, so a rename counts as a commit for both the old and new path.
+
+    Raises:
+        RuntimeError: If git log fails
+    """
+    index = ContributorIndex()
+    start_time = time.perf_counter()
+
+    cmd = [
+        "git",
+        "-C",
+        str(repo_path),
+        # Print non-ASCII paths verbatim so they match the file paths in the batch
+        "-c",
+        "core.quotePath=false",
+        "log",
+        f"--format={_COMMIT_MARKER}%aN|%aE|%aI",
+        "--name-only",
+        "--no-renames",
+    ]
+
+    with newrelic.agent.FunctionTrace(name="GitHubFileBackfill/build_contributor_index"):
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        assert process.stdout is not None and process.stderr is not None
+        # Drain stderr concurrently so a chatty git can't block on a full pipe
+        stderr_task = asyncio.create_task(process.stderr.read())
+
+        commit: tuple[str, str, str] | None = None
+        paths: list[str] = []
+        # Stream the output line by line rather than buffering the whole history
+        async for raw_line in process.stdout:
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\n")
+            if line.startswith(_COMMIT_MARKER):
+                if commit:
+                    index.add_commit(*commit, paths)
+                # Author names may contain "|", emails and timestamps can't
+                parts = line[len(_COMMIT_MARKER) :].rsplit("|", 2)
+                commit = (parts[0], parts[1], parts[2]) if len(parts) == 3 else None
+                paths = []
+            elif line:
+                paths.append(line)
+        if commit:
+            index.add_commit(*commit, paths)
+
+        await process.wait()
+        stderr = await stderr_task
+
+    if process.returncode != 0:
+        error_msg = stderr.decode() if stderr else "Unknown error"
+        raise RuntimeError(f"git log failed while building contributor index: {error_msg}")
+
+    index.build_duration = time.perf_counter() - start_time
+    logger.info(
+        "Built contributor index",
+        repo_path=str(repo_path),
+        commits_walked=index.commits_walked,
+        paths_indexed=len(index.contributors_by_path),
+        duration_seconds=round(index.build_duration, 3),
+    )
+    return index
+
+
+class ContributorIndexCache:
+    """LRU cache of contributor indexes keyed by (repo, commit_sha)."""
+
+    def __init__(self, max_size: int = DEFAULT_CONTRIBUTOR_INDEX_CACHE_SIZE):
+        self.max_size = max_size
+        self._indexes: OrderedDict[tuple[str, str], ContributorIndex] = OrderedDict()
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    async def get_index(self, repo_spec: str, commit_sha: str, repo_path: Path) -> ContributorIndex:
+        """Get the index for a repo at a commit, building it from the clone at `repo_path` if needed."""
+        key = (repo_spec, commit_sha)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                logger.info(f"Reusing contributor index for {repo_spec}@{commit_sha}")
+                return index
+
+            index = await build_contributor_index(repo_path)
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_size:
+                evicted_key, _ = self._indexes.popitem(last=False)
+                self._locks.pop(evicted_key, None)
+            return index
+
+
+_contributor_index_cache: ContributorIndexCache | None = None
+
+
+def get_contributor_index_cache() -> ContributorIndexCache:
+    """Get the process-wide ContributorIndexCache."""
+    global _contributor_index_cache
+    if _contributor_index_cache is None:
+        _contributor_index_cache = ContributorIndexCache(
+            max_size=int(
+                get_config_value(
+                    "GITHUB_CONTRIBUTOR_INDEX_CACHE_SIZE", DEFAULT_CONTRIBUTOR_INDEX_CACHE_SIZE
+                )
+            )
+        )
+    return _contributor_index_cache
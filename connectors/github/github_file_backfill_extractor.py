@@ -13,6 +13,15 @@ import newrelic.agent
 
 from connectors.base import BaseExtractor, TriggerIndexingCallback, get_github_file_entity_id
 from connectors.base.document_source import DocumentSource
+from connectors.github.github_clone_cache import (
+    CloneLease,
+    get_repo_clone_cache,
+    record_clone_bytes_fetched,
+)
+from connectors.github.github_contributor_index import (
+    ContributorIndex,
+    get_contributor_index_cache,
+)
 from connectors.github.github_file_artifacts import (
     GitHubFileArtifact,
     GitHubFileContent,
@@ -21,7 +30,6 @@ from connectors.github.github_file_artifacts import (
 )
 from connectors.github.github_file_utils import generate_binary_file_metadata_content
 from connectors.github.github_models import GitHubFileBackfillConfig, GitHubFileBatch
-from connectors.github.github_repo_utils import CloneResult, clone_repository
 from src.clients.github import GitHubClient
 from src.clients.github_factory import get_github_client_for_tenant
 from src.clients.ssm import SSMClient
@@ -79,7 +87,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 )
 
                 batch_entity_ids = await self._process_file_batch(
-                    job_id, github_client, file_batch, db_pool
+                    job_id, config.tenant_id, github_client, file_batch, db_pool
                 )
                 all_file_entity_ids.extend(batch_entity_ids)
 
@@ -131,31 +139,35 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
     async def _process_file_batch(
         self,
         job_id: str,
+        tenant_id: str,
         github_client: GitHubClient,
         file_batch: GitHubFileBatch,
         db_pool: asyncpg.Pool,
     ) -> list[str]:
         """Process a specific batch of files from a repository."""
+        clone_cache = get_repo_clone_cache()
+        clone_lease: CloneLease | None = None
         try:
             repo_spec = f"{file_batch.org_or_owner}/{file_batch.repo_name}"
             repo_url = f"https://github.com/{repo_spec}"
 
-            # Clone the repository
             if self.temp_dir is None:
                 raise ValueError("Temporary directory not initialized")
 
+            # Get the repository at the batch's commit, reusing a clone from the root job or a
+            # sibling batch in this pod if there is one
             with newrelic.agent.FunctionTrace(name="GitHubFileBackfill/clone_repository"):
-                clone_result: CloneResult = await clone_repository(
-                    repo_url, github_client, self.temp_dir
+                clone_lease = await clone_cache.acquire(
+                    tenant_id, repo_url, github_client, file_batch.commit_sha
                 )
 
-            repo_path = clone_result.repo_path
             logger.info(
-                f"Cloned repository to: {repo_path} (SHA: {clone_result.commit_sha}, branch: {clone_result.branch or 'unknown'})"
+                f"{'Reusing cached' if clone_lease.cache_hit else 'Cloned'} repository at: "
+                f"{clone_lease.repo_path} (SHA: {clone_lease.commit_sha}, branch: {clone_lease.branch or 'unknown'})"
             )
 
             # Validate we got a commit SHA (empty repos have no commits)
-            if not clone_result.commit_sha:
+            if not clone_lease.commit_sha:
                 logger.warning(
                     f"Repository {repo_spec} has no commits (empty repository). "
                     f"Skipping batch with {len(file_batch.file_paths)} files."
@@ -163,10 +175,19 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 # Return empty list - no files can be processed from empty repo
                 return []
 
+            # The clone is shared, so check out into a worktree of our own
+            repo_path = await clone_cache.add_worktree(
+                clone_lease, Path(self.temp_dir) / file_batch.repo_name
+            )
+
             # Configure sparse checkout for only the files we need
             with newrelic.agent.FunctionTrace(name="GitHubFileBackfill/checkout_files"):
+                # Missing blobs are fetched into the shared object store during checkout.
+                # Approximate if sibling batches are checking out at the same time.
+                object_store_size_before = await clone_lease.object_store_size()
+
                 sparse_success = await self._configure_sparse_checkout(
-                    repo_path, file_batch.file_paths
+                    repo_path, file_batch.file_paths, clone_lease.git_env
                 )
 
                 if not sparse_success:
@@ -185,6 +206,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                         *full_checkout_cmd,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE,
+                        env=clone_lease.git_env,
                     )
                     stdout, stderr = await process.communicate()
 
@@ -194,6 +216,23 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
 
                     logger.info("Full checkout completed as fallback")
 
+                record_clone_bytes_fetched(
+                    await clone_lease.object_store_size() - object_store_size_before
+                )
+
+            # Index contributors for every file with one walk over the history, reusing the
+            # index built by sibling batches for the same commit
+            contributor_index: ContributorIndex | None = None
+            try:
+                contributor_index = await get_contributor_index_cache().get_index(
+                    repo_spec, clone_lease.commit_sha, repo_path
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to build contributor index for {repo_spec}, "
+                    f"falling back to per-file git log: {e}"
+                )
+
             entity_ids = []
             artifacts = []
 
@@ -235,9 +274,17 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                         with newrelic.agent.FunctionTrace(
                             name="GitHubFileBackfill/get_file_contributors"
                         ):
-                            contributors, file_stats = await self._get_file_contributors(
-                                repo_path, Path(relative_path), use_follow=False
-                            )
+                            if contributor_index is not None:
+                                contributors = contributor_index.get_contributors(relative_path)
+                                file_stats: dict[str, int | float] = {
+                                    "git_log_duration": 0.0,
+                                    "commits_found": sum(c.commit_count for c in contributors),
+                                    "contributors_found": len(contributors),
+                                }
+                            else:
+                                contributors, file_stats = await self._get_file_contributors(
+                                    repo_path, Path(relative_path), use_follow=False
+                                )
 
                         # Accumulate stats
                         duration = float(file_stats["git_log_duration"])
@@ -397,6 +444,9 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                     slow_files_30s=int(contributor_stats["slow_files_30s"]),
                     total_commits=int(contributor_stats["total_commits"]),
                     total_contributors=int(contributor_stats["total_contributors"]),
+                    index_build_seconds=contributor_index.build_duration
+                    if contributor_index
+                    else None,
                 )
 
             # Log file size statistics
@@ -424,13 +474,6 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
 
             logger.info(f"Processed and stored {len(entity_ids)} files from batch in {repo_spec}")
 
-            # Clean up this repository's clone
-            if repo_path and repo_path.exists():
-                try:
-                    shutil.rmtree(repo_path)
-                except Exception as e:
-                    logger.error(f"Error cleaning up repo {repo_path}: {e}")
-
             return entity_ids
 
         except Exception as e:
@@ -439,6 +482,11 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
             )
             raise
 
+        finally:
+            # Remove our worktree and release the shared clone; it stays cached for other batches
+            if clone_lease is not None:
+                await clone_cache.release(clone_lease)
+
     async def _get_file_contributors(
         self, repo_path: Path, file_path: Path, use_follow: bool = True
     ) -> tuple[list[GitHubFileContributor], dict[str, int | float]]:
@@ -560,10 +608,14 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
             logger.error(f"Error getting commit count for {repo_path}: {e}")
             return 0
 
-    async def _configure_sparse_checkout(self, repo_path: Path, file_paths: list[str]) -> bool:
+    async def _configure_sparse_checkout(
+        self, repo_path: Path, file_paths: list[str], git_env: dict[str, str]
+    ) -> bool:
         """
         Configure sparse checkout to only download specific files.
         Returns True if successful, False if fallback is needed.
+
+        git_env carries the credentials for the blobs fetched by the checkout.
         """
         try:
             # Step 1: Initialize sparse checkout with cone mode for better performance
@@ -604,6 +656,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 *init_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                env=git_env,
             )
             stdout, stderr = await process.communicate()
 
@@ -634,6 +687,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 *set_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                env=git_env,
             )
             stdout, stderr = await process.communicate()
 
@@ -641,7 +695,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 error_msg = stderr.decode() if stderr else "Unknown error"
                 logger.warning(f"Failed to set sparse checkout paths: {error_msg}")
                 # Try to disable sparse checkout before returning
-                await self._disable_sparse_checkout(repo_path)
+                await self._disable_sparse_checkout(repo_path, git_env)
                 return False
 
             # Step 3: Perform the checkout
@@ -657,6 +711,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 *checkout_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                env=git_env,
             )
             stdout, stderr = await process.communicate()
 
@@ -664,7 +719,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 error_msg = stderr.decode() if stderr else "Unknown error"
                 logger.warning(f"Checkout failed during sparse checkout: {error_msg}")
                 # Try to disable sparse checkout
-                await self._disable_sparse_checkout(repo_path)
+                await self._disable_sparse_checkout(repo_path, git_env)
                 return False
 
             # Step 4: Verify that all files were found
@@ -678,7 +733,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 logger.warning(
                     "Didn't find all file paths in sparse checkout, falling back to full checkout"
                 )
-                await self._disable_sparse_checkout(repo_path)
+                await self._disable_sparse_checkout(repo_path, git_env)
                 return False
 
             # Calculate overhead ratio to help identify when cone mode is inefficient
@@ -693,10 +748,10 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
         except Exception as e:
             logger.error(f"Unexpected error during sparse checkout: {e}")
             # Try to disable sparse checkout
-            await self._disable_sparse_checkout(repo_path)
+            await self._disable_sparse_checkout(repo_path, git_env)
             return False
 
-    async def _disable_sparse_checkout(self, repo_path: Path) -> None:
+    async def _disable_sparse_checkout(self, repo_path: Path, git_env: dict[str, str]) -> None:
         """Disable sparse checkout to allow fallback to full checkout."""
         try:
             disable_cmd = [
@@ -711,6 +766,7 @@ class GitHubFileBackfillExtractor(BaseExtractor[GitHubFileBackfillConfig]):
                 *disable_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
+                env=git_env,
             )
             await process.communicate()
             logger.info("Disabled sparse checkout")
@@ -2,19 +2,18 @@ import asyncio
 import logging
 import os
 import secrets
-import shutil
-import tempfile
 from pathlib import Path
 
 import asyncpg
 
 from connectors.base import BaseExtractor, TriggerIndexingCallback
+from connectors.github.github_clone_cache import CloneLease, get_repo_clone_cache
 from connectors.github.github_models import (
     GitHubFileBackfillConfig,
     GitHubFileBackfillRootConfig,
     GitHubFileBatch,
 )
-from connectors.github.github_repo_utils import CloneResult, clone_repository, parse_repo_url
+from connectors.github.github_repo_utils import parse_repo_url
 from src.clients.github import GitHubClient
 from src.clients.github_factory import get_github_client_for_tenant
 from src.clients.sqs import SQSClient
@@ -41,7 +40,6 @@ class GitHubFileBackfillRootExtractor(BaseExtractor[GitHubFileBackfillRootConfig
         super().__init__()
         self.ssm_client = ssm_client
         self.sqs_client = sqs_client
-        self.temp_dir: str | None = None
         # Semaphore to limit concurrent SQS operations
         self._sqs_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SQS_OPERATIONS)
 
@@ -58,113 +56,100 @@ class GitHubFileBackfillRootExtractor(BaseExtractor[GitHubFileBackfillRootConfig
             f"Processing GitHub file backfill root job for tenant {config.tenant_id} with backfill_id {backfill_id}"
         )
 
-        try:
-            # Get GitHub client for this tenant
+        # Get GitHub client for this tenant
 
-            github_client = await get_github_client_for_tenant(config.tenant_id, self.ssm_client)
+        github_client = await get_github_client_for_tenant(config.tenant_id, self.ssm_client)
 
-            # Collect all repositories to process
-            all_repo_urls = []
+        # Collect all repositories to process
+        all_repo_urls = []
 
-            for repo_spec in config.repositories:
-                if not repo_spec.startswith("http"):
-                    repo_url = f"https://github.com/{repo_spec}"
-                else:
-                    repo_url = repo_spec
-                if repo_url not in all_repo_urls:
-                    all_repo_urls.append(repo_url)
+        for repo_spec in config.repositories:
+            if not repo_spec.startswith("http"):
+                repo_url = f"https://github.com/{repo_spec}"
+            else:
+                repo_url = repo_spec
+            if repo_url not in all_repo_urls:
+                all_repo_urls.append(repo_url)
 
-            # Determine what organizations to process
-            orgs_to_process = config.organizations
+        # Determine what organizations to process
+        orgs_to_process = config.organizations
 
-            # If both repositories and organizations are empty, auto-discover repositories
-            if not config.repositories and not config.organizations:
-                if github_client.is_app_authenticated():
-                    # GitHub App: get all repos the installation has access to
-                    logger.info(
-                        "No repositories or organizations specified - GitHub App authentication detected, "
-                        "fetching installation repositories"
-                    )
-                    installation_repos = github_client.get_installation_repositories()
-                    for repo in installation_repos:
-                        repo_full_name = repo.get("full_name")
-                        if repo_full_name:
-                            # Convert full_name to URL format
-                            repo_url = f"https://github.com/{repo_full_name}"
-                            if repo_url not in all_repo_urls:
-                                all_repo_urls.append(repo_url)
-                    logger.info(
-                        f"Found {len(installation_repos)} repositories accessible by installation"
-                    )
-                    # Skip organization processing since we got all repos directly
-                    orgs_to_process = []
-                else:
-                    # PAT: use existing organization discovery
-                    logger.info(
-                        "No repositories or organizations specified - PAT authentication detected, "
-                        "discovering all user organizations"
-                    )
-                    user_orgs = github_client.get_user_organizations()
-                    orgs_to_process = [org.login for org in user_orgs]
-                    logger.info(
-                        f"Auto-discovered {len(orgs_to_process)} organizations: {orgs_to_process}"
-                    )
-
-            # Add repositories from organizations if we have any to process
-            for org_name in orgs_to_process:
-                logger.info(f"Fetching repositories from organization: {org_name}")
-                org_repos = github_client.get_organization_repos(org_name)
-                for repo in org_repos:
+        # If both repositories and organizations are empty, auto-discover repositories
+        if not config.repositories and not config.organizations:
+            if github_client.is_app_authenticated():
+                # GitHub App: get all repos the installation has access to
+                logger.info(
+                    "No repositories or organizations specified - GitHub App authentication detected, "
+                    "fetching installation repositories"
+                )
+                installation_repos = github_client.get_installation_repositories()
+                for repo in installation_repos:
                     repo_full_name = repo.get("full_name")
                     if repo_full_name:
                         # Convert full_name to URL format
                         repo_url = f"https://github.com/{repo_full_name}"
                         if repo_url not in all_repo_urls:
                             all_repo_urls.append(repo_url)
-                logger.info(f"Found {len(org_repos)} repositories in {org_name}")
-
-            if not all_repo_urls:
-                logger.warning(f"No repositories to process for job {job_id}")
-                return
-
-            logger.info(f"Total repositories to process: {len(all_repo_urls)}")
+                logger.info(
+                    f"Found {len(installation_repos)} repositories accessible by installation"
+                )
+                # Skip organization processing since we got all repos directly
+                orgs_to_process = []
+            else:
+                # PAT: use existing organization discovery
+                logger.info(
+                    "No repositories or organizations specified - PAT authentication detected, "
+                    "discovering all user organizations"
+                )
+                user_orgs = github_client.get_user_organizations()
+                orgs_to_process = [org.login for org in user_orgs]
+                logger.info(
+                    f"Auto-discovered {len(orgs_to_process)} organizations: {orgs_to_process}"
+                )
 
-            # Create temporary directory for cloning
-            temp_dir = tempfile.mkdtemp(prefix="github_repo_")
-            self.temp_dir = temp_dir
-            logger.info(f"Created temporary directory: {self.temp_dir}")
+        # Add repositories from organizations if we have any to process
+        for org_name in orgs_to_process:
+            logger.info(f"Fetching repositories from organization: {org_name}")
+            org_repos = github_client.get_organization_repos(org_name)
+            for repo in org_repos:
+                repo_full_name = repo.get("full_name")
+                if repo_full_name:
+                    # Convert full_name to URL format
+                    repo_url = f"https://github.com/{repo_full_name}"
+                    if repo_url not in all_repo_urls:
+                        all_repo_urls.append(repo_url)
+            logger.info(f"Found {len(org_repos)} repositories in {org_name}")
+
+        if not all_repo_urls:
+            logger.warning(f"No repositories to process for job {job_id}")
+            return
+
+        logger.info(f"Total repositories to process: {len(all_repo_urls)}")
+
+        # Analyze file counts and create batches
+        file_batches = await self._analyze_and_create_file_batches(
+            config.tenant_id, all_repo_urls, github_client
+        )
 
-            # Analyze file counts and create batches
-            file_batches = await self._analyze_and_create_file_batches(all_repo_urls, github_client)
+        logger.info(
+            f"Root job {job_id} found {len(file_batches)} file batches across "
+            f"{len(all_repo_urls)} repositories with backfill_id {backfill_id}"
+        )
 
-            logger.info(
-                f"Root job {job_id} found {len(file_batches)} file batches across "
-                f"{len(all_repo_urls)} repositories with backfill_id {backfill_id}"
+        # Send child jobs for file processing
+        if file_batches:
+            # Track total number of ingest jobs (child batches) for this backfill
+            await increment_backfill_total_ingest_jobs(
+                backfill_id, config.tenant_id, len(file_batches)
             )
 
-            # Send child jobs for file processing
-            if file_batches:
-                # Track total number of ingest jobs (child batches) for this backfill
-                await increment_backfill_total_ingest_jobs(
-                    backfill_id, config.tenant_id, len(file_batches)
-                )
-
-                await self._send_child_jobs(config, file_batches, backfill_id)
-                logger.info(f"Sent child jobs for {len(file_batches)} file batches")
-
-            logger.info(f"Successfully completed root job {job_id}")
+            await self._send_child_jobs(config, file_batches, backfill_id)
+            logger.info(f"Sent child jobs for {len(file_batches)} file batches")
 
-        finally:
-            # Clean up temporary directory
-            if self.temp_dir and os.path.exists(self.temp_dir):
-                try:
-                    shutil.rmtree(self.temp_dir)
-                    logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
-                except Exception as e:
-                    logger.error(f"Error cleaning up temporary directory: {e}")
+        logger.info(f"Successfully completed root job {job_id}")
 
     async def _analyze_and_create_file_batches(
-        self, all_repo_urls: list[str], github_client: GitHubClient
+        self, tenant_id: str, all_repo_urls: list[str], github_client: GitHubClient
     ) -> list[GitHubFileBatch]:
         """Analyze repositories to create file batches for child jobs."""
         file_batches = []
@@ -180,16 +165,15 @@ class GitHubFileBackfillRootExtractor(BaseExtractor[GitHubFileBackfillRootConfig
             organization = repo_info["owner"]
             repo_spec = f"{organization}/{repository}"
 
+            clone_cache = get_repo_clone_cache()
+            clone_lease: CloneLease | None = None
             try:
-                # Clone the repository (will detect default branch)
-                if self.temp_dir is None:
-                    raise ValueError("Temporary directory not initialized")
-                clone_result: CloneResult = await clone_repository(
-                    repo_url, github_client, self.temp_dir
-                )
-                repo_path = clone_result.repo_path
+                # Clone the repository (will detect default branch). The clone is cached under
+                # its commit so child jobs in this pod can reuse it.
+                clone_lease = await clone_cache.acquire(tenant_id, repo_url, github_client)
+                repo_path = clone_lease.repo_path
                 logger.info(
-                    f"Cloned repository to: {repo_path} (SHA: {clone_result.commit_sha}, branch: {clone_result.branch or 'unknown'})"
+                    f"Cloned repository to: {repo_path} (SHA: {clone_lease.commit_sha}, branch: {clone_lease.branch or 'unknown'})"
                 )
 
                 # List all files using git ls-tree (no checkout needed!)
@@ -206,23 +190,20 @@ class GitHubFileBackfillRootExtractor(BaseExtractor[GitHubFileBackfillRootConfig
                         org_or_owner=organization,
                         repo_name=repository,
                         file_paths=batch_file_paths,
-                        branch=clone_result.branch,
-                        commit_sha=clone_result.commit_sha,
+                        branch=clone_lease.branch,
+                        commit_sha=clone_lease.commit_sha,
                     )
 
                     file_batches.append(file_batch)
 
-                # Clean up this repository's clone
-                if repo_path and repo_path.exists():
-                    try:
-                        shutil.rmtree(repo_path)
-                    except Exception as e:
-                        logger.error(f"Error cleaning up repo {repo_path}: {e}")
-
             except Exception as e:
                 logger.error(f"Error analyzing repository {repo_url}: {e}")
                 raise
 
+            finally:
+                if clone_lease is not None:
+                    await clone_cache.release(clone_lease)
+
         return file_batches
 
     def _walk_repository(self, repo_path: Path):
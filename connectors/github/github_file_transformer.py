@@ -10,7 +10,7 @@ from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
 )
 
-from connectors.base import BaseTransformer
+from connectors.base import BaseTransformer, TextSplitter, get_text_splitter
 from connectors.base.doc_ids import get_github_file_doc_id
 from connectors.base.document_source import DocumentSource
 from connectors.github.github_file_artifacts import GitHubFileArtifact
@@ -139,6 +139,7 @@ class GithubFileTransformer(BaseTransformer[GitHubFileDocument]):
 
         ext = Path(file_path).suffix.lower()
 
+        splitter: RecursiveCharacterTextSplitter | TextSplitter
         try:
             if ext == ".py":
                 splitter = RecursiveCharacterTextSplitter.from_language(
@@ -205,11 +206,7 @@ class GithubFileTransformer(BaseTransformer[GitHubFileDocument]):
                     language=Language.PHP, chunk_size=max_chunk_size, chunk_overlap=overlap
                 )
             else:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=max_chunk_size,
-                    chunk_overlap=overlap,
-                    separators=["\n\n", "\n", ". ", " ", ""],
-                )
+                splitter = get_text_splitter(chunk_size=max_chunk_size, chunk_overlap=overlap)
 
             chunks = splitter.split_text(content)
             return self._format_chunks([chunk for chunk in chunks if chunk.strip()], file_path)
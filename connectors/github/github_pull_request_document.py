@@ -5,9 +5,7 @@ GitHub document classes for structured PR and activity representation.
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 from src.ingest.references.reference_ids import get_github_pr_reference_id
 
@@ -79,6 +77,18 @@ class GitHubPRDocumentMetadata(TypedDict):
 class GitHubPRChunk(BaseChunk[GitHubPRChunkMetadata]):
     """Represents a single GitHub PR event chunk."""
 
+    def get_unique_key(self) -> str | None:
+        """Anchor the header chunk, and event chunks to their comment or event ID."""
+        if self.raw_data.get("chunk_type") == "header":
+            return "header"
+        comment_id = self.raw_data.get("comment_id")
+        if comment_id:
+            return f"comment:{comment_id}"
+        event_id = self.raw_data.get("event_id")
+        if event_id:
+            return f"event:{event_id}"
+        return None
+
     def get_content(self) -> str:
         """Get the formatted PR event content."""
         event_type = self.raw_data.get("event_type", "")
@@ -322,11 +332,8 @@ class GitHubPRDocument(BaseDocument[GitHubPRChunk, GitHubPRDocumentMetadata]):
             chunks.append(chunk)
 
         # Add file change chunks (split large patches into multiple chunks)
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=MAX_FILE_CHUNK_SIZE,
-            chunk_overlap=FILE_CHUNK_OVERLAP,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
+        text_splitter = get_text_splitter(
+            chunk_size=MAX_FILE_CHUNK_SIZE, chunk_overlap=FILE_CHUNK_OVERLAP
         )
 
         for file_data in files:
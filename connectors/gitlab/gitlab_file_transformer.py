@@ -12,7 +12,7 @@ from langchain_text_splitters import (
     RecursiveCharacterTextSplitter,
 )
 
-from connectors.base import BaseTransformer
+from connectors.base import BaseTransformer, TextSplitter, get_text_splitter
 from connectors.base.doc_ids import get_gitlab_file_doc_id
 from connectors.base.document_source import DocumentSource
 from connectors.gitlab.gitlab_file_artifacts import GitLabFileArtifact
@@ -132,6 +132,7 @@ class GitLabFileTransformer(BaseTransformer[GitLabFileDocument]):
 
         ext = Path(file_path).suffix.lower()
 
+        splitter: RecursiveCharacterTextSplitter | TextSplitter
         try:
             if ext == ".py":
                 splitter = RecursiveCharacterTextSplitter.from_language(
@@ -214,11 +215,7 @@ class GitLabFileTransformer(BaseTransformer[GitLabFileDocument]):
                     language=Language.SWIFT, chunk_size=max_chunk_size, chunk_overlap=overlap
                 )
             else:
-                splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=max_chunk_size,
-                    chunk_overlap=overlap,
-                    separators=["\n\n", "\n", ". ", " ", ""],
-                )
+                splitter = get_text_splitter(chunk_size=max_chunk_size, chunk_overlap=overlap)
 
             chunks = splitter.split_text(content)
             return self._format_chunks([chunk for chunk in chunks if chunk.strip()], file_path)
@@ -5,9 +5,7 @@ GitLab document classes for structured MR and activity representation.
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 from src.ingest.references.reference_ids import get_gitlab_mr_reference_id
 
@@ -346,11 +344,8 @@ class GitLabMRDocument(BaseDocument[GitLabMRChunk, GitLabMRDocumentMetadata]):
             chunks.append(chunk)
 
         # Add diff chunks (split large diffs into multiple chunks)
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=MAX_DIFF_CHUNK_SIZE,
-            chunk_overlap=DIFF_CHUNK_OVERLAP,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
+        text_splitter = get_text_splitter(
+            chunk_size=MAX_DIFF_CHUNK_SIZE, chunk_overlap=DIFF_CHUNK_OVERLAP
         )
 
         for diff_data in diffs:
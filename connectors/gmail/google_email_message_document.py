@@ -6,9 +6,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 logger = logging.getLogger(__name__)
@@ -89,12 +87,7 @@ class GoogleEmailMessageDocument(
             )
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
         text_chunks = text_splitter.split_text(full_content)
 
         logger.info(
@@ -61,6 +61,15 @@ class GongCallDocumentMetadata(TypedDict, total=False):
 class GongCallChunk(BaseChunk[GongCallChunkMetadata]):
     """Represents a chunk of Gong call content."""
 
+    def get_unique_key(self) -> str | None:
+        """Anchor the header chunk, and transcript chunks to their first transcript segment."""
+        if self.raw_data.get("chunk_type") == "header":
+            return "header"
+        segment_indices = self.raw_data.get("segment_indices") or []
+        if segment_indices:
+            return f"segment:{segment_indices[0]}"
+        return None
+
     def get_content(self) -> str:
         return self.raw_data.get("content", "")
 
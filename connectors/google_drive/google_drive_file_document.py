@@ -6,9 +6,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 logger = logging.getLogger(__name__)
@@ -37,6 +35,12 @@ class GoogleDriveDocumentMetadata(TypedDict):
 class GoogleDriveFileChunk(BaseChunk[dict[str, Any]]):
     """Represents a chunk of a Google Drive file."""
 
+    # Updated on every edit of the file, whichever chunk the edit touched, and shifted
+    # whenever the file gains or loses a chunk
+    volatile_metadata_keys = frozenset(
+        {"source_modified_at", "last_modifying_user", "chunk_index", "total_chunks"}
+    )
+
     def get_content(self) -> str:
         """Get the formatted chunk content."""
         content = self.raw_data.get("content", "")
@@ -49,6 +53,10 @@ class GoogleDriveFileChunk(BaseChunk[dict[str, Any]]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        """Get the split text, without the position context."""
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> dict[str, Any]:
         """Get chunk-specific metadata."""
         metadata = {
@@ -98,12 +106,7 @@ class GoogleDriveFileDocument(BaseDocument[GoogleDriveFileChunk, GoogleDriveDocu
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
@@ -7,9 +7,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 logger = logging.getLogger(__name__)
@@ -49,6 +47,9 @@ class HubspotContactDocumentMetadata(TypedDict):
 class HubspotContactChunk(BaseChunk[HubspotContactChunkMetadata]):
     """Single chunk representing entire HubSpot contact."""
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         """Return the formatted contact content."""
         content = self.raw_data.get("content", "")
@@ -61,6 +62,10 @@ class HubspotContactChunk(BaseChunk[HubspotContactChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        """Get the split text, without the position context."""
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> HubspotContactChunkMetadata:
         """Get chunk metadata."""
         return {
@@ -195,12 +200,7 @@ class HubspotContactDocument(BaseDocument[HubspotContactChunk, HubspotContactDoc
         if not content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(content)
 
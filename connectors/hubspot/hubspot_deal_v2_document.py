@@ -7,9 +7,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 from connectors.hubspot.hubspot_artifacts import HUBSPOT_ACTIVITY_PROPERTY_NAMES
 from src.utils.html_to_text import html_to_text_bs4
@@ -55,6 +53,9 @@ class HubspotDealDocumentMetadata(TypedDict):
 class HubspotDealChunk(BaseChunk[HubspotDealChunkMetadata]):
     """Single chunk representing entire HubSpot deal."""
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         """Return the formatted deal content."""
         content = self.raw_data.get("content", "")
@@ -67,6 +68,10 @@ class HubspotDealChunk(BaseChunk[HubspotDealChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        """Get the split text, without the position context."""
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> HubspotDealChunkMetadata:
         """Get chunk metadata."""
         return {
@@ -298,12 +303,7 @@ class HubspotDealDocument(BaseDocument[HubspotDealChunk, HubspotDealDocumentMeta
         if not content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(content)
 
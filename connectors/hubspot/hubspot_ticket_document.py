@@ -7,9 +7,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 logger = logging.getLogger(__name__)
@@ -50,6 +48,9 @@ class HubspotTicketDocumentMetadata(TypedDict):
 class HubspotTicketChunk(BaseChunk[HubspotTicketChunkMetadata]):
     """Single chunk representing entire HubSpot ticket."""
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         """Return the formatted ticket content."""
         content = self.raw_data.get("content", "")
@@ -62,6 +63,10 @@ class HubspotTicketChunk(BaseChunk[HubspotTicketChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        """Get the split text, without the position context."""
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> HubspotTicketChunkMetadata:
         """Get chunk metadata."""
         return {
@@ -141,12 +146,7 @@ class HubspotTicketDocument(BaseDocument[HubspotTicketChunk, HubspotTicketDocume
         if not content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(content)
 
@@ -5,9 +5,7 @@ Document and chunk definitions for Intercom Help Center articles.
 from dataclasses import dataclass
 from typing import Any, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 from connectors.intercom.intercom_utils import convert_timestamp_to_iso
 
@@ -115,12 +113,7 @@ class IntercomHelpCenterArticleDocument(
         if not content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(content)
         chunks: list[IntercomHelpCenterArticleChunk] = []
@@ -54,6 +54,13 @@ class JiraIssueChunk(BaseChunk[JiraIssueChunkMetadata]):
     A chunk representing either the header section or a single activity item from a Jira issue.
     """
 
+    def get_unique_key(self) -> str | None:
+        """Anchor activity chunks to their activity ID; the chunk without one is the header."""
+        activity_id = self.raw_data.get("activity_id")
+        if activity_id:
+            return f"activity:{activity_id}"
+        return "header"
+
     def get_content(self) -> str:
         """Get formatted content for this chunk."""
         # This is a placeholder - content should be set during construction
@@ -64,6 +64,15 @@ class LinearIssueDocumentMetadata(TypedDict):
 class LinearIssueChunk(BaseChunk[LinearIssueChunkMetadata]):
     """Represents a single Linear issue activity chunk."""
 
+    def get_unique_key(self) -> str | None:
+        """Anchor the header chunk, and activity chunks to their activity ID."""
+        if self.raw_data.get("chunk_type") == "header":
+            return "header"
+        activity_id = self.raw_data.get("activity_id")
+        if activity_id:
+            return f"activity:{activity_id}"
+        return None
+
     def get_content(self) -> str:
         """Get the formatted activity content."""
         activity_type = self.raw_data.get("activity_type", "")
@@ -67,6 +67,14 @@ class NotionPageChunk(BaseChunk[NotionPageChunkMetadata]):
     # override the corresponding optional BaseChunk field to require specifying it
     notion_block_ids: list[str]
 
+    def get_unique_key(self) -> str | None:
+        """Anchor the header chunk, and each section to the first block it contains."""
+        if self.raw_data.get("chunk_type") == "header":
+            return "header"
+        if self.notion_block_ids and self.notion_block_ids[0]:
+            return f"block:{self.notion_block_ids[0]}"
+        return None
+
     @classmethod
     def get_content_from_raw_block_data(cls, raw_block_data: Mapping[str, Any]) -> str:
         block_type = raw_block_data.get("block_type", "")
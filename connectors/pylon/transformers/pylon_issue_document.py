@@ -4,9 +4,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 
@@ -53,6 +51,9 @@ class PylonIssueDocumentMetadata(TypedDict):
 class PylonIssueChunk(BaseChunk[PylonIssueChunkMetadata]):
     """Chunk from a Pylon issue document."""
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data.get("content", "")
         chunk_index = self.raw_data.get("chunk_index", 0)
@@ -64,6 +65,9 @@ class PylonIssueChunk(BaseChunk[PylonIssueChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> PylonIssueChunkMetadata:
         return PylonIssueChunkMetadata(
             issue_id=self.raw_data["issue_id"],
@@ -299,13 +303,8 @@ class PylonIssueDocument(BaseDocument[PylonIssueChunk, PylonIssueDocumentMetadat
         if not full_content.strip():
             return []
 
-        # Use RecursiveCharacterTextSplitter with overlap for better context
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=200,  # 200 char overlap for context continuity
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        # Use the shared text splitter with overlap for better context
+        text_splitter = get_text_splitter(chunk_size=6000, chunk_overlap=200)
 
         text_chunks = text_splitter.split_text(full_content)
         embedding_chunks: list[PylonIssueChunk] = []
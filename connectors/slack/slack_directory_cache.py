@@ -0,0 +1,326 @@
+"""Per-tenant cache of Slack users, channels and teams for SlackTransformer.
+
+Loading the full Slack directory (`slack_user`, `slack_channel` and `slack_team` artifacts)
+on every index job is expensive for large tenants, often more so than building the
+channel-day documents themselves. This cache keeps one SlackDirectory per tenant in the
+worker process and shares it across index jobs:
+
+- A directory is loaded in full once, then refreshed incrementally with
+  `source_updated_at >= last_seen` on each use.
+- Channel artifacts use the channel's creation time as source_updated_at, so renames and
+  membership changes don't show up incrementally. Directories are therefore fully reloaded
+  every SLACK_DIRECTORY_FULL_RELOAD_SECONDS.
+- When a job only needs a few users and channels and the tenant's directory isn't fully
+  loaded yet, only those IDs are fetched (and cached for later jobs). Such targeted
+  directories are dropped and refetched after the same SLACK_DIRECTORY_FULL_RELOAD_SECONDS.
+- Memory is bounded by SLACK_DIRECTORY_CACHE_MAX_ENTRIES across all tenants, evicting the
+  least recently used tenants first.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import asyncpg
+
+from src.utils.config import get_config_value
+from src.utils.error_handling import ErrorCounter, record_exception_and_ignore
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 500_000
+DEFAULT_FULL_RELOAD_SECONDS = 15 * 60
+# Jobs needing at most this many users + channels fetch only those IDs on a cold cache
+DEFAULT_TARGETED_MAX_IDS = 500
+
+_DIRECTORY_ENTITIES = ["slack_user", "slack_channel", "slack_team"]
+
+
+def is_slack_directory_cache_enabled() -> bool:
+    return get_config_value("SLACK_DIRECTORY_CACHE_ENABLED", True)
+
+
+@dataclass
+class SlackDirectory:
+    """Slack users, channels and teams for one tenant, with derived lookup maps."""
+
+    users_metadata: dict[str, dict[str, Any]] = field(default_factory=dict)
+    channels_metadata: dict[str, dict[str, Any]] = field(default_factory=dict)
+    team_metadata: dict[str, dict[str, Any]] = field(default_factory=dict)
+    user_map: dict[str, str] = field(default_factory=dict)
+    channel_map: dict[str, str] = field(default_factory=dict)
+    dm_participants_map: dict[str, list[str]] = field(default_factory=dict)
+    # Latest source_updated_at seen, used as the incremental refresh cursor
+    last_seen: datetime | None = None
+    # Whether every user/channel/team was loaded, as opposed to only targeted IDs
+    complete: bool = False
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.users_metadata) + len(self.channels_metadata) + len(self.team_metadata)
+
+    def apply_artifacts(self, artifacts: Iterable[asyncpg.Record]) -> None:
+        """Add or update directory entries from slack_user/slack_channel/slack_team artifacts."""
+        metadata_counter: ErrorCounter = {}
+        for artifact in artifacts:
+            with record_exception_and_ignore(
+                logger,
+                f"Failed to process {artifact.get('entity', 'unknown')} artifact loaded from DB",
+                metadata_counter,
+            ):
+                updated_at = artifact.get("source_updated_at")
+                if updated_at and (self.last_seen is None or updated_at > self.last_seen):
+                    self.last_seen = updated_at
+
+                entity_type = artifact["entity"]
+                content = artifact.get("content", {})
+                if not content:
+                    continue
+
+                entity_id = content.get("id", artifact["entity_id"])
+
+                if entity_type == "slack_user":
+                    self._set_user(entity_id, content)
+                elif entity_type == "slack_channel":
+                    self._set_channel(entity_id, content)
+                elif entity_type == "slack_team":
+                    self.team_metadata[entity_id] = content
+
+        if metadata_counter.get("failed", 0):
+            logger.warning(
+                f"Failed to process {metadata_counter['failed']} Slack directory artifacts "
+                f"({metadata_counter.get('successful', 0)} successful)"
+            )
+
+    def _set_user(self, user_id: str, user_data: dict[str, Any]) -> None:
+        self.users_metadata[user_id] = user_data
+        profile = user_data.get("profile", {})
+        self.user_map[user_id] = (
+            profile.get("display_name")
+            or profile.get("real_name")
+            or user_data.get("real_name")
+            or user_data.get("name")
+            or user_id
+        )
+
+    def _set_channel(self, channel_id: str, channel_data: dict[str, Any]) -> None:
+        self.channels_metadata[channel_id] = channel_data
+        self.channel_map[channel_id] = channel_data.get("name", channel_id)
+        # DMs (is_im) map to their participants for permission tokens
+        if channel_data.get("is_im", False):
+            self.dm_participants_map[channel_id] = channel_data.get("members", [])
+
+
+async def load_full_slack_directory(readonly_db_pool: asyncpg.Pool) -> SlackDirectory:
+    """Load every Slack user, channel and team artifact into a new SlackDirectory."""
+    async with readonly_db_pool.acquire() as conn:
+        artifacts = await conn.fetch(
+            """
+            SELECT entity, entity_id, content, source_updated_at
+            FROM ingest_artifact
+            WHERE entity = ANY($1::text[])
+            """,
+            _DIRECTORY_ENTITIES,
+        )
+
+    directory = SlackDirectory(complete=True)
+    directory.apply_artifacts(artifacts)
+    return directory
+
+
+class SlackDirectoryCache:
+    """LRU cache of SlackDirectory objects keyed by tenant."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        full_reload_seconds: float = DEFAULT_FULL_RELOAD_SECONDS,
+        targeted_max_ids: int = DEFAULT_TARGETED_MAX_IDS,
+    ):
+        self.max_entries = max_entries
+        self.full_reload_seconds = full_reload_seconds
+        self.targeted_max_ids = targeted_max_ids
+        self._directories: OrderedDict[str, SlackDirectory] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get_directory(
+        self,
+        tenant_id: str,
+        readonly_db_pool: asyncpg.Pool,
+        user_ids: set[str] | None = None,
+        channel_ids: set[str] | None = None,
+    ) -> SlackDirectory:
+        """Get an up-to-date Slack directory for a tenant.
+
+        Args:
+            tenant_id: The tenant identifier
+            readonly_db_pool: The tenant's database pool
+            user_ids: User IDs the caller needs, if known
+            channel_ids: Channel IDs the caller needs, if known
+
+        Returns:
+            The tenant's SlackDirectory. Callers must treat it as read-only; it is shared
+            across concurrent index jobs.
+        """
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            directory = self._directories.get(tenant_id)
+            needed_count = len(user_ids or ()) + len(channel_ids or ())
+
+            if directory and directory.complete:
+                if time.monotonic() - directory.loaded_at >= self.full_reload_seconds:
+                    directory = await load_full_slack_directory(readonly_db_pool)
+                    logger.info(
+                        f"Reloaded Slack directory for tenant {tenant_id}: "
+                        f"{directory.entry_count} entries"
+                    )
+                else:
+                    await self._refresh_incrementally(directory, readonly_db_pool)
+            elif (
+                user_ids is not None
+                and channel_ids is not None
+                and needed_count <= self.targeted_max_ids
+            ):
+                if (
+                    directory is None
+                    or time.monotonic() - directory.loaded_at >= self.full_reload_seconds
+                ):
+                    # Cached entries may hold stale channel names or DM members, so start over
+                    directory = SlackDirectory()
+                else:
+                    await self._refresh_incrementally(directory, readonly_db_pool)
+                await self._fetch_targeted(directory, readonly_db_pool, user_ids, channel_ids)
+            else:
+                directory = await load_full_slack_directory(readonly_db_pool)
+                logger.info(
+                    f"Loaded Slack directory for tenant {tenant_id}: "
+                    f"{directory.entry_count} entries"
+                )
+
+            self._directories[tenant_id] = directory
+            self._directories.move_to_end(tenant_id)
+            self._evict(keep=tenant_id)
+            return directory
+
+    async def _refresh_incrementally(
+        self, directory: SlackDirectory, readonly_db_pool: asyncpg.Pool
+    ) -> None:
+        """Apply directory artifacts updated since the directory's last_seen cursor."""
+        if directory.last_seen is None:
+            return
+
+        # >= rather than > so rows sharing the cursor's timestamp are never skipped
+        async with readonly_db_pool.acquire() as conn:
+            artifacts = await conn.fetch(
+                """
+                SELECT entity, entity_id, content, source_updated_at
+                FROM ingest_artifact
+                WHERE entity = ANY($1::text[])
+                  AND source_updated_at >= $2
+                """,
+                _DIRECTORY_ENTITIES,
+                directory.last_seen,
+            )
+        directory.apply_artifacts(artifacts)
+
+    async def _fetch_targeted(
+        self,
+        directory: SlackDirectory,
+        readonly_db_pool: asyncpg.Pool,
+        user_ids: set[str],
+        channel_ids: set[str],
+    ) -> None:
+        """Fetch uncached channels, their DM participants, users and the team."""
+        async with readonly_db_pool.acquire() as conn:
+            missing_channel_ids = [c for c in channel_ids if c not in directory.channels_metadata]
+            if missing_channel_ids:
+                directory.apply_artifacts(
+                    await conn.fetch(
+                        """
+                        SELECT entity, entity_id, content, source_updated_at
+                        FROM ingest_artifact
+                        WHERE entity = 'slack_channel' AND entity_id = ANY($1::text[])
+                        """,
+                        missing_channel_ids,
+                    )
+                )
+
+            # DM participants are needed for permission tokens
+            needed_user_ids = set(user_ids)
+            for channel_id in channel_ids:
+                needed_user_ids.update(directory.dm_participants_map.get(channel_id, []))
+
+            missing_user_ids = [u for u in needed_user_ids if u not in directory.users_metadata]
+            if missing_user_ids:
+                directory.apply_artifacts(
+                    await conn.fetch(
+                        """
+                        SELECT entity, entity_id, content, source_updated_at
+                        FROM ingest_artifact
+                        WHERE entity = 'slack_user' AND entity_id = ANY($1::text[])
+                        """,
+                        missing_user_ids,
+                    )
+                )
+
+            if not directory.team_metadata:
+                directory.apply_artifacts(
+                    await conn.fetch(
+                        """
+                        SELECT entity, entity_id, content, source_updated_at
+                        FROM ingest_artifact
+                        WHERE entity = 'slack_team'
+                        """
+                    )
+                )
+
+        logger.debug(
+            f"Fetched {len(missing_channel_ids)} channels and {len(missing_user_ids)} users "
+            "for targeted Slack directory lookup"
+        )
+
+    def _evict(self, keep: str) -> None:
+        """Evict least recently used tenants until the total entry count fits the bound."""
+        total = sum(directory.entry_count for directory in self._directories.values())
+        for tenant_id in list(self._directories):
+            if total <= self.max_entries:
+                break
+            if tenant_id == keep:
+                continue
+            total -= self._directories.pop(tenant_id).entry_count
+            # A held lock still guards an in-progress lookup, so leave it for that caller
+            lock = self._locks.get(tenant_id)
+            if lock is not None and not lock.locked():
+                del self._locks[tenant_id]
+            logger.info(f"Evicted Slack directory for tenant {tenant_id} from cache")
+
+    def invalidate(self, tenant_id: str) -> None:
+        """Drop a tenant's cached directory so the next lookup reloads it."""
+        self._directories.pop(tenant_id, None)
+
+
+_slack_directory_cache: SlackDirectoryCache | None = None
+
+
+def get_slack_directory_cache() -> SlackDirectoryCache:
+    """Get the process-wide SlackDirectoryCache, configured from the environment."""
+    global _slack_directory_cache
+    if _slack_directory_cache is None:
+        _slack_directory_cache = SlackDirectoryCache(
+            max_entries=int(
+                get_config_value("SLACK_DIRECTORY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+            full_reload_seconds=float(
+                get_config_value("SLACK_DIRECTORY_FULL_RELOAD_SECONDS", DEFAULT_FULL_RELOAD_SECONDS)
+            ),
+            targeted_max_ids=int(
+                get_config_value("SLACK_DIRECTORY_TARGETED_MAX_IDS", DEFAULT_TARGETED_MAX_IDS)
+            ),
+        )
+    return _slack_directory_cache
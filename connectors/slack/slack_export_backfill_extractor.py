@@ -1,15 +1,17 @@
 import asyncio
-import json
 import logging
-import zlib
 from typing import cast
-from urllib.parse import urlparse
 
 import asyncpg
-import boto3
 
 from connectors.base import BaseExtractor, TriggerIndexingCallback
 from connectors.base.document_source import DocumentSource
+from connectors.slack.slack_export_reader import (
+    ByteRange,
+    iter_zip_entry_json_array,
+    plan_byte_ranges,
+    read_s3_byte_range,
+)
 from connectors.slack.slack_models import SlackChannelDayFile, SlackExportBackfillConfig
 from connectors.slack.slack_utils import create_slack_message_artifact
 from src.utils.tenant_config import (
@@ -20,6 +22,9 @@ from src.utils.tenant_config import (
 
 logger = logging.getLogger(__name__)
 
+# Maximum concurrent ranged reads from the export per job
+MAX_CONCURRENT_RANGE_READS = 4
+
 
 class SlackExportBackfillExtractor(BaseExtractor[SlackExportBackfillConfig]):
     """
@@ -42,13 +47,20 @@ class SlackExportBackfillExtractor(BaseExtractor[SlackExportBackfillConfig]):
                 f"Processing {len(config.channel_day_files)} channel-day files for job {job_id}"
             )
 
-            # Process channel-day files in parallel
-            tasks = []
-            for channel_day_file in config.channel_day_files:
-                task = self._process_channel_day_file(
-                    job_id, config.uri, channel_day_file, db_pool, config.message_limit
+            # Read adjacent channel-day files together with a few large ranged GETs, and
+            # process the ranges in parallel
+            byte_ranges = plan_byte_ranges(config.channel_day_files)
+            logger.info(
+                f"Reading {len(config.channel_day_files)} channel-day files with "
+                f"{len(byte_ranges)} ranged reads for job {job_id}"
+            )
+            read_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RANGE_READS)
+            tasks = [
+                self._process_byte_range(
+                    job_id, config.uri, byte_range, db_pool, read_semaphore, config.message_limit
                 )
-                tasks.append(task)
+                for byte_range in byte_ranges
+            ]
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -95,40 +107,54 @@ class SlackExportBackfillExtractor(BaseExtractor[SlackExportBackfillConfig]):
                     config.backfill_id, config.tenant_id, 1
                 )
 
-    async def _process_channel_day_file(
+    async def _process_byte_range(
         self,
         job_id: str,
         uri: str,
-        channel_day_file: SlackChannelDayFile,
+        byte_range: ByteRange,
         db_pool: asyncpg.Pool,
+        read_semaphore: asyncio.Semaphore,
         message_limit: int | None = None,
     ) -> list[str]:
-        """Process a single channel-day file using HTTP Range requests."""
-        try:
-            # Read the specific bytes from the S3 ZIP file
-            file_bytes = await self._read_bytes_from_uri(
-                uri, channel_day_file.start_byte, channel_day_file.size
+        """Read a coalesced byte range of the export and process each channel-day file in it."""
+        async with read_semaphore:
+            range_bytes = memoryview(
+                await read_s3_byte_range(uri, byte_range.start, byte_range.end)
             )
 
-            # Decompress the bytes (ZIP entry might be compressed)
-            file_content = await self._decompress_zip_entry_bytes(file_bytes)
-
-            # Parse JSON content
-            messages_data = json.loads(file_content)
-
-            if not messages_data:
-                logger.warning(
-                    f"No messages found in {channel_day_file.channel_name}/{channel_day_file.filename}"
+        entity_ids: list[str] = []
+        for channel_day_file in byte_range.files:
+            offset = channel_day_file.start_byte - byte_range.start
+            entity_ids.extend(
+                await self._process_channel_day_file(
+                    job_id,
+                    range_bytes[offset : offset + channel_day_file.size],
+                    channel_day_file,
+                    db_pool,
+                    message_limit,
                 )
-                return []
+            )
+        return entity_ids
 
-            # Process messages
+    async def _process_channel_day_file(
+        self,
+        job_id: str,
+        file_bytes: bytes | memoryview,
+        channel_day_file: SlackChannelDayFile,
+        db_pool: asyncpg.Pool,
+        message_limit: int | None = None,
+    ) -> list[str]:
+        """Process a single channel-day file from its compressed ZIP entry bytes."""
+        try:
             entity_ids = []
             batch = []
             batch_size = 1000
             message_count = 0
+            found_messages = False
 
-            for msg in messages_data:
+            # Inflate and parse the entry incrementally, storing messages as they're parsed
+            for msg in iter_zip_entry_json_array(file_bytes):
+                found_messages = True
                 if msg.get("type") == "message" and "client_msg_id" in msg:
                     # Create artifact using shared utility function
                     artifact = create_slack_message_artifact(
@@ -152,6 +178,12 @@ class SlackExportBackfillExtractor(BaseExtractor[SlackExportBackfillConfig]):
                             entity_ids.extend([a.entity_id for a in batch])
                         return entity_ids
 
+            if not found_messages:
+                logger.warning(
+                    f"No messages found in {channel_day_file.channel_name}/{channel_day_file.filename}"
+                )
+                return []
+
             # Process any remaining messages in the final batch
             if batch:
                 await self.store_artifacts_batch(db_pool, batch)
@@ -167,28 +199,3 @@ class SlackExportBackfillExtractor(BaseExtractor[SlackExportBackfillConfig]):
                 f"Error processing {channel_day_file.channel_name}/{channel_day_file.filename}: {e}"
             )
             raise
-
-    async def _read_bytes_from_uri(self, uri: str, start_byte: int, size: int) -> bytes:
-        """Read specific byte range from S3 using GetObject with Range."""
-        parsed_uri = urlparse(uri)
-
-        if parsed_uri.scheme != "s3":
-            raise ValueError(f"Only S3 URIs are supported, got: {uri}")
-
-        bucket = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
-        end_byte = start_byte + size - 1
-
-        s3_client = boto3.client("s3")
-        response = s3_client.get_object(
-            Bucket=bucket, Key=key, Range=f"bytes={start_byte}-{end_byte}"
-        )
-        return response["Body"].read()
-
-    async def _decompress_zip_entry_bytes(self, file_bytes: bytes) -> str:
-        """Decompress ZIP entry bytes and return as string."""
-        # The bytes we received are ZIP-compressed DEFLATE data from inside a ZIP file
-        # ZIP uses DEFLATE but with different framing than raw zlib
-        # -zlib.MAX_WBITS tells zlib to expect raw DEFLATE data
-        decompressed = zlib.decompress(file_bytes, -zlib.MAX_WBITS)
-        return decompressed.decode("utf-8")
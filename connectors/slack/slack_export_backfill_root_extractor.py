@@ -9,11 +9,9 @@ import zipfile
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import cast
-from urllib.parse import urlparse
 from uuid import UUID
 
 import asyncpg
-import boto3
 
 from connectors.base import (
     BaseExtractor,
@@ -31,6 +29,7 @@ from connectors.slack.slack_artifacts import (
     SlackUserArtifact,
     SlackUserContent,
 )
+from connectors.slack.slack_export_reader import download_s3_file, parse_s3_uri
 from connectors.slack.slack_models import (
     SlackChannelDayFile,
     SlackExportBackfillConfig,
@@ -215,19 +214,13 @@ class SlackExportBackfillRootExtractor(BaseExtractor[SlackExportBackfillRootConf
             logger.info(f"Successfully completed root job {job_id}")
 
     async def _download_file(self, uri: str, temp_dir: Path) -> Path:
-        parsed_uri = urlparse(uri)
-
-        if parsed_uri.scheme != "s3":
-            raise ValueError(f"Only S3 URIs are supported, got: {uri}")
-
-        bucket = parsed_uri.netloc
-        key = parsed_uri.path.lstrip("/")
-        filename = Path(parsed_uri.path).name or "slack_export.zip"
+        bucket, key = parse_s3_uri(uri)
+        filename = Path(key).name or "slack_export.zip"
         download_path = temp_dir / filename
 
         logger.info(f"Downloading from S3: bucket={bucket}, key={key} to {download_path}")
-        s3_client = boto3.client("s3")
-        s3_client.download_file(bucket, key, str(download_path))
+        # Runs in a worker thread, so multi-GB exports don't block the event loop
+        await download_s3_file(uri, str(download_path))
 
         logger.info(f"Downloaded file to {download_path}")
         return download_path
@@ -0,0 +1,177 @@
+"""Read channel-day files straight out of a Slack export ZIP in S3.
+
+Child backfill jobs read their channel-day files with ranged GETs instead of downloading the
+whole export. Channel-day files of a batch are usually adjacent ZIP entries, so their byte
+ranges are coalesced into a few large reads (`plan_byte_ranges`), and each entry is then
+inflated and parsed incrementally (`iter_zip_entry_json_array`) so a day's messages never
+have to be held in memory as one decompressed string.
+
+boto3 is synchronous, so S3 calls run in a worker thread on one shared client.
+"""
+
+import asyncio
+import codecs
+import json
+import threading
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlparse
+
+import boto3
+from botocore.client import BaseClient
+
+from connectors.slack.slack_models import SlackChannelDayFile
+
+# Entries closer together than this are read with one GET, including the bytes between them
+DEFAULT_MAX_RANGE_GAP_BYTES = 1024 * 1024
+# Upper bound on a single coalesced read, since it is held in memory while its entries are parsed
+DEFAULT_MAX_RANGE_BYTES = 64 * 1024 * 1024
+# Compressed bytes inflated per step when streaming a ZIP entry
+INFLATE_CHUNK_BYTES = 64 * 1024
+
+_s3_client: BaseClient | None = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client() -> BaseClient:
+    """Get the process-wide S3 client. Clients are thread-safe once created, sessions are not."""
+    global _s3_client
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client("s3")
+        return _s3_client
+
+
+def parse_s3_uri(uri: str) -> tuple[str, str]:
+    """Split an s3://bucket/key URI into (bucket, key)."""
+    parsed_uri = urlparse(uri)
+    if parsed_uri.scheme != "s3":
+        raise ValueError(f"Only S3 URIs are supported, got: {uri}")
+    return parsed_uri.netloc, parsed_uri.path.lstrip("/")
+
+
+@dataclass
+class ByteRange:
+    """A contiguous byte range of the export covering one or more channel-day files."""
+
+    start: int
+    end: int  # exclusive
+    files: list[SlackChannelDayFile] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def plan_byte_ranges(
+    channel_day_files: list[SlackChannelDayFile],
+    max_gap_bytes: int = DEFAULT_MAX_RANGE_GAP_BYTES,
+    max_range_bytes: int = DEFAULT_MAX_RANGE_BYTES,
+) -> list[ByteRange]:
+    """Coalesce channel-day file byte ranges into as few reads as possible.
+
+    Files are merged into the previous range when the gap between them is at most
+    `max_gap_bytes` and the merged range stays within `max_range_bytes`. A single file larger
+    than `max_range_bytes` still gets a range of its own.
+    """
+    ranges: list[ByteRange] = []
+    for channel_day_file in sorted(channel_day_files, key=lambda f: f.start_byte):
+        file_start = channel_day_file.start_byte
+        file_end = file_start + channel_day_file.size
+        current = ranges[-1] if ranges else None
+        if (
+            current is not None
+            and file_start - current.end <= max_gap_bytes
+            and max(current.end, file_end) - current.start <= max_range_bytes
+        ):
+            current.end = max(current.end, file_end)
+            current.files.append(channel_day_file)
+        else:
+            ranges.append(ByteRange(start=file_start, end=file_end, files=[channel_day_file]))
+    return ranges
+
+
+async def read_s3_byte_range(uri: str, start: int, end: int) -> bytes:
+    """Read bytes [start, end) of an S3 object without blocking the event loop."""
+    bucket, key = parse_s3_uri(uri)
+
+    def read() -> bytes:
+        response = get_s3_client().get_object(
+            Bucket=bucket, Key=key, Range=f"bytes={start}-{end - 1}"
+        )
+        return response["Body"].read()
+
+    return await asyncio.to_thread(read)
+
+
+async def download_s3_file(uri: str, download_path: str) -> None:
+    """Download an S3 object to a local file without blocking the event loop."""
+    bucket, key = parse_s3_uri(uri)
+    await asyncio.to_thread(get_s3_client().download_file, bucket, key, download_path)
+
+
+def _inflate_text(deflated: bytes | memoryview) -> Iterator[str]:
+    """Inflate raw DEFLATE data (as stored in a ZIP entry) into UTF-8 text, chunk by chunk."""
+    # -zlib.MAX_WBITS tells zlib to expect raw DEFLATE data without zlib framing
+    inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    for offset in range(0, len(deflated), INFLATE_CHUNK_BYTES):
+        text = text_decoder.decode(
+            inflater.decompress(deflated[offset : offset + INFLATE_CHUNK_BYTES])
+        )
+        if text:
+            yield text
+    text = text_decoder.decode(inflater.flush(), final=True)
+    if text:
+        yield text
+
+
+def iter_zip_entry_json_array(deflated: bytes | memoryview) -> Iterator[Any]:
+    """Inflate a ZIP entry holding a JSON array and yield its items as soon as each is parsed.
+
+    Raises:
+        ValueError: If the entry isn't a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    in_array = False
+
+    for text in _inflate_text(deflated):
+        buffer = buffer[pos:] + text
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            if not in_array:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                in_array = True
+                pos += 1
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The item continues in the next chunk
+                break
+            if end == len(buffer) and not isinstance(item, dict | list):
+                # A number at the end of the buffer may continue in the next chunk
+                break
+            yield item
+            pos = end
+
+    if not in_array:
+        # Empty entry
+        return
+    # Surface the parse error for the truncated or malformed item, if any
+    decoder.raw_decode(buffer, pos)
+    raise ValueError("JSON array is not terminated")
@@ -216,14 +216,8 @@ class SlackPruner(BasePruner):
                     f"Found {len(document_ids)} documents to delete for channel {channel_id}: {document_ids}"
                 )
 
-                # Delete each document and its chunks
-                successful_deletions = 0
-                for document_id in document_ids:
-                    success = await self.delete_document(document_id, tenant_id, db_pool)
-                    if success:
-                        successful_deletions += 1
-                    else:
-                        logger.warning(f"Failed to delete document {document_id}")
+                # Delete the documents and their chunks in bulk
+                successful_deletions = await self.delete_documents(document_ids, tenant_id, db_pool)
 
                 total_artifacts_deleted = channel_artifacts_deleted + message_artifacts_deleted
 
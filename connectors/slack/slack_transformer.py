@@ -1,11 +1,10 @@
 """Transformer for Slack channel-day artifacts to SlackChannelDocuments."""
 
-import asyncio
 import html
 import re
 from datetime import UTC, datetime, timedelta
 from datetime import date as date_type
-from typing import Any
+from typing import Any, Required, TypedDict
 
 import asyncpg
 
@@ -13,6 +12,11 @@ from connectors.base import BaseTransformer
 from connectors.base.doc_ids import get_slack_doc_id
 from connectors.base.document_source import DocumentSource
 from connectors.slack.slack_channel_document import SlackChannelDocument
+from connectors.slack.slack_directory_cache import (
+    get_slack_directory_cache,
+    is_slack_directory_cache_enabled,
+    load_full_slack_directory,
+)
 from connectors.slack.slack_message_utils import deduplicate_messages
 from connectors.slack.slack_thread_utils import (
     resolve_thread_relationships_with_placeholders,
@@ -27,6 +31,15 @@ from src.utils.pacific_time import format_pacific_time
 logger = get_logger(__name__)
 
 
+class ChannelDayFetchResult(TypedDict, total=False):
+    """Outcome of fetching one channel-day's messages; `error` is set when `success` is False."""
+
+    success: Required[bool]
+    channel_day: Required[dict[str, str]]
+    messages: list[asyncpg.Record]
+    error: Exception
+
+
 class SlackTransformer(BaseTransformer[SlackChannelDocument]):
     """Transform Slack channel-day batches into SlackChannelDocuments."""
 
@@ -45,7 +58,7 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
         self._dm_participants_map = {}  # Map DM ID to list of participant user IDs
 
     async def transform_artifacts(
-        self, entity_ids: list[str], readonly_db_pool: asyncpg.Pool
+        self, entity_ids: list[str], readonly_db_pool: asyncpg.Pool, tenant_id: str | None = None
     ) -> list[SlackChannelDocument]:
         """Transform Slack artifacts identified by entity_ids into SlackChannelDocuments.
 
@@ -55,6 +68,7 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
         Args:
             entity_ids: List of entity IDs (e.g., message IDs, channel IDs, user IDs)
             readonly_db_pool: Database connection pool
+            tenant_id: Tenant ID, used to share the Slack directory cache across index jobs
 
         Returns:
             List of SlackChannelDocument instances
@@ -141,16 +155,20 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
         logger.info(f"Found {len(channel_days)} unique channel-day combinations to process")
 
         # Use the existing transform_channel_days implementation
-        return await self.transform_channel_days(channel_days, readonly_db_pool)
+        return await self.transform_channel_days(channel_days, readonly_db_pool, tenant_id)
 
     async def transform_channel_days(
-        self, channel_days: list[dict[str, str]], readonly_db_pool: asyncpg.Pool
+        self,
+        channel_days: list[dict[str, str]],
+        readonly_db_pool: asyncpg.Pool,
+        tenant_id: str | None = None,
     ) -> list[SlackChannelDocument]:
         """Transform channel-day batches into SlackChannelDocuments.
 
         Args:
             channel_days: List of dicts with 'channel_id' and 'date' keys
             readonly_db_pool: Database connection pool
+            tenant_id: Tenant ID, used to share the Slack directory cache across index jobs
 
         Returns:
             List of SlackChannelDocument instances
@@ -159,48 +177,58 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
             logger.warning("No channel-days to process")
             return []
 
-        # First, load all metadata (users, channels, teams)
-        await self._load_all_metadata(readonly_db_pool)
-
         logger.info(f"Processing {len(channel_days)} channel-day combinations")
 
-        # Create semaphore to limit concurrency to 40
-        semaphore = asyncio.Semaphore(40)
-
-        async def build_document_with_semaphore(channel_day):
-            async with semaphore:
-                try:
-                    doc = await self._build_channel_day_document(
-                        channel_day["channel_id"], channel_day["date"], readonly_db_pool
-                    )
-                    if doc:
-                        logger.info(
-                            f"✅ Created document for {channel_day['channel_id']} on {channel_day['date']}"
-                        )
-                    return {"success": True, "doc": doc, "channel_day": channel_day}
-                except Exception as e:
-                    logger.error(
-                        f"Failed to process {channel_day['channel_id']} on {channel_day['date']}: {e}",
-                        exc_info=True,
-                    )
-                    return {"success": False, "error": e, "channel_day": channel_day}
+        # Fetch messages for all channel-days up front with set-based queries, so we know which
+        # users and channels the directory lookup actually needs
+        fetch_results: list[ChannelDayFetchResult]
+        try:
+            messages_by_channel_day = await self._fetch_channel_days_messages(
+                channel_days, readonly_db_pool
+            )
+            fetch_results = [
+                {"success": True, "messages": messages, "channel_day": channel_day}
+                for channel_day, messages in zip(channel_days, messages_by_channel_day, strict=True)
+            ]
+        except Exception as e:
+            logger.error(
+                f"Failed to fetch messages for {len(channel_days)} channel-days: {e}",
+                exc_info=True,
+            )
+            fetch_results = [
+                {"success": False, "error": e, "channel_day": channel_day}
+                for channel_day in channel_days
+            ]
 
-        # Process all channel-days in parallel with limited concurrency
-        results = await asyncio.gather(
-            *[build_document_with_semaphore(channel_day) for channel_day in channel_days],
-            return_exceptions=False,
+        user_ids, channel_ids = self._collect_directory_ids(
+            [result for result in fetch_results if result["success"]]
         )
+        await self._load_metadata(readonly_db_pool, tenant_id, user_ids, channel_ids)
 
-        # Separate successful documents from errors
+        # Build documents, separating successful documents from errors
         documents = []
-        errors = []
+        errors = [result for result in fetch_results if not result["success"]]
 
-        for result in results:
-            if result["success"]:
-                if result["doc"] is not None:
-                    documents.append(result["doc"])
-            else:
-                errors.append(result)
+        for result in fetch_results:
+            if not result["success"]:
+                continue
+
+            channel_day = result["channel_day"]
+            try:
+                doc = self._build_channel_day_document(
+                    channel_day["channel_id"], channel_day["date"], result["messages"]
+                )
+                if doc is not None:
+                    logger.info(
+                        f"✅ Created document for {channel_day['channel_id']} on {channel_day['date']}"
+                    )
+                    documents.append(doc)
+            except Exception as e:
+                logger.error(
+                    f"Failed to process {channel_day['channel_id']} on {channel_day['date']}: {e}",
+                    exc_info=True,
+                )
+                errors.append({"success": False, "error": e, "channel_day": channel_day})
 
         # If any errors occurred, raise an exception with details
         if errors:
@@ -221,151 +249,144 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
         logger.info(f"Successfully created {len(documents)} documents")
         return documents
 
-    async def _load_all_metadata(self, readonly_db_pool: asyncpg.Pool) -> None:
-        """Load all metadata (users, channels, teams) using a single database query."""
+    async def _load_metadata(
+        self,
+        readonly_db_pool: asyncpg.Pool,
+        tenant_id: str | None = None,
+        user_ids: set[str] | None = None,
+        channel_ids: set[str] | None = None,
+    ) -> None:
+        """Load Slack users, channels and teams, via the tenant's shared directory cache if enabled.
 
-        # Use single connection and query for better database efficiency
-        # This is still really inefficient, especially for large tenants, but it's a start.
-        # Using bigger index batch sizes will help mitigate this as well, as would properly filtering
-        # to only the entities we need (harder).
-        async with readonly_db_pool.acquire() as conn:
-            artifacts = await conn.fetch(
-                "SELECT * FROM ingest_artifact WHERE entity IN ('slack_user', 'slack_channel', 'slack_team')"
+        The directory is shared across concurrent index jobs, so the maps must not be mutated.
+        """
+        if tenant_id and is_slack_directory_cache_enabled():
+            directory = await get_slack_directory_cache().get_directory(
+                tenant_id, readonly_db_pool, user_ids, channel_ids
             )
+        else:
+            directory = await load_full_slack_directory(readonly_db_pool)
 
-        # Process all artifacts in a single pass
-        metadata_counter: ErrorCounter = {}
-        for artifact in artifacts:
-            with record_exception_and_ignore(
-                logger,
-                f"Failed to process {artifact.get('entity', 'unknown')} artifact loaded from DB",
-                metadata_counter,
-            ):
-                entity_type = artifact["entity"]
-                content = artifact.get("content", {})
-                if not content:
-                    continue
-
-                entity_id = content.get("id", artifact["entity_id"])
-
-                if entity_type == "slack_user":
-                    self._users_metadata[entity_id] = content
-                elif entity_type == "slack_channel":
-                    self._channels_metadata[entity_id] = content
-                elif entity_type == "slack_team":
-                    self._team_metadata[entity_id] = content
-
-        # Build lookup maps
-        self._build_user_map()
-        self._build_channel_map()
-        self._build_dm_map()
-
-        metadata_successful = metadata_counter.get("successful", 0)
-        metadata_failed = metadata_counter.get("failed", 0)
+        self._users_metadata = directory.users_metadata
+        self._channels_metadata = directory.channels_metadata
+        self._team_metadata = directory.team_metadata
+        self._user_map = directory.user_map
+        self._channel_map = directory.channel_map
+        self._dm_participants_map = directory.dm_participants_map
 
         logger.info(
             f"Loaded metadata: {len(self._users_metadata)} users, "
-            f"{len(self._channels_metadata)} channels, {len(self._team_metadata)} teams "
-            f"({metadata_successful} successful, {metadata_failed} failed)"
+            f"{len(self._channels_metadata)} channels, {len(self._team_metadata)} teams"
         )
 
-    def _build_user_map(self) -> None:
-        """Build user ID to username mapping."""
-        for user_id, user_data in self._users_metadata.items():
-            profile = user_data.get("profile", {})
-            username = (
-                profile.get("display_name")
-                or profile.get("real_name")
-                or user_data.get("real_name")
-                or user_data.get("name")
-                or user_id
-            )
-            self._user_map[user_id] = username
-
-    def _build_channel_map(self) -> None:
-        """Build channel ID to channel name mapping."""
-        for channel_id, channel_data in self._channels_metadata.items():
-            channel_name = channel_data.get("name", channel_id)
-            self._channel_map[channel_id] = channel_name
-
-    def _build_dm_map(self) -> None:
-        """Build DM ID to participants mapping."""
-        for channel_id, channel_data in self._channels_metadata.items():
-            # Check if this is a DM (direct message) by looking for is_im flag
-            if channel_data.get("is_im", False):
-                members = channel_data.get("members", [])
-                self._dm_participants_map[channel_id] = members
-                logger.debug(f"Loaded DM {channel_id} with {len(members)} participants: {members}")
-
-    async def _build_channel_day_document(
+    def _collect_directory_ids(
+        self, fetch_results: list[ChannelDayFetchResult]
+    ) -> tuple[set[str], set[str]]:
+        """Collect the user and channel IDs referenced by fetched channel-day messages.
+
+        Returns:
+            Tuple of (user IDs, channel IDs)
+        """
+        user_ids: set[str] = set()
+        channel_ids: set[str] = set()
+
+        for result in fetch_results:
+            channel_ids.add(result["channel_day"]["channel_id"])
+            for artifact in result["messages"]:
+                message = artifact.get("content") or {}
+                for key in ("user", "parent_user_id"):
+                    if message.get(key):
+                        user_ids.add(message[key])
+
+                block_text = self._extract_text_from_blocks(message.get("blocks"))
+                for text in (message.get("text"), block_text):
+                    if text:
+                        user_ids.update(self.MENTION_PATTERN.findall(text))
+                        channel_ids.update(
+                            match.group(1) for match in self.CHANNEL_PATTERN.finditer(text)
+                        )
+
+        return user_ids, channel_ids
+
+    async def _fetch_channel_days_messages(
         self,
-        channel_id: str,
-        date: str,
+        channel_days: list[dict[str, str]],
         readonly_db_pool: asyncpg.Pool,
-    ) -> SlackChannelDocument | None:
-        """Build a document for a specific channel-day.
+    ) -> list[list[asyncpg.Record]]:
+        """Fetch message artifacts for channel-days, plus replies to threads started those days.
+
+        Uses two queries regardless of the number of channel-days: one for the messages in every
+        (channel, day) window, and one for the replies to every thread started in them.
 
         Args:
-            channel_id: The Slack channel ID
-            date: The date in YYYY-MM-DD format
+            channel_days: List of dicts with 'channel_id' and 'date' (YYYY-MM-DD) keys
             readonly_db_pool: Database connection pool
 
         Returns:
-            SlackChannelDocument or None if no messages found
+            Message artifacts for each channel-day, in the same order as `channel_days`. Each
+            list is empty if the channel has no messages that day.
         """
-        channel_name = self._channel_map.get(channel_id, channel_id)
-
-        # Convert date string to datetime.date object
-        date_obj = date_type.fromisoformat(date)
+        window_channel_ids = []
+        window_starts = []
+        window_ends = []
+        for channel_day in channel_days:
+            date_obj = date_type.fromisoformat(channel_day["date"])
+            # Use start of next day to avoid floating-point precision issues with datetime.max.time()
+            start_of_day = datetime.combine(date_obj, datetime.min.time(), tzinfo=UTC)
+            start_of_next_day = datetime.combine(
+                date_obj + timedelta(days=1), datetime.min.time(), tzinfo=UTC
+            )
+            window_channel_ids.append(channel_day["channel_id"])
+            window_starts.append(start_of_day.timestamp())
+            window_ends.append(start_of_next_day.timestamp())
 
-        # Calculate timestamp bounds for efficient index usage
-        start_of_day = datetime.combine(date_obj, datetime.min.time(), tzinfo=UTC)
-        # Use start of next day to avoid floating-point precision issues with datetime.max.time()
-        next_day = date_obj + timedelta(days=1)
-        start_of_next_day = datetime.combine(next_day, datetime.min.time(), tzinfo=UTC)
-        start_timestamp = start_of_day.timestamp()
-        end_timestamp = start_of_next_day.timestamp()
-        logger.info(
-            f"Building document for {channel_name} ({channel_id}) on {date} (start_timestamp: {start_timestamp}, end_timestamp: {end_timestamp})"
-        )
+        day_messages: list[list[asyncpg.Record]] = [[] for _ in channel_days]
+        thread_messages: list[list[asyncpg.Record]] = [[] for _ in channel_days]
+        query_count = 0
 
         async with readonly_db_pool.acquire() as conn:
-            # Step 1: Get all messages for this channel-day
-            day_messages = await conn.fetch(
+            # Step 1: Get all messages for every channel-day window
+            rows = await conn.fetch(
                 # IMPORTANT: we use `ts` bounds here (as opposed to something like `DATE(to_timestamp((content->>'ts')::float))`)
                 # to ensure we use the `idx_slack_message_ts` index
                 """
-                SELECT * FROM ingest_artifact
-                WHERE entity = 'slack_message'
-                  AND metadata->>'channel_id' = $1
-                  AND (content->>'ts')::float >= $2
-                  AND (content->>'ts')::float < $3
-                ORDER BY (content->>'ts')::float
+                SELECT a.*, w.window_index
+                FROM unnest($1::text[], $2::float8[], $3::float8[])
+                    WITH ORDINALITY AS w(channel_id, start_ts, end_ts, window_index)
+                JOIN ingest_artifact a
+                  ON a.entity = 'slack_message'
+                 AND a.metadata->>'channel_id' = w.channel_id
+                 AND (a.content->>'ts')::float >= w.start_ts
+                 AND (a.content->>'ts')::float < w.end_ts
+                ORDER BY (a.content->>'ts')::float
                 """,
-                channel_id,
-                start_timestamp,
-                end_timestamp,
+                window_channel_ids,
+                window_starts,
+                window_ends,
             )
-
-            if not day_messages:
-                logger.debug(f"No messages found for {channel_name} on {date}")
-                return None
-
-            # Step 2: Find thread roots that start on this day
-            thread_roots = set()
-            for msg in day_messages:
-                content = msg.get("content", {})
-                msg_ts = content.get("ts")
-                thread_ts = content.get("thread_ts")
-
-                # This is a thread root if it has no thread_ts or thread_ts equals ts
-                if msg_ts and (not thread_ts or thread_ts == msg_ts):
-                    thread_roots.add(msg_ts)
-
-            # Step 3: Fetch ALL messages from threads that start on this day
-            thread_messages = []
-            if thread_roots:
-                thread_messages = await conn.fetch(
+            query_count += 1
+            for row in rows:
+                # WITH ORDINALITY is 1-based
+                day_messages[row["window_index"] - 1].append(row)
+
+            # Step 2: Find thread roots that start on each channel-day
+            windows_by_thread_root: dict[str, list[int]] = {}
+            for window_index, messages in enumerate(day_messages):
+                thread_roots = set()
+                for msg in messages:
+                    content = msg.get("content", {})
+                    msg_ts = content.get("ts")
+                    thread_ts = content.get("thread_ts")
+
+                    # This is a thread root if it has no thread_ts or thread_ts equals ts
+                    if msg_ts and (not thread_ts or thread_ts == msg_ts):
+                        thread_roots.add(msg_ts)
+                for thread_root in thread_roots:
+                    windows_by_thread_root.setdefault(thread_root, []).append(window_index)
+
+            # Step 3: Fetch ALL messages from threads that start on these days
+            if windows_by_thread_root:
+                replies = await conn.fetch(
                     """
                     SELECT * FROM ingest_artifact
                     WHERE entity = 'slack_message'
@@ -373,102 +394,132 @@ class SlackTransformer(BaseTransformer[SlackChannelDocument]):
                       AND content->>'ts' != content->>'thread_ts'
                     ORDER BY (content->>'ts')::float
                     """,
-                    list(thread_roots),
-                )
-                logger.info(
-                    f"Found {len(thread_messages)} thread replies for {len(thread_roots)} threads"
+                    list(windows_by_thread_root),
                 )
+                query_count += 1
+                for reply in replies:
+                    thread_ts = reply.get("content", {}).get("thread_ts")
+                    for window_index in windows_by_thread_root.get(thread_ts, []):
+                        thread_messages[window_index].append(reply)
 
-            # Step 4: Process all messages
-            all_message_artifacts = day_messages + thread_messages
-            processed_messages = []
-
-            # Find the latest source_updated_at from all artifacts
-            latest_source_updated_at = None
-            for artifact in all_message_artifacts:
-                artifact_updated_at = artifact.get("source_updated_at")
-                if artifact_updated_at and (
-                    latest_source_updated_at is None
-                    or artifact_updated_at > latest_source_updated_at
-                ):
-                    latest_source_updated_at = artifact_updated_at
-
-            message_counter: ErrorCounter = {}
-            for artifact in all_message_artifacts:
-                with record_exception_and_ignore(
-                    logger, "Failed to process message", message_counter
-                ):
-                    message = artifact.get("content", {})
-                    if message:
-                        message["channel_id"] = channel_id
-                        processed_msg = self._process_message(message, channel_id)
-                        if processed_msg:
-                            processed_messages.append(processed_msg)
-
-            # Log message processing results
-            message_successful = message_counter.get("successful", 0)
-            message_failed = message_counter.get("failed", 0)
-            logger.debug(
-                f"Message processing for {channel_name} on {date}: {message_successful} successful, {message_failed} failed, {len(processed_messages)} final messages"
-            )
+        logger.info(
+            f"Fetched {len(rows)} messages and {sum(len(m) for m in thread_messages)} thread "
+            f"replies for {len(channel_days)} channel-days",
+            query_count=query_count,
+        )
 
-            # Deduplicate (in case some thread messages were already in day_messages)
-            processed_messages = deduplicate_messages(processed_messages)
+        return [day + thread for day, thread in zip(day_messages, thread_messages, strict=True)]
 
-            # Add thread relationship placeholders if needed
-            processed_messages = resolve_thread_relationships_with_placeholders(
-                processed_messages, channel_id, channel_name
-            )
+    def _build_channel_day_document(
+        self,
+        channel_id: str,
+        date: str,
+        all_message_artifacts: list[asyncpg.Record],
+    ) -> SlackChannelDocument | None:
+        """Build a document for a specific channel-day from its fetched message artifacts.
 
-            # Sort messages for display
-            processed_messages = sort_messages_for_display(processed_messages)
+        Args:
+            channel_id: The Slack channel ID
+            date: The date in YYYY-MM-DD format
+            all_message_artifacts: Message artifacts from _fetch_channel_days_messages
 
-            # Create document
-            document_id = get_slack_doc_id(channel_id, date)
+        Returns:
+            SlackChannelDocument or None if no messages found
+        """
+        channel_name = self._channel_map.get(channel_id, channel_id)
 
-            # Get team info if available
-            team_id = None
-            team_domain = None
-            if self._team_metadata:
-                team_id, team_data = next(iter(self._team_metadata.items()))
-                team_domain = team_data.get("domain", "")
+        if not all_message_artifacts:
+            logger.debug(f"No messages found for {channel_name} on {date}")
+            return None
 
-            document_data = {
-                "channel_id": channel_id,
-                "channel_name": channel_name,
-                "date": date,
-                "messages": processed_messages,
-            }
+        logger.info(f"Building document for {channel_name} ({channel_id}) on {date}")
 
-            if team_id:
-                document_data["team_id"] = team_id
-            if team_domain:
-                document_data["team_domain"] = team_domain
+        # Step 4: Process all messages
+        processed_messages = []
 
-            # Use the latest source_updated_at, or fall back to the current time if none available
-            source_updated_at = latest_source_updated_at or datetime.now(UTC)
+        # Find the latest source_updated_at from all artifacts
+        latest_source_updated_at = None
+        for artifact in all_message_artifacts:
+            artifact_updated_at = artifact.get("source_updated_at")
+            if artifact_updated_at and (
+                latest_source_updated_at is None or artifact_updated_at > latest_source_updated_at
+            ):
+                latest_source_updated_at = artifact_updated_at
+
+        message_counter: ErrorCounter = {}
+        for artifact in all_message_artifacts:
+            with record_exception_and_ignore(logger, "Failed to process message", message_counter):
+                message = artifact.get("content", {})
+                if message:
+                    message["channel_id"] = channel_id
+                    processed_msg = self._process_message(message, channel_id)
+                    if processed_msg:
+                        processed_messages.append(processed_msg)
+
+        # Log message processing results
+        message_successful = message_counter.get("successful", 0)
+        message_failed = message_counter.get("failed", 0)
+        logger.debug(
+            f"Message processing for {channel_name} on {date}: {message_successful} successful, {message_failed} failed, {len(processed_messages)} final messages"
+        )
 
-            # Determine permissions based on whether this is a DM or public channel
-            permission_policy: PermissionPolicy | None = None
-            permission_allowed_tokens = None
+        # Deduplicate (in case some thread messages were already in day_messages)
+        processed_messages = deduplicate_messages(processed_messages)
 
-            if channel_id.startswith("D"):
-                permission_policy = "private"
-                permission_allowed_tokens = self._get_dm_permission_tokens(channel_id)
-                logger.info(
-                    f"Set private permissions for DM {channel_id} with {len(permission_allowed_tokens) if permission_allowed_tokens else 0} participants"
-                )
-            else:
-                permission_policy = "tenant"
-                logger.debug(f"Set tenant permissions for public channel {channel_id}")
-
-            return SlackChannelDocument(
-                id=document_id,
-                raw_data=document_data,
-                source_updated_at=source_updated_at,
-                permission_policy=permission_policy,
-                permission_allowed_tokens=permission_allowed_tokens,
+        # Add thread relationship placeholders if needed
+        processed_messages = resolve_thread_relationships_with_placeholders(
+            processed_messages, channel_id, channel_name
+        )
+
+        # Sort messages for display
+        processed_messages = sort_messages_for_display(processed_messages)
+
+        # Create document
+        document_id = get_slack_doc_id(channel_id, date)
+
+        # Get team info if available
+        team_id = None
+        team_domain = None
+        if self._team_metadata:
+            team_id, team_data = next(iter(self._team_metadata.items()))
+            team_domain = team_data.get("domain", "")
+
+        document_data = {
+            "channel_id": channel_id,
+            "channel_name": channel_name,
+            "date": date,
+            "messages": processed_messages,
+        }
+
+        if team_id:
+            document_data["team_id"] = team_id
+        if team_domain:
+            document_data["team_domain"] = team_domain
+
+        # Use the latest source_updated_at, or fall back to the current time if none available
+        source_updated_at = latest_source_updated_at or datetime.now(UTC)
+
+        # Determine permissions based on whether this is a DM or public channel
+        permission_policy: PermissionPolicy | None = None
+        permission_allowed_tokens = None
+
+        if channel_id.startswith("D"):
+            permission_policy = "private"
+            permission_allowed_tokens = self._get_dm_permission_tokens(channel_id)
+            logger.info(
+                f"Set private permissions for DM {channel_id} with {len(permission_allowed_tokens) if permission_allowed_tokens else 0} participants"
             )
+        else:
+            permission_policy = "tenant"
+            logger.debug(f"Set tenant permissions for public channel {channel_id}")
+
+        return SlackChannelDocument(
+            id=document_id,
+            raw_data=document_data,
+            source_updated_at=source_updated_at,
+            permission_policy=permission_policy,
+            permission_allowed_tokens=permission_allowed_tokens,
+        )
 
     def _extract_text_from_blocks(self, blocks: list[dict[str, Any]] | None) -> str:
         """Extract text content from Slack blocks.
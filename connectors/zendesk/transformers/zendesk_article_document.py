@@ -2,12 +2,12 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from markdownify import markdownify as md
 
 from connectors.base.base_chunk import BaseChunk
 from connectors.base.base_document import BaseDocument
 from connectors.base.document_source import DocumentSource
+from connectors.base.text_splitter import get_text_splitter
 from connectors.zendesk.client.zendesk_help_center_models import ZendeskCategory, ZendeskSection
 from connectors.zendesk.extractors.zendesk_artifacts import (
     ZendeskArticleArtifact,
@@ -34,6 +34,9 @@ class ZendeskArticleChunkRawData(TypedDict):
 class ZendeskArticleChunk(BaseChunk[ZendeskArticleChunkMetadata]):
     raw_data: ZendeskArticleChunkRawData
 
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data["content"]
         chunk_index = self.raw_data["chunk_index"]
@@ -45,6 +48,9 @@ class ZendeskArticleChunk(BaseChunk[ZendeskArticleChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data["content"]
+
     def get_metadata(self) -> ZendeskArticleChunkMetadata:
         return ZendeskArticleChunkMetadata(
             article_id=self.raw_data["article_id"],
@@ -78,12 +84,7 @@ class ZendeskArticleDocument(BaseDocument[ZendeskArticleChunk, ZendeskArticleDoc
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
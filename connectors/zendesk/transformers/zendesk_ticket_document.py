@@ -6,9 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal, TypedDict
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, get_text_splitter
 from connectors.base.document_source import DocumentSource
 
 
@@ -54,6 +52,9 @@ class ZendeskTicketDocumentMetadata(TypedDict):
 
 @dataclass
 class ZendeskTicketChunk(BaseChunk[ZendeskTicketChunkMetadata]):
+    # Shifted whenever the document gains or loses a chunk
+    volatile_metadata_keys = frozenset({"chunk_index", "total_chunks"})
+
     def get_content(self) -> str:
         content = self.raw_data.get("content", "")
         chunk_index = self.raw_data.get("chunk_index", 0)
@@ -65,6 +66,9 @@ class ZendeskTicketChunk(BaseChunk[ZendeskTicketChunkMetadata]):
         position_context = f"[Part {chunk_index + 1} of {total_chunks}]\n\n"
         return f"{position_context}{content}"
 
+    def get_split_content(self) -> str:
+        return self.raw_data.get("content", "")
+
     def get_metadata(self) -> ZendeskTicketChunkMetadata:
         return ZendeskTicketChunkMetadata(
             ticket_id=self.raw_data["ticket_id"],
@@ -315,12 +319,7 @@ class ZendeskTicketDocument(BaseDocument[ZendeskTicketChunk, ZendeskTicketDocume
         if not full_content.strip():
             return []
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=6000,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
+        text_splitter = get_text_splitter()
 
         text_chunks = text_splitter.split_text(full_content)
 
@@ -0,0 +1,7 @@
+-- Let webhook subscriptions opt in to batched deliveries: one documents.changed payload
+-- listing up to a batch of changed documents instead of one document.changed per document
+
+ALTER TABLE webhook_subscriptions
+    ADD COLUMN IF NOT EXISTS batch_deliveries BOOLEAN NOT NULL DEFAULT false;
+
+COMMENT ON COLUMN webhook_subscriptions.batch_deliveries IS 'Whether to send one documents.changed payload per batch of changed documents';
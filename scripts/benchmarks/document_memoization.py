@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for per-document memoization during indexing.
+
+Replays the document-level CPU work one `gen_and_store_embeddings` job does for each
+document (content hash, reference scan, chunking, Turbopuffer/Postgres/OpenSearch row
+building) over synthetic Gong, Notion and PostHog documents, once without memoization
+(every phase rebuilds content and metadata) and once with `BaseDocument.enable_memoization()`.
+Reports CPU time per index job for each connector.
+
+No network or database access is made.
+
+Example usage:
+
+    uv run python scripts/benchmarks/document_memoization.py --docs 200 --jobs 5
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from connectors.base import BaseDocument
+from connectors.gong.gong_call_document import GongCallDocument
+from connectors.notion.notion_page_document import NotionPageDocument
+from connectors.posthog.posthog_documents import PostHogInsightDocument
+from src.ingest.references.find_references import find_references_in_doc
+
+NOW = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_words(rng: random.Random) -> list[str]:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(2000)]
+
+
+def make_gong_call(i: int, rng: random.Random, words: list[str]) -> GongCallDocument:
+    """A call with a few hundred transcript lines split into transcript chunks."""
+    lines = [
+        f"Speaker {rng.randint(1, 6)}: {' '.join(rng.choices(words, k=rng.randint(5, 40)))}"
+        for _ in range(rng.randint(200, 600))
+    ]
+    transcript_chunks = [
+        {"content": "\n".join(lines[start : start + 40]), "segment_indices": [start]}
+        for start in range(0, len(lines), 40)
+    ]
+    return GongCallDocument(
+        id=f"gong_call_{i}",
+        source_updated_at=NOW,
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={
+            "call_id": str(i),
+            "title": f"Call {i}",
+            "workspace_id": "ws",
+            "owner_email": "owner@example.com",
+            "started": NOW.isoformat(),
+            "duration_ms": 1_800_000,
+            "participants": [
+                {"name": f"Person {n}", "email": f"p{n}@example.com"} for n in range(6)
+            ],
+            "source_created_at": NOW.isoformat(),
+            "transcript_lines": lines,
+            "transcript_chunks": transcript_chunks,
+        },
+    )
+
+
+def make_notion_page(i: int, rng: random.Random, words: list[str]) -> NotionPageDocument:
+    """A page with a few hundred paragraph and list blocks."""
+    blocks = [
+        {
+            "block_id": f"block_{i}_{b}",
+            "block_type": rng.choice(["paragraph", "bulleted_list_item", "heading_2"]),
+            "content": " ".join(rng.choices(words, k=rng.randint(5, 60))),
+            "last_edited_by": f"user_{rng.randint(1, 10)}",
+        }
+        for b in range(rng.randint(100, 400))
+    ]
+    return NotionPageDocument(
+        id=f"notion_page_{i}",
+        source_updated_at=NOW,
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={
+            "page_id": f"page_{i}",
+            "page_title": f"Page {i}",
+            "page_url": f"https://notion.so/page_{i}",
+            "workspace_id": "ws",
+            "blocks": blocks,
+            "comments": [],
+            "properties": {"Status": "Done"},
+            "source_created_at": NOW.isoformat(),
+        },
+    )
+
+
+def make_posthog_insight(i: int, rng: random.Random, words: list[str]) -> PostHogInsightDocument:
+    """An insight with a moderately sized query definition."""
+    events = [{"id": rng.choice(words), "math": "total"} for _ in range(rng.randint(5, 30))]
+    return PostHogInsightDocument(
+        id=f"posthog_insight_{i}",
+        source_updated_at=NOW,
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={
+            "insight_id": i,
+            "project_id": 1,
+            "short_id": f"ins{i}",
+            "name": f"Insight {i}",
+            "description": " ".join(rng.choices(words, k=80)),
+            "filters": {"events": events, "interval": "day"},
+            "query": {"kind": "TrendsQuery", "series": events},
+            "created_at": NOW.isoformat(),
+            "updated_at": NOW.isoformat(),
+            "tags": ["growth"],
+            "dashboards": [1, 2],
+        },
+    )
+
+
+def index_job(documents: list[BaseDocument[Any, Any]]) -> None:
+    """The per-document calls gen_and_store_embeddings makes, in the same order."""
+    for document in documents:
+        # prepare_documents_batch
+        document.get_content_hash()
+        find_references_in_doc(document.get_content(), document.get_reference_id())
+        chunks = document.to_embedding_chunks()
+        for chunk in chunks:
+            document.populate_chunk_permissions(chunk)
+            # batch_turbopuffer_write
+            chunk.get_content_hash()
+            json.dumps(chunk.get_metadata())
+            _ = chunk.source_created_at
+        # batch_postgres_write
+        document.get_content()
+        json.dumps(document.get_metadata())
+        document.get_source_created_at()
+        # batch_opensearch_write
+        document.get_content()
+        document.get_source_created_at()
+        document.get_metadata()
+
+
+def measure(documents: list[BaseDocument[Any, Any]], jobs: int, memoize: bool) -> float:
+    """Average CPU seconds per index job."""
+    total = 0.0
+    for _ in range(jobs):
+        for document in documents:
+            if memoize:
+                document.enable_memoization()
+            else:
+                document.disable_memoization()
+        start = time.process_time()
+        index_job(documents)
+        total += time.process_time() - start
+    for document in documents:
+        document.disable_memoization()
+    return total / jobs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=100, help="Documents per connector")
+    parser.add_argument("--jobs", type=int, default=3, help="Index jobs to average over")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = make_words(rng)
+    factories: dict[str, Callable[[int, random.Random, list[str]], BaseDocument[Any, Any]]] = {
+        "gong": make_gong_call,
+        "notion": make_notion_page,
+        "posthog": make_posthog_insight,
+    }
+
+    print(f"{args.docs} documents per connector, averaged over {args.jobs} index jobs\n")
+    for name, factory in factories.items():
+        documents = [factory(i, rng, words) for i in range(args.docs)]
+        hashes = [document.get_content_hash() for document in documents]
+
+        before = measure(documents, args.jobs, memoize=False)
+        after = measure(documents, args.jobs, memoize=True)
+
+        for document, content_hash in zip(documents, hashes, strict=True):
+            document.enable_memoization()
+            assert document.get_content_hash() == content_hash, "memoized hash differs"
+            document.disable_memoization()
+
+        print(
+            f"{name:<10} before {before * 1000:>9.1f}ms/job   after {after * 1000:>9.1f}ms/job   "
+            f"{before / after:>5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
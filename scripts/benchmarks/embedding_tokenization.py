@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for embedding input preparation (tokenization + truncation).
+
+Compares the previous per-chunk path (`tiktoken.encoding_for_model` + `encode` for every
+chunk, on the event loop) against `OpenAIClient._process_texts_for_embedding`, which uses a
+cached encoding and a single `encode_batch` call in a worker thread. Also reports the worst
+event loop stall observed while each path runs, since that is what trips liveness checks.
+
+No OpenAI requests are made.
+
+Example usage:
+
+    uv run python scripts/benchmarks/embedding_tokenization.py --chunks 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import string
+import time
+
+import tiktoken
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from src.clients.openai import MAX_TOKENS_PER_TEXT, OpenAIClient
+
+
+def make_chunks(count: int, seed: int = 0) -> list[str]:
+    """Generate chunk-sized texts, including a few that need truncation."""
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(2000)
+    ]
+    chunks = []
+    for i in range(count):
+        # ~1 in 50 chunks is oversized, the rest are typical 500-6000 char chunks
+        n_words = rng.randint(10000, 14000) if i % 50 == 0 else rng.randint(80, 900)
+        chunks.append(" ".join(rng.choices(words, k=n_words)))
+    return chunks
+
+
+def process_per_chunk(model: str, texts: list[str]) -> tuple[list[str], list[int]]:
+    """The previous implementation: look up the encoding and encode every chunk one at a time."""
+    processed_texts = []
+    token_counts = []
+    for text in texts:
+        encoding = tiktoken.encoding_for_model(model)
+        tokens = encoding.encode(text)
+        if len(tokens) > MAX_TOKENS_PER_TEXT:
+            tokens = tokens[:MAX_TOKENS_PER_TEXT]
+            processed_texts.append(encoding.decode(tokens))
+            token_counts.append(MAX_TOKENS_PER_TEXT)
+        else:
+            processed_texts.append(text)
+            token_counts.append(len(tokens))
+    return processed_texts, token_counts
+
+
+async def measure(label: str, coro_fn, n_chunks: int) -> tuple[list[str], list[int]]:
+    """Run `coro_fn` while a ticker task records the longest gap between event loop ticks."""
+    max_stall = 0.0
+    running = True
+
+    async def ticker() -> None:
+        nonlocal max_stall
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            max_stall = max(max_stall, now - last - 0.005)
+            last = now
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    result = await coro_fn()
+    elapsed = time.perf_counter() - start
+    running = False
+    await ticker_task
+
+    print(
+        f"{label:<28} {n_chunks / elapsed:>10.0f} chunks/sec   "
+        f"{elapsed:>7.3f}s total   max loop stall {max_stall * 1000:>8.1f}ms"
+    )
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunks", type=int, default=2000, help="Number of chunks to prepare")
+    args = parser.parse_args()
+
+    client = OpenAIClient()
+    model = client.get_embedding_model()
+    texts = make_chunks(args.chunks)
+
+    # Warm up tiktoken's own encoding registry so neither path pays the download/load cost
+    tiktoken.encoding_for_model(model)
+
+    async def before():
+        return process_per_chunk(model, texts)
+
+    async def after():
+        return await asyncio.to_thread(client._process_texts_for_embedding, texts)
+
+    print(f"Preparing {args.chunks} chunks for {model}\n")
+    before_result = await measure("before (per-chunk, on loop)", before, args.chunks)
+    after_result = await measure("after (encode_batch, thread)", after, args.chunks)
+
+    assert before_result == after_result, "processed texts/token counts differ between paths"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for finding document references in large documents.
+
+Compares `find_references_in_doc` with a full scan that runs every reference regex over
+the whole content (stripping the Notion header once per Notion pattern), which is what
+it did before patterns were prefiltered. Documents are synthetic multi-megabyte texts:
+plain prose, prose with references of every kind mixed in, and a Notion page with a
+Contributors header. Both must find the same references.
+
+Example usage:
+
+    uv run python scripts/benchmarks/reference_scanning.py --size-mb 4 --runs 3
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+from collections import defaultdict
+from collections.abc import Callable
+
+from src.ingest.references.find_references import DOC_REFERENCE_PATTERNS, find_references_in_doc
+
+REFERENCES = [
+    "ENG-123",
+    "see 2024-01-15",
+    "company/repo#456",
+    "https://linear.app/team/issue/ENG-9/some-title",
+    "https://github.com/org/repo/pull/3",
+    "https://github.com/org/repo/blob/main/src/file.py",
+    "https://app.graphite.dev/github/pr/org/repo/12",
+    "https://drive.google.com/file/d/1AnotherFile789/edit",
+    "https://acme.gong.io/call?id=99",
+    "https://www.notion.so/workspace/Page-0123456789abcdef0123456789abcdef",
+    "12345678-90ab-cdef-1234-567890abcdef",
+    "https://demo.lightning.force.com/lightning/r/Contact/003gK00000AB08eQAD/view",
+]
+
+
+def make_document(rng: random.Random, size: int, reference_rate: float, header: str = "") -> str:
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(2000)
+    ]
+    parts = [header]
+    length = len(header)
+    while length < size:
+        line = " ".join(
+            rng.choice(REFERENCES) if rng.random() < reference_rate else rng.choice(words)
+            for _ in range(rng.randint(5, 30))
+        )
+        parts.append(f"- {line}.")
+        length += len(line) + 3
+    return "\n".join(parts)
+
+
+def find_references_full_scan(content: str, doc_reference_id: str) -> dict[str, int]:
+    """Run every pattern's regex over the whole content."""
+    reference_counts: dict[str, int] = defaultdict(int)
+    for pattern in DOC_REFERENCE_PATTERNS:
+        search_content = content
+        if pattern.strip_notion_contributors:
+            search_content = re.sub(r"^Contributors:.*$", "", content, flags=re.MULTILINE)
+        for match in pattern.regex.finditer(search_content):
+            reference_counts[pattern.ref_builder(match)] += 1
+    reference_counts.pop(doc_reference_id, None)
+    return dict(reference_counts)
+
+
+def measure(
+    find_references: Callable[[str, str], dict[str, int]], content: str, runs: int
+) -> tuple[float, dict[str, int]]:
+    """Best wall time over runs, and the references found."""
+    best = float("inf")
+    result: dict[str, int] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = find_references(content, "r_notion_page_self")
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--size-mb", type=float, default=4, help="Size of each document in MB")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per document (best is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    size = int(args.size_mb * 1_000_000)
+    notion_header = (
+        "Page: Planning\n"
+        "Contributors: <@11111111-2222-3333-4444-555555555555>, "
+        "<@66666666-7777-8888-9999-000000000000>\n"
+    )
+    documents = {
+        "prose": make_document(rng, size, reference_rate=0.0),
+        "references": make_document(rng, size, reference_rate=0.01),
+        "notion": make_document(rng, size, reference_rate=0.001, header=notion_header),
+    }
+
+    print(f"{args.size_mb:g}MB documents, best of {args.runs} runs\n")
+    for name, content in documents.items():
+        before, expected = measure(find_references_full_scan, content, args.runs)
+        after, result = measure(find_references_in_doc, content, args.runs)
+        assert result == expected, f"{name}: references differ from full scan"
+        print(
+            f"{name:<12} before {before * 1000:>8.1f}ms   after {after * 1000:>8.1f}ms   "
+            f"{before / after:>5.2f}x   {sum(result.values())} references"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Microbenchmark for document text splitting.
+
+Compares langchain's `RecursiveCharacterTextSplitter`, as the document classes used to
+build it for every chunking call, against the shared `get_text_splitter()` splitter over a
+corpus of large synthetic documents (prose with paragraphs and sentences, plus a few
+documents without paragraph breaks that fall back to word-level splitting). Checks that
+both produce identical chunks.
+
+Example usage:
+
+    uv run python scripts/benchmarks/text_splitting.py --docs 200
+"""
+
+import argparse
+import logging
+import random
+import string
+import time
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from connectors.base import get_text_splitter
+
+# langchain warns about oversized chunks; that's not what we're measuring
+logging.getLogger("langchain_text_splitters").setLevel(logging.ERROR)
+
+
+def make_corpus(count: int, seed: int = 0) -> list[str]:
+    """Generate large documents; every 20th has no paragraph or sentence breaks."""
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(2000)
+    ]
+    corpus = []
+    for i in range(count):
+        if i % 20 == 0:
+            corpus.append(" ".join(rng.choices(words, k=rng.randint(20000, 60000))))
+            continue
+        paragraphs = []
+        for _ in range(rng.randint(100, 400)):
+            sentences = [
+                " ".join(rng.choices(words, k=rng.randint(5, 25))) for _ in range(rng.randint(1, 8))
+            ]
+            paragraphs.append(". ".join(sentences) + ".")
+        corpus.append("\n\n".join(paragraphs))
+    return corpus
+
+
+def split_with_langchain(corpus: list[str]) -> list[list[str]]:
+    """The previous per-document path: build a langchain splitter for every document."""
+    results = []
+    for text in corpus:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=6000,
+            chunk_overlap=100,
+            length_function=len,
+            separators=["\n\n", "\n", ". ", " ", ""],
+        )
+        results.append(splitter.split_text(text))
+    return results
+
+
+def split_with_shared_splitter(corpus: list[str]) -> list[list[str]]:
+    return [get_text_splitter().split_text(text) for text in corpus]
+
+
+def measure(label: str, fn, corpus: list[str]) -> list[list[str]]:
+    total_mb = sum(len(text) for text in corpus) / 1_000_000
+    start = time.perf_counter()
+    result = fn(corpus)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<12} {len(corpus) / elapsed:>8.1f} docs/sec   {total_mb / elapsed:>7.2f} MB/sec   "
+        f"{elapsed:>7.3f}s total"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--docs", type=int, default=100, help="Number of documents to split")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs)
+    total_chars = sum(len(text) for text in corpus)
+    print(f"Splitting {args.docs} documents ({total_chars / 1_000_000:.1f}M chars)\n")
+
+    before = measure("langchain", split_with_langchain, corpus)
+    after = measure("shared", split_with_shared_splitter, corpus)
+
+    assert before == after, "chunks differ between splitters"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Content-addressed cache for embedding vectors.
+
+Embeddings are keyed by (model, sha256 of the processed text) so that re-indexing
+unchanged chunk text never pays for the same OpenAI call twice. Vectors are stored
+compactly as float16 bytes (6KB for a 3072-dim vector).
+
+The backend is selected with EMBEDDING_CACHE_BACKEND:
+- "none" (default): caching disabled
+- "memory": in-process LRU, sized by EMBEDDING_CACHE_MAX_ENTRIES
+- "redis": shared cache through src/clients/redis.py, expiring after EMBEDDING_CACHE_TTL_SECONDS
+- "disk": local on-disk store under EMBEDDING_CACHE_DIR
+
+Cache failures are never fatal: a failed lookup is treated as a miss and a failed
+store is logged and ignored.
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+
+import newrelic.agent
+import numpy as np
+
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 5000  # ~30MB of 3072-dim float16 vectors
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+REDIS_KEY_PREFIX = "embedding:"
+
+
+def make_embedding_cache_key(model: str, text: str) -> str:
+    """Build the content-addressed cache key for an already-processed text."""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{text_hash}"
+
+
+def encode_vector(vector: list[float]) -> bytes:
+    """Encode an embedding vector as float16 bytes."""
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """Decode float16 bytes back into an embedding vector."""
+    return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+
+
+class EmbeddingCacheBackend(ABC):
+    """Storage backend for encoded embedding vectors."""
+
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """Return the stored bytes for every key that is present."""
+
+    @abstractmethod
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        """Store encoded vectors by key."""
+
+
+class InMemoryEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """In-process LRU backend."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        for key in keys:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                found[key] = value
+        return found
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        for key, value in items.items():
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """Redis backend, shared across processes.
+
+    The shared Redis client decodes responses as strings, so vectors are base64-encoded.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        from src.clients.redis import get_client as get_redis_client
+
+        if not keys:
+            return {}
+
+        redis_client = await get_redis_client()
+        values = await redis_client.mget([f"{REDIS_KEY_PREFIX}{key}" for key in keys])
+        return {
+            key: base64.b64decode(value)
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        from src.clients.redis import get_client as get_redis_client
+
+        if not items:
+            return
+
+        redis_client = await get_redis_client()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(
+                    f"{REDIS_KEY_PREFIX}{key}",
+                    self.ttl_seconds,
+                    base64.b64encode(value).decode("ascii"),
+                )
+            await pipe.execute()
+
+
+class DiskEmbeddingCacheBackend(EmbeddingCacheBackend):
+    """Local on-disk backend, one file per vector sharded by key hash prefix."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def _path_for(self, key: str) -> Path:
+        model, _, text_hash = key.rpartition(":")
+        return self.directory / model / text_hash[:2] / f"{text_hash}.f16"
+
+    def _read_many(self, keys: list[str]) -> dict[str, bytes]:
+        found: dict[str, bytes] = {}
+        for key in keys:
+            try:
+                found[key] = self._path_for(key).read_bytes()
+            except FileNotFoundError:
+                continue
+        return found
+
+    def _write_many(self, items: dict[str, bytes]) -> None:
+        for key, value in items.items():
+            path = self._path_for(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers never see partial vectors
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(value)
+                os.replace(tmp_path, path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        return await asyncio.to_thread(self._read_many, keys)
+
+    async def set_many(self, items: dict[str, bytes]) -> None:
+        await asyncio.to_thread(self._write_many, items)
+
+
+class EmbeddingCache:
+    """Embedding cache with hit/miss accounting in front of a pluggable backend."""
+
+    def __init__(self, backend: EmbeddingCacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get_many(self, model: str, texts: list[str]) -> dict[str, list[float]]:
+        """Look up cached embeddings for processed texts.
+
+        Returns:
+            Dict mapping text -> embedding for every cache hit
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        keys = [make_embedding_cache_key(model, text) for text in unique_texts]
+
+        try:
+            stored = await self.backend.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed, treating as miss: {e}")
+            stored = {}
+
+        found = {
+            text: decode_vector(stored[key])
+            for text, key in zip(unique_texts, keys, strict=True)
+            if key in stored
+        }
+
+        hits = len(found)
+        misses = len(unique_texts) - hits
+        self.hits += hits
+        self.misses += misses
+        newrelic.agent.record_custom_metrics(
+            [
+                ("Custom/EmbeddingCache/Hits", hits),
+                ("Custom/EmbeddingCache/Misses", misses),
+            ]
+        )
+
+        return found
+
+    async def set_many(self, model: str, embeddings: dict[str, list[float]]) -> None:
+        """Store embeddings for processed texts."""
+        if not embeddings:
+            return
+
+        items = {
+            make_embedding_cache_key(model, text): encode_vector(vector)
+            for text, vector in embeddings.items()
+        }
+        try:
+            await self.backend.set_many(items)
+        except Exception as e:
+            logger.warning(f"Failed to store {len(items)} embeddings in cache: {e}")
+
+    def get_stats(self) -> dict[str, int | float | str]:
+        """Get cumulative hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_embedding_cache_from_config() -> EmbeddingCache | None:
+    """Create the embedding cache configured by EMBEDDING_CACHE_BACKEND, or None if disabled."""
+    backend_name = str(get_config_value("EMBEDDING_CACHE_BACKEND", "none")).lower()
+
+    backend: EmbeddingCacheBackend
+    if backend_name == "none":
+        return None
+    elif backend_name == "memory":
+        backend = InMemoryEmbeddingCacheBackend(
+            max_entries=int(get_config_value("EMBEDDING_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        )
+    elif backend_name == "redis":
+        backend = RedisEmbeddingCacheBackend(
+            ttl_seconds=int(get_config_value("EMBEDDING_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        )
+    elif backend_name == "disk":
+        backend = DiskEmbeddingCacheBackend(
+            get_config_value("EMBEDDING_CACHE_DIR", "/tmp/grapevine-embedding-cache")
+        )
+    else:
+        logger.warning(f"Unknown EMBEDDING_CACHE_BACKEND '{backend_name}', caching disabled")
+        return None
+
+    logger.info(f"Embedding cache enabled with {type(backend).__name__}")
+    return EmbeddingCache(backend)
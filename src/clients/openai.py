@@ -1,5 +1,7 @@
 """OpenAI client utility for embeddings and completions."""
 
+import asyncio
+import functools
 import logging
 import sys
 from pathlib import Path
@@ -10,8 +12,9 @@ from openai import AsyncOpenAI, OpenAI
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from src.clients.embedding_cache import create_embedding_cache_from_config
 from src.utils.config import get_config_value, get_openai_api_key, get_openai_base_url
-from src.utils.rate_limiter import RateLimitedError, rate_limited
+from src.utils.rate_limiter import RateLimitedError, TokenBucket, rate_limited
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +28,31 @@ MAX_TOKENS_PER_BATCH = 250000  # true limit: 300k tokens
 MAX_ITEMS_PER_BATCH = 2048
 MAX_TOKENS_PER_TEXT = 7000  # true limit: 8192 tokens
 
+# Defaults for concurrent sub-batch dispatch. TPM/RPM are per-process budgets and should stay
+# below our org's embedding rate limits divided by the number of worker processes.
+DEFAULT_MAX_CONCURRENT_BATCHES = 4
+DEFAULT_EMBEDDING_TPM = 2_000_000
+DEFAULT_EMBEDDING_RPM = 2_000
+
+
+@functools.lru_cache(maxsize=8)
+def get_embedding_encoding(model: str) -> tiktoken.Encoding:
+    """Get the tiktoken encoding for an embedding model, loaded once per model."""
+    return tiktoken.encoding_for_model(model)
+
+
+def fits_embedding_token_limit(text: str) -> bool:
+    """Cheaply check whether a text is guaranteed to be under MAX_TOKENS_PER_TEXT without tokenizing.
+
+    Every BPE token covers at least one UTF-8 byte and a character is at most 4 bytes, so
+    the character length bounds the token count from above.
+    """
+    if len(text) * 4 <= MAX_TOKENS_PER_TEXT:
+        return True
+    if len(text) > MAX_TOKENS_PER_TEXT:
+        return False
+    return len(text.encode("utf-8")) <= MAX_TOKENS_PER_TEXT
+
 
 class OpenAIClient:
     """A client for interacting with the OpenAI API."""
@@ -43,6 +71,18 @@ class OpenAIClient:
         self.sync_client = OpenAI(api_key=api_key, base_url=base_url, max_retries=MAX_RETRIES)
         self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=MAX_RETRIES)
         self._api_key = api_key
+        self.embedding_cache = create_embedding_cache_from_config()
+
+        # Per-process budget shared by all concurrent embedding sub-batches
+        self.max_concurrent_batches = int(
+            get_config_value("OPENAI_EMBEDDING_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENT_BATCHES)
+        )
+        self.embedding_tokens_bucket = TokenBucket(
+            int(get_config_value("OPENAI_EMBEDDING_TPM", DEFAULT_EMBEDDING_TPM))
+        )
+        self.embedding_requests_bucket = TokenBucket(
+            int(get_config_value("OPENAI_EMBEDDING_RPM", DEFAULT_EMBEDDING_RPM))
+        )
 
     def get_embedding_model(self) -> str:
         """Get the configured embedding model name.
@@ -67,8 +107,17 @@ class OpenAIClient:
         if model is None:
             model = self.get_embedding_model()
 
-        text, _ = self._process_text_for_embedding(text)
+        if not text:
+            raise ValueError("Cannot embed empty string")
+
+        # Search queries are almost always short enough to skip tokenizing entirely. Their byte
+        # length bounds the token count, which is close enough for charging the TPM budget.
+        if fits_embedding_token_limit(text):
+            token_count = len(text.encode("utf-8"))
+        else:
+            text, token_count = await asyncio.to_thread(self._process_text_for_embedding, text)
 
+        await self._acquire_embedding_budget(token_count)
         try:
             response = await self.async_client.embeddings.create(input=text, model=model)
             return response.data[0].embedding
@@ -86,28 +135,49 @@ class OpenAIClient:
         Raises:
             ValueError: If text is an empty string
         """
-        if not text:
+        processed_texts, token_counts = self._process_texts_for_embedding([text])
+        return processed_texts[0], token_counts[0]
+
+    def _process_texts_for_embedding(self, texts: list[str]) -> tuple[list[str], list[int]]:
+        """Process and validate many texts for embedding, tokenizing them in one `encode_batch` call.
+
+        This is CPU-bound, so async callers should run it in a worker thread.
+
+        Returns:
+            Tuple of (processed_texts, token_counts), in input order
+
+        Raises:
+            ValueError: If any text is an empty string
+        """
+        if not all(texts):
             raise ValueError("Cannot embed empty string")
 
-        model = self.get_embedding_model()
-        encoding = tiktoken.encoding_for_model(model)
-        tokens = encoding.encode(text)
+        encoding = get_embedding_encoding(self.get_embedding_model())
+        all_tokens = encoding.encode_batch(texts)
 
-        if len(tokens) > MAX_TOKENS_PER_TEXT:
-            logger.warning(
-                f"Text exceeds token limit ({len(tokens)} tokens), truncating to {MAX_TOKENS_PER_TEXT} tokens"
-            )
-            tokens = tokens[:MAX_TOKENS_PER_TEXT]
-            text = encoding.decode(tokens)
-            return text, MAX_TOKENS_PER_TEXT
+        processed_texts: list[str] = []
+        token_counts: list[int] = []
+        for text, tokens in zip(texts, all_tokens, strict=True):
+            if len(tokens) > MAX_TOKENS_PER_TEXT:
+                logger.warning(
+                    f"Text exceeds token limit ({len(tokens)} tokens), truncating to {MAX_TOKENS_PER_TEXT} tokens"
+                )
+                processed_texts.append(encoding.decode(tokens[:MAX_TOKENS_PER_TEXT]))
+                token_counts.append(MAX_TOKENS_PER_TEXT)
+            else:
+                processed_texts.append(text)
+                token_counts.append(len(tokens))
 
-        return text, len(tokens)
+        return processed_texts, token_counts
 
     async def create_embeddings_batch(
         self, texts: list[str], model: str | None = None
     ) -> list[list[float]]:
         """Create embeddings for multiple texts, automatically batching to respect token and array limits.
 
+        If an embedding cache is configured (EMBEDDING_CACHE_BACKEND), texts that were already
+        embedded with the same model are served from the cache and only misses hit the API.
+
         Args:
             texts: List of texts to embed
             model: Model to use. If not provided, uses configured default.
@@ -118,29 +188,61 @@ class OpenAIClient:
         if not texts:
             return []
 
-        # Validate and process all inputs upfront, get processed texts and token counts
-        processed_texts = []
-        token_counts = []
-        for text in texts:
-            processed_text, token_count = self._process_text_for_embedding(text)
-            processed_texts.append(processed_text)
-            token_counts.append(token_count)
+        # Validate and process all inputs upfront, get processed texts and token counts.
+        # Tokenizing thousands of chunks is CPU-heavy, so keep it off the event loop.
+        processed_texts, token_counts = await asyncio.to_thread(
+            self._process_texts_for_embedding, texts
+        )
 
         if model is None:
             model = self.get_embedding_model()
 
+        if self.embedding_cache is None:
+            return await self._embed_processed_texts(processed_texts, token_counts, model)
+
+        # Only send cache misses to the API, embedding each distinct text once
+        cached = await self.embedding_cache.get_many(model, processed_texts)
+        miss_token_counts: dict[str, int] = {}
+        for text, token_count in zip(processed_texts, token_counts, strict=True):
+            if text not in cached:
+                miss_token_counts[text] = token_count
+
+        if miss_token_counts:
+            miss_texts = list(miss_token_counts.keys())
+            miss_embeddings = await self._embed_processed_texts(
+                miss_texts, list(miss_token_counts.values()), model
+            )
+            fresh = dict(zip(miss_texts, miss_embeddings, strict=True))
+            await self.embedding_cache.set_many(model, fresh)
+            cached.update(fresh)
+
+        logger.info(
+            f"Embedding cache: {len(processed_texts) - len(miss_token_counts)} of "
+            f"{len(processed_texts)} texts served from cache, {len(miss_token_counts)} embedded"
+        )
+        return [cached[text] for text in processed_texts]
+
+    async def _embed_processed_texts(
+        self, processed_texts: list[str], token_counts: list[int], model: str
+    ) -> list[list[float]]:
+        """Embed already-processed texts, splitting into batches that respect token and array limits.
+
+        Inputs that fit in a single request go straight to `_create_embeddings_single_batch`.
+        Larger inputs are split into sub-batches that are sent concurrently (bounded by
+        OPENAI_EMBEDDING_MAX_CONCURRENCY), with each sub-batch keeping the `rate_limited` retry
+        behaviour. Every request is charged against the per-process TPM/RPM buckets. Output order matches input order.
+        """
         total_estimated_tokens = sum(token_counts)
         if (
             total_estimated_tokens <= MAX_TOKENS_PER_BATCH
             and len(processed_texts) <= MAX_ITEMS_PER_BATCH
         ):
-            return await self._create_embeddings_single_batch(processed_texts, model)
-
-        logger.info(
-            f"Large batch detected ({total_estimated_tokens} estimated tokens, {len(processed_texts)} items), splitting into smaller batches"
-        )
+            return await self._create_embeddings_single_batch(
+                processed_texts, model, total_estimated_tokens
+            )
 
-        all_embeddings: list[list[float]] = []
+        # Split into sub-batches that each fit within the API limits
+        sub_batches: list[tuple[list[str], int]] = []
         current_batch: list[str] = []
         current_batch_tokens = 0
 
@@ -150,11 +252,7 @@ class OpenAIClient:
                 current_batch_tokens + text_tokens > MAX_TOKENS_PER_BATCH
                 or len(current_batch) >= MAX_ITEMS_PER_BATCH
             ):
-                logger.info(
-                    f"Processing batch of {len(current_batch)} chunks ({current_batch_tokens} tokens)"
-                )
-                batch_embeddings = await self._create_embeddings_single_batch(current_batch, model)
-                all_embeddings.extend(batch_embeddings)
+                sub_batches.append((current_batch, current_batch_tokens))
                 current_batch = [text]
                 current_batch_tokens = text_tokens
             else:
@@ -162,23 +260,56 @@ class OpenAIClient:
                 current_batch_tokens += text_tokens
 
         if current_batch:
-            logger.info(
-                f"Processing final batch of {len(current_batch)} chunks ({current_batch_tokens} tokens)"
+            sub_batches.append((current_batch, current_batch_tokens))
+
+        logger.info(
+            f"Large batch detected ({total_estimated_tokens} estimated tokens, {len(processed_texts)} items), "
+            f"dispatching {len(sub_batches)} batches with concurrency {self.max_concurrent_batches}"
+        )
+
+        # Send sub-batches concurrently; gather preserves input order
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+        tasks = [
+            asyncio.create_task(
+                self._dispatch_embeddings_batch(batch, batch_tokens, model, semaphore)
             )
-            batch_embeddings = await self._create_embeddings_single_batch(current_batch, model)
-            all_embeddings.extend(batch_embeddings)
+            for batch, batch_tokens in sub_batches
+        ]
+        try:
+            batch_results = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't keep spending API budget on a call that has already failed
+            for task in tasks:
+                task.cancel()
+            raise
 
-        logger.info(f"Processed {len(processed_texts)} texts in multiple batches")
+        all_embeddings = [embedding for batch in batch_results for embedding in batch]
+        logger.info(f"Processed {len(processed_texts)} texts in {len(sub_batches)} batches")
         return all_embeddings
 
+    async def _dispatch_embeddings_batch(
+        self, texts: list[str], batch_tokens: int, model: str, semaphore: asyncio.Semaphore
+    ) -> list[list[float]]:
+        """Send one sub-batch once a concurrency slot is free."""
+        async with semaphore:
+            logger.info(f"Processing batch of {len(texts)} chunks ({batch_tokens} tokens)")
+            return await self._create_embeddings_single_batch(texts, model, batch_tokens)
+
+    async def _acquire_embedding_budget(self, token_count: int) -> None:
+        """Wait until the per-process RPM/TPM budget allows one request of `token_count` tokens."""
+        await self.embedding_requests_bucket.acquire(1)
+        await self.embedding_tokens_bucket.acquire(token_count)
+
     @rate_limited()
     async def _create_embeddings_single_batch(
-        self, texts: list[str], model: str
+        self, texts: list[str], model: str, token_count: int
     ) -> list[list[float]]:
         """
         Create embeddings for a single batch that fits within limits.
         `texts` should already be validated (`_process_text_for_embedding`)!
+        Every attempt, including retries, is charged against the per-process TPM/RPM budget.
         """
+        await self._acquire_embedding_budget(token_count)
         try:
             response = await self.async_client.embeddings.create(input=texts, model=model)
             return [item.embedding for item in response.data]
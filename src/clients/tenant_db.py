@@ -1,15 +1,25 @@
 import asyncio
 import contextlib
+import functools
 import json
 import os
+import time
 from collections import OrderedDict
 from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from typing import Any, cast
 
 import asyncpg
+import newrelic.agent
 
 from src.clients.ssm import SSMClient
-from src.utils.config import get_control_database_url
+from src.clients.tenant_db_broker import (
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_TENANT,
+    BrokeredPool,
+    ConnectionBroker,
+)
+from src.utils.config import get_config_value, get_control_database_url
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +27,10 @@ logger = get_logger(__name__)
 # Default pool limits
 DEFAULT_MAX_POOLS = 10
 DEFAULT_MAX_READONLY_POOLS = 10
+# In broker mode pools hold no connections while idle, so many more of them can be kept
+DEFAULT_BROKER_MAX_POOLS = 500
+# How long tenant DB credentials fetched from SSM are reused, so rotated passwords are picked up
+DEFAULT_CREDENTIALS_TTL_SECONDS = 300
 
 
 async def init_connection(conn: asyncpg.Connection) -> None:
@@ -39,6 +53,10 @@ class PoolInfo:
 
     pool: asyncpg.Pool
     tenant_id: str = ""
+    # Number of acquire_pool contexts currently using the pool
+    ref_count: int = 0
+    # Set once the pool is evicted from the LRU cache; it's closed when its last user releases it
+    evicted: bool = False
 
 
 class TenantDBManager:
@@ -47,31 +65,36 @@ class TenantDBManager:
     Provides context managers for acquiring pools and connections.
     Supports both tenant-specific and control database pools.
     Uses LRU caching to automatically close least recently used pools.
+
+    Pools are created without any global lock: concurrent callers for the same tenant share
+    one in-flight creation, and different tenants' pools are created in parallel. Evicted
+    pools are only closed once every acquire_pool context using them has exited.
+
+    With a ConnectionBroker (broker mode), connections are capped by the broker's global
+    budget rather than by the number of pools; see src.clients.tenant_db_broker.
     """
 
     def __init__(
         self,
         max_pools: int = DEFAULT_MAX_POOLS,
         max_readonly_pools: int = DEFAULT_MAX_READONLY_POOLS,
+        credentials_ttl_seconds: int = DEFAULT_CREDENTIALS_TTL_SECONDS,
+        broker: ConnectionBroker | None = None,
     ) -> None:
         self._pool_info: OrderedDict[str, PoolInfo] = OrderedDict()
         self._readonly_pool_info: OrderedDict[str, PoolInfo] = OrderedDict()
         self._max_pools = max_pools
         self._max_readonly_pools = max_readonly_pools
+        self._credentials_ttl_seconds = credentials_ttl_seconds
+        # In-flight pool creations keyed by (org_id, readonly), shared by concurrent callers
+        self._pool_creations: dict[tuple[str, bool], asyncio.Task[PoolInfo]] = {}
         # Locks are lazily initialized to avoid event loop binding issues
         # when using multiple asyncio.run() calls in CLI tools
-        self._lock: asyncio.Lock | None = None
         self._control_db_lock: asyncio.Lock | None = None
         self._ssm = SSMClient()
+        self._broker = broker
         self.control_db_pool: asyncpg.Pool | None = None
 
-    @property
-    def _pool_lock(self) -> asyncio.Lock:
-        """Lazily initialize the pool lock for the current event loop."""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
-        return self._lock
-
     @property
     def _control_lock(self) -> asyncio.Lock:
         """Lazily initialize the control DB lock for the current event loop."""
@@ -96,9 +119,12 @@ class TenantDBManager:
                     logger.info("Control database pool initialized")
         return self.control_db_pool
 
-    async def _get_connection_params(self, org_id: str, readonly: bool = False) -> dict[str, str]:
+    async def _get_connection_params(
+        self, org_id: str, readonly: bool = False, use_cache: bool = True
+    ) -> dict[str, str]:
         """Get connection params for the given org suitable for passing to `asyncpg.connect`
-        (or `asyncpg.create_pool`). Queries SSM to retrieve db/username/pass.
+        (or `asyncpg.create_pool`). Queries SSM to retrieve db/username/pass, reusing
+        credentials fetched within the last `credentials_ttl_seconds`.
 
         Expects these SSM parameters (created by tenant provisioner):
           /{org_id}/credentials/postgresql/db_name
@@ -113,12 +139,18 @@ class TenantDBManager:
         Args:
             org_id: Organization ID
             readonly: Whether to use readonly database host
+            use_cache: Whether to reuse cached credentials
         """
         logger.info(f"Fetching database credentials from SSM for org {org_id}")
         db_name, db_rw_user, db_rw_pass = await asyncio.gather(
-            self._ssm.get_parameter(f"/{org_id}/credentials/postgresql/db_name"),
-            self._ssm.get_parameter(f"/{org_id}/credentials/postgresql/db_rw_user"),
-            self._ssm.get_parameter(f"/{org_id}/credentials/postgresql/db_rw_pass"),
+            *[
+                self._ssm.get_parameter(
+                    f"/{org_id}/credentials/postgresql/{name}",
+                    use_cache=use_cache,
+                    ttl_seconds=self._credentials_ttl_seconds,
+                )
+                for name in ("db_name", "db_rw_user", "db_rw_pass")
+            ]
         )
 
         missing: list[str] = []
@@ -151,9 +183,19 @@ class TenantDBManager:
             "ssl": sslmode,
         }
 
+    async def _close_pool(self, pool_info: PoolInfo, readonly: bool = False) -> None:
+        pool_type = "readonly" if readonly else "read-write"
+        try:
+            await pool_info.pool.close()
+        except Exception as e:
+            logger.error(f"Error closing {pool_type} pool for org {pool_info.tenant_id}: {e}")
+
     async def _evict_lru_pool(self, readonly: bool = False) -> None:
         """Evict the least recently used pool to make room for a new one.
 
+        The pool is closed right away if nothing is using it, otherwise by the last
+        acquire_pool context to release it.
+
         Args:
             readonly: Whether to evict from readonly pools or read-write pools
         """
@@ -164,15 +206,78 @@ class TenantDBManager:
             return
 
         # Get least recently used (first item in OrderedDict)
-        lru_org_id, lru_pool_info = next(iter(pool_dict.items()))
+        lru_org_id, lru_pool_info = pool_dict.popitem(last=False)
+        lru_pool_info.evicted = True
+        newrelic.agent.record_custom_metric("Custom/TenantDB/PoolEvictions", 1)
+        if self._broker is not None:
+            self._broker.record_pool_evicted(lru_org_id)
+
+        if lru_pool_info.ref_count > 0:
+            logger.info(
+                f"Evicting LRU {pool_type} pool for org {lru_org_id}, closing once its "
+                f"{lru_pool_info.ref_count} users release it"
+            )
+            return
 
         logger.info(f"Evicting LRU {pool_type} pool for org {lru_org_id}")
+        await self._close_pool(lru_pool_info, readonly=readonly)
+
+    async def _create_pool(self, org_id: str, readonly: bool = False) -> PoolInfo:
+        """Create a pool for a tenant and add it to the LRU cache, evicting pools over the limit."""
+        pool_dict = self._readonly_pool_info if readonly else self._pool_info
+        max_pools = self._max_readonly_pools if readonly else self._max_pools
+        pool_type = "readonly" if readonly else "read-write"
+
+        pool_options: dict[str, Any] = {"min_size": 0, "max_size": 3}
+        if self._broker is not None:
+            # The broker caps checkouts, so the pool only bounds a single tenant's burst.
+            # Idle connections are closed quickly so idle tenants hold none.
+            pool_options = {
+                "min_size": 0,
+                "max_size": self._broker.max_connections_per_tenant,
+                "max_inactive_connection_lifetime": self._broker.idle_connection_lifetime_seconds,
+            }
+
+        connection_params = await self._get_connection_params(org_id, readonly=readonly)
         try:
-            await lru_pool_info.pool.close()
-        except Exception as e:
-            logger.error(f"Error closing {pool_type} pool for org {lru_org_id}: {e}")
-        finally:
-            del pool_dict[lru_org_id]
+            # Create pool with SSL but without certificate verification
+            pool = await asyncpg.create_pool(
+                **connection_params, **pool_options, init=init_connection, timeout=30
+            )
+        except (
+            asyncpg.InvalidPasswordError,
+            asyncpg.InvalidAuthorizationSpecificationError,
+        ):
+            # Cached credentials may have been rotated; retry once with fresh ones
+            logger.warning(f"Retrying {pool_type} pool for org {org_id} with fresh credentials")
+            connection_params = await self._get_connection_params(
+                org_id, readonly=readonly, use_cache=False
+            )
+            pool = await asyncpg.create_pool(
+                **connection_params, **pool_options, init=init_connection, timeout=30
+            )
+
+        if self._broker is not None:
+            pool = cast(asyncpg.Pool, BrokeredPool(pool, org_id, self._broker))
+            self._broker.record_pool_created(org_id)
+        pool_info = PoolInfo(pool=pool, tenant_id=org_id)
+        pool_dict[org_id] = pool_info
+        newrelic.agent.record_custom_metric("Custom/TenantDB/PoolCreations", 1)
+
+        while len(pool_dict) > max_pools:
+            await self._evict_lru_pool(readonly=readonly)
+
+        logger.info(
+            f"Created {pool_type} pool for org {org_id}, new total {len(pool_dict)} {pool_type} pools"
+        )
+        return pool_info
+
+    def _on_pool_creation_done(self, key: tuple[str, bool], task: asyncio.Task[PoolInfo]) -> None:
+        if self._pool_creations.get(key) is task:
+            del self._pool_creations[key]
+        # Mark a failure as retrieved even if every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
 
     async def _get_or_create_pool(self, org_id: str, readonly: bool = False) -> PoolInfo:
         """Internal method to get or create a pool for a tenant.
@@ -187,9 +292,8 @@ class TenantDBManager:
             raise ValueError("org_id is required to get tenant DB pool")
 
         pool_dict = self._readonly_pool_info if readonly else self._pool_info
-        max_pools = self._max_readonly_pools if readonly else self._max_pools
 
-        async with self._pool_lock:
+        while True:
             # Check if pool exists and mark as most recently used
             pool_info = pool_dict.get(org_id)
             if pool_info is not None:
@@ -197,24 +301,24 @@ class TenantDBManager:
                 pool_dict.move_to_end(org_id)
                 return pool_info
 
-            # Check if we need to evict before creating new pool
-            if len(pool_dict) >= max_pools:
-                await self._evict_lru_pool(readonly=readonly)
-
-            connection_params = await self._get_connection_params(org_id, readonly=readonly)
-
-            # Create pool with SSL but without certificate verification
-            pool = await asyncpg.create_pool(
-                **connection_params, min_size=0, max_size=3, init=init_connection, timeout=30
+            # Join the in-flight creation for this tenant, or start one
+            key = (org_id, readonly)
+            creation = self._pool_creations.get(key)
+            if creation is None:
+                creation = asyncio.create_task(self._create_pool(org_id, readonly=readonly))
+                self._pool_creations[key] = creation
+                creation.add_done_callback(functools.partial(self._on_pool_creation_done, key))
+
+            wait_start = time.perf_counter()
+            # Shielded so one cancelled caller doesn't cancel the creation for everyone else
+            pool_info = await asyncio.shield(creation)
+            newrelic.agent.record_custom_metric(
+                "Custom/TenantDB/PoolWaitTimeMS", (time.perf_counter() - wait_start) * 1000
             )
-            pool_info = PoolInfo(pool=pool, tenant_id=org_id)
-            pool_dict[org_id] = pool_info
 
-            pool_type = "readonly" if readonly else "read-write"
-            logger.info(
-                f"Created {pool_type} pool for org {org_id}, new total {len(pool_dict)} {pool_type} pools"
-            )
-            return pool_info
+            # Other creations may have evicted the new pool before this caller resumed
+            if not pool_info.evicted:
+                return pool_info
 
     @contextlib.asynccontextmanager
     async def acquire_pool(
@@ -228,7 +332,8 @@ class TenantDBManager:
             async with tenant_db_manager.acquire_pool(tenant_id, readonly=True) as pool:
                 # Use pool for read-only operations
 
-        The pool is managed by an LRU cache and will be closed when evicted.
+        The pool is managed by an LRU cache. If it's evicted while in use, it's closed once
+        the last context using it exits.
         """
         pool_type = "readonly" if readonly else "read-write"
         try:
@@ -240,7 +345,14 @@ class TenantDBManager:
             raise
 
         logger.info(f"Acquired {pool_type} pool for tenant {tenant_id}")
-        yield pool_info.pool
+        pool_info.ref_count += 1
+        try:
+            yield pool_info.pool
+        finally:
+            pool_info.ref_count -= 1
+            if pool_info.evicted and pool_info.ref_count == 0:
+                logger.info(f"Closing evicted {pool_type} pool for org {tenant_id}")
+                await self._close_pool(pool_info, readonly=readonly)
 
     @contextlib.asynccontextmanager
     async def acquire_connection(
@@ -259,6 +371,22 @@ class TenantDBManager:
         async with self.acquire_pool(tenant_id, readonly=readonly) as pool, pool.acquire() as conn:
             yield conn
 
+    def get_connection_stats(self, per_tenant: bool = True) -> dict[str, Any]:
+        """Pool counts, plus connection usage and churn in broker mode.
+
+        Args:
+            per_tenant: Include a breakdown by tenant ID. Leave this off wherever the stats
+                can be read without auth.
+        """
+        stats: dict[str, Any] = {
+            "broker_mode": self._broker is not None,
+            "read_write_pools": len(self._pool_info),
+            "readonly_pools": len(self._readonly_pool_info),
+        }
+        if self._broker is not None:
+            stats.update(self._broker.get_stats(per_tenant=per_tenant))
+        return stats
+
     async def cleanup(self) -> None:
         """Close all connection pools and reset event-loop-bound state.
 
@@ -266,6 +394,12 @@ class TenantDBManager:
         especially when using multiple asyncio.run() calls in CLI tools.
         After cleanup, the manager can be safely used in a new event loop.
         """
+        # Cancel in-flight pool creations
+        for creation in list(self._pool_creations.values()):
+            creation.cancel()
+        await asyncio.gather(*self._pool_creations.values(), return_exceptions=True)
+        self._pool_creations.clear()
+
         # Close tenant read-write pools
         for pool_info in list(self._pool_info.values()):
             logger.info(f"Closing read-write pool for org {pool_info.tenant_id}")
@@ -290,13 +424,30 @@ class TenantDBManager:
         # Reset locks to None so they can be lazily recreated in the new event loop
         # This is necessary when using multiple asyncio.run() calls - creating new
         # Lock() objects here would bind them to the closing event loop
-        self._lock = None
         self._control_db_lock = None
+        if self._broker is not None:
+            self._broker.reset()
+
+
+def _create_tenant_db_manager() -> TenantDBManager:
+    if not get_config_value("TENANT_DB_BROKER_MODE", False):
+        return TenantDBManager()
+
+    broker = ConnectionBroker(
+        max_connections=int(get_config_value("TENANT_DB_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        max_connections_per_tenant=int(
+            get_config_value(
+                "TENANT_DB_MAX_CONNECTIONS_PER_TENANT", DEFAULT_MAX_CONNECTIONS_PER_TENANT
+            )
+        ),
+    )
+    max_pools = int(get_config_value("TENANT_DB_BROKER_MAX_POOLS", DEFAULT_BROKER_MAX_POOLS))
+    return TenantDBManager(max_pools=max_pools, max_readonly_pools=max_pools, broker=broker)
 
 
 # Singleton manager
 # Session token is automatically used if AWS_SESSION_TOKEN env var is set (matches JS pattern)
-_tenant_db_manager = TenantDBManager()
+_tenant_db_manager = _create_tenant_db_manager()
 
 # Export the singleton for external use
 tenant_db_manager = _tenant_db_manager
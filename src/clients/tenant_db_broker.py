@@ -0,0 +1,290 @@
+"""Connection broker that shares one connection budget across tenant DB pools.
+
+With a fixed number of small pools, a process serving more active tenants than it has
+pools keeps evicting and recreating them, paying TLS and auth on every switch. In broker
+mode TenantDBManager keeps a pool per tenant instead and lets this broker decide how many
+connections each tenant may have checked out:
+
+- The process never has more than `max_connections` connections checked out in total.
+- When tenants compete for the budget, each tenant's share follows its recent demand (a
+  decaying peak of its concurrent checkouts), bounded by `max_connections_per_tenant`.
+  Every tenant can always get at least one connection, and a tenant over its share may
+  still use free budget that no other tenant is waiting for.
+- Tenant pools have min_size=0 and a short idle lifetime, so idle tenants shrink to zero
+  open connections while their pool and cached credentials stay around for the next request.
+
+Pools are wrapped in BrokeredPool, which takes a slot from the broker around every
+connection checkout, including pool-level fetch/execute calls.
+
+Custom metrics have no tenant dimension, so per-tenant acquire waits and pool churn are
+recorded as New Relic custom events (TenantDBAcquireWait, TenantDBPoolChurn) with a
+tenant_id attribute.
+"""
+
+import asyncio
+import contextlib
+import math
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import asyncpg
+import newrelic.agent
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 60
+DEFAULT_MAX_CONNECTIONS_PER_TENANT = 10
+# How quickly a tenant's recent peak demand decays once its load drops
+DEFAULT_DEMAND_HALF_LIFE_SECONDS = 60.0
+# Idle connections are closed after this long, shrinking idle tenants to zero connections
+DEFAULT_IDLE_CONNECTION_LIFETIME_SECONDS = 30.0
+# Shorter waits weren't held back by the broker, so they don't get a per-tenant event
+ACQUIRE_WAIT_EVENT_THRESHOLD_SECONDS = 0.01
+
+
+@dataclass
+class TenantConnectionStats:
+    """Connection usage of one tenant, exposed for capacity tuning."""
+
+    in_use: int = 0
+    waiting: int = 0
+    # Decaying peak of concurrent checkouts
+    recent_demand: float = 0.0
+    demand_updated_at: float = 0.0
+    acquire_count: int = 0
+    acquire_wait_seconds: float = 0.0
+    max_acquire_wait_seconds: float = 0.0
+    pool_creations: int = 0
+    pool_evictions: int = 0
+
+
+class ConnectionBroker:
+    """Shares a global connection budget between tenants according to recent demand."""
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_connections_per_tenant: int = DEFAULT_MAX_CONNECTIONS_PER_TENANT,
+        demand_half_life_seconds: float = DEFAULT_DEMAND_HALF_LIFE_SECONDS,
+        idle_connection_lifetime_seconds: float = DEFAULT_IDLE_CONNECTION_LIFETIME_SECONDS,
+    ) -> None:
+        self.max_connections = max(max_connections, 1)
+        self.max_connections_per_tenant = max(min(max_connections_per_tenant, max_connections), 1)
+        self.demand_half_life_seconds = demand_half_life_seconds
+        self.idle_connection_lifetime_seconds = idle_connection_lifetime_seconds
+        self._tenants: dict[str, TenantConnectionStats] = {}
+        self._in_use = 0
+        # Lazily initialized to avoid binding to an event loop at import time
+        self._condition: asyncio.Condition | None = None
+
+    @property
+    def _slot_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _tenant(self, tenant_id: str) -> TenantConnectionStats:
+        stats = self._tenants.get(tenant_id)
+        if stats is None:
+            stats = self._tenants[tenant_id] = TenantConnectionStats()
+        return stats
+
+    def _current_demand(self, stats: TenantConnectionStats, now: float) -> float:
+        """A tenant's recent peak demand, decayed to now and never below what it needs now."""
+        elapsed = now - stats.demand_updated_at
+        decayed = stats.recent_demand * math.pow(0.5, elapsed / self.demand_half_life_seconds)
+        return max(decayed, stats.in_use + stats.waiting)
+
+    def tenant_limit(self, tenant_id: str) -> int:
+        """How many connections a tenant may have checked out at once right now."""
+        now = time.monotonic()
+        demands = {tid: self._current_demand(stats, now) for tid, stats in self._tenants.items()}
+        tenant_demand = demands.get(tenant_id, 0.0)
+        total_demand = sum(demands.values())
+        if total_demand <= self.max_connections:
+            # Enough budget for everyone's recent peak
+            share = self.max_connections_per_tenant
+        else:
+            share = math.floor(self.max_connections * tenant_demand / total_demand)
+        return max(1, min(share, self.max_connections_per_tenant))
+
+    def _can_acquire(self, tenant_id: str) -> bool:
+        stats = self._tenant(tenant_id)
+        if self._in_use >= self.max_connections:
+            return False
+        if stats.in_use == 0 or stats.in_use < self.tenant_limit(tenant_id):
+            # A tenant's first connection only needs free budget, so no tenant starves
+            return True
+        # Over its share: only borrow free budget nobody else is waiting for
+        return stats.in_use < self.max_connections_per_tenant and not any(
+            other.waiting for other_id, other in self._tenants.items() if other_id != tenant_id
+        )
+
+    async def acquire_slot(self, tenant_id: str) -> None:
+        """Wait until the tenant may check out another connection, then reserve it."""
+        stats = self._tenant(tenant_id)
+        wait_start = time.monotonic()
+        condition = self._slot_condition
+        async with condition:
+            stats.waiting += 1
+            try:
+                await condition.wait_for(lambda: self._can_acquire(tenant_id))
+            finally:
+                stats.waiting -= 1
+
+            now = time.monotonic()
+            stats.in_use += 1
+            self._in_use += 1
+            stats.recent_demand = self._current_demand(stats, now)
+            stats.demand_updated_at = now
+
+        wait_seconds = time.monotonic() - wait_start
+        stats.acquire_count += 1
+        stats.acquire_wait_seconds += wait_seconds
+        stats.max_acquire_wait_seconds = max(stats.max_acquire_wait_seconds, wait_seconds)
+        newrelic.agent.record_custom_metric(
+            "Custom/TenantDB/Broker/AcquireWaitMS", wait_seconds * 1000
+        )
+        if wait_seconds >= ACQUIRE_WAIT_EVENT_THRESHOLD_SECONDS:
+            newrelic.agent.record_custom_event(
+                "TenantDBAcquireWait",
+                {
+                    "tenant_id": tenant_id,
+                    "wait_ms": round(wait_seconds * 1000, 2),
+                    "in_use": stats.in_use,
+                    "limit": self.tenant_limit(tenant_id),
+                },
+            )
+
+    async def release_slot(self, tenant_id: str) -> None:
+        """Return a tenant's connection slot to the budget."""
+        condition = self._slot_condition
+        async with condition:
+            stats = self._tenant(tenant_id)
+            now = time.monotonic()
+            stats.recent_demand = self._current_demand(stats, now)
+            stats.demand_updated_at = now
+            stats.in_use -= 1
+            self._in_use -= 1
+            condition.notify_all()
+
+    def record_pool_created(self, tenant_id: str) -> None:
+        self._tenant(tenant_id).pool_creations += 1
+        self._record_pool_churn(tenant_id, "created")
+
+    def record_pool_evicted(self, tenant_id: str) -> None:
+        self._tenant(tenant_id).pool_evictions += 1
+        self._record_pool_churn(tenant_id, "evicted")
+
+    def _record_pool_churn(self, tenant_id: str, action: str) -> None:
+        stats = self._tenant(tenant_id)
+        newrelic.agent.record_custom_event(
+            "TenantDBPoolChurn",
+            {
+                "tenant_id": tenant_id,
+                "action": action,
+                "pool_creations": stats.pool_creations,
+                "pool_evictions": stats.pool_evictions,
+            },
+        )
+
+    def get_stats(self, per_tenant: bool = True) -> dict[str, Any]:
+        """Snapshot of the budget and overall usage, plus each tenant's usage, latency and pool
+        churn if `per_tenant` is set.
+        """
+        all_tenant_stats = self._tenants.values()
+        snapshot: dict[str, Any] = {
+            "max_connections": self.max_connections,
+            "in_use": self._in_use,
+            "tenant_count": len(self._tenants),
+            "waiting": sum(stats.waiting for stats in all_tenant_stats),
+            "max_acquire_wait_ms": round(
+                max((stats.max_acquire_wait_seconds for stats in all_tenant_stats), default=0.0)
+                * 1000,
+                2,
+            ),
+            "pool_creations": sum(stats.pool_creations for stats in all_tenant_stats),
+            "pool_evictions": sum(stats.pool_evictions for stats in all_tenant_stats),
+        }
+        if not per_tenant:
+            return snapshot
+
+        now = time.monotonic()
+        snapshot["tenants"] = {
+            tenant_id: {
+                "in_use": stats.in_use,
+                "waiting": stats.waiting,
+                "limit": self.tenant_limit(tenant_id),
+                "recent_demand": round(self._current_demand(stats, now), 2),
+                "acquire_count": stats.acquire_count,
+                "avg_acquire_wait_ms": round(
+                    stats.acquire_wait_seconds * 1000 / stats.acquire_count, 2
+                )
+                if stats.acquire_count
+                else 0.0,
+                "max_acquire_wait_ms": round(stats.max_acquire_wait_seconds * 1000, 2),
+                "pool_creations": stats.pool_creations,
+                "pool_evictions": stats.pool_evictions,
+            }
+            for tenant_id, stats in self._tenants.items()
+        }
+        return snapshot
+
+    def reset(self) -> None:
+        """Drop event-loop-bound state, for reuse from a new event loop."""
+        self._condition = None
+        self._in_use = 0
+        for stats in self._tenants.values():
+            stats.in_use = 0
+            stats.waiting = 0
+
+
+class BrokeredPool:
+    """An asyncpg pool whose connection checkouts are admitted by a ConnectionBroker.
+
+    Supports the Pool methods callers use (acquire, fetch, fetchrow, fetchval, execute,
+    executemany); anything else is passed through to the underlying pool.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, tenant_id: str, broker: ConnectionBroker) -> None:
+        self._pool = pool
+        self._tenant_id = tenant_id
+        self._broker = broker
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncIterator[asyncpg.Connection]:
+        await self._broker.acquire_slot(self._tenant_id)
+        try:
+            async with self._pool.acquire(timeout=timeout) as conn:
+                yield conn
+        finally:
+            await self._broker.release_slot(self._tenant_id)
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None) -> list[Any]:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args: Any, timeout: float | None = None) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(
+        self, query: str, *args: Any, column: int = 0, timeout: float | None = None
+    ) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args: Any, *, timeout: float | None = None) -> None:
+        async with self.acquire() as conn:
+            return await conn.executemany(command, args, timeout=timeout)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
@@ -403,6 +403,93 @@ class TurbopufferClient:
             )
             return {}
 
+    async def get_existing_chunk_hashes_bulk(
+        self, tenant_id: str, doc_ids: list[str]
+    ) -> dict[str, dict[str, str]]:
+        """Get existing chunk IDs and content hashes for many documents at once.
+
+        Used by the batched prepare phase so that an index job issues a handful of
+        Turbopuffer queries per batch instead of at least one per document.
+
+        Chunks for all documents are fetched with a single `In` filter and paginated
+        across the combined result by advancing a filter on the chunk id (ids are
+        unique, so unlike updated_at they never tie across a page boundary).
+        If the bulk query fails, falls back to the per-document path.
+
+        Args:
+            tenant_id: The tenant identifier
+            doc_ids: The document IDs to fetch chunks for
+
+        Returns:
+            Dict mapping doc_id -> (chunk_id -> content_hash). Documents without
+            existing chunks map to an empty dict.
+        """
+        result: dict[str, dict[str, str]] = {doc_id: {} for doc_id in doc_ids}
+        if not result:
+            return result
+
+        try:
+            return await self._fetch_chunk_hashes_bulk(tenant_id, result)
+        except Exception as e:
+            logger.warning(
+                f"Bulk chunk hash query failed for {len(result)} documents: {e}. "
+                "Falling back to per-document queries."
+            )
+
+        # get_existing_chunk_hashes returns an empty dict on error, which triggers a full reindex
+        return {
+            doc_id: await self.get_existing_chunk_hashes(tenant_id, doc_id) for doc_id in result
+        }
+
+    async def _fetch_chunk_hashes_bulk(
+        self, tenant_id: str, result: dict[str, dict[str, str]]
+    ) -> dict[str, dict[str, str]]:
+        """Page through chunks for every document in `result`, filling it in place."""
+        namespace = self._get_namespace(tenant_id)
+        doc_filter: Filter = ("document_id", "In", list(result.keys()))
+        last_chunk_id: str | None = None
+        page_count = 0
+        row_count = 0
+
+        while True:
+            page_count += 1
+
+            if last_chunk_id is None:
+                query_filter = doc_filter
+            else:
+                query_filter = cast(Filter, ("And", [doc_filter, ("id", "Gt", last_chunk_id)]))
+
+            response = await namespace.query(
+                rank_by=("id", "asc"),
+                top_k=MAX_TOP_K,
+                filters=query_filter,
+                include_attributes=["id", "document_id", "content_hash"],
+            )
+
+            rows = response.rows or []
+            for row in rows:
+                row_dict = row.to_dict()
+                chunk_id = row_dict.get("id")
+                document_id = row_dict.get("document_id")
+                content_hash = row_dict.get("content_hash")
+
+                if chunk_id:
+                    last_chunk_id = str(chunk_id)
+                if chunk_id and content_hash and document_id in result:
+                    result[str(document_id)][str(chunk_id)] = str(content_hash)
+
+            row_count += len(rows)
+
+            # If we got fewer than MAX_TOP_K, we've fetched all chunks
+            if len(rows) < MAX_TOP_K or last_chunk_id is None:
+                break
+
+        logger.debug(
+            f"Fetched {row_count} existing chunk hashes for {len(result)} documents "
+            f"in {page_count} page(s)"
+        )
+        return result
+
     async def delete_chunks(self, tenant_id: str, doc_id: str):
         """Delete all chunks for a document from Turbopuffer."""
         namespace = self._get_namespace(tenant_id)
@@ -412,6 +499,23 @@ class TurbopufferClient:
 
         logger.info(f"✅ Successfully deleted chunks for document {doc_id} from Turbopuffer")
 
+    async def delete_chunks_for_documents(self, tenant_id: str, doc_ids: list[str]):
+        """Delete all chunks for many documents from Turbopuffer with one filtered delete.
+
+        Args:
+            tenant_id: The tenant identifier
+            doc_ids: IDs of the documents whose chunks should be deleted
+        """
+        if not doc_ids:
+            return
+
+        namespace = self._get_namespace(tenant_id)
+        await namespace.write(
+            delete_by_filter=("document_id", "In", doc_ids),
+        )
+
+        logger.info(f"✅ Successfully deleted chunks for {len(doc_ids)} documents from Turbopuffer")
+
     async def delete_chunks_by_ids(self, tenant_id: str, chunk_ids: list[str]):
         """Delete specific chunks by their IDs from Turbopuffer.
 
@@ -2,7 +2,7 @@
 Document reference finding functionality.
 """
 
-from .calculate_referrers import calculate_referrers
+from .calculate_referrers import calculate_referrers_batch
 from .find_references import find_references_in_doc
 
-__all__ = ["find_references_in_doc", "calculate_referrers"]
+__all__ = ["find_references_in_doc", "calculate_referrers_batch"]
@@ -13,50 +13,50 @@ import asyncpg
 logger = logging.getLogger(__name__)
 
 
-async def calculate_referrers(
-    reference_id: str,
+async def calculate_referrers_batch(
+    reference_ids: list[str],
     readonly_db_pool: asyncpg.Pool,
-) -> dict[str, int]:
-    """Calculate referrers for a document by finding all docs that reference it.
+) -> dict[str, dict[str, int]]:
+    """Calculate referrers for many documents with a single query.
+
+    Uses the GIN index's `?|` operator to find every referring document in one round trip.
 
     Args:
-        reference_id: The reference ID of the document to find referrers for
+        reference_ids: The reference IDs of the documents to find referrers for
         readonly_db_pool: Database pool for queries
 
     Returns:
-        Dict mapping referring document reference_ids to reference counts
+        Dict mapping each requested reference_id to its referrers
+        (referring document reference_id -> reference count)
     """
+    result: dict[str, dict[str, int]] = {reference_id: {} for reference_id in reference_ids}
+    if not result:
+        return result
+
     async with readonly_db_pool.acquire() as conn:
-        # Use GIN index to find all documents that reference our document
-        # Require reference_id to be non-null to skip docs that haven't been migrated yet
-        # or are broken. We can't use a doc without its reference_id.
         referring_docs = await conn.fetch(
             """
-            SELECT reference_id, referenced_docs, metadata
+            SELECT reference_id, referenced_docs
             FROM documents
-            WHERE reference_id IS NOT NULL AND referenced_docs ? $1
+            WHERE reference_id IS NOT NULL AND referenced_docs ?| $1::text[]
             """,
-            reference_id,
+            list(result.keys()),
         )
 
-        referrers: dict[str, int] = {}
-
-        for row in referring_docs:
-            # This should always be a dict given our type codec in TenantDBManager
-            referenced_docs = (
-                row["referenced_docs"] if isinstance(row["referenced_docs"], dict) else {}
-            )
+    for row in referring_docs:
+        # This should always be a dict given our type codec in TenantDBManager
+        referenced_docs = row["referenced_docs"] if isinstance(row["referenced_docs"], dict) else {}
 
-            if reference_id in referenced_docs:
-                reference_count = referenced_docs[reference_id]
+        for referenced_id, reference_count in referenced_docs.items():
+            referrers = result.get(referenced_id)
+            if referrers is not None:
                 referrers[row["reference_id"]] = reference_count
-            else:
-                logger.error(
-                    f"Document returned from referrers query but does not have {reference_id} in its referenced_docs"
-                )
 
-        logger.info(f"Found {len(referrers)} referrers for reference_id {reference_id}")
-        return referrers
+    logger.info(
+        f"Found referrers for {len(result)} reference_ids in one query "
+        f"({len(referring_docs)} referring documents)"
+    )
+    return result
 
 
 def calculate_referrer_score(referrers: dict[str, int]) -> float:
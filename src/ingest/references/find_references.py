@@ -3,11 +3,22 @@ Document reference finding implementation.
 
 This module analyzes document content to find references to other documents
 and returns a mapping of referenced document IDs to their occurrence counts.
+
+Each pattern is matched independently, so a span matched by one pattern can also count
+for another (e.g. an ENG-123 style key inside a UUID). To keep multi-megabyte documents
+cheap, patterns are compiled once and only run where they can match:
+- URL patterns are skipped unless their domain occurs in the content.
+- Patterns without a literal prefix (issue keys, org/repo#123, bare UUIDs) are only tried
+  at candidate positions found from a literal anchor (`-`, `#`, a run of 32 hex digits)
+  instead of at every character.
+- The Notion header is stripped once for all Notion patterns, and only if it is present.
 """
 
 import re
+import string
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 
 from src.ingest.references.reference_ids import (
     get_github_file_reference_id,
@@ -19,6 +30,8 @@ from src.ingest.references.reference_ids import (
     get_salesforce_reference_id,
 )
 
+_NOTION_CONTRIBUTORS_LINE = re.compile(r"^Contributors:.*$", flags=re.MULTILINE)
+
 
 def _strip_contributors_from_notion_header(content: str) -> str:
     """
@@ -26,91 +39,199 @@ def _strip_contributors_from_notion_header(content: str) -> str:
     Strip them out so we don't confuse those UUIDs for document references.
     """
     # See NotionPageDocument for where this line comes from
-    return re.sub(r"^Contributors:.*$", "", content, flags=re.MULTILINE)
+    if "Contributors:" not in content:
+        return content
+    return _NOTION_CONTRIBUTORS_LINE.sub("", content)
+
+
+# Candidate start finders. Each yields, in ascending order, every position where its
+# pattern could match; the pattern itself then decides at each one.
+_DASH_BEFORE_DIGIT = re.compile(r"-(?=\d)")
+_DASH_BEFORE_UUID_GROUP = re.compile(r"-(?=[a-fA-F0-9]{4}-)")
+_HASH_BEFORE_DIGIT = re.compile(r"#(?=\d)")
+# Hex digits become NUL (and NUL becomes something else), so hex runs can be found literally
+_HEX_TO_NUL = str.maketrans({"\0": "\1", **dict.fromkeys(string.hexdigits, "\0")})
+_HEX_RUN = re.compile("\0" * 32 + "\0*")
+_GITHUB_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
+
+
+def _linear_issue_starts(content: str) -> Iterator[int]:
+    """Issue keys have 2-4 capital letters before a dash followed by a digit."""
+    next_start = 0
+    for dash in _DASH_BEFORE_DIGIT.finditer(content):
+        position = dash.start()
+        yield from range(max(position - 4, next_start), position - 1)
+        next_start = position - 1
+
+
+def _dashed_uuid_starts(content: str) -> Iterator[int]:
+    """UUIDs start 8 characters before a dash followed by a 4 hex digit group."""
+    for dash in _DASH_BEFORE_UUID_GROUP.finditer(content):
+        if dash.start() >= 8:
+            yield dash.start() - 8
+
+
+def _hex_uuid_starts(content: str) -> Iterator[int]:
+    """Undashed UUIDs can only start where a run of at least 32 hex digits starts."""
+    for run in _HEX_RUN.finditer(content.translate(_HEX_TO_NUL)):
+        yield run.start()
+
+
+def _name_start(content: str, end: int) -> int:
+    """Start of the run of GitHub owner/repo name characters ending at `end`."""
+    start = end
+    while start > 0 and content[start - 1] in _GITHUB_NAME_CHARS:
+        start -= 1
+    return start
+
+
+def _github_shorthand_starts(content: str) -> Iterator[int]:
+    """Any position in the owner name of `owner/repo` directly before a `#` and a digit."""
+    for hash_sign in _HASH_BEFORE_DIGIT.finditer(content):
+        repo_start = _name_start(content, hash_sign.start())
+        if repo_start == hash_sign.start() or content[repo_start - 1 : repo_start] != "/":
+            continue
+        owner_end = repo_start - 1
+        yield from range(_name_start(content, owner_end), owner_end)
+
+
+@dataclass(frozen=True)
+class ReferencePattern:
+    """A reference pattern and how to narrow down where it is tried.
+
+    Attributes:
+        regex: Compiled pattern; its groups are passed to `ref_builder` via the match
+        ref_builder: Builds the reference ID from a match
+        anchor: Literal every match contains; the pattern is skipped if it is absent
+        find_starts: Yields candidate match positions in ascending order; if None, the
+            whole content is searched
+        strip_notion_contributors: Search the content with the Notion Contributors line removed
+    """
+
+    regex: re.Pattern[str]
+    ref_builder: Callable[[re.Match[str]], str]
+    anchor: str | None = None
+    find_starts: Callable[[str], Iterator[int]] | None = None
+    strip_notion_contributors: bool = False
+
+    def finditer(self, content: str) -> Iterator[re.Match[str]]:
+        """Same matches as `self.regex.finditer(content)`."""
+        if self.anchor is not None and self.anchor not in content:
+            return
+        if self.find_starts is None:
+            yield from self.regex.finditer(content)
+            return
+
+        end = 0
+        for start in self.find_starts(content):
+            if start < end:
+                continue
+            match = self.regex.match(content, start)
+            if match:
+                yield match
+                end = match.end()
 
 
 # Pattern definitions with their corresponding reference ID builders
-# Each pattern can be either:
-# - (pattern, ref_builder) tuple for simple patterns
-# - (pattern, ref_builder, preprocess_function) tuple for patterns that need content preprocessing
-DOC_REFERENCE_PATTERNS: list[tuple[str, Callable] | tuple[str, Callable, Callable[[str], str]]] = [
+DOC_REFERENCE_PATTERNS: list[ReferencePattern] = [
     # Linear issue identifier pattern (e.g., ENG-123, PROD-456) - excludes matches inside URLs
-    (
-        r"(?<!/)([A-Z]{2,4}-\d+)(?!/)\b",
+    ReferencePattern(
+        re.compile(r"(?<!/)([A-Z]{2,4}-\d+)(?!/)\b"),
         lambda m: get_linear_issue_reference_id(issue_id=m.group(1)),
+        anchor="-",
+        find_starts=_linear_issue_starts,
     ),
     # Linear URL pattern
-    (
-        r"https://linear\.app/[^/]+/issue/([A-Z]+-\d+)(?:/[^\s]*)?",
+    ReferencePattern(
+        re.compile(r"https://linear\.app/[^/]+/issue/([A-Z]+-\d+)(?:/[^\s]*)?"),
         lambda m: get_linear_issue_reference_id(issue_id=m.group(1)),
+        anchor="https://linear.app/",
     ),
     # GitHub PR URL pattern
-    (
-        r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)",
+    ReferencePattern(
+        re.compile(r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)"),
         lambda m: get_github_pr_reference_id(
             owner=m.group(1), repo=m.group(2), pr_number=m.group(3)
         ),
+        anchor="https://github.com/",
     ),
     # GitHub PR shorthand reference pattern (org/repo#123)
-    (
-        r"\b([a-zA-Z0-9_.-]+)/([a-zA-Z0-9_.-]+)#(\d+)\b",
+    ReferencePattern(
+        re.compile(r"\b([a-zA-Z0-9_.-]+)/([a-zA-Z0-9_.-]+)#(\d+)\b"),
         lambda m: get_github_pr_reference_id(
             owner=m.group(1), repo=m.group(2), pr_number=m.group(3)
         ),
+        anchor="#",
+        find_starts=_github_shorthand_starts,
     ),
     # Graphite PR URL pattern
-    (
-        r"https://app\.graphite\.dev/github/pr/([^/]+)/([^/]+)/(\d+)(?:/[^/\s]*)?",
+    ReferencePattern(
+        re.compile(r"https://app\.graphite\.dev/github/pr/([^/]+)/([^/]+)/(\d+)(?:/[^/\s]*)?"),
         lambda m: get_github_pr_reference_id(
             owner=m.group(1), repo=m.group(2), pr_number=m.group(3)
         ),
+        anchor="https://app.graphite.dev/github/pr/",
     ),
     # GitHub file blob URL pattern
-    (
-        r'https://github\.com/([^/]+)/([^/]+)/blob/([^/]+)/(.+?)(?:\s|$|[<>"\'#])',
+    ReferencePattern(
+        re.compile(r'https://github\.com/([^/]+)/([^/]+)/blob/([^/]+)/(.+?)(?:\s|$|[<>"\'#])'),
         lambda m: get_github_file_reference_id(
             owner=m.group(1), repo=m.group(2), file_path=m.group(4)
         ),
+        anchor="https://github.com/",
     ),
     # Google Drive file URL pattern
-    (
-        r"https://drive\.google\.com/file/d/([a-zA-Z0-9_-]+)(?:/[^/\s]*)?(?:\?[^\s]*)?",
+    ReferencePattern(
+        re.compile(r"https://drive\.google\.com/file/d/([a-zA-Z0-9_-]+)(?:/[^/\s]*)?(?:\?[^\s]*)?"),
         lambda m: get_google_drive_file_reference_id(file_id=m.group(1)),
+        anchor="https://drive.google.com/file/d/",
     ),
     # Gong call URL pattern
-    (
-        r"https://[\w.-]+\.gong\.io/call\?id=(\d+)",
+    ReferencePattern(
+        re.compile(r"https://[\w.-]+\.gong\.io/call\?id=(\d+)"),
         lambda m: get_gong_call_reference_id(call_id=m.group(1)),
+        anchor=".gong.io/call?id=",
     ),
     # Slack message URL pattern. TODO: AIVP-384 figure out how to handle references to Slack docs
-    # (
-    #     r'https://([^.\s]+)\.slack\.com/archives/([A-Z0-9]{3,11})/p(\d{16})(?:\?[^"\s]*)?',
+    # ReferencePattern(
+    #     re.compile(r'https://([^.\s]+)\.slack\.com/archives/([A-Z0-9]{3,11})/p(\d{16})(?:\?[^"\s]*)?'),
     #     lambda m: get_slack_doc_reference_id(
     #         workspace=m.group(1), channel_id=m.group(2), timestamp=m.group(3)
     #     ),
     # ),
     # Notion URL pattern with UUID
-    (
-        r"https://(?:www\.)?notion\.so/(?:[^/]+/)?(?:[^/]+-)?([a-fA-F0-9]{8}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{12})",
+    ReferencePattern(
+        re.compile(
+            r"https://(?:www\.)?notion\.so/(?:[^/]+/)?(?:[^/]+-)?([a-fA-F0-9]{8}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{4}-?[a-fA-F0-9]{12})"
+        ),
         lambda m: get_notion_page_reference_id(page_uuid=m.group(1)),
-        _strip_contributors_from_notion_header,
+        anchor="notion.so/",
+        strip_notion_contributors=True,
     ),
     # Notion direct UUID pattern (with dashes)
-    (
-        r"(?<![\w/-])([a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12})(?![\w/-])",
+    ReferencePattern(
+        re.compile(
+            r"(?<![\w/-])([a-fA-F0-9]{8}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{4}-[a-fA-F0-9]{12})(?![\w/-])"
+        ),
         lambda m: get_notion_page_reference_id(page_uuid=m.group(1)),
-        _strip_contributors_from_notion_header,
+        anchor="-",
+        find_starts=_dashed_uuid_starts,
+        strip_notion_contributors=True,
     ),
     # Notion direct UUID pattern (without dashes, 32 hex chars)
-    (
-        r"(?<![\w/-])([a-fA-F0-9]{32})(?![\w/-])",
+    ReferencePattern(
+        re.compile(r"(?<![\w/-])([a-fA-F0-9]{32})(?![\w/-])"),
         lambda m: get_notion_page_reference_id(page_uuid=m.group(1)),
-        _strip_contributors_from_notion_header,
+        find_starts=_hex_uuid_starts,
+        strip_notion_contributors=True,
     ),
     # Salesforce Lightning URL pattern with object type
-    (
-        r"https://[^/]+(?:\.lightning\.force\.com|\.my\.salesforce\.com|\.salesforce\.com)/lightning/r/([A-Za-z]+)/([a-zA-Z0-9]{15}(?![a-zA-Z0-9])|[a-zA-Z0-9]{18}(?![a-zA-Z0-9]))(?:/[^\s]*)?",
+    ReferencePattern(
+        re.compile(
+            r"https://[^/]+(?:\.lightning\.force\.com|\.my\.salesforce\.com|\.salesforce\.com)/lightning/r/([A-Za-z]+)/([a-zA-Z0-9]{15}(?![a-zA-Z0-9])|[a-zA-Z0-9]{18}(?![a-zA-Z0-9]))(?:/[^\s]*)?"
+        ),
         lambda m: get_salesforce_reference_id(object_type=m.group(1), record_id=m.group(2)),
+        anchor="/lightning/r/",
     ),
 ]
 
@@ -132,38 +253,21 @@ def find_references_in_doc(content: str, doc_reference_id: str) -> dict[str, int
 
     # Track reference counts
     reference_counts: dict[str, int] = defaultdict(int)
+    notion_content: str | None = None
 
     # Find all potential references using different patterns
-    for pattern_tuple in DOC_REFERENCE_PATTERNS:
-        if len(pattern_tuple) == 3:
-            pattern, ref_builder, preprocess_func = (
-                pattern_tuple[0],
-                pattern_tuple[1],
-                pattern_tuple[2],
-            )
-            _apply_pattern(content, pattern, ref_builder, reference_counts, preprocess_func)
-        else:
-            pattern, ref_builder = pattern_tuple[0], pattern_tuple[1]
-            _apply_pattern(content, pattern, ref_builder, reference_counts)
+    for pattern in DOC_REFERENCE_PATTERNS:
+        search_content = content
+        if pattern.strip_notion_contributors:
+            if notion_content is None:
+                notion_content = _strip_contributors_from_notion_header(content)
+            search_content = notion_content
+
+        for match in pattern.finditer(search_content):
+            reference_counts[pattern.ref_builder(match)] += 1
 
     # Remove self-references
     if doc_reference_id in reference_counts:
         del reference_counts[doc_reference_id]
 
     return dict(reference_counts)
-
-
-def _apply_pattern(
-    content: str,
-    pattern: str,
-    ref_builder: Callable,
-    reference_counts: dict[str, int],
-    preprocess_func: Callable[[str], str] | None = None,
-) -> None:
-    """Apply a single regex pattern and count references."""
-    # Apply preprocessing if provided
-    search_content = preprocess_func(content) if preprocess_func else content
-
-    for match in re.finditer(pattern, search_content):
-        ref_id = ref_builder(match)
-        reference_counts[ref_id] += 1
@@ -88,14 +88,16 @@ async def _fetch_current_referrers(
     if not affected_ref_ids:
         return {}
 
-    placeholders = ",".join(f"${i + 1}" for i in range(len(affected_ref_ids)))
-    query = f"""
+    # A single array parameter rather than one placeholder per id, since bulk deletions can
+    # affect more documents than Postgres allows parameters
+    rows = await conn.fetch(
+        """
         SELECT reference_id, referrers, id
         FROM documents
-        WHERE reference_id IN ({placeholders})
-    """
-
-    rows = await conn.fetch(query, *list(affected_ref_ids))
+        WHERE reference_id = ANY($1::varchar[])
+        """,
+        list(affected_ref_ids),
+    )
 
     current_referrers_map: dict[str, tuple[dict[str, int], str]] = {}
     for row in rows:
@@ -208,6 +210,56 @@ async def prepare_referrer_updates_for_deletion(
     return updates
 
 
+async def prepare_referrer_updates_for_bulk_deletion(
+    deleted_referenced_docs: dict[str, dict[str, int]],
+    deleted_document_ids: set[str],
+    conn: asyncpg.Connection,
+) -> list[ReferrerUpdate]:
+    """Prepare referrer updates for documents affected by deleting many documents at once.
+
+    Like `prepare_referrer_updates_for_deletion`, but each affected document gets one update
+    with every deleted document removed from its `referrers`. Documents that are being
+    deleted themselves are skipped.
+
+    Args:
+        deleted_referenced_docs: The referenced_docs field of each deleted document, by reference_id
+        deleted_document_ids: IDs of the documents being deleted
+        conn: Database connection for queries
+    """
+    affected_ref_ids: set[str] = set()
+    for referenced_docs in deleted_referenced_docs.values():
+        affected_ref_ids.update(referenced_docs.keys())
+
+    if not affected_ref_ids:
+        return []
+
+    current_referrers_map = await _fetch_current_referrers(affected_ref_ids, conn)
+
+    updates: list[ReferrerUpdate] = []
+    for ref_id, (current_referrers, document_id) in current_referrers_map.items():
+        if document_id in deleted_document_ids:
+            continue
+
+        remaining_referrers = {
+            referrer: count
+            for referrer, count in current_referrers.items()
+            if referrer not in deleted_referenced_docs
+        }
+        updates.append(
+            ReferrerUpdate(
+                reference_id=ref_id, referrers=remaining_referrers, document_id=document_id
+            )
+        )
+
+    if len(updates) > 0:
+        logger.info(
+            f"Prepared {len(updates)} referrer updates for the deletion of "
+            f"{len(deleted_referenced_docs)} documents"
+        )
+
+    return updates
+
+
 async def apply_referrer_updates_to_db(
     referrer_updates: list[ReferrerUpdate], conn: asyncpg.Connection
 ) -> None:
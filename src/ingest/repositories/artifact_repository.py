@@ -11,10 +11,23 @@ from typing import Any, Protocol, TypeVar
 import asyncpg
 
 from connectors.base.base_ingest_artifact import BaseIngestArtifact
+from src.ingest.repositories.bulk_copy import copy_to_staging_table, should_use_bulk_copy
 from src.ingest.services.exclusion_rules import ExclusionRulesService
 
 T = TypeVar("T", bound=BaseIngestArtifact)
 
+# Staging table layout for COPY-based upserts; JSON and UUID columns are cast during the merge
+_ARTIFACT_STAGING_COLUMNS = [
+    ("id", "text"),
+    ("entity", "text"),
+    ("entity_id", "text"),
+    ("ingest_job_id", "text"),
+    ("metadata", "text"),
+    ("content", "text"),
+    ("source_updated_at", "timestamptz"),
+    ("last_seen_backfill_id", "text"),
+]
+
 logger = logging.getLogger(__name__)
 
 
@@ -131,6 +144,8 @@ class ArtifactRepository(ArtifactCache):
     async def upsert_artifacts_batch(self, artifacts: Sequence[BaseIngestArtifact]) -> None:
         """Batch inserts or updates artifacts efficiently (updates only if newer via `source_updated_at`).
 
+        Large batches (see `should_use_bulk_copy`) are streamed through COPY and merged in one statement.
+
         Args:
             artifacts: List of artifacts to upsert
         """
@@ -152,6 +167,12 @@ class ArtifactRepository(ArtifactCache):
                 )
             )
 
+        if should_use_bulk_copy(len(upsert_rows)):
+            await self._copy_upsert_artifacts(
+                [(*row, None) for row in upsert_rows], newer_wins=True
+            )
+            return
+
         async with self.db_pool.acquire() as conn:
             await conn.executemany(
                 """
@@ -176,6 +197,8 @@ class ArtifactRepository(ArtifactCache):
         This is useful when metadata must be updated regardless of source_updated_at,
         such as when workspace attribution or permission data changes.
 
+        Large batches (see `should_use_bulk_copy`) are streamed through COPY and merged in one statement.
+
         Args:
             artifacts: List of artifacts to force upsert
             backfill_id: Optional backfill ID to track which sync last saw these artifacts
@@ -199,6 +222,10 @@ class ArtifactRepository(ArtifactCache):
                 )
             )
 
+        if should_use_bulk_copy(len(upsert_rows)):
+            await self._copy_upsert_artifacts(upsert_rows, newer_wins=False)
+            return
+
         async with self.db_pool.acquire() as conn:
             await conn.executemany(
                 """
@@ -215,6 +242,76 @@ class ArtifactRepository(ArtifactCache):
                 upsert_rows,
             )
 
+    async def _copy_upsert_artifacts(
+        self,
+        rows: Sequence[tuple[str, str, str, str, str, str, datetime, str | None]],
+        newer_wins: bool,
+    ) -> None:
+        """Upsert artifact rows by COPYing them into a staging table and merging in one statement.
+
+        Args:
+            rows: (id, entity, entity_id, ingest_job_id, metadata, content, source_updated_at,
+                last_seen_backfill_id) tuples with JSON columns already serialized
+            newer_wins: If True, only overwrite existing artifacts with an older
+                `source_updated_at` (as `upsert_artifacts_batch` does). If False, always overwrite
+                and also set `last_seen_backfill_id` (as `force_upsert_artifacts_batch` does).
+        """
+        # A single INSERT can't update the same row twice, so collapse duplicates the way
+        # sequential upserts would: newer-wins keeps the first row with the latest timestamp,
+        # forced upserts keep the last row.
+        deduped: dict[
+            tuple[str, str], tuple[str, str, str, str, str, str, datetime, str | None]
+        ] = {}
+        for row in rows:
+            key = (row[1], row[2])
+            existing = deduped.get(key)
+            if existing is None or not newer_wins or existing[6] < row[6]:
+                deduped[key] = row
+
+        if newer_wins:
+            conflict_clause = """
+                ON CONFLICT (entity, entity_id) DO UPDATE SET
+                    id = EXCLUDED.id,
+                    ingest_job_id = EXCLUDED.ingest_job_id,
+                    metadata = EXCLUDED.metadata,
+                    content = EXCLUDED.content,
+                    source_updated_at = EXCLUDED.source_updated_at
+                WHERE ingest_artifact.source_updated_at < EXCLUDED.source_updated_at
+            """
+            insert_columns = (
+                "id, entity, entity_id, ingest_job_id, metadata, content, source_updated_at"
+            )
+            select_columns = "id::uuid, entity, entity_id, ingest_job_id::uuid, metadata::jsonb, content::jsonb, source_updated_at"
+        else:
+            conflict_clause = """
+                ON CONFLICT (entity, entity_id) DO UPDATE SET
+                    id = EXCLUDED.id,
+                    ingest_job_id = EXCLUDED.ingest_job_id,
+                    metadata = EXCLUDED.metadata,
+                    content = EXCLUDED.content,
+                    source_updated_at = EXCLUDED.source_updated_at,
+                    last_seen_backfill_id = EXCLUDED.last_seen_backfill_id
+            """
+            insert_columns = "id, entity, entity_id, ingest_job_id, metadata, content, source_updated_at, last_seen_backfill_id"
+            select_columns = "id::uuid, entity, entity_id, ingest_job_id::uuid, metadata::jsonb, content::jsonb, source_updated_at, last_seen_backfill_id"
+
+        async with self.db_pool.acquire() as conn, conn.transaction():
+            await copy_to_staging_table(
+                conn, "ingest_artifact_staging", _ARTIFACT_STAGING_COLUMNS, list(deduped.values())
+            )
+            # ORDER BY keeps row lock acquisition order consistent across concurrent writers
+            await conn.execute(
+                f"""
+                INSERT INTO ingest_artifact ({insert_columns})
+                SELECT {select_columns}
+                FROM ingest_artifact_staging
+                ORDER BY entity, entity_id
+                {conflict_clause}
+                """
+            )
+
+        logger.info(f"Bulk upserted {len(deduped)} artifacts via COPY")
+
     async def get_artifacts(self, artifact_class: type[T]) -> list[T]:
         """Get typed artifacts using Pydantic models."""
         where_clause, bind_variables = self._build_entity_type_filter(artifact_class)
@@ -0,0 +1,57 @@
+"""Bulk upsert helpers that stream rows to Postgres with COPY.
+
+`executemany` with `INSERT ... ON CONFLICT` executes one statement per row. For large
+batches (e.g. Slack export or GitHub file backfills) it is much faster to COPY rows into a
+temporary staging table and merge them with a single `INSERT ... SELECT ... ON CONFLICT`.
+
+JSON columns are staged as text and cast to jsonb during the merge, since COPY uses
+asyncpg's binary protocol and our jsonb codec only handles text format.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+import asyncpg
+
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Batches with at least this many rows use COPY instead of executemany
+DEFAULT_BULK_COPY_MIN_ROWS = 200
+
+
+def should_use_bulk_copy(row_count: int) -> bool:
+    """Whether a batch is large enough to switch to the COPY-based upsert path.
+
+    The threshold is configurable with POSTGRES_BULK_COPY_MIN_ROWS (set it to 0 to disable COPY).
+    """
+    min_rows = int(get_config_value("POSTGRES_BULK_COPY_MIN_ROWS", DEFAULT_BULK_COPY_MIN_ROWS))
+    return min_rows > 0 and row_count >= min_rows
+
+
+async def copy_to_staging_table(
+    conn: asyncpg.Connection,
+    staging_table: str,
+    columns: Sequence[tuple[str, str]],
+    records: Sequence[tuple[Any, ...]],
+) -> None:
+    """Create a temporary staging table and stream `records` into it with COPY.
+
+    Must be called inside a transaction: the staging table is dropped on commit.
+
+    Args:
+        conn: Connection with an open transaction
+        staging_table: Name of the temporary table to create
+        columns: (column name, Postgres type) pairs, in record order
+        records: Rows to copy, each a tuple matching `columns`
+    """
+    column_defs = ", ".join(f"{name} {pg_type}" for name, pg_type in columns)
+    await conn.execute(f"CREATE TEMP TABLE {staging_table} ({column_defs}) ON COMMIT DROP")
+    await conn.copy_records_to_table(
+        staging_table,
+        records=records,
+        columns=[name for name, _ in columns],
+    )
+    logger.debug(f"Copied {len(records)} rows into {staging_table}")
@@ -3,6 +3,9 @@ Document deletion utilities.
 """
 
 import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
 
 import asyncpg
 
@@ -12,6 +15,7 @@ from src.ingest.references.update_referrers import (
     ReferrerUpdate,
     apply_referrer_updates_to_db,
     apply_referrer_updates_to_opensearch,
+    prepare_referrer_updates_for_bulk_deletion,
     prepare_referrer_updates_for_deletion,
 )
 from src.utils.logging import get_logger
@@ -19,39 +23,180 @@ from src.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
-# Process document deletions in chunks to avoid overwhelming the system
-DOCUMENT_DELETION_CHUNK_SIZE = 100
-# Max 10 parallel deletions
+# Documents deleted together with one query, transaction, OpenSearch _bulk and Turbopuffer delete
+DOCUMENT_DELETION_BATCH_SIZE = 500
+# Max 10 parallel single-document deletions
 delete_semaphore = asyncio.Semaphore(10)
 
 
+@dataclass
+class DeletionStoreStats:
+    """Time spent deleting documents from one storage system, for throughput logging."""
+
+    documents: int = 0
+    seconds: float = 0.0
+
+    def record(self, documents: int, seconds: float) -> None:
+        self.documents += documents
+        self.seconds += seconds
+
+    @property
+    def documents_per_second(self) -> float:
+        return round(self.documents / self.seconds, 1) if self.seconds > 0 else 0.0
+
+
 async def delete_documents_and_chunks(
     document_ids: list[str],
     tenant_id: str,
     opensearch_client: TenantScopedOpenSearchClient,
     pool: asyncpg.Pool,
 ) -> int:
-    """Delete multiple documents and their chunks from all storage systems."""
+    """Delete multiple documents and their chunks from all storage systems.
 
+    Documents are deleted in batches of DOCUMENT_DELETION_BATCH_SIZE using set-based
+    operations against each store. A failed batch is logged and doesn't stop later batches.
+
+    Returns:
+        Number of documents deleted
+    """
+    unique_document_ids = list(dict.fromkeys(document_ids))
+    store_stats = {
+        "postgres": DeletionStoreStats(),
+        "opensearch": DeletionStoreStats(),
+        "turbopuffer": DeletionStoreStats(),
+    }
     deleted_count = 0
+    start_time = time.perf_counter()
+
+    for i in range(0, len(unique_document_ids), DOCUMENT_DELETION_BATCH_SIZE):
+        batch = unique_document_ids[i : i + DOCUMENT_DELETION_BATCH_SIZE]
+        try:
+            deleted_count += await _delete_documents_batch(
+                batch, tenant_id, opensearch_client, pool, store_stats
+            )
+        except Exception as e:
+            logger.error(
+                f"Error deleting batch of {len(batch)} documents: {e}", tenant_id=tenant_id
+            )
+
+    logger.info(
+        f"Deleted {deleted_count}/{len(unique_document_ids)} documents",
+        tenant_id=tenant_id,
+        duration_seconds=round(time.perf_counter() - start_time, 3),
+        **{
+            f"{store}_docs_per_second": stats.documents_per_second
+            for store, stats in store_stats.items()
+        },
+    )
+    return deleted_count
+
+
+async def _delete_documents_batch(
+    document_ids: list[str],
+    tenant_id: str,
+    opensearch_client: TenantScopedOpenSearchClient,
+    pool: asyncpg.Pool,
+    store_stats: dict[str, DeletionStoreStats],
+) -> int:
+    """Delete a batch of documents and their chunks from all storage systems.
 
-    for i in range(0, len(document_ids), DOCUMENT_DELETION_CHUNK_SIZE):
-        chunk = document_ids[i : i + DOCUMENT_DELETION_CHUNK_SIZE]
-        results = await asyncio.gather(
-            *[
-                delete_document_and_chunks(doc_id, tenant_id, opensearch_client, pool)
-                for doc_id in chunk
-            ],
-            return_exceptions=True,
+    Returns:
+        Number of documents deleted from every store
+    """
+    # 1. Delete from PostgreSQL, updating the referrers of documents they referenced
+    postgres_start = time.perf_counter()
+    async with pool.acquire() as conn, conn.transaction():
+        rows = await conn.fetch(
+            "SELECT id, reference_id, referenced_docs FROM documents WHERE id = ANY($1)",
+            document_ids,
+        )
+        deleted_referenced_docs: dict[str, dict[str, int]] = {
+            row["reference_id"]: row["referenced_docs"]
+            for row in rows
+            if row["reference_id"] and isinstance(row["referenced_docs"], dict)
+        }
+        referrer_updates = await prepare_referrer_updates_for_bulk_deletion(
+            deleted_referenced_docs, set(document_ids), conn
         )
+        if referrer_updates:
+            await apply_referrer_updates_to_db(referrer_updates, conn)
 
-        for result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Error deleting document: {result}", tenant_id=tenant_id)
-            else:
-                deleted_count += 1
+        await conn.execute(
+            "DELETE FROM document_permissions WHERE document_id = ANY($1)", document_ids
+        )
+        await conn.execute("DELETE FROM documents WHERE id = ANY($1)", document_ids)
+    store_stats["postgres"].record(len(document_ids), time.perf_counter() - postgres_start)
+    logger.info(f"✅ Deleted {len(rows)} documents from PostgreSQL", tenant_id=tenant_id)
 
-    return deleted_count
+    # 2. Delete from OpenSearch and Turbopuffer in parallel
+    async def delete_opensearch() -> set[str]:
+        opensearch_start = time.perf_counter()
+        failed_ids = await _bulk_delete_from_opensearch(
+            document_ids, referrer_updates, tenant_id, opensearch_client
+        )
+        store_stats["opensearch"].record(len(document_ids), time.perf_counter() - opensearch_start)
+        return failed_ids
+
+    async def delete_turbopuffer() -> None:
+        turbopuffer_start = time.perf_counter()
+        await get_turbopuffer_client().delete_chunks_for_documents(tenant_id, document_ids)
+        store_stats["turbopuffer"].record(
+            len(document_ids), time.perf_counter() - turbopuffer_start
+        )
+
+    failed_ids, _ = await asyncio.gather(delete_opensearch(), delete_turbopuffer())
+    return len(document_ids) - len(failed_ids)
+
+
+async def _bulk_delete_from_opensearch(
+    document_ids: list[str],
+    referrer_updates: list[ReferrerUpdate],
+    tenant_id: str,
+    opensearch_client: TenantScopedOpenSearchClient,
+) -> set[str]:
+    """Delete documents and apply referrer updates in one OpenSearch _bulk request.
+
+    Returns:
+        IDs of the documents that couldn't be deleted
+    """
+    index_name = f"tenant-{tenant_id}"
+    body: list[dict[str, Any]] = []
+    for document_id in document_ids:
+        body.append({"delete": {"_index": index_name, "_id": document_id}})
+    for update in referrer_updates:
+        body.extend(
+            [
+                {"update": {"_index": index_name, "_id": update.document_id}},
+                {"doc": {"referrer_score": update.referrer_score}},
+            ]
+        )
+
+    response = await opensearch_client.bulk(index=index_name, body=body, refresh=False)
+    if not response.get("errors"):
+        logger.info(
+            f"✅ Deleted {len(document_ids)} documents and updated {len(referrer_updates)} "
+            "referrer_scores in OpenSearch",
+            tenant_id=tenant_id,
+        )
+        return set()
+
+    failed_ids: set[str] = set()
+    for item in response.get("items", []):
+        if "delete" in item:
+            result = item["delete"]
+            # Documents that were never indexed are already gone
+            if result.get("error") and result.get("status") != 404:
+                failed_ids.add(result["_id"])
+                logger.error(
+                    f"Failed to delete document {result['_id']} from OpenSearch: {result['error']}"
+                )
+        elif "update" in item and item["update"].get("error"):
+            # The deletions themselves succeeded, so only log stale referrer_scores
+            logger.error(
+                f"Failed to update referrer_score in OpenSearch for document "
+                f"{item['update']['_id']}: {item['update']['error']}"
+            )
+    return failed_ids
 
 
 async def delete_document_and_chunks(
@@ -64,7 +64,7 @@ from src.utils.job_metrics import record_job_completion
 from src.utils.logging import get_logger
 from src.utils.rate_limiter import RateLimitedError
 from src.utils.slack_question_extractor import extract_questions_from_messages
-from src.webhooks.delivery import trigger_webhooks_for_document
+from src.webhooks.dispatcher import get_webhook_dispatcher
 
 logger = get_logger(__name__)
 
@@ -204,24 +204,23 @@ class IndexJobHandler:
                 backfill_id=backfill_id,
             )
 
-            # Trigger webhook delivery for each processed document (fire and forget)
-            for document in documents:
-                try:
-                    trigger_webhooks_for_document(
-                        tenant_id=tenant_id,
-                        document_id=document.id,
-                        source=source.value,
-                        db_pool=readonly_db_pool,
-                    )
-                except Exception as e:
-                    # Log webhook failure but don't fail the index job
-                    logger.warning(
-                        "Webhook delivery failed for document",
-                        tenant_id=tenant_id,
-                        document_id=document.id,
-                        source=source.value,
-                        error=str(e),
-                    )
+            # Queue webhook delivery for the processed documents (delivered in the background)
+            try:
+                await get_webhook_dispatcher().enqueue(
+                    tenant_id=tenant_id,
+                    document_ids=[document.id for document in documents],
+                    source=source.value,
+                    db_pool=readonly_db_pool,
+                )
+            except Exception as e:
+                # Log webhook failure but don't fail the index job
+                logger.warning(
+                    "Webhook delivery failed for documents",
+                    tenant_id=tenant_id,
+                    document_count=len(documents),
+                    source=source.value,
+                    error=str(e),
+                )
 
             # Extract sample questions from Slack documents
             # This is kind of lame that we have it here _instead of_ the Slack
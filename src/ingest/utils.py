@@ -5,7 +5,6 @@ Utility functions for document processing and storage.
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import json
 import sys
 import time
@@ -27,20 +26,23 @@ sys.path.append(str(project_root))
 
 import asyncpg
 
-from connectors.base import BaseChunk, BaseDocument
+from connectors.base import BaseChunk, BaseDocument, assign_chunk_keys
 from src.clients.openai import get_openai_client
 from src.clients.opensearch import OpenSearchDocument
 from src.clients.tenant_db import tenant_db_manager
 from src.clients.tenant_opensearch import TenantScopedOpenSearchClient
 from src.clients.turbopuffer import get_turbopuffer_client
-from src.ingest.references.calculate_referrers import calculate_referrer_score, calculate_referrers
+from src.ingest.references.calculate_referrers import (
+    calculate_referrer_score,
+    calculate_referrers_batch,
+)
 from src.ingest.references.update_referrers import (
     ReferrerUpdate,
     apply_referrer_updates_to_db,
     apply_referrer_updates_to_opensearch,
-    fetch_existing_referenced_docs,
     prepare_referrer_updates,
 )
+from src.ingest.repositories.bulk_copy import copy_to_staging_table, should_use_bulk_copy
 from src.permissions import DocumentPermissions, PermissionsService
 from src.utils.logging import get_logger
 
@@ -132,6 +134,13 @@ class PreparedDocumentData(NamedTuple):
     chunk_diff: ChunkDiffResult | None = None
 
 
+class ExistingDocumentState(NamedTuple):
+    """State of a document already stored in Postgres, used to decide what to re-index."""
+
+    content_hash: str | None
+    referenced_docs: dict[str, int]
+
+
 class BatchEmbeddingData(NamedTuple):
     """Mapping data for batch embedding results."""
 
@@ -146,9 +155,13 @@ async def prepare_documents_batch(
     tenant_id: str,
     force_reprocess: bool = False,
 ) -> tuple[list[PreparedDocumentData], list[BaseChunk], list[BatchEmbeddingData]]:
-    """Prepare all documents in parallel, collecting chunks for batch embedding.
+    """Prepare all documents as a batch, collecting chunks for batch embedding.
 
-    This function now supports incremental indexing: it fetches existing chunk hashes
+    All lookups are set-based: one Postgres query for existing content hashes and
+    referenced_docs, one for referrers, and one Turbopuffer query for existing chunk
+    hashes, regardless of how many documents are in the batch.
+
+    This function supports incremental indexing: it fetches existing chunk hashes
     from Turbopuffer and computes a diff to only embed new/changed chunks.
 
     Args:
@@ -164,91 +177,128 @@ async def prepare_documents_batch(
     """
     turbopuffer_client = get_turbopuffer_client()
 
-    async def prepare_single_document(document: BaseDocument) -> PreparedDocumentData | None:
-        """Prepare a single document's data. Returns None if the document does not need indexing."""
-        doc_id = document.id
-        metadata = document.get_metadata()
-        content = document.get_content()
+    # Round trip 1: existing content_hash and referenced_docs for every document at once
+    existing_states = await fetch_existing_document_states(
+        [document.id for document in documents], readonly_db_pool
+    )
+
+    # Decide which documents need indexing and do all per-document CPU work up front
+    candidates: list[tuple[BaseDocument, str, dict[str, int], list[BaseChunk]]] = []
+    for document in documents:
         try:
-            content_hash = make_content_hash(content, metadata)
+            content_hash = document.get_content_hash()
+            existing_state = existing_states.get(document.id)
+
+            if (
+                not force_reprocess
+                and existing_state is not None
+                and existing_state.content_hash == content_hash
+            ):
+                continue
 
-            # Check if document needs indexing
-            needs_indexing = await should_index_postgres_document(
-                doc_id, content_hash, readonly_db_pool, force_reprocess
+            new_referenced_docs = find_references_in_doc(
+                document.get_content(), document.get_reference_id()
             )
 
-            if not needs_indexing:
-                return None
+            # Create chunks and populate chunk permissions immediately
+            chunks = document.to_embedding_chunks()
+            for chunk in chunks:
+                document.populate_chunk_permissions(chunk)
+            # Stable per-chunk IDs let incremental indexing skip unchanged chunks
+            assign_chunk_keys(chunks)
 
-            # Prepare referrers and referrer updates in parallel
-            reference_id = document.get_reference_id()
-            referrers_task = calculate_referrers(reference_id, readonly_db_pool)
+            candidates.append((document, content_hash, new_referenced_docs, chunks))
+        except Exception as e:
+            logger.error(f"❌ Error preparing document {document.id}: {e}")
+            raise
 
-            old_referenced_docs = await fetch_existing_referenced_docs(
-                document.id, readonly_db_pool
-            )
-            new_referenced_docs = find_references_in_doc(document.get_content(), reference_id)
-            referrer_updates_task = prepare_referrer_updates(
+    # Only fetch existing chunk hashes for incremental indexing if enabled, not
+    # force_reprocess, and chunks support deterministic IDs
+    incremental_doc_ids = [
+        document.id
+        for document, _, _, chunks in candidates
+        if INCREMENTAL_INDEXING_ENABLED
+        and not force_reprocess
+        and chunks
+        and chunks[0].get_chunk_key() is not None
+    ]
+
+    # Round trips 2 and 3 (in parallel): referrers for all reference_ids, and
+    # existing chunk hashes for all incremental documents
+    referrers_by_reference_id: dict[str, dict[str, int]] = {}
+    existing_hashes_by_doc: dict[str, dict[str, str]] = {}
+    if candidates:
+        referrers_by_reference_id, existing_hashes_by_doc = await asyncio.gather(
+            calculate_referrers_batch(
+                [document.get_reference_id() for document, _, _, _ in candidates],
+                readonly_db_pool,
+            ),
+            turbopuffer_client.get_existing_chunk_hashes_bulk(tenant_id, incremental_doc_ids),
+        )
+
+    # Referrer updates only query when a document's references actually changed
+    referrer_updates_list = await asyncio.gather(
+        *[
+            prepare_referrer_updates(
                 readonly_db_pool=readonly_db_pool,
-                reference_id=reference_id,
-                old_referenced_docs=old_referenced_docs,
+                reference_id=document.get_reference_id(),
+                old_referenced_docs=(
+                    existing_states[document.id].referenced_docs
+                    if document.id in existing_states
+                    else {}
+                ),
                 new_referenced_docs=new_referenced_docs,
             )
+            for document, _, new_referenced_docs, _ in candidates
+        ]
+    )
 
-            # Wait for all prep tasks
-            referrers = await referrers_task
-            referrer_updates = await referrer_updates_task
-            referrer_score = calculate_referrer_score(referrers)
-
-            # Create chunks and set default permissions
-            chunks = document.to_embedding_chunks()
+    prepared_docs: list[PreparedDocumentData] = []
+    for (document, content_hash, new_referenced_docs, chunks), referrer_updates in zip(
+        candidates, referrer_updates_list, strict=True
+    ):
+        doc_id = document.id
+        referrers = referrers_by_reference_id.get(document.get_reference_id(), {})
 
-            # Populate chunk permissions immediately
-            for chunk in chunks:
-                document.populate_chunk_permissions(chunk)
+        chunk_diff: ChunkDiffResult | None = None
+        existing_hashes = existing_hashes_by_doc.get(doc_id)
+        if existing_hashes:
+            chunk_diff = compute_chunk_diff(chunks, existing_hashes)
+            logger.debug(
+                f"Chunk diff for {doc_id}: {len(chunk_diff.new_chunks)} new, "
+                f"{len(chunk_diff.changed_chunks)} changed, "
+                f"{len(chunk_diff.unchanged_chunk_ids)} unchanged, "
+                f"{len(chunk_diff.deleted_chunk_ids)} deleted"
+            )
 
-            # Fetch existing chunk hashes from Turbopuffer for incremental indexing
-            # (only if enabled, not force_reprocess, and chunks support deterministic IDs)
-            chunk_diff: ChunkDiffResult | None = None
-            if (
-                INCREMENTAL_INDEXING_ENABLED
-                and not force_reprocess
-                and chunks
-                and chunks[0].get_unique_key() is not None
-            ):
-                existing_hashes = await turbopuffer_client.get_existing_chunk_hashes(
-                    tenant_id, doc_id
-                )
-                if existing_hashes:
-                    chunk_diff = compute_chunk_diff(chunks, existing_hashes)
-                    logger.debug(
-                        f"Chunk diff for {doc_id}: {len(chunk_diff.new_chunks)} new, "
-                        f"{len(chunk_diff.changed_chunks)} changed, "
-                        f"{len(chunk_diff.unchanged_chunk_ids)} unchanged, "
-                        f"{len(chunk_diff.deleted_chunk_ids)} deleted"
-                    )
-
-            return PreparedDocumentData(
+        prepared_docs.append(
+            PreparedDocumentData(
                 document=document,
                 chunks=chunks,
                 content_hash=content_hash,
                 references=new_referenced_docs,
                 referrers=referrers,
                 referrer_updates=referrer_updates,
-                referrer_score=referrer_score,
+                referrer_score=calculate_referrer_score(referrers),
                 chunk_diff=chunk_diff,
             )
+        )
 
-        except Exception as e:
-            logger.error(f"❌ Error preparing document {document.id}: {e}")
-            raise
-
-    # Prepare all documents in parallel
-    tasks = [prepare_single_document(doc) for doc in documents]
-    prepared_docs_raw = await asyncio.gather(*tasks)
+    # Per-document path: one content_hash check per doc (skipped when forced), then one
+    # referenced_docs fetch, one referrers query and one Turbopuffer query per indexed doc
+    per_document_round_trips = (
+        (0 if force_reprocess else len(documents)) + 2 * len(candidates) + len(incremental_doc_ids)
+    )
+    batched_round_trips = 1 + (1 if candidates else 0) + (1 if incremental_doc_ids else 0)
+    logger.info(
+        f"Batched prep for {len(documents)} documents ({len(candidates)} need indexing): "
+        f"{batched_round_trips} round trips, saved "
+        f"{per_document_round_trips - batched_round_trips}",
+        round_trips=batched_round_trips,
+        round_trips_saved=per_document_round_trips - batched_round_trips,
+    )
 
-    # Filter out None results (docs that don't need indexing) and collect batch embedding data
-    prepared_docs = [doc for doc in prepared_docs_raw if doc is not None]
+    # Collect batch embedding data
     all_chunks: list[BaseChunk] = []
     batch_embedding_data: list[BatchEmbeddingData] = []
 
@@ -425,6 +475,10 @@ async def gen_and_store_embeddings(
     openai_client = get_openai_client()
     source = documents[0].get_source() if documents else "unknown"
 
+    # Content, metadata and hashes are read by every phase below; compute them once per document
+    for document in documents:
+        document.enable_memoization()
+
     try:
         logger.info(
             f"🚛 Background task started: Processing {len(documents)} documents from {source} "
@@ -511,6 +565,9 @@ async def gen_and_store_embeddings(
             f"❌ Critical error processing documents from {source}: {e}. Full traceback: {traceback.format_exc()}"
         )
         raise
+    finally:
+        for document in documents:
+            document.disable_memoization()
 
     # Aggregate results (all successful if we get here, since exceptions would be raised)
     total_docs = len(documents)
@@ -526,36 +583,38 @@ async def gen_and_store_embeddings(
     )
 
 
-def make_content_hash(content: str, metadata: dict[str, Any]) -> str:
-    content_and_metadata = {"content": content, "metadata": metadata}
-    return hashlib.sha256(json.dumps(content_and_metadata, sort_keys=True).encode()).hexdigest()
-
-
-async def should_index_postgres_document(
-    doc_id: str,
-    content_hash: str,
+async def fetch_existing_document_states(
+    doc_ids: list[str],
     readonly_db_pool: asyncpg.Pool,
-    force_reprocess: bool = False,
-) -> bool:
-    """Check if a document should be indexed into Postgres. Skip docs where the new and old content hashes are the same.
+) -> dict[str, ExistingDocumentState]:
+    """Fetch content_hash and referenced_docs for many existing documents in one query.
 
-    Returns:
-        - True if the document should be indexed, otherwise False
+    Documents that don't exist yet are absent from the result. On error, returns an
+    empty dict so every document is treated as new.
     """
-    if force_reprocess:
-        return True
+    if not doc_ids:
+        return {}
 
     try:
         async with readonly_db_pool.acquire() as conn:
-            existing_doc = await conn.fetchrow(
-                "SELECT content_hash FROM documents WHERE id = $1",
-                doc_id,
+            rows = await conn.fetch(
+                "SELECT id, content_hash, referenced_docs FROM documents WHERE id = ANY($1)",
+                list(set(doc_ids)),
             )
-
-            return not (existing_doc and existing_doc["content_hash"] == content_hash)
     except Exception as e:
-        logger.error(f"Failed to check existing document state: {e}")
-        return True
+        logger.error(f"Failed to check existing document state for {len(doc_ids)} documents: {e}")
+        return {}
+
+    return {
+        row["id"]: ExistingDocumentState(
+            content_hash=row["content_hash"],
+            # This should always be a dict given our type codec in TenantDBManager
+            referenced_docs=(
+                row["referenced_docs"] if isinstance(row["referenced_docs"], dict) else {}
+            ),
+        )
+        for row in rows
+    }
 
 
 async def index_opensearch_document(
@@ -592,12 +651,48 @@ async def index_opensearch_document(
     logger.info(f"✅ Successfully indexed document {document.id} in OpenSearch")
 
 
+_DOCUMENTS_UPSERT_CONFLICT_CLAUSE = """
+ON CONFLICT (id) DO UPDATE SET
+    content = EXCLUDED.content,
+    content_hash = EXCLUDED.content_hash,
+    metadata = EXCLUDED.metadata,
+    source_created_at = EXCLUDED.source_created_at,
+    source_updated_at = EXCLUDED.source_updated_at,
+    reference_id = EXCLUDED.reference_id,
+    referenced_docs = EXCLUDED.referenced_docs,
+    referrers = EXCLUDED.referrers,
+    referrer_score = EXCLUDED.referrer_score,
+    last_seen_backfill_id = EXCLUDED.last_seen_backfill_id,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# Staging table layout for COPY-based document upserts; JSON columns are cast during the merge
+_DOCUMENT_STAGING_COLUMNS = [
+    ("id", "text"),
+    ("content", "text"),
+    ("content_hash", "text"),
+    ("metadata", "text"),
+    ("source", "text"),
+    ("source_created_at", "timestamptz"),
+    ("source_updated_at", "timestamptz"),
+    ("reference_id", "text"),
+    ("referenced_docs", "text"),
+    ("referrers", "text"),
+    ("referrer_score", "real"),
+    ("last_seen_backfill_id", "text"),
+]
+
+
 async def batch_postgres_write(
     prepared_docs: list[PreparedDocumentData],
     readwrite_db_pool: asyncpg.Pool,
     backfill_id: str | None = None,
 ) -> None:
-    """Batch write all documents to PostgreSQL in a single transaction (no chunks table)."""
+    """Batch write all documents to PostgreSQL in a single transaction (no chunks table).
+
+    Batches at or above POSTGRES_BULK_COPY_MIN_ROWS are written with COPY into a staging
+    table plus a single merge statement instead of `executemany`.
+    """
     # Collect all documents that need indexing
     if not prepared_docs:
         logger.info("No documents need PostgreSQL indexing")
@@ -680,26 +775,33 @@ async def batch_postgres_write(
                     ]
                     await conn.execute(f"SELECT {', '.join(placeholders)}", *batch_ids)
 
-            # Batch insert all documents in a single operation
-            await conn.executemany(
-                """
-                INSERT INTO documents (id, content, content_hash, metadata, source, source_created_at, source_updated_at, reference_id, referenced_docs, referrers, referrer_score, last_seen_backfill_id)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                ON CONFLICT (id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    content_hash = EXCLUDED.content_hash,
-                    metadata = EXCLUDED.metadata,
-                    source_created_at = EXCLUDED.source_created_at,
-                    source_updated_at = EXCLUDED.source_updated_at,
-                    reference_id = EXCLUDED.reference_id,
-                    referenced_docs = EXCLUDED.referenced_docs,
-                    referrers = EXCLUDED.referrers,
-                    referrer_score = EXCLUDED.referrer_score,
-                    last_seen_backfill_id = EXCLUDED.last_seen_backfill_id,
-                    updated_at = CURRENT_TIMESTAMP
-                """,
-                document_records,
-            )
+            if should_use_bulk_copy(len(document_records)):
+                # Large batch: stream rows through COPY and merge them in a single statement.
+                # A single INSERT can't update the same row twice, so keep the last record per id
+                # (matching what sequential upserts would leave behind).
+                deduped_records = list({record[0]: record for record in document_records}.values())
+                await copy_to_staging_table(
+                    conn, "documents_staging", _DOCUMENT_STAGING_COLUMNS, deduped_records
+                )
+                await conn.execute(
+                    f"""
+                    INSERT INTO documents (id, content, content_hash, metadata, source, source_created_at, source_updated_at, reference_id, referenced_docs, referrers, referrer_score, last_seen_backfill_id)
+                    SELECT id, content, content_hash, metadata::jsonb, source, source_created_at, source_updated_at, reference_id, referenced_docs::jsonb, referrers::jsonb, referrer_score, last_seen_backfill_id
+                    FROM documents_staging
+                    ORDER BY id
+                    {_DOCUMENTS_UPSERT_CONFLICT_CLAUSE}
+                    """
+                )
+            else:
+                # Batch insert all documents in a single operation
+                await conn.executemany(
+                    f"""
+                    INSERT INTO documents (id, content, content_hash, metadata, source, source_created_at, source_updated_at, reference_id, referenced_docs, referrers, referrer_score, last_seen_backfill_id)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                    {_DOCUMENTS_UPSERT_CONFLICT_CLAUSE}
+                    """,
+                    document_records,
+                )
 
             logger.info(
                 f"✅ Successfully batch indexed {len(prepared_docs)} documents in PostgreSQL"
@@ -28,6 +28,7 @@ from connectors.base.external_source import (
     ExternalSource,
     get_external_source_for_document_source,
 )
+from src.clients.openai import get_openai_client
 from src.clients.sqs import SQSClient
 from src.ingest.services.index_job_handler import IndexJobHandler
 from src.jobs.base_worker import BaseJobWorker
@@ -36,10 +37,12 @@ from src.jobs.models import BackfillCompleteNotificationMessage, DeleteJobMessag
 from src.jobs.sqs_job_processor import SQSJobProcessor, SQSMessageMetadata
 from src.utils.config import get_config_value
 from src.utils.logging import LogContext, get_logger
+from src.utils.search_cache import invalidate_tenant_search_cache
 from src.utils.tenant_config import (
     check_and_mark_backfill_complete,
     increment_backfill_done_index_jobs,
 )
+from src.webhooks.dispatcher import close_webhook_dispatcher
 
 logger = get_logger(__name__)
 
@@ -74,7 +77,14 @@ class IndexJobWorker(BaseJobWorker):
 
     def _register_custom_routes(self, app) -> None:
         """Register index worker specific routes."""
-        pass
+
+        @app.get("/metrics/embedding-cache")
+        async def embedding_cache_metrics():
+            """Cumulative embedding cache hit/miss counters for this process."""
+            embedding_cache = get_openai_client().embedding_cache
+            if embedding_cache is None:
+                return {"enabled": False}
+            return {"enabled": True, **embedding_cache.get_stats()}
 
     async def send_backfill_complete_notification(
         self, tenant_id: str, source: ExternalSource, backfill_id: str
@@ -222,6 +232,9 @@ class IndexJobWorker(BaseJobWorker):
                 index_message, readonly_tenant_db_pool, sqs_metadata
             )
 
+            # Cached search results for this tenant may now be stale
+            await invalidate_tenant_search_cache(index_message.tenant_id)
+
             # Track backfill completion if backfill_id exists
             if index_message.backfill_id:
                 await self._track_backfill_completion(index_message)
@@ -260,6 +273,7 @@ class IndexJobWorker(BaseJobWorker):
                 opensearch_client=opensearch_client,
                 pool=pool,
             )
+            await invalidate_tenant_search_cache(tenant_id)
 
             duration = time.perf_counter() - start_time
             logger.info(
@@ -370,16 +384,20 @@ async def main() -> None:
             processor = SQSJobProcessor(
                 queue_arn=queue_arn,
                 process_function=process_index_job,
-                max_messages=1,  # Process one job at a time
+                max_messages=1,
+                # Jobs are mostly I/O wait, so pods can run several at once.
+                # Defaults to 1 (one job at a time); receives are sized to free slots, up to 10.
+                max_concurrent_jobs=int(get_config_value("INDEX_WORKER_CONCURRENCY", 1)),
                 wait_time_seconds=20,  # Long polling
-                # 6 minute vis timeout
-                # TODO AIVP-460 extend visibility timeouts for long running tasks
-                visibility_timeout_seconds=6 * 60,
+                # 2 minute vis timeout, kept alive by a heartbeat every 40s while a job runs,
+                # so long jobs aren't redelivered but a crashed worker's job is retried quickly
+                visibility_timeout_seconds=2 * 60,
             )
 
             await processor.start()
         finally:
             # Clean up worker resources
+            await close_webhook_dispatcher()
             await worker.cleanup()
 
     # Run both SQS processor and HTTP server
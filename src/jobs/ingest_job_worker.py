@@ -1118,8 +1118,8 @@ async def main() -> None:
                 process_function=process_ingest_job,
                 max_messages=1,  # Process one job at a time
                 wait_time_seconds=20,  # Long polling
-                # 15 min vis timeout - some edge case jobs may take a long time to process, e.g. see AIVP-276
-                # TODO AIVP-460 extend visibility timeouts for long running tasks
+                # 15 min vis timeout - some edge case jobs may take a long time to process, e.g. see AIVP-276.
+                # The processor heartbeat keeps extending it while a job is still running.
                 visibility_timeout_seconds=15 * 60,
                 sqs_client=sqs_client,  # Use the shared SQS client
             )
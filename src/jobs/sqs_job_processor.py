@@ -5,12 +5,13 @@ Provides a generic processor that polls SQS queues and executes provided process
 """
 
 import asyncio
+import contextlib
 import json
 import logging
 import random
 import signal
 import traceback
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any, TypedDict, cast
 
 import newrelic.agent
@@ -41,6 +42,8 @@ class SQSJobProcessor:
         wait_time_seconds: int = 20,
         visibility_timeout_seconds: int = 300,
         sqs_client: SQSClient | None = None,
+        max_concurrent_jobs: int = 1,
+        heartbeat_interval_seconds: float | None = None,
     ):
         """Initialize SQS job processor.
 
@@ -51,12 +54,27 @@ class SQSJobProcessor:
             wait_time_seconds: Long polling wait time (0-20 seconds)
             visibility_timeout_seconds: How long message is hidden from other consumers
             sqs_client: Optional SQS client to use. If None, creates a new one.
+            max_concurrent_jobs: Maximum jobs processed concurrently by this process. With 1 (the
+                default), messages are processed one at a time. With N > 1, up to N jobs run
+                concurrently and receives are sized to the free slots (up to 10 per receive).
+            heartbeat_interval_seconds: How often to re-extend a message's visibility timeout while
+                it is being processed. Defaults to a third of `visibility_timeout_seconds`, so a
+                long-running job stays hidden while a crashed worker's message reappears quickly.
         """
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1")
+
         self.queue_arn = queue_arn
         self.process_function = process_function
         self.max_messages = max_messages
         self.wait_time_seconds = wait_time_seconds
         self.visibility_timeout_seconds = visibility_timeout_seconds
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.heartbeat_interval_seconds = (
+            heartbeat_interval_seconds
+            if heartbeat_interval_seconds is not None
+            else visibility_timeout_seconds / 3
+        )
 
         self.sqs_client = sqs_client or SQSClient()
         self.running = False
@@ -64,6 +82,9 @@ class SQSJobProcessor:
         # Track messages currently being processed: receipt_handle -> message
         self.in_progress_messages: dict[str, dict[str, Any]] = {}
         self._lock = asyncio.Lock()
+        # Concurrent mode: one slot per in-flight job, and the tasks running them
+        self._job_slots = asyncio.Semaphore(max_concurrent_jobs)
+        self._in_flight_tasks: set[asyncio.Task[None]] = set()
 
     def setup_signal_handlers(self) -> None:
         """Set up signal handlers for graceful shutdown."""
@@ -112,8 +133,9 @@ class SQSJobProcessor:
         }
 
         try:
-            # Process the message with separate metadata argument
-            await self.process_function(message_data, sqs_metadata)
+            # Process the message with separate metadata argument, keeping it invisible meanwhile
+            async with self._visibility_heartbeat(receipt_handle):
+                await self.process_function(message_data, sqs_metadata)
             return True  # message should be deleted on success
 
         except* ExtendVisibilityException as e_group:
@@ -147,8 +169,105 @@ class SQSJobProcessor:
         # Return False regardless to prevent msg deletion
         return False
 
+    @contextlib.asynccontextmanager
+    async def _visibility_heartbeat(self, receipt_handle: str) -> AsyncIterator[None]:
+        """Periodically re-extend a message's visibility timeout while the body is running.
+
+        The heartbeat is stopped before the context exits, so any visibility change made after
+        processing (e.g. for ExtendVisibilityException) is never overwritten.
+        """
+
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(self.heartbeat_interval_seconds)
+                try:
+                    extended = await self.sqs_client.change_message_visibility(
+                        self.queue_arn, receipt_handle, self.visibility_timeout_seconds
+                    )
+                    if extended:
+                        logger.debug(
+                            f"Heartbeat extended visibility timeout by {self.visibility_timeout_seconds} seconds "
+                            f"for receipt handle: {receipt_handle[:20]}..."
+                        )
+                    else:
+                        logger.warning(
+                            f"Heartbeat failed to extend visibility timeout for receipt handle: {receipt_handle[:20]}..."
+                        )
+                except Exception as e:
+                    logger.error(f"Error extending visibility timeout in heartbeat: {e}")
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        try:
+            yield
+        finally:
+            heartbeat_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat_task
+
+    async def _handle_message(
+        self, message: dict[str, Any], prefetch: bool = False
+    ) -> list[dict[str, Any]]:
+        """Process one received message, delete it on success, and stop tracking it.
+
+        Args:
+            message: SQS message dictionary
+            prefetch: If True, short poll for the next batch before deleting a successful message
+
+        Returns:
+            Messages pre-fetched via short poll (empty unless `prefetch` is set)
+        """
+        short_polled_messages: list[dict[str, Any]] = []
+
+        receipt_handle: str | None = message.get("ReceiptHandle")
+        if not receipt_handle:
+            logger.warning("Message missing ReceiptHandle, skipping")
+            return short_polled_messages
+
+        try:
+            should_delete = await self.process_message(message)
+
+            if should_delete:
+                # Short poll to pre-fetch next batch before deleting current message
+                # to guarantee we don't get the same messageGroupId again if there are
+                # other group IDs available. This helps with ingest lane fairness, see AIVP-347
+                if prefetch and not self.shutdown_event.is_set():
+                    try:
+                        short_polled_messages = await self.receive_and_track_messages(
+                            wait_time_seconds=1,  # Short poll
+                        )
+                        logger.info(
+                            f"Pre-fetched {len(short_polled_messages)} message(s) via short poll"
+                        )
+                    except Exception as e:
+                        logger.error(f"Short poll failed, will continue with regular polling: {e}")
+
+                # Delete message from queue on successful processing
+                deleted = await self.sqs_client.delete_message(self.queue_arn, receipt_handle)
+                if not deleted:
+                    logger.error("Failed to delete processed message")
+
+        except* asyncio.CancelledError:
+            logger.info(
+                f"Message processing cancelled for receipt handle: {receipt_handle[:20]}..."
+            )
+            # Re-raise to properly handle cancellation
+            raise
+        except* Exception:
+            error_message = traceback.format_exc()
+            logger.error(f"Error processing message polling: {error_message}")
+        finally:
+            # Remove from in-progress tracking
+            async with self._lock:
+                self.in_progress_messages.pop(receipt_handle, None)
+
+        return short_polled_messages
+
     async def poll_and_process(self) -> None:
         """Main polling loop that receives and processes messages."""
+        if self.max_concurrent_jobs > 1:
+            await self._poll_and_process_concurrently()
+            return
+
         logger.info(f"Starting SQS job processor for queue: {self.queue_arn}")
         self.running = True
 
@@ -179,56 +298,15 @@ class SQSJobProcessor:
 
                 # Process each message
                 for message in messages:
-                    receipt_handle: str | None = message.get("ReceiptHandle")
-                    if not receipt_handle:
-                        logger.warning("Message missing ReceiptHandle, skipping")
-                        continue
-
                     # Check if we should stop processing new messages
                     if self.shutdown_event.is_set():
                         logger.info("Shutdown in progress, not processing new messages")
                         break
 
-                    try:
-                        should_delete = await self.process_message(message)
-
-                        if should_delete:
-                            # Short poll to pre-fetch next batch before deleting current message
-                            # to guarantee we don't get the same messageGroupId again if there are
-                            # other group IDs available. This helps with ingest lane fairness, see AIVP-347
-                            if not short_polled_messages and not self.shutdown_event.is_set():
-                                try:
-                                    short_polled_messages = await self.receive_and_track_messages(
-                                        wait_time_seconds=1,  # Short poll
-                                    )
-                                    logger.info(
-                                        f"Pre-fetched {len(short_polled_messages)} message(s) via short poll"
-                                    )
-                                except Exception as e:
-                                    logger.error(
-                                        f"Short poll failed, will continue with regular polling: {e}"
-                                    )
-
-                            # Delete message from queue on successful processing
-                            deleted = await self.sqs_client.delete_message(
-                                self.queue_arn, receipt_handle
-                            )
-                            if not deleted:
-                                logger.error("Failed to delete processed message")
-
-                    except* asyncio.CancelledError:
-                        logger.info(
-                            f"Message processing cancelled for receipt handle: {receipt_handle[:20]}..."
-                        )
-                        # Re-raise to properly handle cancellation
-                        raise
-                    except* Exception:
-                        error_message = traceback.format_exc()
-                        logger.error(f"Error processing message polling: {error_message}")
-                    finally:
-                        # Remove from in-progress tracking
-                        async with self._lock:
-                            self.in_progress_messages.pop(receipt_handle, None)
+                    prefetched = await self._handle_message(
+                        message, prefetch=not short_polled_messages
+                    )
+                    short_polled_messages = short_polled_messages or prefetched
 
             except* Exception:
                 error_message = traceback.format_exc()
@@ -236,6 +314,74 @@ class SQSJobProcessor:
 
         logger.info("SQS job processor stopped")
 
+    async def _poll_and_process_concurrently(self) -> None:
+        """Polling loop that keeps up to `max_concurrent_jobs` messages in flight at once."""
+        logger.info(
+            f"Starting SQS job processor for queue: {self.queue_arn} "
+            f"with up to {self.max_concurrent_jobs} concurrent jobs"
+        )
+        self.running = True
+
+        try:
+            while self.running and not self.shutdown_event.is_set():
+                # Wait for a free slot before receiving, so messages never sit invisible in memory
+                await self._job_slots.acquire()
+                slot_acquired = True
+                try:
+                    if self.shutdown_event.is_set():
+                        break
+
+                    # Apply short random jitter before next poll to smooth out recvs across the worker fleet over time
+                    await asyncio.sleep(random.uniform(0, 0.15))
+
+                    free_slots = self.max_concurrent_jobs - len(self._in_flight_tasks)
+                    messages = await self.receive_and_track_messages(
+                        max_messages=min(free_slots, 10)
+                    )
+
+                    logger.info(
+                        f"Received {len(messages)} messages from queue {self.queue_arn} with groupIds: {', '.join([message.get('Attributes', {}).get('MessageGroupId', 'N/A') for message in messages])}"
+                    )
+
+                    for message in messages:
+                        # The first message uses the slot acquired above; the rest fit in the free slots
+                        if not slot_acquired:
+                            await self._job_slots.acquire()
+                        slot_acquired = False
+                        self._start_message_task(message)
+
+                except* Exception:
+                    error_message = traceback.format_exc()
+                    logger.error(f"Error in polling loop: {error_message}")
+                finally:
+                    if slot_acquired:
+                        self._job_slots.release()
+
+            # Let in-flight jobs finish; anything left unprocessed is released on shutdown
+            if self._in_flight_tasks:
+                logger.info(f"Waiting for {len(self._in_flight_tasks)} in-flight jobs to finish")
+                await asyncio.gather(*self._in_flight_tasks, return_exceptions=True)
+
+        except asyncio.CancelledError:
+            for task in self._in_flight_tasks:
+                task.cancel()
+            raise
+
+        logger.info("SQS job processor stopped")
+
+    def _start_message_task(self, message: dict[str, Any]) -> None:
+        """Run a message in its own task, holding a job slot until it finishes."""
+
+        async def run() -> None:
+            try:
+                await self._handle_message(message)
+            finally:
+                self._job_slots.release()
+
+        task = asyncio.create_task(run())
+        self._in_flight_tasks.add(task)
+        task.add_done_callback(self._in_flight_tasks.discard)
+
     async def start(self) -> None:
         """Start the job processor with signal handling."""
         self.setup_signal_handlers()
@@ -248,14 +394,14 @@ class SQSJobProcessor:
             await self.shutdown()
 
     async def receive_and_track_messages(
-        self, wait_time_seconds: int | None = None
+        self, wait_time_seconds: int | None = None, max_messages: int | None = None
     ) -> list[dict[str, Any]]:
         """Receive messages and track them as in-progress."""
         # We technically have a race condition risk here where the recv could succeed but the track fails,
         # but it should be very rare in practice
         messages = await self.sqs_client.receive_messages(
             queue_arn=self.queue_arn,
-            max_messages=self.max_messages,
+            max_messages=max_messages if max_messages is not None else self.max_messages,
             wait_time_seconds=wait_time_seconds
             if wait_time_seconds is not None
             else self.wait_time_seconds,
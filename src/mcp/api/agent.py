@@ -37,7 +37,7 @@ from src.utils.errors import (
 )
 from src.utils.logging import get_logger
 from src.utils.timeout import TimeoutError, with_timeout
-from src.utils.token_counting import count_messages_tokens
+from src.utils.token_counting import ConversationTokenCounter
 from src.utils.tracing import create_agent_metadata, create_tool_metadata, trace_span
 
 logger = get_logger(__name__)
@@ -660,6 +660,8 @@ async def stream_advanced_search_answer(
         # Track messages added since last agent call
         last_message_count = 0
         context_window = get_context_window(model)
+        # Running token count of `messages`, so each message is only tokenized once
+        token_counter = ConversationTokenCounter(model, messages)
 
         allowed_to_finish = False
 
@@ -687,7 +689,7 @@ async def stream_advanced_search_answer(
             last_message_count = len(messages)
 
             # Calculate context window usage percentage
-            current_tokens = count_messages_tokens(messages, model)
+            current_tokens = token_counter.total
             context_usage_percent = round((current_tokens / context_window) * 100, 1)
 
             # Add context window percentage to decision data
@@ -715,6 +717,7 @@ async def stream_advanced_search_answer(
                     }
                     # Update the last message with the override
                     messages[-1]["content"] = json.dumps(decision)
+                    token_counter.update(-1, messages[-1])
 
                     # Yield tool_call event BEFORE execution
                     yield {
@@ -738,10 +741,10 @@ async def stream_advanced_search_answer(
                     # Check context window before adding forced search result
                     buffer_size = int(context_window * CONTEXT_WINDOW_BUFFER)
                     max_allowed_tokens = context_window - buffer_size
-                    current_tokens = count_messages_tokens(messages, model)
+                    current_tokens = token_counter.total
 
                     message = {"role": "assistant", "content": json.dumps(search_result)}
-                    response_tokens = count_messages_tokens([message], model)
+                    response_tokens = message_tokens = token_counter.count(message)
                     predicted_total = current_tokens + response_tokens
 
                     if predicted_total > max_allowed_tokens:
@@ -762,12 +765,14 @@ async def stream_advanced_search_answer(
                             available_tools=list(AVAILABLE_TOOLS.keys()),
                         )
                         message["content"] = json.dumps(overflow_result_dict)
+                        message_tokens = token_counter.count(message)
                         current_usage_percent = round((current_tokens / context_window) * 100, 1)
                         logger.warning(
                             f"Forced semantic search would overflow context window: {response_tokens} tokens (limit: {remaining_tokens}) - Current usage: {current_usage_percent}%"
                         )
 
                     messages.append(message)
+                    token_counter.append(message, message_tokens)
 
                     # Yield only the tool_result (tool_call was already sent before execution)
                     yield {
@@ -784,7 +789,7 @@ async def stream_advanced_search_answer(
                     }
                     yield {"type": "message", "data": message}
                 else:
-                    current_tokens = count_messages_tokens(messages, model)
+                    current_tokens = token_counter.total
                     current_usage_percent = round((current_tokens / context_window) * 100, 1)
                     yield {
                         "type": "status",
@@ -889,13 +894,13 @@ async def stream_advanced_search_answer(
                 max_allowed_tokens = context_window - buffer_size
 
                 # Calculate current conversation size
-                current_tokens = count_messages_tokens(messages, model)
+                current_tokens = token_counter.total
 
                 # Calculate size of the tool response we're about to add
                 tool_response_msg = format_tool_response_message(
                     call_id=str(call_id), result=call_tool_response
                 )
-                response_tokens = count_messages_tokens([tool_response_msg], model)
+                response_tokens = message_tokens = token_counter.count(tool_response_msg)
 
                 # Check if adding this response would overflow
                 predicted_total = current_tokens + response_tokens
@@ -925,6 +930,7 @@ async def stream_advanced_search_answer(
                         available_tools=list(AVAILABLE_TOOLS.keys()),
                     )
                     success = False
+                    message_tokens = token_counter.count(tool_response_msg)
 
                     current_usage_percent = round((current_tokens / context_window) * 100, 1)
                     logger.warning(
@@ -932,6 +938,7 @@ async def stream_advanced_search_answer(
                     )
 
                 messages.append(tool_response_msg)
+                token_counter.append(tool_response_msg, message_tokens)
 
                 # Prepare tool call data for yield
                 tool_call_data = {
@@ -962,7 +969,7 @@ async def stream_advanced_search_answer(
 
         # Check if we hit the message limit
         if len(messages) >= MAX_MESSAGES:
-            current_tokens = count_messages_tokens(messages, model)
+            current_tokens = token_counter.total
             current_usage_percent = round((current_tokens / context_window) * 100, 1)
             yield {
                 "type": "status",
@@ -10,6 +10,7 @@ from starlette.responses import JSONResponse
 from src.clients.openai import get_openai_client
 from src.clients.redis import ping as redis_ping
 from src.clients.supabase import get_control_db_connection
+from src.clients.tenant_db import tenant_db_manager
 from src.mcp.middleware.metrics import get_metrics
 
 # Cache for expensive health checks
@@ -237,6 +238,22 @@ def register_health_routes(app):
                 status_code=503,
             )
 
+    @app.get("/health/tenant-db")
+    async def tenant_db_stats(request: Request) -> JSONResponse:
+        """Aggregate tenant DB pool and connection usage, for tuning connection capacity.
+
+        This route is unauthenticated, so it never reports individual tenants. Per-tenant
+        acquire waits and pool churn go to New Relic as TenantDBAcquireWait and
+        TenantDBPoolChurn events instead.
+        """
+        return JSONResponse(
+            {
+                "service": "corporate-context-mcp",
+                "timestamp": datetime.utcnow().isoformat(),
+                **tenant_db_manager.get_connection_stats(per_tenant=False),
+            }
+        )
+
     @app.get("/metrics")
     async def metrics_endpoint(request: Request):
         """Prometheus metrics endpoint."""
@@ -25,6 +25,19 @@ mcp_tool_errors_total = Counter(
     "mcp_tool_errors_total", "Total number of MCP tool errors", ["tool", "error_type"]
 )
 
+mcp_search_cache_lookups_total = Counter(
+    "mcp_search_cache_lookups_total",
+    "Total number of search cache lookups",
+    ["search_type", "layer", "result"],
+)
+
+
+def record_search_cache_lookup(search_type: str, layer: str, hit: bool) -> None:
+    """Record a search cache lookup; hit rate is hits / (hits + misses) per search type and layer."""
+    mcp_search_cache_lookups_total.labels(
+        search_type=search_type, layer=layer, result="hit" if hit else "miss"
+    ).inc()
+
 
 class MetricsMiddleware(Middleware):
     """Middleware to collect Prometheus metrics for MCP tool calls."""
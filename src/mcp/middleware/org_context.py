@@ -19,7 +19,6 @@ if TYPE_CHECKING:
     from src.clients.tenant_opensearch import TenantScopedOpenSearchClient
 
 import asyncpg
-import httpx
 from fastmcp.server.context import Context
 from fastmcp.server.dependencies import get_http_request
 from fastmcp.server.middleware import Middleware, MiddlewareContext
@@ -32,11 +31,13 @@ from src.mcp.utils.auth_helpers import (
     is_api_key_authentication,
     is_api_key_non_billable,
 )
-from src.utils.config import get_config_value
+from src.mcp.utils.workos_identity import IdentityCache, get_workos_user_organization_id
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_org_tenant_cache: IdentityCache[str] = IdentityCache("workos_org_tenant")
+
 
 async def _resolve_workos_org_to_tenant_id(
     control_pool: asyncpg.Pool, workos_org_id: str
@@ -64,8 +65,18 @@ async def _resolve_workos_org_to_tenant_id(
         return None
 
 
+async def _get_tenant_id_for_workos_org(workos_org_id: str) -> str | None:
+    """Resolve a WorkOS organization ID to an internal tenant ID, cached per org."""
+
+    async def load() -> str | None:
+        control_pool = await _tenant_db_manager.get_control_db()
+        return await _resolve_workos_org_to_tenant_id(control_pool, workos_org_id)
+
+    return await _org_tenant_cache.get_or_load(workos_org_id, load)
+
+
 async def _get_user_organization_from_workos(user_id: str) -> str | None:
-    """Get user's organization ID from WorkOS API.
+    """Get user's organization ID from WorkOS API (cached, see workos_identity).
 
     Args:
         user_id: WorkOS user ID (from JWT sub claim)
@@ -74,37 +85,7 @@ async def _get_user_organization_from_workos(user_id: str) -> str | None:
         Organization ID or None if not found
     """
     try:
-        workos_api_key = get_config_value("WORKOS_API_KEY")
-        if not workos_api_key:
-            logger.warning("OrgContextMiddleware - WORKOS_API_KEY not configured")
-            return None
-
-        async with httpx.AsyncClient() as client:
-            # Get user's organization memberships
-            response = await client.get(
-                "https://api.workos.com/user_management/organization_memberships",
-                headers={"Authorization": f"Bearer {workos_api_key}", "Accept": "application/json"},
-                params={"user_id": user_id},
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                memberships = data.get("data", [])
-                if memberships:
-                    # Take the first organization membership
-                    first_membership = memberships[0]
-                    org_id = first_membership.get("organization_id")
-                    logger.debug(f"OrgContextMiddleware - Found org_id from WorkOS API: {org_id}")
-                    return org_id
-                else:
-                    logger.debug("OrgContextMiddleware - User has no organization memberships")
-                    return None
-            else:
-                logger.warning(
-                    f"OrgContextMiddleware - WorkOS API error: {response.status_code} {response.text}"
-                )
-                return None
-
+        return await get_workos_user_organization_id(user_id)
     except Exception as e:
         logger.warning(f"OrgContextMiddleware - Error calling WorkOS API: {e}")
         return None
@@ -321,12 +302,8 @@ class OrgContextMiddleware(Middleware):
                     org_id = await _get_user_organization_from_workos(user_id)
                     logger.info(f"OrgContextMiddleware - WorkOS API returned org_id: {org_id}")
                     if org_id:
-                        logger.info("OrgContextMiddleware - Acquiring control DB pool")
-                        control_pool = await _tenant_db_manager.get_control_db()
-                        logger.info("OrgContextMiddleware - Resolving org_id to tenant_id in DB")
-                        resolved_tenant_id = await _resolve_workos_org_to_tenant_id(
-                            control_pool, org_id
-                        )
+                        logger.info("OrgContextMiddleware - Resolving org_id to tenant_id")
+                        resolved_tenant_id = await _get_tenant_id_for_workos_org(org_id)
                         logger.info(
                             f"OrgContextMiddleware - DB lookup returned tenant_id: {resolved_tenant_id}"
                         )
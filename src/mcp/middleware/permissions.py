@@ -5,7 +5,6 @@ from __future__ import annotations
 import contextlib
 from typing import Any
 
-import httpx
 import jwt
 from fastmcp.server.context import Context
 from fastmcp.server.dependencies import get_http_request
@@ -13,8 +12,8 @@ from fastmcp.server.middleware import Middleware, MiddlewareContext
 from fastmcp.server.middleware.middleware import CallNext
 
 from src.mcp.utils.auth_helpers import is_api_key_authentication
+from src.mcp.utils.workos_identity import get_workos_user_email
 from src.permissions.utils import make_email_permission_token
-from src.utils.config import get_config_value
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -123,40 +122,8 @@ class PermissionsMiddleware(Middleware):
             return None
 
         try:
-            workos_api_key = get_config_value("WORKOS_API_KEY")
-            if not workos_api_key:
-                logger.warning(
-                    "PermissionsMiddleware - WORKOS_API_KEY not configured for email lookup"
-                )
-                return None
-
-            logger.info(f"PermissionsMiddleware - Calling WorkOS API for user email {user_id}")
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"https://api.workos.com/user_management/users/{user_id}",
-                    headers={
-                        "Authorization": f"Bearer {workos_api_key}",
-                        "Accept": "application/json",
-                    },
-                )
-                logger.info(
-                    f"PermissionsMiddleware - WorkOS user API response: {response.status_code}"
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    email = data.get("email")
-                    if email:
-                        return email
-                    else:
-                        logger.debug("PermissionsMiddleware - User has no email in WorkOS")
-                        return None
-                else:
-                    logger.warning(
-                        f"PermissionsMiddleware - WorkOS user API error: {response.status_code} {response.text}"
-                    )
-                    return None
-
+            logger.info(f"PermissionsMiddleware - Getting WorkOS email for user {user_id}")
+            return await get_workos_user_email(user_id)
         except Exception as e:
             logger.warning(f"PermissionsMiddleware - Error calling WorkOS user API: {e}")
             return None
@@ -210,6 +210,7 @@ def main():
             "/health - Comprehensive health check",
             "/health/live - Liveness probe",
             "/health/ready - Readiness probe",
+            "/health/tenant-db - Aggregate tenant DB connection usage",
             "/metrics - Prometheus metrics",
         ],
         mcp_endpoints=[
@@ -6,6 +6,7 @@ from pydantic import Field
 # Company name will be injected at runtime
 from connectors.base.document_source import DocumentSource
 from src.mcp.mcp_instance import get_mcp
+from src.mcp.middleware.metrics import record_search_cache_lookup
 from src.mcp.middleware.org_context import (
     acquire_connection_from_context,
     acquire_opensearch_from_context,
@@ -14,6 +15,12 @@ from src.mcp.tools.filters import SearchFilters, build_opensearch_filters, get_f
 from src.permissions.verifier import batch_verify_document_access
 from src.utils.logging import get_logger
 from src.utils.scoring import get_keyword_search_scoring_config
+from src.utils.search_cache import (
+    TenantSearchCache,
+    get_candidates_ttl_seconds,
+    get_results_ttl_seconds,
+    normalize_search_query,
+)
 
 
 async def perform_keyword_search(
@@ -73,20 +80,62 @@ async def perform_keyword_search(
         fields=fields,
     )
 
-    # Lazily acquire OpenSearch client and perform search
-    async with acquire_opensearch_from_context(context) as (opensearch_client, index_name):
-        # Use OpenSearch for keyword search with query, recency, and references weighting
-        raw_results = await opensearch_client.keyword_search(
-            index_name=index_name,
-            query=query,
-            fields=fields,
-            query_weight=config["query_weight"],
-            recency_weight=config["recency_weight"],
-            references_weight=config["references_weight"],
-            limit=limit,
-            filters=combined_filters,
-            advanced=advanced,
-        )
+    # Repeated searches are served from the tenant's search cache when enabled
+    tenant_id = context.get_state("tenant_id")
+    search_cache = await TenantSearchCache.open(tenant_id, "keyword") if tenant_id else None
+    normalized_query = normalize_search_query(query)
+    results_key_parts = {
+        "query": normalized_query,
+        "filters": filters.model_dump(mode="json"),
+        "limit": limit,
+        "advanced": advanced,
+        "permission_principal_token": permission_principal_token,
+        "permission_audience": permission_audience,
+        "scoring_config": config,
+    }
+    # Candidates are cached before permission verification; the OpenSearch filters
+    # already include the permission filter, so they are part of the key
+    candidates_key_parts = {
+        "query": normalized_query,
+        "opensearch_filters": combined_filters,
+        "fields": fields,
+        "limit": limit,
+        "advanced": advanced,
+        "scoring_config": config,
+    }
+
+    if search_cache:
+        cached_response = await search_cache.get("results", **results_key_parts)
+        record_search_cache_lookup("keyword", "results", hit=cached_response is not None)
+        if cached_response is not None:
+            return cached_response
+
+    raw_results: list[dict] | None = None
+    if search_cache:
+        raw_results = await search_cache.get("candidates", **candidates_key_parts)
+        record_search_cache_lookup("keyword", "candidates", hit=raw_results is not None)
+
+    if raw_results is None:
+        # Lazily acquire OpenSearch client and perform search
+        async with acquire_opensearch_from_context(context) as (opensearch_client, index_name):
+            # Use OpenSearch for keyword search with query, recency, and references weighting
+            raw_results = await opensearch_client.keyword_search(
+                index_name=index_name,
+                # Query with the same normalized text used for the cache key, so queries that
+                # share a candidates entry always get the results for that text
+                query=normalized_query,
+                fields=fields,
+                query_weight=config["query_weight"],
+                recency_weight=config["recency_weight"],
+                references_weight=config["references_weight"],
+                limit=limit,
+                filters=combined_filters,
+                advanced=advanced,
+            )
+        if search_cache:
+            await search_cache.set(
+                "candidates", raw_results, get_candidates_ttl_seconds(), **candidates_key_parts
+            )
 
     # Debug logging for raw results
     logger.info(
@@ -159,10 +208,13 @@ async def perform_keyword_search(
         top_5_ids=[r.get("document_id") for r in filtered_results[:5]],
     )
 
-    return {
+    response = {
         "results": filtered_results,
         "count": len(filtered_results),
     }
+    if search_cache:
+        await search_cache.set("results", response, get_results_ttl_seconds(), **results_key_parts)
+    return response
 
 
 def _get_fields_for_source(source: DocumentSource) -> list[str]:
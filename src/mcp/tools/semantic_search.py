@@ -3,6 +3,7 @@ from typing import Annotated
 
 from fastmcp.server.context import Context
 from pydantic import Field
+from turbopuffer.types import Filter
 from typing_extensions import TypedDict
 
 from connectors.base import TurbopufferChunkKey
@@ -10,8 +11,9 @@ from connectors.base import TurbopufferChunkKey
 # Company name will be injected at runtime
 from connectors.base.document_source import DocumentSource
 from src.clients.openai import get_openai_client
-from src.clients.turbopuffer import get_turbopuffer_client
+from src.clients.turbopuffer import ChunkRowDict, get_turbopuffer_client
 from src.mcp.mcp_instance import get_mcp
+from src.mcp.middleware.metrics import record_search_cache_lookup
 from src.mcp.middleware.org_context import acquire_connection_from_context
 from src.mcp.tools.filters import SearchFilters, build_turbopuffer_filters, get_filter_description
 from src.permissions.verifier import batch_verify_document_access
@@ -20,6 +22,12 @@ from src.utils.scoring import (
     calculate_in_memory_scores,
     get_semantic_search_scoring_config,
 )
+from src.utils.search_cache import (
+    TenantSearchCache,
+    get_candidates_ttl_seconds,
+    get_results_ttl_seconds,
+    normalize_search_query,
+)
 from src.utils.tracing import trace_span
 
 
@@ -73,21 +81,6 @@ async def perform_semantic_search(
             "tenant_id not found in tool context; ensure OrgContextMiddleware is enabled"
         )
 
-    # Warm the turbopuffer cache in the background while we embed the query
-    # OK to fire and forget here - warm_cache() never throws
-    turbopuffer_client = get_turbopuffer_client()
-    asyncio.create_task(turbopuffer_client.warm_cache(tenant_id))
-
-    # Generate embedding for the query
-    openai_client = get_openai_client()
-    async with trace_span(
-        name="create_embedding",
-        input_data={"query": query},
-    ) as span:
-        query_embedding = await openai_client.create_embedding(query)
-    if not query_embedding:
-        raise ValueError("Failed to generate embedding for query")
-
     permission_principal_token = context.get_state("permission_principal_token")
     permission_audience = context.get_state("permission_audience")
     turbopuffer_filters = build_turbopuffer_filters(
@@ -97,29 +90,49 @@ async def perform_semantic_search(
     # Query Turbopuffer for candidates (10x the limit for reranking)
     candidate_limit = min(limit * 10, MAX_SEARCH_CANDIDATES)
 
-    # Include attributes we need for reranking and final results
-    include_attributes: list[TurbopufferChunkKey] = [
-        "id",
-        "document_id",
-        "source",
-        "content",
-        "metadata",
-        "source_created_at",
-    ]
-
-    async with trace_span(
-        name="query_turbopuffer",
-        input_data={"tenant_id": tenant_id, "top_k": candidate_limit},
-        metadata={"operation": "turbopuffer_query", "filters": str(turbopuffer_filters)},
-    ) as span:
-        turbopuffer_results = await turbopuffer_client.query_chunks(
-            tenant_id=tenant_id,
-            query_vector=query_embedding,
-            top_k=candidate_limit,
-            filters=turbopuffer_filters,
-            include_attributes=include_attributes,
+    # Repeated searches are served from the tenant's search cache when enabled
+    search_cache = await TenantSearchCache.open(tenant_id, "semantic")
+    normalized_query = normalize_search_query(query)
+    results_key_parts = {
+        "query": normalized_query,
+        "filters": filters.model_dump(mode="json"),
+        "limit": limit,
+        "permission_principal_token": permission_principal_token,
+        "permission_audience": permission_audience,
+        "scoring_config": scoring_config,
+    }
+    # Candidates are cached before permission verification; the Turbopuffer filter
+    # already includes the permission filter, so it is part of the key
+    candidates_key_parts = {
+        "query": normalized_query,
+        "turbopuffer_filters": turbopuffer_filters,
+        "top_k": candidate_limit,
+    }
+
+    if search_cache:
+        cached_response = await search_cache.get("results", **results_key_parts)
+        record_search_cache_lookup("semantic", "results", hit=cached_response is not None)
+        if cached_response is not None:
+            return cached_response
+
+    turbopuffer_results: list[ChunkRowDict] | None = None
+    if search_cache:
+        turbopuffer_results = await search_cache.get("candidates", **candidates_key_parts)
+        record_search_cache_lookup("semantic", "candidates", hit=turbopuffer_results is not None)
+
+    if turbopuffer_results is None:
+        # Embed the same normalized text used for the cache key, so queries that share a
+        # candidates entry always get the results for that text
+        turbopuffer_results = await _query_turbopuffer_candidates(
+            tenant_id, normalized_query, turbopuffer_filters, candidate_limit
         )
-        span.update(output={"result_count": len(turbopuffer_results)})
+        if search_cache:
+            await search_cache.set(
+                "candidates",
+                turbopuffer_results,
+                get_candidates_ttl_seconds(),
+                **candidates_key_parts,
+            )
 
     if not turbopuffer_results:
         return {"results": [], "count": 0}
@@ -201,7 +214,59 @@ async def perform_semantic_search(
     results.sort(key=lambda x: float(x["score"]), reverse=True)
     results = results[:limit]
 
-    return {"results": results, "count": len(results)}
+    response: SemanticSearchResultResponse = {"results": results, "count": len(results)}
+    if search_cache:
+        await search_cache.set("results", response, get_results_ttl_seconds(), **results_key_parts)
+    return response
+
+
+async def _query_turbopuffer_candidates(
+    tenant_id: str,
+    query: str,
+    turbopuffer_filters: Filter | None,
+    candidate_limit: int,
+) -> list[ChunkRowDict]:
+    """Embed the query and fetch candidate chunks from Turbopuffer."""
+    # Warm the turbopuffer cache in the background while we embed the query
+    # OK to fire and forget here - warm_cache() never throws
+    turbopuffer_client = get_turbopuffer_client()
+    asyncio.create_task(turbopuffer_client.warm_cache(tenant_id))
+
+    # Generate embedding for the query
+    openai_client = get_openai_client()
+    async with trace_span(
+        name="create_embedding",
+        input_data={"query": query},
+    ) as span:
+        query_embedding = await openai_client.create_embedding(query)
+    if not query_embedding:
+        raise ValueError("Failed to generate embedding for query")
+
+    # Include attributes we need for reranking and final results
+    include_attributes: list[TurbopufferChunkKey] = [
+        "id",
+        "document_id",
+        "source",
+        "content",
+        "metadata",
+        "source_created_at",
+    ]
+
+    async with trace_span(
+        name="query_turbopuffer",
+        input_data={"tenant_id": tenant_id, "top_k": candidate_limit},
+        metadata={"operation": "turbopuffer_query", "filters": str(turbopuffer_filters)},
+    ) as span:
+        turbopuffer_results = await turbopuffer_client.query_chunks(
+            tenant_id=tenant_id,
+            query_vector=query_embedding,
+            top_k=candidate_limit,
+            filters=turbopuffer_filters,
+            include_attributes=include_attributes,
+        )
+        span.update(output={"result_count": len(turbopuffer_results)})
+
+    return turbopuffer_results
 
 
 @get_mcp().tool(
@@ -0,0 +1,205 @@
+"""Cached identity lookups for the MCP middleware.
+
+When a JWT doesn't carry a tenant_id or email, OrgContextMiddleware and PermissionsMiddleware
+resolve the token's user through the WorkOS API (and the org through the control DB) on
+every tool call. Agent workloads make dozens of tool calls per question, so lookups are
+cached per process:
+
+- Results are cached per user/org ID for WORKOS_IDENTITY_CACHE_TTL_SECONDS. Definite misses
+  (unknown user, no membership or email, no provisioned tenant) are cached for the shorter
+  WORKOS_IDENTITY_CACHE_NEGATIVE_TTL_SECONDS. Errors are not cached.
+- Concurrent lookups of the same ID share one upstream request.
+- Each cache holds at most WORKOS_IDENTITY_CACHE_MAX_ENTRIES IDs, evicting the least
+  recently used.
+- WorkOS requests share one pooled HTTP client instead of connecting on every call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from src.mcp.utils.workos_user import WORKOS_BASE_URL
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_NEGATIVE_TTL_SECONDS = 30.0
+DEFAULT_MAX_ENTRIES = 10_000
+WORKOS_HTTP_TIMEOUT_SECONDS = 10.0
+WORKOS_MAX_CONNECTIONS = 20
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_workos_http_client() -> httpx.AsyncClient:
+    """Shared HTTP client for the WorkOS user management API, created on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=WORKOS_BASE_URL,
+            timeout=WORKOS_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=WORKOS_MAX_CONNECTIONS,
+                max_keepalive_connections=WORKOS_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+class IdentityCache[V]:
+    """Bounded TTL cache with negative caching and single-flight loads."""
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float | None = None,
+        negative_ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl_seconds = float(
+            ttl_seconds
+            if ttl_seconds is not None
+            else get_config_value("WORKOS_IDENTITY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+        )
+        self.negative_ttl_seconds = float(
+            negative_ttl_seconds
+            if negative_ttl_seconds is not None
+            else get_config_value(
+                "WORKOS_IDENTITY_CACHE_NEGATIVE_TTL_SECONDS", DEFAULT_NEGATIVE_TTL_SECONDS
+            )
+        )
+        self.max_entries = max(
+            int(
+                max_entries
+                if max_entries is not None
+                else get_config_value("WORKOS_IDENTITY_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+            ),
+            1,
+        )
+        # key -> (expires_at, value); None values are cached misses
+        self._entries: OrderedDict[str, tuple[float, V | None]] = OrderedDict()
+        self._loads: dict[str, asyncio.Task[V | None]] = {}
+        self.hits = 0
+        self.loads = 0
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[V | None]]) -> V | None:
+        """Get the cached value for key, or load it once for all concurrent callers.
+
+        `load` should return None for a definite miss and raise on errors, which reach
+        every waiting caller and are not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._loads.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load))
+            self._loads[key] = task
+        # Shielded so a cancelled caller doesn't cancel the load for the others
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[V | None]]) -> V | None:
+        self.loads += 1
+        try:
+            value = await load()
+        finally:
+            self._loads.pop(key, None)
+
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "loads": self.loads,
+        }
+
+
+class WorkOSLookupError(Exception):
+    """A WorkOS lookup failed for a reason other than the identity not existing."""
+
+
+async def _workos_get(path: str, params: dict[str, str] | None = None) -> dict[str, Any]:
+    workos_api_key = get_config_value("WORKOS_API_KEY")
+    if not workos_api_key:
+        raise WorkOSLookupError("WORKOS_API_KEY not configured")
+
+    response = await get_workos_http_client().get(
+        path,
+        headers={"Authorization": f"Bearer {workos_api_key}", "Accept": "application/json"},
+        params=params,
+    )
+    if response.status_code == 404:
+        # Unknown user: a definite miss rather than an error
+        return {}
+    if response.status_code != 200:
+        raise WorkOSLookupError(f"WorkOS API error: {response.status_code} {response.text}")
+    return response.json()
+
+
+async def _fetch_user_organization_id(user_id: str) -> str | None:
+    data = await _workos_get("/organization_memberships", params={"user_id": user_id})
+    memberships = data.get("data", [])
+    if not memberships:
+        logger.debug("User has no WorkOS organization memberships", user_id=user_id)
+        return None
+    # Take the first organization membership
+    return memberships[0].get("organization_id")
+
+
+async def _fetch_user_email(user_id: str) -> str | None:
+    data = await _workos_get(f"/users/{user_id}")
+    email = data.get("email")
+    if not email:
+        logger.debug("User has no email in WorkOS", user_id=user_id)
+    return email or None
+
+
+_user_organization_cache: IdentityCache[str] = IdentityCache("workos_user_organization")
+_user_email_cache: IdentityCache[str] = IdentityCache("workos_user_email")
+
+
+async def get_workos_user_organization_id(user_id: str) -> str | None:
+    """Get a WorkOS user's (first) organization ID.
+
+    Raises:
+        WorkOSLookupError: If WorkOS is not configured or the API call fails
+    """
+    return await _user_organization_cache.get_or_load(
+        user_id, lambda: _fetch_user_organization_id(user_id)
+    )
+
+
+async def get_workos_user_email(user_id: str) -> str | None:
+    """Get a WorkOS user's email address.
+
+    Raises:
+        WorkOSLookupError: If WorkOS is not configured or the API call fails
+    """
+    return await _user_email_cache.get_or_load(user_id, lambda: _fetch_user_email(user_id))
@@ -1,5 +1,6 @@
 import asyncio
 import functools
+import threading
 import time
 
 from tqdm import tqdm
@@ -113,3 +114,44 @@ def rate_limited(max_retries=5, base_delay=5):
             return sync_wrapper
 
     return decorator
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for budgeting a per-process rate (e.g. tokens or requests per minute).
+
+    The bucket holds up to `capacity` tokens and refills continuously at `capacity / period_seconds`
+    tokens per second. It is safe to share across threads and event loops, since waiting is done
+    with `asyncio.sleep` outside the lock.
+    """
+
+    def __init__(self, capacity: float, period_seconds: float = 60.0):
+        if capacity <= 0:
+            raise ValueError("TokenBucket capacity must be positive")
+        self.capacity = capacity
+        self.refill_rate = capacity / period_seconds
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate
+        )
+        self._last_refill = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until `amount` tokens are available, then take them.
+
+        Requests larger than the bucket capacity are clamped to the capacity so they can't wait forever.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_seconds = (amount - self._tokens) / self.refill_rate
+            await asyncio.sleep(wait_seconds)
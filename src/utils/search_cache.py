@@ -0,0 +1,120 @@
+"""Tenant-scoped cache for search results, shared across MCP server replicas through Redis.
+
+Agent loops often repeat the same (or nearly the same) semantic_search and keyword_search
+calls, both within a conversation and across users in the same tenant. Searches cache two
+layers separately:
+- "candidates": raw backend results (Turbopuffer / OpenSearch) before permission verification.
+  The backend query already embeds the permission filter, so it is part of the key.
+- "results": final permission-filtered results, keyed by the permission principal and audience.
+
+Invalidation uses a per-tenant generation counter that is part of every key: the index worker
+bumps it after writing or deleting documents for a tenant, and entries from older generations
+simply expire with their TTL.
+
+Caching is enabled with SEARCH_CACHE_ENABLED. Redis failures are never fatal: a failed lookup
+is treated as a miss and a failed store is ignored.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from src.clients.redis import get_client as get_redis_client
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SEARCH_CACHE_KEY_PREFIX = "search_cache"
+DEFAULT_CANDIDATES_TTL_SECONDS = 300
+# Permission-filtered results are kept briefly so access changes are picked up quickly
+DEFAULT_RESULTS_TTL_SECONDS = 60
+
+
+def is_search_cache_enabled() -> bool:
+    return get_config_value("SEARCH_CACHE_ENABLED", False)
+
+
+def get_candidates_ttl_seconds() -> int:
+    return int(
+        get_config_value("SEARCH_CACHE_CANDIDATES_TTL_SECONDS", DEFAULT_CANDIDATES_TTL_SECONDS)
+    )
+
+
+def get_results_ttl_seconds() -> int:
+    return int(get_config_value("SEARCH_CACHE_RESULTS_TTL_SECONDS", DEFAULT_RESULTS_TTL_SECONDS))
+
+
+def normalize_search_query(query: str) -> str:
+    """Normalize a query for cache keying by collapsing whitespace."""
+    return " ".join(query.split())
+
+
+def _generation_key(tenant_id: str) -> str:
+    return f"{SEARCH_CACHE_KEY_PREFIX}:{tenant_id}:generation"
+
+
+async def invalidate_tenant_search_cache(tenant_id: str) -> None:
+    """Invalidate all cached searches for a tenant by bumping its generation counter."""
+    if not is_search_cache_enabled():
+        return
+
+    try:
+        redis_client = await get_redis_client()
+        await redis_client.incr(_generation_key(tenant_id))
+    except Exception as e:
+        logger.warning(f"Failed to invalidate search cache for tenant {tenant_id}: {e}")
+
+
+class TenantSearchCache:
+    """Search cache for one tenant and search type, pinned to the tenant's current generation."""
+
+    def __init__(self, tenant_id: str, search_type: str, generation: int):
+        self.tenant_id = tenant_id
+        self.search_type = search_type
+        self.generation = generation
+
+    @classmethod
+    async def open(cls, tenant_id: str, search_type: str) -> "TenantSearchCache | None":
+        """Get the search cache for a tenant, or None if caching is disabled or Redis is unavailable."""
+        if not is_search_cache_enabled():
+            return None
+
+        try:
+            redis_client = await get_redis_client()
+            generation = await redis_client.get(_generation_key(tenant_id))
+        except Exception as e:
+            logger.debug(f"Redis unavailable for search cache: {e}")
+            return None
+
+        return cls(tenant_id, search_type, int(generation or 0))
+
+    def make_key(self, layer: str, **key_parts: Any) -> str:
+        """Build the cache key for a layer from the parameters that determine its value."""
+        serialized = json.dumps(key_parts, sort_keys=True, default=str)
+        digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return (
+            f"{SEARCH_CACHE_KEY_PREFIX}:{self.tenant_id}:{self.generation}:"
+            f"{self.search_type}:{layer}:{digest}"
+        )
+
+    async def get(self, layer: str, **key_parts: Any) -> Any | None:
+        """Get a cached value, or None on a miss."""
+        key = self.make_key(layer, **key_parts)
+        try:
+            redis_client = await get_redis_client()
+            cached_value = await redis_client.get(key)
+        except Exception as e:
+            logger.debug(f"Search cache lookup failed, treating as miss: {e}")
+            return None
+
+        return json.loads(cached_value) if cached_value is not None else None
+
+    async def set(self, layer: str, value: Any, ttl_seconds: int, **key_parts: Any) -> None:
+        """Store a JSON-serializable value."""
+        key = self.make_key(layer, **key_parts)
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.setex(key, ttl_seconds, json.dumps(value, default=str))
+        except Exception as e:
+            logger.debug(f"Failed to store search cache entry: {e}")
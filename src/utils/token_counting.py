@@ -1,14 +1,22 @@
 """Token counting utilities for OpenAI models."""
 
+import functools
 from typing import Any
 
 import tiktoken
 
+# Token counts for message formatting (based on OpenAI's guidelines)
+TOKENS_PER_MESSAGE = 3  # <|start|>role<|end|>
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3  # Every reply is primed with <|start|>assistant<|end|>
 
-def _get_encoding_for_model(model: str):
+
+@functools.lru_cache(maxsize=16)
+def _get_encoding_for_model(model: str) -> tiktoken.Encoding:
     """Get tiktoken encoding for model with safe fallbacks.
 
     Falls back to a generic encoding when the model is unknown (e.g., 'gpt-5').
+    Cached per model, so unknown models don't go through the failed lookup on every call.
     """
     try:
         return tiktoken.encoding_for_model(model)
@@ -25,47 +33,94 @@ def count_tokens(text: str, model: str) -> int:
     return len(encoding.encode(text or ""))
 
 
+def count_message_tokens(message: dict[str, Any], model: str) -> int:
+    """Calculate tokens for a single message including its formatting overhead."""
+    total_tokens = TOKENS_PER_MESSAGE
+
+    # Count tokens in each field
+    if "role" in message:
+        total_tokens += count_tokens(message["role"], model)
+
+    if "content" in message:
+        content = message["content"]
+        if isinstance(content, str):
+            # Simple string content
+            total_tokens += count_tokens(content, model)
+        elif isinstance(content, list):
+            # Array content (with files/images)
+            for item in content:
+                if isinstance(item, dict) and "text" in item:
+                    total_tokens += count_tokens(item["text"], model)
+                # Note: We can't easily count tokens for images, so we skip them
+        else:
+            # Fallback: convert to string
+            total_tokens += count_tokens(str(content), model)
+
+    if "name" in message:
+        total_tokens += TOKENS_PER_NAME
+        total_tokens += count_tokens(message["name"], model)
+
+    # Handle function call outputs
+    if "type" in message and message["type"] == "function_call_output":
+        if "call_id" in message:
+            total_tokens += count_tokens(message["call_id"], model)
+        if "output" in message:
+            total_tokens += count_tokens(message["output"], model)
+
+    return total_tokens
+
+
 def count_messages_tokens(messages: list[dict[str, Any]], model: str) -> int:
     """Calculate total tokens in a conversation including message formatting overhead."""
-    # Token counts for message formatting (based on OpenAI's guidelines)
-    tokens_per_message = 3  # <|start|>role<|end|>
-    tokens_per_name = 1
-
-    total_tokens = 0
-
-    for message in messages:
-        total_tokens += tokens_per_message
-
-        # Count tokens in each field
-        if "role" in message:
-            total_tokens += count_tokens(message["role"], model)
-
-        if "content" in message:
-            content = message["content"]
-            if isinstance(content, str):
-                # Simple string content
-                total_tokens += count_tokens(content, model)
-            elif isinstance(content, list):
-                # Array content (with files/images)
-                for item in content:
-                    if isinstance(item, dict) and "text" in item:
-                        total_tokens += count_tokens(item["text"], model)
-                    # Note: We can't easily count tokens for images, so we skip them
-            else:
-                # Fallback: convert to string
-                total_tokens += count_tokens(str(content), model)
-
-        if "name" in message:
-            total_tokens += tokens_per_name
-            total_tokens += count_tokens(message["name"], model)
-
-        # Handle function call outputs
-        if "type" in message and message["type"] == "function_call_output":
-            if "call_id" in message:
-                total_tokens += count_tokens(message["call_id"], model)
-            if "output" in message:
-                total_tokens += count_tokens(message["output"], model)
-
-    total_tokens += 3  # Every reply is primed with <|start|>assistant<|end|>
+    total_tokens = sum(count_message_tokens(message, model) for message in messages)
+    return total_tokens + REPLY_PRIMING_TOKENS
 
-    return total_tokens
+
+class ConversationTokenCounter:
+    """Running token count of a conversation, kept in step with its message list.
+
+    Each message is counted once when it is added (and again only if it is replaced), so
+    checking the conversation size every agent turn doesn't re-encode the whole history.
+    `total` always equals `count_messages_tokens(messages, model)` for the tracked messages.
+    """
+
+    def __init__(self, model: str, messages: list[dict[str, Any]] | None = None) -> None:
+        self.model = model
+        self._message_tokens: list[int] = []
+        self._total = REPLY_PRIMING_TOKENS
+        for message in messages or []:
+            self.append(message)
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    def count(self, message: dict[str, Any]) -> int:
+        """Tokens a message would add to the conversation."""
+        return count_message_tokens(message, self.model)
+
+    def append(self, message: dict[str, Any], tokens: int | None = None) -> int:
+        """Track a message appended to the conversation.
+
+        Args:
+            message: The appended message
+            tokens: Its token count, if already known from `count()`
+
+        Returns:
+            The message's token count
+        """
+        if tokens is None:
+            tokens = self.count(message)
+        self._message_tokens.append(tokens)
+        self._total += tokens
+        return tokens
+
+    def update(self, index: int, message: dict[str, Any]) -> int:
+        """Recount a message that was modified or replaced in place (e.g. truncated output)."""
+        tokens = self.count(message)
+        self._total += tokens - self._message_tokens[index]
+        self._message_tokens[index] = tokens
+        return tokens
+
+    def __len__(self) -> int:
+        return len(self._message_tokens)
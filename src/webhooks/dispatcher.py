@@ -0,0 +1,286 @@
+"""
+Webhook dispatcher that fans document changes out to a tenant's webhook subscriptions.
+
+Index jobs hand over all the documents they indexed in one call. The dispatcher:
+
+- Queues them on a bounded queue, so a burst of jobs waits for room instead of piling up
+  unbounded background tasks. A job waits at most WEBHOOK_ENQUEUE_TIMEOUT_SECONDS; after that
+  its remaining deliveries are dropped and logged, so slow endpoints can't stall indexing.
+- Caches each tenant's active subscriptions for WEBHOOK_SUBSCRIPTION_CACHE_TTL_SECONDS, so a
+  large job doesn't re-query webhook_subscriptions for every document.
+- Splits a job's documents into batches of at most WEBHOOK_MAX_BATCH_SIZE. Subscriptions with
+  batch_deliveries get one documents.changed payload per batch; the rest keep getting one
+  document.changed payload per document.
+- Sends everything through one pooled HTTP client, with at most
+  WEBHOOK_MAX_CONCURRENT_DELIVERIES requests in flight. Deliveries only hold a slot while a
+  request is in flight, not while backing off between retries, so dead endpoints can't take
+  every slot.
+
+A dispatcher is bound to the event loop it first runs on.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+import asyncpg
+import httpx
+
+from src.utils.config import get_config_value
+from src.utils.logging import get_logger
+from src.webhooks.delivery import (
+    WebhookSubscription,
+    build_document_changed_payload,
+    build_documents_changed_payload,
+    get_active_webhook_subscriptions,
+    send_single_webhook,
+)
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_QUEUE_SIZE = 100
+DEFAULT_MAX_BATCH_SIZE = 100
+DEFAULT_MAX_CONCURRENT_DELIVERIES = 20
+DEFAULT_SUBSCRIPTION_CACHE_TTL_SECONDS = 60.0
+DEFAULT_NUM_WORKERS = 4
+DEFAULT_TIMEOUT_SECONDS = 5.0
+DEFAULT_ENQUEUE_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class DocumentChangeBatch:
+    """Changed documents of one tenant and source, delivered together."""
+
+    tenant_id: str
+    source: str
+    document_ids: list[str]
+    db_pool: asyncpg.Pool
+
+
+class WebhookDispatcher:
+    """Queues document changes and delivers them to webhook subscriptions in batches."""
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_concurrent_deliveries: int = DEFAULT_MAX_CONCURRENT_DELIVERIES,
+        subscription_cache_ttl_seconds: float = DEFAULT_SUBSCRIPTION_CACHE_TTL_SECONDS,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        enqueue_timeout_seconds: float = DEFAULT_ENQUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_concurrent_deliveries = max(max_concurrent_deliveries, 1)
+        self.subscription_cache_ttl_seconds = subscription_cache_ttl_seconds
+        self.num_workers = max(num_workers, 1)
+        self.timeout_seconds = timeout_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+
+        self._queue: asyncio.Queue[DocumentChangeBatch] = asyncio.Queue(maxsize=max_queue_size)
+        self._delivery_semaphore = asyncio.Semaphore(self.max_concurrent_deliveries)
+        # tenant_id -> (expires_at, subscriptions)
+        self._subscriptions: dict[str, tuple[float, list[WebhookSubscription]]] = {}
+        self._subscription_locks: dict[str, asyncio.Lock] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def enqueue(
+        self, tenant_id: str, document_ids: list[str], source: str, db_pool: asyncpg.Pool
+    ) -> None:
+        """Queue webhook delivery for changed documents.
+
+        Returns once the documents are queued, waiting up to enqueue_timeout_seconds for
+        room if the queue is full; batches that don't fit in time are dropped and logged.
+        Deliveries happen in the background and their failures are only logged.
+
+        Args:
+            tenant_id: The tenant ID
+            document_ids: IDs of the documents that changed
+            source: The source of the documents (github, slack, etc.)
+            db_pool: Database pool for the tenant
+        """
+        self._start_workers()
+        unique_document_ids = list(dict.fromkeys(document_ids))
+        queued_count = 0
+        try:
+            async with asyncio.timeout(self.enqueue_timeout_seconds):
+                for i in range(0, len(unique_document_ids), self.max_batch_size):
+                    batch_document_ids = unique_document_ids[i : i + self.max_batch_size]
+                    await self._queue.put(
+                        DocumentChangeBatch(
+                            tenant_id=tenant_id,
+                            source=source,
+                            document_ids=batch_document_ids,
+                            db_pool=db_pool,
+                        )
+                    )
+                    queued_count += len(batch_document_ids)
+        except TimeoutError:
+            logger.warning(
+                "Dropped webhook delivery, queue full",
+                tenant_id=tenant_id,
+                source=source,
+                dropped_document_count=len(unique_document_ids) - queued_count,
+                queue_size=self._queue.qsize(),
+            )
+            return
+
+        logger.debug(
+            "Queued webhook delivery",
+            tenant_id=tenant_id,
+            source=source,
+            document_count=len(unique_document_ids),
+            queue_size=self._queue.qsize(),
+        )
+
+    def _start_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.num_workers:
+            self._workers.append(asyncio.create_task(self._run_worker()))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrent_deliveries,
+                    max_keepalive_connections=self.max_concurrent_deliveries,
+                ),
+            )
+        return self._client
+
+    async def _run_worker(self) -> None:
+        while True:
+            batch = await self._queue.get()
+            try:
+                await self._deliver_batch(batch)
+            except Exception as e:
+                # Log but don't re-raise - one bad batch must not stop the worker
+                logger.error(
+                    "webhook_delivery_error",
+                    tenant_id=batch.tenant_id,
+                    source=batch.source,
+                    document_count=len(batch.document_ids),
+                    error=str(e),
+                )
+            finally:
+                self._queue.task_done()
+
+    async def _get_subscriptions(
+        self, tenant_id: str, db_pool: asyncpg.Pool
+    ) -> list[WebhookSubscription]:
+        """Get a tenant's active subscriptions, querying at most once per TTL."""
+        cached = self._subscriptions.get(tenant_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        lock = self._subscription_locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            # Another worker may have refreshed the cache while we waited
+            cached = self._subscriptions.get(tenant_id)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
+            subscriptions = await get_active_webhook_subscriptions(db_pool)
+            self._subscriptions[tenant_id] = (
+                time.monotonic() + self.subscription_cache_ttl_seconds,
+                subscriptions,
+            )
+            return subscriptions
+
+    async def _deliver_batch(self, batch: DocumentChangeBatch) -> None:
+        subscriptions = await self._get_subscriptions(batch.tenant_id, batch.db_pool)
+        if not subscriptions:
+            logger.debug(
+                "No active webhook subscriptions found",
+                tenant_id=batch.tenant_id,
+                document_count=len(batch.document_ids),
+            )
+            return
+
+        deliveries = []
+        for subscription in subscriptions:
+            if subscription.batch_deliveries:
+                payload = build_documents_changed_payload(
+                    batch.tenant_id, batch.document_ids, batch.source
+                )
+                deliveries.append(self._send(subscription, payload))
+            else:
+                deliveries.extend(
+                    self._send(
+                        subscription,
+                        build_document_changed_payload(batch.tenant_id, document_id, batch.source),
+                    )
+                    for document_id in batch.document_ids
+                )
+
+        await asyncio.gather(*deliveries, return_exceptions=True)
+
+        logger.debug(
+            "Webhook delivery completed",
+            tenant_id=batch.tenant_id,
+            document_count=len(batch.document_ids),
+            subscription_count=len(subscriptions),
+            delivery_count=len(deliveries),
+        )
+
+    async def _send(self, subscription: WebhookSubscription, payload: dict) -> None:
+        await send_single_webhook(
+            subscription,
+            payload,
+            client=self._get_client(),
+            concurrency_limit=self._delivery_semaphore,
+        )
+
+    async def aclose(self, drain_timeout_seconds: float = 10.0) -> None:
+        """Deliver what's already queued (up to a timeout), then stop workers and close the client."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=drain_timeout_seconds)
+            except TimeoutError:
+                logger.warning(
+                    "Timed out draining webhook queue", remaining_batches=self._queue.qsize()
+                )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_webhook_dispatcher: WebhookDispatcher | None = None
+
+
+def get_webhook_dispatcher() -> WebhookDispatcher:
+    """Get the process-wide WebhookDispatcher, configured from the environment."""
+    global _webhook_dispatcher
+    if _webhook_dispatcher is None:
+        _webhook_dispatcher = WebhookDispatcher(
+            max_queue_size=int(get_config_value("WEBHOOK_MAX_QUEUE_SIZE", DEFAULT_MAX_QUEUE_SIZE)),
+            max_batch_size=int(get_config_value("WEBHOOK_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)),
+            max_concurrent_deliveries=int(
+                get_config_value(
+                    "WEBHOOK_MAX_CONCURRENT_DELIVERIES", DEFAULT_MAX_CONCURRENT_DELIVERIES
+                )
+            ),
+            subscription_cache_ttl_seconds=float(
+                get_config_value(
+                    "WEBHOOK_SUBSCRIPTION_CACHE_TTL_SECONDS", DEFAULT_SUBSCRIPTION_CACHE_TTL_SECONDS
+                )
+            ),
+            enqueue_timeout_seconds=float(
+                get_config_value("WEBHOOK_ENQUEUE_TIMEOUT_SECONDS", DEFAULT_ENQUEUE_TIMEOUT_SECONDS)
+            ),
+        )
+    return _webhook_dispatcher
+
+
+async def close_webhook_dispatcher() -> None:
+    """Flush and close the process-wide WebhookDispatcher, if one was created."""
+    global _webhook_dispatcher
+    if _webhook_dispatcher is not None:
+        await _webhook_dispatcher.aclose()
+        _webhook_dispatcher = None
@@ -0,0 +1,103 @@
+"""Tests for the content-addressed embedding cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.clients.embedding_cache import (
+    DiskEmbeddingCacheBackend,
+    EmbeddingCache,
+    InMemoryEmbeddingCacheBackend,
+    decode_vector,
+    encode_vector,
+    make_embedding_cache_key,
+)
+
+
+class FakeEncoding:
+    """Whitespace tokenizer standing in for tiktoken, so tests don't download encodings."""
+
+    def encode_batch(self, texts: list[str]) -> list[list[str]]:
+        return [text.split() for text in texts]
+
+    def decode(self, tokens: list[str]) -> str:
+        return " ".join(tokens)
+
+
+class TestVectorEncoding:
+    """Test float16 vector encoding."""
+
+    def test_roundtrip_is_close(self):
+        vector = [0.0123, -0.5, 0.25, 1.0]
+        decoded = decode_vector(encode_vector(vector))
+        assert decoded == pytest.approx(vector, abs=1e-3)
+
+    def test_encoded_size_is_two_bytes_per_dim(self):
+        assert len(encode_vector([0.1] * 3072)) == 3072 * 2
+
+    def test_key_depends_on_model_and_text(self):
+        key = make_embedding_cache_key("text-embedding-3-large", "hello")
+        assert key == make_embedding_cache_key("text-embedding-3-large", "hello")
+        assert key != make_embedding_cache_key("text-embedding-3-small", "hello")
+        assert key != make_embedding_cache_key("text-embedding-3-large", "hello!")
+
+
+class TestBackends:
+    """Test the cache storage backends."""
+
+    async def test_in_memory_lru_evicts_oldest(self):
+        backend = InMemoryEmbeddingCacheBackend(max_entries=2)
+        await backend.set_many({"a": b"1", "b": b"2"})
+        await backend.get_many(["a"])  # touch "a" so "b" is least recently used
+        await backend.set_many({"c": b"3"})
+
+        assert await backend.get_many(["a", "b", "c"]) == {"a": b"1", "c": b"3"}
+
+    async def test_disk_roundtrip(self, tmp_path):
+        backend = DiskEmbeddingCacheBackend(tmp_path)
+        key = make_embedding_cache_key("model", "text")
+        await backend.set_many({key: b"vector"})
+
+        assert await backend.get_many([key, "model:missing"]) == {key: b"vector"}
+
+
+class TestEmbeddingCache:
+    """Test hit/miss accounting and failure handling."""
+
+    async def test_counts_hits_and_misses(self):
+        cache = EmbeddingCache(InMemoryEmbeddingCacheBackend())
+        await cache.set_many("model", {"cached text": [0.5, 0.25]})
+
+        found = await cache.get_many("model", ["cached text", "new text"])
+
+        assert found == {"cached text": [0.5, 0.25]}
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    async def test_backend_failure_is_a_miss(self):
+        backend = MagicMock()
+        backend.get_many = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = EmbeddingCache(backend)
+
+        assert await cache.get_many("model", ["text"]) == {}
+        assert cache.misses == 1
+
+
+class TestCreateEmbeddingsBatchWithCache:
+    """Test that create_embeddings_batch only sends cache misses to the API."""
+
+    async def test_only_misses_are_embedded(self):
+        from src.clients.openai import OpenAIClient
+
+        with patch("src.clients.openai.get_openai_api_key", return_value="sk-test"):
+            client = OpenAIClient()
+        client.embedding_cache = EmbeddingCache(InMemoryEmbeddingCacheBackend())
+        await client.embedding_cache.set_many("model", {"seen": [1.0, 0.0]})
+
+        client._create_embeddings_single_batch = AsyncMock(return_value=[[0.0, 1.0]])
+
+        with patch("src.clients.openai.get_embedding_encoding", return_value=FakeEncoding()):
+            result = await client.create_embeddings_batch(["seen", "unseen", "seen"], model="model")
+
+        client._create_embeddings_single_batch.assert_awaited_once_with(["unseen"], "model", 1)
+        assert result == [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0]]
@@ -0,0 +1,127 @@
+"""Tests for OpenAIClient embedding batch dispatch."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.clients import openai as openai_module
+from src.clients.openai import MAX_TOKENS_PER_TEXT, OpenAIClient, fits_embedding_token_limit
+
+
+class FakeEncoding:
+    """Whitespace tokenizer standing in for tiktoken, so tests don't download encodings."""
+
+    def encode_batch(self, texts: list[str]) -> list[list[str]]:
+        return [text.split() for text in texts]
+
+    def decode(self, tokens: list[str]) -> str:
+        return " ".join(tokens)
+
+
+def _make_client() -> OpenAIClient:
+    with patch("src.clients.openai.get_openai_api_key", return_value="sk-test"):
+        return OpenAIClient()
+
+
+class TestEmbedProcessedTexts:
+    """Test splitting and concurrent dispatch of embedding sub-batches."""
+
+    async def test_small_input_uses_single_batch_fast_path(self):
+        client = _make_client()
+        client._create_embeddings_single_batch = AsyncMock(return_value=[[1.0], [2.0]])
+        client._dispatch_embeddings_batch = AsyncMock()  # type: ignore[method-assign]
+
+        result = await client._embed_processed_texts(["a", "b"], [1, 1], "model")
+
+        assert result == [[1.0], [2.0]]
+        client._create_embeddings_single_batch.assert_awaited_once_with(["a", "b"], "model", 2)
+        client._dispatch_embeddings_batch.assert_not_called()
+
+    async def test_sub_batches_run_concurrently_and_preserve_order(self):
+        client = _make_client()
+        client.max_concurrent_batches = 3
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_single_batch(
+            texts: list[str], model: str, token_count: int
+        ) -> list[list[float]]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Later batches finish first to make sure ordering doesn't depend on completion order
+            await asyncio.sleep(0.01 * (10 - int(texts[0])))
+            in_flight -= 1
+            return [[float(text)] for text in texts]
+
+        client._create_embeddings_single_batch = fake_single_batch
+
+        texts = [str(i) for i in range(8)]
+        with patch.object(openai_module, "MAX_ITEMS_PER_BATCH", 2):
+            result = await client._embed_processed_texts(texts, [1] * len(texts), "model")
+
+        assert result == [[float(i)] for i in range(8)]
+        assert max_in_flight == 3
+
+
+class TestEmbeddingBudget:
+    """Test that every embedding request path is charged against the TPM/RPM buckets."""
+
+    async def test_single_batch_charges_buckets(self):
+        client = _make_client()
+        client.async_client = MagicMock()
+        client.async_client.embeddings.create = AsyncMock(
+            return_value=MagicMock(data=[MagicMock(embedding=[1.0]), MagicMock(embedding=[2.0])])
+        )
+        client.embedding_requests_bucket = MagicMock(acquire=AsyncMock())
+        client.embedding_tokens_bucket = MagicMock(acquire=AsyncMock())
+
+        await client._create_embeddings_single_batch(["a", "b"], "model", 42)
+
+        client.embedding_requests_bucket.acquire.assert_awaited_once_with(1)
+        client.embedding_tokens_bucket.acquire.assert_awaited_once_with(42)
+
+    async def test_single_text_charges_buckets(self):
+        client = _make_client()
+        client.async_client = MagicMock()
+        client.async_client.embeddings.create = AsyncMock(
+            return_value=MagicMock(data=[MagicMock(embedding=[1.0])])
+        )
+        client.embedding_requests_bucket = MagicMock(acquire=AsyncMock())
+        client.embedding_tokens_bucket = MagicMock(acquire=AsyncMock())
+
+        await client.create_embedding("hello", model="model")
+
+        client.embedding_requests_bucket.acquire.assert_awaited_once_with(1)
+        client.embedding_tokens_bucket.acquire.assert_awaited_once_with(len("hello"))
+
+
+class TestFitsEmbeddingTokenLimit:
+    """Test the cheap character-length bound used to skip tokenization."""
+
+    def test_short_text_fits(self):
+        assert fits_embedding_token_limit("how do I deploy the api?")
+
+    def test_ascii_text_within_byte_bound_fits(self):
+        assert fits_embedding_token_limit("a" * MAX_TOKENS_PER_TEXT)
+
+    def test_long_text_is_not_proven_to_fit(self):
+        assert not fits_embedding_token_limit("a" * (MAX_TOKENS_PER_TEXT + 1))
+
+    def test_multibyte_text_uses_byte_length(self):
+        # 3 bytes per char, so this exceeds the byte bound even though the char count is small
+        assert not fits_embedding_token_limit("€" * (MAX_TOKENS_PER_TEXT // 2))
+
+
+class TestProcessTextsForEmbedding:
+    """Test batch tokenization and truncation."""
+
+    def test_truncates_only_oversized_texts(self):
+        client = _make_client()
+        long_text = "word " * (MAX_TOKENS_PER_TEXT * 2)
+
+        with patch.object(openai_module, "get_embedding_encoding", return_value=FakeEncoding()):
+            processed, counts = client._process_texts_for_embedding(["short text", long_text])
+
+        assert processed[0] == "short text"
+        assert counts[1] == MAX_TOKENS_PER_TEXT
+        assert len(processed[1]) < len(long_text)
@@ -0,0 +1,106 @@
+"""Tests for per-tenant pool creation and reference-counted eviction in TenantDBManager."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.clients.tenant_db import TenantDBManager
+
+CONNECTION_PARAMS = {"host": "localhost", "port": "5432", "user": "u", "password": "p"}
+
+
+def _make_manager(max_pools: int = 10) -> TenantDBManager:
+    with patch("src.clients.tenant_db.SSMClient"):
+        manager = TenantDBManager(max_pools=max_pools)
+    manager._get_connection_params = AsyncMock(return_value=CONNECTION_PARAMS)  # type: ignore[method-assign]
+    return manager
+
+
+def _make_pool() -> MagicMock:
+    pool = MagicMock()
+    pool.close = AsyncMock()
+    return pool
+
+
+@pytest.fixture
+def mock_create_pool():
+    with patch("src.clients.tenant_db.asyncpg.create_pool", new_callable=AsyncMock) as mock:
+        mock.side_effect = lambda **kwargs: _make_pool()
+        yield mock
+
+
+class TestTenantDBManagerPoolCreation:
+    """Test that pool creation is shared per tenant and parallel across tenants."""
+
+    async def test_concurrent_callers_share_one_creation(self, mock_create_pool):
+        manager = _make_manager()
+
+        pools = await asyncio.gather(*[manager._get_or_create_pool("tenant-a") for _ in range(5)])
+
+        assert mock_create_pool.call_count == 1
+        assert len({id(pool_info.pool) for pool_info in pools}) == 1
+
+    async def test_slow_tenant_does_not_block_others(self, mock_create_pool):
+        manager = _make_manager()
+        release_slow_tenant = asyncio.Event()
+
+        async def create_pool(**kwargs):
+            if kwargs["database"] == "slow":
+                await release_slow_tenant.wait()
+            return _make_pool()
+
+        mock_create_pool.side_effect = create_pool
+
+        async def connection_params(org_id, readonly=False, use_cache=True):
+            return {**CONNECTION_PARAMS, "database": org_id}
+
+        manager._get_connection_params = connection_params  # type: ignore[method-assign]
+
+        slow = asyncio.create_task(manager._get_or_create_pool("slow"))
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(manager._get_or_create_pool("fast"), timeout=1)
+
+        assert fast.tenant_id == "fast"
+        assert not slow.done()
+        release_slow_tenant.set()
+        assert (await slow).tenant_id == "slow"
+
+    async def test_failed_creation_is_retried_by_next_caller(self, mock_create_pool):
+        manager = _make_manager()
+        mock_create_pool.side_effect = [RuntimeError("connection refused"), _make_pool()]
+
+        with pytest.raises(RuntimeError):
+            await manager._get_or_create_pool("tenant-a")
+        pool_info = await manager._get_or_create_pool("tenant-a")
+
+        assert pool_info.tenant_id == "tenant-a"
+        assert mock_create_pool.call_count == 2
+
+
+class TestTenantDBManagerEviction:
+    """Test that evicted pools are only closed once nothing is using them."""
+
+    async def test_evicted_pool_closes_after_last_release(self, mock_create_pool):
+        manager = _make_manager(max_pools=1)
+
+        async with manager.acquire_pool("tenant-a") as pool_a:
+            async with manager.acquire_pool("tenant-b"):
+                pass
+
+            # tenant-a was evicted but is still in use
+            assert "tenant-a" not in manager._pool_info
+            pool_a.close.assert_not_called()
+
+        pool_a.close.assert_called_once()
+
+    async def test_unused_pool_closes_on_eviction(self, mock_create_pool):
+        manager = _make_manager(max_pools=1)
+
+        async with manager.acquire_pool("tenant-a") as pool_a:
+            pass
+        async with manager.acquire_pool("tenant-b"):
+            pass
+
+        pool_a.close.assert_called_once()
+        assert list(manager._pool_info) == ["tenant-b"]
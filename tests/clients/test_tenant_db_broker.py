@@ -0,0 +1,138 @@
+"""Tests for the tenant DB connection broker."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.clients.tenant_db import TenantDBManager
+from src.clients.tenant_db_broker import BrokeredPool, ConnectionBroker
+
+
+class TestConnectionBroker:
+    """Test the global budget and demand-based per-tenant limits."""
+
+    async def test_caps_total_checkouts_at_budget(self):
+        broker = ConnectionBroker(max_connections=2, max_connections_per_tenant=2)
+        await broker.acquire_slot("tenant-a")
+        await broker.acquire_slot("tenant-b")
+
+        waiter = asyncio.create_task(broker.acquire_slot("tenant-c"))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await broker.release_slot("tenant-a")
+        await asyncio.wait_for(waiter, timeout=1)
+        assert broker.get_stats()["in_use"] == 2
+
+    async def test_busy_tenant_gets_full_share_when_budget_allows(self):
+        broker = ConnectionBroker(max_connections=20, max_connections_per_tenant=5)
+        for _ in range(3):
+            await broker.acquire_slot("tenant-a")
+
+        assert broker.tenant_limit("tenant-a") == 5
+
+    async def test_limits_follow_demand_when_oversubscribed(self):
+        broker = ConnectionBroker(max_connections=4, max_connections_per_tenant=4)
+        for _ in range(3):
+            await broker.acquire_slot("busy")
+        await broker.acquire_slot("quiet")
+
+        busy_waiter = asyncio.create_task(broker.acquire_slot("busy"))
+        quiet_waiter = asyncio.create_task(broker.acquire_slot("quiet"))
+        await asyncio.sleep(0)
+        assert broker.tenant_limit("busy") > broker.tenant_limit("quiet")
+
+        # The freed connection goes to the tenant under its share, not the one over it
+        await broker.release_slot("quiet")
+        await asyncio.wait_for(quiet_waiter, timeout=1)
+        assert not busy_waiter.done()
+
+        await broker.release_slot("quiet")
+        await asyncio.wait_for(busy_waiter, timeout=1)
+
+    async def test_stats_report_per_tenant_usage(self):
+        broker = ConnectionBroker()
+        await broker.acquire_slot("tenant-a")
+        await broker.release_slot("tenant-a")
+        broker.record_pool_created("tenant-a")
+        broker.record_pool_evicted("tenant-a")
+
+        tenant_stats = broker.get_stats()["tenants"]["tenant-a"]
+        assert tenant_stats["in_use"] == 0
+        assert tenant_stats["acquire_count"] == 1
+        assert tenant_stats["pool_creations"] == 1
+        assert tenant_stats["pool_evictions"] == 1
+
+    async def test_aggregate_stats_omit_tenant_ids(self):
+        broker = ConnectionBroker()
+        await broker.acquire_slot("tenant-a")
+        broker.record_pool_created("tenant-a")
+        broker.record_pool_created("tenant-b")
+
+        stats = broker.get_stats(per_tenant=False)
+        assert "tenants" not in stats
+        assert stats["tenant_count"] == 2
+        assert stats["in_use"] == 1
+        assert stats["pool_creations"] == 2
+
+    async def test_records_per_tenant_events(self):
+        broker = ConnectionBroker(max_connections=1)
+
+        with patch(
+            "src.clients.tenant_db_broker.newrelic.agent.record_custom_event"
+        ) as record_custom_event:
+            broker.record_pool_created("tenant-a")
+            await broker.acquire_slot("tenant-a")
+            waiter = asyncio.create_task(broker.acquire_slot("tenant-b"))
+            await asyncio.sleep(0.02)
+            await broker.release_slot("tenant-a")
+            await asyncio.wait_for(waiter, timeout=1)
+            broker.record_pool_evicted("tenant-a")
+
+        events = [(call.args[0], call.args[1]) for call in record_custom_event.call_args_list]
+        churn = [fields for name, fields in events if name == "TenantDBPoolChurn"]
+        assert [(fields["tenant_id"], fields["action"]) for fields in churn] == [
+            ("tenant-a", "created"),
+            ("tenant-a", "evicted"),
+        ]
+        # Only the acquire that the budget held back is recorded
+        waits = [fields for name, fields in events if name == "TenantDBAcquireWait"]
+        assert [fields["tenant_id"] for fields in waits] == ["tenant-b"]
+        assert waits[0]["wait_ms"] >= 10
+
+
+class TestBrokeredPool:
+    """Test that pool-level queries take and return a broker slot."""
+
+    async def test_fetch_takes_slot(self):
+        broker = ConnectionBroker(max_connections=1)
+        conn = MagicMock()
+        conn.fetch = AsyncMock(return_value=[{"id": 1}])
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        brokered = BrokeredPool(pool, "tenant-a", broker)
+        assert await brokered.fetch("SELECT 1") == [{"id": 1}]
+
+        assert broker.get_stats()["in_use"] == 0
+        assert broker.get_stats()["tenants"]["tenant-a"]["acquire_count"] == 1
+
+
+class TestTenantDBManagerBrokerMode:
+    """Test that broker mode sizes pools per tenant and wraps them."""
+
+    async def test_creates_brokered_pools(self):
+        broker = ConnectionBroker(max_connections=30, max_connections_per_tenant=6)
+        with patch("src.clients.tenant_db.SSMClient"):
+            manager = TenantDBManager(broker=broker)
+        manager._get_connection_params = AsyncMock(return_value={"host": "localhost"})  # type: ignore[method-assign]
+
+        with patch(
+            "src.clients.tenant_db.asyncpg.create_pool", new_callable=AsyncMock
+        ) as mock_create_pool:
+            async with manager.acquire_pool("tenant-a") as pool:
+                assert isinstance(pool, BrokeredPool)
+
+        assert mock_create_pool.call_args.kwargs["min_size"] == 0
+        assert mock_create_pool.call_args.kwargs["max_size"] == 6
+        assert manager.get_connection_stats()["tenants"]["tenant-a"]["pool_creations"] == 1
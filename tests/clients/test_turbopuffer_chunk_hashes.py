@@ -0,0 +1,90 @@
+"""Tests for TurbopufferClient bulk chunk hash lookups."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.clients import turbopuffer as turbopuffer_module
+from src.clients.turbopuffer import TurbopufferClient
+
+
+def _make_client(namespace: MagicMock) -> TurbopufferClient:
+    with patch.dict(
+        "os.environ", {"TURBOPUFFER_API_KEY": "tpuf-test", "TURBOPUFFER_REGION": "test-region"}
+    ):
+        client = TurbopufferClient()
+    client._get_namespace = MagicMock(return_value=namespace)  # type: ignore[method-assign]
+    return client
+
+
+def _rows(*rows: tuple[str, str, str]) -> SimpleNamespace:
+    return SimpleNamespace(
+        rows=[
+            MagicMock(
+                to_dict=MagicMock(
+                    return_value={"id": chunk_id, "document_id": doc_id, "content_hash": h}
+                )
+            )
+            for chunk_id, doc_id, h in rows
+        ]
+    )
+
+
+class TestGetExistingChunkHashesBulk:
+    """Test fetching chunk hashes for many documents with one paginated query."""
+
+    async def test_groups_rows_by_document(self):
+        namespace = MagicMock()
+        namespace.query = AsyncMock(return_value=_rows(("c1", "doc1", "h1"), ("c2", "doc2", "h2")))
+        client = _make_client(namespace)
+
+        result = await client.get_existing_chunk_hashes_bulk("tenant", ["doc1", "doc2", "doc3"])
+
+        assert result == {"doc1": {"c1": "h1"}, "doc2": {"c2": "h2"}, "doc3": {}}
+        namespace.query.assert_awaited_once()
+        assert namespace.query.await_args.kwargs["filters"] == (
+            "document_id",
+            "In",
+            ["doc1", "doc2", "doc3"],
+        )
+
+    async def test_paginates_across_combined_result_by_chunk_id(self):
+        namespace = MagicMock()
+        namespace.query = AsyncMock(
+            side_effect=[
+                _rows(("c1", "doc1", "h1"), ("c2", "doc2", "h2")),
+                _rows(("c3", "doc1", "h3")),
+            ]
+        )
+        client = _make_client(namespace)
+
+        with patch.object(turbopuffer_module, "MAX_TOP_K", 2):
+            result = await client.get_existing_chunk_hashes_bulk("tenant", ["doc1", "doc2"])
+
+        assert result == {"doc1": {"c1": "h1", "c3": "h3"}, "doc2": {"c2": "h2"}}
+        assert namespace.query.await_count == 2
+        second_filter = namespace.query.await_args_list[1].kwargs["filters"]
+        assert second_filter == (
+            "And",
+            [("document_id", "In", ["doc1", "doc2"]), ("id", "Gt", "c2")],
+        )
+
+    async def test_falls_back_to_per_document_queries_on_failure(self):
+        namespace = MagicMock()
+        namespace.query = AsyncMock(side_effect=RuntimeError("boom"))
+        client = _make_client(namespace)
+        client.get_existing_chunk_hashes = AsyncMock(  # type: ignore[method-assign]
+            side_effect=lambda tenant_id, doc_id: {f"{doc_id}-chunk": "h"}
+        )
+
+        result = await client.get_existing_chunk_hashes_bulk("tenant", ["doc1", "doc2"])
+
+        assert result == {"doc1": {"doc1-chunk": "h"}, "doc2": {"doc2-chunk": "h"}}
+        assert client.get_existing_chunk_hashes.await_count == 2
+
+    async def test_empty_doc_ids_skips_query(self):
+        namespace = MagicMock()
+        namespace.query = AsyncMock()
+        client = _make_client(namespace)
+
+        assert await client.get_existing_chunk_hashes_bulk("tenant", []) == {}
+        namespace.query.assert_not_called()
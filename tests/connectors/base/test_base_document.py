@@ -0,0 +1,99 @@
+"""Tests for opt-in memoization on BaseDocument."""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from connectors.base import BaseChunk, BaseDocument, compute_chunk_content_hash
+from connectors.base.document_source import DocumentSource
+
+
+@dataclass
+class CountingDocument(BaseDocument[BaseChunk[Any], dict[str, Any]]):
+    """Document that counts how often its content and metadata are built."""
+
+    body: str
+    content_calls: int = 0
+    metadata_calls: int = 0
+
+    def to_embedding_chunks(self) -> list[BaseChunk[Any]]:
+        return []
+
+    def get_content(self) -> str:
+        object.__setattr__(self, "content_calls", self.content_calls + 1)
+        return self.body
+
+    def get_metadata(self) -> dict[str, Any]:
+        object.__setattr__(self, "metadata_calls", self.metadata_calls + 1)
+        return {"source_created_at": "2024-01-15T10:30:00Z", "length": len(self.body)}
+
+    def get_source_enum(self) -> DocumentSource:
+        return DocumentSource.NOTION
+
+
+@dataclass
+class ExtendedDocument(CountingDocument):
+    """Subclass that builds on its parent's metadata via super()."""
+
+    def get_metadata(self) -> dict[str, Any]:
+        return {**super().get_metadata(), "extended": True}
+
+
+def _make_document(cls: type[CountingDocument] = CountingDocument) -> CountingDocument:
+    return cls(
+        id="doc-1",
+        source_updated_at=datetime(2024, 1, 16, tzinfo=UTC),
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        body="hello world",
+    )
+
+
+class TestBaseDocumentMemoization:
+    """Test that memoized values are computed once and dropped on mutation."""
+
+    def test_not_memoized_by_default(self):
+        document = _make_document()
+        document.get_content()
+        document.get_content()
+        assert document.content_calls == 2
+
+    def test_memoizes_content_metadata_and_hash(self):
+        document = _make_document()
+        document.enable_memoization()
+
+        content_hash = document.get_content_hash()
+        document.get_content()
+        document.get_metadata()
+        source_created_at = document.get_source_created_at()
+
+        assert content_hash == compute_chunk_content_hash("hello world", document.get_metadata())
+        assert source_created_at == datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+        assert document.content_calls == 1
+        assert document.metadata_calls == 1
+
+    def test_reassignment_invalidates(self):
+        document = _make_document()
+        document.enable_memoization()
+        original_hash = document.get_content_hash()
+
+        document.body = "changed"
+
+        assert document.get_content() == "changed"
+        assert document.get_content_hash() != original_hash
+
+    def test_subclass_super_call_uses_own_cache_entry(self):
+        document = _make_document(ExtendedDocument)
+        document.enable_memoization()
+
+        assert document.get_metadata()["extended"] is True
+        assert document.get_metadata()["extended"] is True
+        assert document.metadata_calls == 1
+
+    def test_disable_drops_cached_values(self):
+        document = _make_document()
+        document.enable_memoization()
+        document.get_content()
+        document.disable_memoization()
+        document.get_content()
+        assert document.content_calls == 2
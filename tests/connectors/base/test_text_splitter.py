@@ -0,0 +1,62 @@
+"""Tests for the shared text splitter."""
+
+import random
+import string
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from connectors.base import TextSplitter, get_text_splitter
+from connectors.base.text_splitter import DEFAULT_SEPARATORS
+
+
+def _make_text(rng: random.Random, n_pieces: int) -> str:
+    """Text mixing every separator, runs of whitespace and long unbroken words."""
+    pieces = []
+    for _ in range(n_pieces):
+        roll = rng.random()
+        if roll < 0.1:
+            pieces.append("\n\n")
+        elif roll < 0.2:
+            pieces.append("\n")
+        elif roll < 0.3:
+            pieces.append(". ")
+        elif roll < 0.35:
+            pieces.append("  ")
+        elif roll < 0.37:
+            pieces.append("x" * rng.randint(50, 400))
+        else:
+            pieces.append(" " + "".join(rng.choices(string.ascii_letters, k=rng.randint(1, 12))))
+    return "".join(pieces)
+
+
+class TestTextSplitter:
+    """Test that chunks match langchain's RecursiveCharacterTextSplitter exactly."""
+
+    @pytest.mark.parametrize(
+        ("chunk_size", "chunk_overlap"), [(6000, 100), (6000, 200), (200, 20), (50, 10), (30, 0)]
+    )
+    def test_matches_langchain(self, chunk_size, chunk_overlap):
+        langchain_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            separators=list(DEFAULT_SEPARATORS),
+        )
+        splitter = TextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        rng = random.Random(chunk_size * 1000 + chunk_overlap)
+
+        for _ in range(50):
+            text = _make_text(rng, rng.randint(0, 3000))
+            assert splitter.split_text(text) == langchain_splitter.split_text(text)
+
+    def test_short_text_is_one_chunk(self):
+        assert get_text_splitter().split_text("  hello world \n") == ["hello world"]
+
+    def test_splitters_are_shared_per_configuration(self):
+        assert get_text_splitter() is get_text_splitter(chunk_size=6000, chunk_overlap=100)
+        assert get_text_splitter() is not get_text_splitter(chunk_size=6000, chunk_overlap=200)
+
+    def test_rejects_overlap_larger_than_chunk_size(self):
+        with pytest.raises(ValueError):
+            TextSplitter(chunk_size=10, chunk_overlap=20)
@@ -0,0 +1,124 @@
+"""Tests for ranged, streaming reads of Slack export channel-day files."""
+
+import asyncio
+import json
+import zlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from connectors.slack.slack_export_backfill_extractor import SlackExportBackfillExtractor
+from connectors.slack.slack_export_reader import iter_zip_entry_json_array, plan_byte_ranges
+from connectors.slack.slack_models import SlackChannelDayFile
+
+
+def _deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _day_file(start_byte: int, size: int, filename: str = "2024-01-01.json") -> SlackChannelDayFile:
+    return SlackChannelDayFile(
+        channel_name="general",
+        channel_id="C123",
+        filename=filename,
+        start_byte=start_byte,
+        size=size,
+    )
+
+
+def _message(i: int) -> dict:
+    return {
+        "type": "message",
+        "client_msg_id": f"msg-{i}",
+        "user": "U123",
+        "text": f"héllo wörld {i} 🎉",
+        "ts": f"1704067200.{i:06d}",
+    }
+
+
+class TestPlanByteRanges:
+    """Test coalescing of channel-day file byte ranges."""
+
+    def test_merges_adjacent_and_nearby_files(self):
+        files = [_day_file(0, 100), _day_file(150, 100), _day_file(260, 40)]
+
+        ranges = plan_byte_ranges(files, max_gap_bytes=50)
+
+        assert len(ranges) == 1
+        assert (ranges[0].start, ranges[0].end) == (0, 300)
+        assert ranges[0].files == files
+
+    def test_splits_on_large_gaps_and_unsorted_input(self):
+        far = _day_file(10_000, 100)
+        near = _day_file(0, 100)
+
+        ranges = plan_byte_ranges([far, near], max_gap_bytes=50)
+
+        assert [(r.start, r.end) for r in ranges] == [(0, 100), (10_000, 10_100)]
+        assert ranges[0].files == [near]
+
+    def test_respects_max_range_size(self):
+        files = [_day_file(0, 100), _day_file(100, 100), _day_file(200, 100)]
+
+        ranges = plan_byte_ranges(files, max_gap_bytes=0, max_range_bytes=200)
+
+        assert [(r.start, r.end) for r in ranges] == [(0, 200), (200, 300)]
+
+
+class TestIterZipEntryJsonArray:
+    """Test incremental inflate and parse of ZIP entries."""
+
+    def test_matches_json_loads_across_chunk_boundaries(self):
+        messages = [_message(i) for i in range(200)]
+        deflated = _deflate(json.dumps(messages, ensure_ascii=False, indent=2).encode("utf-8"))
+
+        # Tiny chunks split multi-byte characters and items across reads
+        with patch("connectors.slack.slack_export_reader.INFLATE_CHUNK_BYTES", 7):
+            parsed = list(iter_zip_entry_json_array(deflated))
+
+        assert parsed == messages
+
+    def test_empty_array(self):
+        assert list(iter_zip_entry_json_array(_deflate(b" [ ] "))) == []
+
+    def test_truncated_array_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_zip_entry_json_array(_deflate(b'[{"a": 1}, {"b": ')))
+
+
+class TestSlackExportBackfillRangedReads:
+    """Test that a batch of channel-day files is read with coalesced ranged GETs."""
+
+    async def test_reads_adjacent_files_with_one_request(self):
+        entries = [
+            _deflate(json.dumps([_message(0), {"type": "channel_join"}]).encode()),
+            _deflate(json.dumps([_message(1), _message(2)]).encode()),
+        ]
+        export_bytes = b"HEADER" + entries[0] + b"HDR" + entries[1]
+        files = [
+            _day_file(6, len(entries[0]), "2024-01-01.json"),
+            _day_file(6 + len(entries[0]) + 3, len(entries[1]), "2024-01-02.json"),
+        ]
+
+        async def read_range(uri: str, start: int, end: int) -> bytes:
+            return export_bytes[start:end]
+
+        extractor = SlackExportBackfillExtractor()
+        extractor.store_artifacts_batch = AsyncMock()  # type: ignore[method-assign]
+        mock_read = AsyncMock(side_effect=read_range)
+
+        with patch(
+            "connectors.slack.slack_export_backfill_extractor.read_s3_byte_range", mock_read
+        ):
+            entity_ids = await extractor._process_byte_range(
+                "00000000-0000-0000-0000-000000000000",
+                "s3://bucket/export.zip",
+                plan_byte_ranges(files)[0],
+                MagicMock(),
+                asyncio.Semaphore(1),
+            )
+
+        assert mock_read.call_count == 1
+        assert len(entity_ids) == 3
+        assert extractor.store_artifacts_batch.call_count == 2
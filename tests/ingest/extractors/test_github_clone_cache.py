@@ -0,0 +1,183 @@
+"""Tests for the pod-local GitHub clone cache."""
+
+import base64
+import subprocess
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from connectors.github.github_clone_cache import RepoCloneCache
+from connectors.github.github_repo_utils import CloneResult
+
+REPO_URL = "https://github.com/acme/widgets"
+TENANT_ID = "tenant123"
+
+
+def _git(repo_path: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def origin(tmp_path: Path) -> Path:
+    """A local origin repository that serves blobless clones."""
+    origin_path = tmp_path / "origin"
+    origin_path.mkdir()
+    _git(origin_path, "init")
+    _git(origin_path, "config", "uploadpack.allowFilter", "true")
+    (origin_path / "src").mkdir()
+    (origin_path / "src" / "app.py").write_text("print('app')")
+    (origin_path / "docs").mkdir()
+    (origin_path / "docs" / "guide.md").write_text("# Guide")
+    _git(origin_path, "add", ".")
+    _git(origin_path, "commit", "-m", "initial")
+    return origin_path
+
+
+@pytest.fixture
+def mock_clone(origin: Path):
+    """Patch clone_repository to make blobless clones of the local origin."""
+
+    async def clone(repo_url, github_client, temp_dir):
+        repo_path = Path(temp_dir) / "widgets"
+        _git(
+            Path(temp_dir),
+            "clone",
+            "--no-checkout",
+            "--filter=blob:none",
+            f"file://{origin}",
+            str(repo_path),
+        )
+        return CloneResult(
+            repo_path=repo_path, commit_sha=_git(repo_path, "rev-parse", "HEAD"), branch="main"
+        )
+
+    with patch(
+        "connectors.github.github_clone_cache.clone_repository", AsyncMock(side_effect=clone)
+    ) as mock:
+        yield mock
+
+
+class TestRepoCloneCache:
+    """Test clone reuse, per-job worktrees and eviction."""
+
+    async def test_reuses_clone_for_same_commit(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"))
+        commit_sha = _git(origin, "rev-parse", "HEAD")
+
+        first = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_sha)
+        second = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_sha)
+
+        assert not first.cache_hit
+        assert second.cache_hit
+        assert first.repo_path == second.repo_path
+        assert second.branch == "main"
+        assert mock_clone.call_count == 1
+
+        await cache.release(first)
+        await cache.release(second)
+
+    async def test_root_clone_is_reused_by_child_batches(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"))
+
+        root_lease = await cache.acquire(TENANT_ID, REPO_URL, MagicMock())
+        await cache.release(root_lease)
+        child_lease = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), root_lease.commit_sha)
+
+        assert root_lease.commit_sha == _git(origin, "rev-parse", "HEAD")
+        assert child_lease.cache_hit
+        assert child_lease.repo_path == root_lease.repo_path
+        assert mock_clone.call_count == 1
+
+        await cache.release(child_lease)
+
+    async def test_worktrees_check_out_independently(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"))
+        commit_sha = _git(origin, "rev-parse", "HEAD")
+
+        first = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_sha)
+        second = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_sha)
+        first_worktree = await cache.add_worktree(first, tmp_path / "job1" / "widgets")
+        second_worktree = await cache.add_worktree(second, tmp_path / "job2" / "widgets")
+
+        size_before = await first.object_store_size()
+        _git(first_worktree, "sparse-checkout", "set", "--no-cone", "src/app.py")
+        _git(first_worktree, "checkout")
+        _git(second_worktree, "sparse-checkout", "set", "--no-cone", "docs/guide.md")
+        _git(second_worktree, "checkout")
+
+        assert (first_worktree / "src" / "app.py").read_text() == "print('app')"
+        assert not (first_worktree / "docs" / "guide.md").exists()
+        assert (second_worktree / "docs" / "guide.md").read_text() == "# Guide"
+        assert not (second_worktree / "src" / "app.py").exists()
+        # Blobs were fetched into the shared object store on demand
+        assert await first.object_store_size() > size_before
+
+        await cache.release(first)
+        await cache.release(second)
+        assert not first_worktree.exists()
+        assert not second_worktree.exists()
+        assert first.repo_path.exists()
+
+    async def test_evicts_unused_clones_over_budget(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"), max_bytes=0)
+        commit_shas = [_git(origin, "rev-parse", "HEAD")]
+        for version in ["v2", "v3"]:
+            (origin / "src" / "app.py").write_text(f"print('{version}')")
+            _git(origin, "commit", "-am", version)
+            commit_shas.append(_git(origin, "rev-parse", "HEAD"))
+
+        first = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_shas[0])
+        second = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_shas[1])
+        # Clones still held by a job are never evicted
+        assert first.repo_path.exists()
+
+        await cache.release(first)
+        await cache.release(second)
+        third = await cache.acquire(TENANT_ID, REPO_URL, MagicMock(), commit_shas[2])
+
+        assert not first.repo_path.exists()
+        assert not second.repo_path.exists()
+        assert third.repo_path.exists()
+
+        await cache.release(third)
+
+    async def test_tenants_do_not_share_clones(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"))
+        commit_sha = _git(origin, "rev-parse", "HEAD")
+
+        first = await cache.acquire("tenant_a", REPO_URL, MagicMock(), commit_sha)
+        second = await cache.acquire("tenant_b", REPO_URL, MagicMock(), commit_sha)
+
+        # Each tenant clones with its own installation, which checks its access to the repo
+        assert not second.cache_hit
+        assert first.repo_path != second.repo_path
+        assert mock_clone.call_count == 2
+
+        await cache.release(first)
+        await cache.release(second)
+
+    async def test_credentials_are_passed_per_command(self, tmp_path, origin, mock_clone):
+        cache = RepoCloneCache(cache_dir=str(tmp_path / "cache"))
+        commit_sha = _git(origin, "rev-parse", "HEAD")
+        github_client = MagicMock(_token="ghs_secret")
+        github_client.is_app_authenticated.return_value = True
+
+        await cache.release(await cache.acquire(TENANT_ID, REPO_URL, github_client, commit_sha))
+        lease = await cache.acquire(TENANT_ID, REPO_URL, github_client, commit_sha)
+
+        # Reusing a clone leaves its config untouched, with no token in it
+        assert "ghs_secret" not in (lease.repo_path / ".git" / "config").read_text()
+        assert lease.git_env["GIT_CONFIG_KEY_0"] == "http.https://github.com/.extraHeader"
+        assert lease.git_env["GIT_CONFIG_VALUE_0"] == (
+            f"Authorization: Basic {base64.b64encode(b'x-access-token:ghs_secret').decode()}"
+        )
+
+        await cache.release(lease)
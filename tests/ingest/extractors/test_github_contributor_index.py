@@ -0,0 +1,91 @@
+"""Tests for the single-pass GitHub contributor index."""
+
+import subprocess
+from pathlib import Path
+
+from connectors.github.github_contributor_index import (
+    ContributorIndexCache,
+    build_contributor_index,
+)
+
+
+def _git(repo_path: Path, *args: str, author: str | None = None) -> None:
+    env_args = []
+    if author:
+        name, email = author.split(":")
+        env_args = ["-c", f"user.name={name}", "-c", f"user.email={email}"]
+    subprocess.run(["git", *env_args, *args], cwd=repo_path, check=True, capture_output=True)
+
+
+def _create_repo(tmp_path: Path) -> Path:
+    repo_path = tmp_path / "repo"
+    repo_path.mkdir()
+    _git(repo_path, "init")
+
+    (repo_path / "a.txt").write_text("one")
+    (repo_path / "docs").mkdir()
+    (repo_path / "docs" / "guide.md").write_text("guide")
+    _git(repo_path, "add", ".")
+    _git(repo_path, "commit", "-m", "initial", author="Alice:alice@example.com")
+
+    (repo_path / "a.txt").write_text("two")
+    _git(repo_path, "commit", "-am", "edit a", author="Bob|Builder:bob@example.com")
+
+    (repo_path / "a.txt").write_text("three")
+    _git(repo_path, "commit", "-am", "edit a again", author="Alice:alice@example.com")
+    return repo_path
+
+
+def _per_file_git_log(repo_path: Path, path: str) -> list[str]:
+    result = subprocess.run(
+        ["git", "log", "--format=%aE", "--", path],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+class TestBuildContributorIndex:
+    """Test that one history walk matches per-file git log."""
+
+    async def test_matches_per_file_git_log(self, tmp_path):
+        repo_path = _create_repo(tmp_path)
+
+        index = await build_contributor_index(repo_path)
+
+        assert index.commits_walked == 3
+        for path in ["a.txt", "docs/guide.md"]:
+            emails = _per_file_git_log(repo_path, path)
+            contributors = index.get_contributors(path)
+            assert sum(c.commit_count for c in contributors) == len(emails)
+            assert [c.email for c in contributors] == list(dict.fromkeys(emails))
+
+    async def test_contributor_details(self, tmp_path):
+        repo_path = _create_repo(tmp_path)
+
+        index = await build_contributor_index(repo_path)
+        contributors = {c.email: c for c in index.get_contributors("a.txt")}
+
+        assert contributors["alice@example.com"].commit_count == 2
+        # Author names containing "|" are parsed correctly
+        assert contributors["bob@example.com"].name == "Bob|Builder"
+        assert contributors["bob@example.com"].last_contribution_at
+        assert index.get_contributors("missing.txt") == []
+
+
+class TestContributorIndexCache:
+    """Test reuse of indexes across batches for the same commit."""
+
+    async def test_reuses_index_for_same_repo_and_commit(self, tmp_path):
+        repo_path = _create_repo(tmp_path)
+        cache = ContributorIndexCache(max_size=1)
+
+        first = await cache.get_index("org/repo", "sha1", repo_path)
+        second = await cache.get_index("org/repo", "sha1", repo_path)
+        other = await cache.get_index("org/repo", "sha2", repo_path)
+
+        assert first is second
+        assert other is not first
+        assert list(cache._indexes) == [("org/repo", "sha2")]
@@ -9,7 +9,9 @@ from uuid import uuid4
 import pytest
 
 from connectors.github import GitHubFileBackfillExtractor
+from connectors.github.github_clone_cache import RepoCloneCache
 from connectors.github.github_models import GitHubFileBatch
+from connectors.github.github_repo_utils import CloneResult
 from src.clients.ssm import SSMClient
 
 
@@ -113,20 +115,29 @@ class TestGitHubFileBackfillNullBytes:
             file_paths=["normal.txt", "binary.txt", "README.md"],
         )
 
-        # Mock clone_repository to return our test repo
+        async def clone_test_repo(repo_url, github_client, temp_dir):
+            clone_path = Path(temp_dir) / "test-repo"
+            subprocess.run(
+                ["git", "clone", "--no-checkout", str(repo_path), str(clone_path)],
+                check=True,
+                capture_output=True,
+            )
+            return CloneResult(repo_path=clone_path, commit_sha=commit_sha, branch="main")
+
+        # Clone our test repo into an isolated clone cache
         with (
             patch(
-                "connectors.github.github_file_backfill_extractor.clone_repository"
-            ) as mock_clone,
+                "connectors.github.github_clone_cache.clone_repository",
+                AsyncMock(side_effect=clone_test_repo),
+            ),
+            patch(
+                "connectors.github.github_file_backfill_extractor.get_repo_clone_cache",
+                return_value=RepoCloneCache(cache_dir=str(tmp_path / "clone_cache")),
+            ),
             patch(
                 "connectors.github.github_file_backfill_extractor.get_github_client_for_tenant"
             ) as mock_get_client,
         ):
-            from connectors.github.github_repo_utils import CloneResult
-
-            mock_clone.return_value = CloneResult(
-                repo_path=repo_path, commit_sha=commit_sha, branch="main"
-            )
             mock_get_client.return_value = mock_github_client
 
             # Create temporary directory for the extractor
@@ -136,6 +147,7 @@ class TestGitHubFileBackfillNullBytes:
                 # Process the batch
                 entity_ids = await extractor._process_file_batch(
                     job_id=str(uuid4()),
+                    tenant_id="tenant123",
                     github_client=mock_github_client,
                     file_batch=file_batch,
                     db_pool=mock_db_pool,
@@ -27,6 +27,7 @@ def create_mock_opensearch_client():
     """Create a mock OpenSearch client."""
     client = MagicMock()
     client.delete_document = AsyncMock()
+    client.bulk = AsyncMock(return_value={"errors": False, "items": []})
     return client
 
 
@@ -47,6 +48,7 @@ def create_mock_turbopuffer_client():
     """Create a mock Turbopuffer client."""
     client = MagicMock()
     client.delete_chunks = AsyncMock()
+    client.delete_chunks_for_documents = AsyncMock()
     return client
 
 
@@ -340,8 +340,14 @@ class TestSlackPruner:
             conn, reference_id="slack_channel_ref_123", referenced_docs={}
         )
 
-        with patch("connectors.base.doc_ids.get_slack_channel_doc_ids") as mock_get_docs:
+        with (
+            patch("connectors.base.doc_ids.get_slack_channel_doc_ids") as mock_get_docs,
+            patch.object(
+                SlackPruner, "delete_documents", new_callable=AsyncMock
+            ) as mock_delete_docs,
+        ):
             mock_get_docs.return_value = ["C123456789_2024-01-15", "C123456789_2024-01-16"]
+            mock_delete_docs.return_value = 2
 
             pruner = SlackPruner()
             result = await pruner.delete_channel(
@@ -352,6 +358,11 @@ class TestSlackPruner:
 
         assert result is True
 
+        # Verify the channel's documents were deleted in one bulk call
+        mock_delete_docs.assert_called_once_with(
+            ["C123456789_2024-01-15", "C123456789_2024-01-16"], "tenant-slack", pool
+        )
+
         # Verify channel artifacts were deleted
         conn.execute.assert_any_call(
             "DELETE FROM ingest_artifact WHERE entity = $1 AND entity_id = $2",
@@ -452,9 +463,11 @@ class TestSlackPruner:
         with patch("connectors.base.doc_ids.get_slack_channel_doc_ids") as mock_get_docs:
             mock_get_docs.return_value = ["C123456789_2024-01-15", "C123456789_2024-01-16"]
 
-            with patch.object(SlackPruner, "delete_document") as mock_delete_doc:
-                # First document deletion succeeds, second fails
-                mock_delete_doc.side_effect = [True, False]
+            with patch.object(
+                SlackPruner, "delete_documents", new_callable=AsyncMock
+            ) as mock_delete_docs:
+                # Only one of the two documents is deleted
+                mock_delete_docs.return_value = 1
 
                 pruner = SlackPruner()
                 result = await pruner.delete_channel(
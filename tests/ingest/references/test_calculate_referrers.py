@@ -2,7 +2,13 @@
 Tests for calculate_referrers functionality.
 """
 
-from src.ingest.references.calculate_referrers import calculate_referrer_score
+from unittest.mock import AsyncMock
+
+from src.ingest.references.calculate_referrers import (
+    calculate_referrer_score,
+    calculate_referrers_batch,
+)
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
 
 
 class TestCalculateReferrerScore:
@@ -37,3 +43,44 @@ class TestCalculateReferrerScore:
         }
         result = calculate_referrer_score(referrers)
         assert result == 0
+
+
+class TestCalculateReferrersBatch:
+    """Test suite for calculate_referrers_batch function."""
+
+    async def test_empty_reference_ids_skips_query(self):
+        """No reference_ids means no database round trip."""
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock()
+
+        result = await calculate_referrers_batch([], pool)
+
+        assert result == {}
+        conn.fetch.assert_not_called()
+
+    async def test_groups_referrers_by_reference_id(self):
+        """Referring rows are attributed to every requested reference_id they mention."""
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {
+                    "reference_id": "r_linear_issue_eng-1",
+                    "referenced_docs": {"r_github_pr_org_repo_1": 2, "r_other": 5},
+                },
+                {
+                    "reference_id": "r_notion_page_abc",
+                    "referenced_docs": {"r_github_pr_org_repo_1": 1, "r_github_pr_org_repo_2": 3},
+                },
+            ]
+        )
+
+        result = await calculate_referrers_batch(
+            ["r_github_pr_org_repo_1", "r_github_pr_org_repo_2", "r_unreferenced"], pool
+        )
+
+        assert conn.fetch.await_count == 1
+        assert result == {
+            "r_github_pr_org_repo_1": {"r_linear_issue_eng-1": 2, "r_notion_page_abc": 1},
+            "r_github_pr_org_repo_2": {"r_notion_page_abc": 3},
+            "r_unreferenced": {},
+        }
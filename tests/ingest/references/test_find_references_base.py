@@ -2,7 +2,9 @@
 Base tests and shared utilities for document reference finding functionality.
 """
 
-from src.ingest.references.find_references import find_references_in_doc
+import pytest
+
+from src.ingest.references.find_references import DOC_REFERENCE_PATTERNS, find_references_in_doc
 
 
 class TestFindReferencesInDocBase:
@@ -50,3 +52,33 @@ class TestFindReferencesInDocBase:
         # Should not crash, may pick up some IDs but no major errors
         # The main goal is no crash, not necessarily empty result
         assert isinstance(result, dict)
+
+
+class TestReferencePatternPrefilters:
+    """Test that prefiltered patterns find exactly what a full regex scan finds."""
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "ENG-123 AB-1 ABCDE-12 /ENG-4 ENG-5/ 2024-01-15 XY-1-2",
+            "a/b/c#7 org/repo#45 x.y-z/r_e.po#8a #12 /repo#3 owner/#4 a/b#1/c#2",
+            "12345678-ABCD-1234-abcd-123456789012 -abcd-12345678-1234-1234-1234-123456789abc",
+            "0123456789abcdef0123456789ABCDEF 0123456789abcdef0123456789abcdef0 g0123456789abcdef",
+            "Contributors: 11111111-2222-3333-4444-555555555555\nhttps://notion.so/Page-"
+            "0123456789abcdef0123456789abcdef",
+            "https://linear.app/t/issue/ENG-9/slug,https://github.com/o/r/pull/3",
+        ],
+    )
+    def test_same_matches_as_full_scan(self, content: str):
+        for pattern in DOC_REFERENCE_PATTERNS:
+            expected = [match.span() for match in pattern.regex.finditer(content)]
+            assert [match.span() for match in pattern.finditer(content)] == expected
+
+    def test_overlapping_matches_count_for_each_pattern(self):
+        """An issue-key-like group inside a UUID still counts as both."""
+        content = "See 12345678-ABCD-1234-abcd-123456789012"
+        result = find_references_in_doc(content, "test_doc")
+        assert result == {
+            "r_notion_page_12345678-abcd-1234-abcd-123456789012": 1,
+            "r_linear_issue_abcd-1234": 1,
+        }
@@ -2,7 +2,12 @@
 Tests for update_referrers functionality.
 """
 
-from src.ingest.references.update_referrers import compute_referenced_docs_diff
+from unittest.mock import AsyncMock, MagicMock
+
+from src.ingest.references.update_referrers import (
+    compute_referenced_docs_diff,
+    prepare_referrer_updates_for_bulk_deletion,
+)
 
 
 class TestComputeReferencedDocsDiff:
@@ -96,3 +101,40 @@ class TestComputeReferencedDocsDiff:
 
         result = compute_referenced_docs_diff(old_refs, new_refs)
         assert result == {"added_or_changed": {"r_linear_issue_eng-456": 0}, "removed": {}}
+
+
+class TestPrepareReferrerUpdatesForBulkDeletion:
+    """Test suite for `prepare_referrer_updates_for_bulk_deletion` function."""
+
+    async def test_removes_all_deleted_referrers_in_one_update(self):
+        """Test that each affected document gets one update without any deleted referrer."""
+        conn = MagicMock()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {"reference_id": "r_x", "referrers": {"r_a": 1, "r_b": 2, "r_c": 1}, "id": "doc_x"},
+                # Referenced by a deleted document, but being deleted itself
+                {"reference_id": "r_b", "referrers": {"r_a": 1}, "id": "doc_b"},
+            ]
+        )
+
+        updates = await prepare_referrer_updates_for_bulk_deletion(
+            {"r_a": {"r_x": 1, "r_b": 1}, "r_b": {"r_x": 2}},
+            {"doc_a", "doc_b"},
+            conn,
+        )
+
+        assert conn.fetch.call_count == 1
+        assert set(conn.fetch.call_args.args[1]) == {"r_x", "r_b"}
+        assert len(updates) == 1
+        assert updates[0].document_id == "doc_x"
+        assert updates[0].referrers == {"r_c": 1}
+
+    async def test_no_references_skips_query(self):
+        """Test that deleting documents without references doesn't query referrers."""
+        conn = MagicMock()
+        conn.fetch = AsyncMock()
+
+        updates = await prepare_referrer_updates_for_bulk_deletion({"r_a": {}}, {"doc_a"}, conn)
+
+        assert updates == []
+        conn.fetch.assert_not_called()
@@ -0,0 +1,78 @@
+"""Tests for the COPY-based bulk upsert path in ArtifactRepository."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from connectors.base.base_ingest_artifact import ArtifactEntity, BaseIngestArtifact
+from src.ingest.repositories.artifact_repository import ArtifactRepository
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
+
+
+def _make_artifact(entity_id: str, updated_day: int, text: str) -> BaseIngestArtifact:
+    return BaseIngestArtifact(
+        entity=ArtifactEntity.SLACK_MESSAGE,
+        entity_id=entity_id,
+        ingest_job_id=uuid4(),
+        content={"text": text},
+        metadata={},
+        source_updated_at=datetime(2025, 1, updated_day, tzinfo=UTC),
+    )
+
+
+class TestUpsertArtifactsBatchBulkCopy:
+    """Test that large batches are COPYed into a staging table and merged once."""
+
+    async def test_small_batch_uses_executemany(self):
+        pool, conn = create_mock_db_pool()
+        conn.executemany = AsyncMock()
+        conn.copy_records_to_table = AsyncMock()
+
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "10"}):
+            await ArtifactRepository(pool).upsert_artifacts_batch([_make_artifact("m1", 1, "a")])
+
+        conn.executemany.assert_awaited_once()
+        conn.copy_records_to_table.assert_not_called()
+
+    async def test_large_batch_copies_and_merges_with_newer_wins_guard(self):
+        pool, conn = create_mock_db_pool()
+        conn.execute = AsyncMock()
+        conn.executemany = AsyncMock()
+        conn.copy_records_to_table = AsyncMock()
+
+        artifacts = [
+            _make_artifact("m1", 1, "old"),
+            _make_artifact("m2", 1, "only"),
+            _make_artifact("m1", 3, "newest"),
+            _make_artifact("m1", 2, "stale"),
+        ]
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "2"}):
+            await ArtifactRepository(pool).upsert_artifacts_batch(artifacts)
+
+        conn.executemany.assert_not_called()
+
+        copied = conn.copy_records_to_table.await_args.kwargs["records"]
+        contents = sorted(record[5] for record in copied)
+        assert contents == ['{"text": "newest"}', '{"text": "only"}']
+
+        merge_sql = conn.execute.await_args_list[-1].args[0]
+        assert "FROM ingest_artifact_staging" in merge_sql
+        assert "WHERE ingest_artifact.source_updated_at < EXCLUDED.source_updated_at" in merge_sql
+
+    async def test_forced_large_batch_sets_backfill_id_without_guard(self):
+        pool, conn = create_mock_db_pool()
+        conn.execute = AsyncMock()
+        conn.copy_records_to_table = AsyncMock()
+
+        artifacts = [_make_artifact("m1", 2, "a"), _make_artifact("m2", 1, "b")]
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "2"}):
+            await ArtifactRepository(pool).force_upsert_artifacts_batch(
+                artifacts, backfill_id="backfill-1"
+            )
+
+        copied = conn.copy_records_to_table.await_args.kwargs["records"]
+        assert {record[7] for record in copied} == {"backfill-1"}
+
+        merge_sql = conn.execute.await_args_list[-1].args[0]
+        assert "last_seen_backfill_id = EXCLUDED.last_seen_backfill_id" in merge_sql
+        assert "source_updated_at <" not in merge_sql
@@ -0,0 +1,129 @@
+"""Tests for the bulk document deletion path in deletion_service."""
+
+from unittest.mock import AsyncMock, patch
+
+from src.ingest.references.update_referrers import ReferrerUpdate
+from src.ingest.services.deletion_service import delete_documents_and_chunks
+from tests.ingest.pruners.mock_utils import (
+    create_mock_db_pool,
+    create_mock_opensearch_client,
+    create_mock_turbopuffer_client,
+)
+
+
+class TestDeleteDocumentsAndChunks:
+    """Test that a batch of documents is deleted with set-based operations on every store."""
+
+    async def test_deletes_batch_with_one_operation_per_store(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(
+            return_value=[
+                {"id": "doc_a", "reference_id": "ref_a", "referenced_docs": {"ref_x": 1}},
+                {"id": "doc_b", "reference_id": "ref_b", "referenced_docs": {"ref_a": 2}},
+            ]
+        )
+        conn.execute = AsyncMock()
+        opensearch_client = create_mock_opensearch_client()
+        turbopuffer_client = create_mock_turbopuffer_client()
+        referrer_update = ReferrerUpdate(reference_id="ref_x", referrers={}, document_id="doc_x")
+
+        with (
+            patch(
+                "src.ingest.services.deletion_service.get_turbopuffer_client",
+                return_value=turbopuffer_client,
+            ),
+            patch(
+                "src.ingest.services.deletion_service.prepare_referrer_updates_for_bulk_deletion",
+                AsyncMock(return_value=[referrer_update]),
+            ) as mock_prepare,
+            patch(
+                "src.ingest.services.deletion_service.apply_referrer_updates_to_db"
+            ) as mock_apply_db,
+        ):
+            deleted_count = await delete_documents_and_chunks(
+                ["doc_a", "doc_b", "doc_c", "doc_a"], "tenant123", opensearch_client, pool
+            )
+
+        assert deleted_count == 3
+        document_ids = ["doc_a", "doc_b", "doc_c"]
+
+        # One lookup of the deleted documents' references, then set-based deletes
+        assert conn.fetch.call_count == 1
+        assert conn.fetch.call_args.args[1] == document_ids
+        mock_prepare.assert_called_once_with(
+            {"ref_a": {"ref_x": 1}, "ref_b": {"ref_a": 2}}, set(document_ids), conn
+        )
+        mock_apply_db.assert_called_once_with([referrer_update], conn)
+        conn.execute.assert_any_call(
+            "DELETE FROM document_permissions WHERE document_id = ANY($1)", document_ids
+        )
+        conn.execute.assert_any_call("DELETE FROM documents WHERE id = ANY($1)", document_ids)
+
+        # One OpenSearch _bulk with the deletes and the referrer update
+        opensearch_client.bulk.assert_called_once()
+        body = opensearch_client.bulk.call_args.kwargs["body"]
+        assert body == [
+            {"delete": {"_index": "tenant-tenant123", "_id": "doc_a"}},
+            {"delete": {"_index": "tenant-tenant123", "_id": "doc_b"}},
+            {"delete": {"_index": "tenant-tenant123", "_id": "doc_c"}},
+            {"update": {"_index": "tenant-tenant123", "_id": "doc_x"}},
+            {"doc": {"referrer_score": referrer_update.referrer_score}},
+        ]
+        opensearch_client.delete_document.assert_not_called()
+
+        # One Turbopuffer delete for every document's chunks
+        turbopuffer_client.delete_chunks_for_documents.assert_called_once_with(
+            "tenant123", document_ids
+        )
+        turbopuffer_client.delete_chunks.assert_not_called()
+
+    async def test_opensearch_failures_are_not_counted(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(return_value=[])
+        conn.execute = AsyncMock()
+        opensearch_client = create_mock_opensearch_client()
+        opensearch_client.bulk = AsyncMock(
+            return_value={
+                "errors": True,
+                "items": [
+                    {"delete": {"_id": "doc_a", "status": 200}},
+                    {"delete": {"_id": "doc_b", "status": 404, "error": "not_found"}},
+                    {"delete": {"_id": "doc_c", "status": 500, "error": "boom"}},
+                ],
+            }
+        )
+
+        with patch(
+            "src.ingest.services.deletion_service.get_turbopuffer_client",
+            return_value=create_mock_turbopuffer_client(),
+        ):
+            deleted_count = await delete_documents_and_chunks(
+                ["doc_a", "doc_b", "doc_c"], "tenant123", opensearch_client, pool
+            )
+
+        assert deleted_count == 2
+
+    async def test_failed_batch_does_not_stop_later_batches(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(side_effect=[Exception("db down"), []])
+        conn.execute = AsyncMock()
+        turbopuffer_client = create_mock_turbopuffer_client()
+
+        with (
+            patch("src.ingest.services.deletion_service.DOCUMENT_DELETION_BATCH_SIZE", 2),
+            patch(
+                "src.ingest.services.deletion_service.get_turbopuffer_client",
+                return_value=turbopuffer_client,
+            ),
+        ):
+            deleted_count = await delete_documents_and_chunks(
+                ["doc_a", "doc_b", "doc_c"],
+                "tenant123",
+                create_mock_opensearch_client(),
+                pool,
+            )
+
+        assert deleted_count == 1
+        turbopuffer_client.delete_chunks_for_documents.assert_called_once_with(
+            "tenant123", ["doc_c"]
+        )
@@ -0,0 +1,99 @@
+"""Tests for the COPY-based bulk upsert path in batch_postgres_write."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from connectors.google_drive.google_drive_file_document import GoogleDriveFileDocument
+from src.ingest.utils import PreparedDocumentData, batch_postgres_write
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
+
+
+def _prepared(doc_id: str, text: str, updated_day: int) -> PreparedDocumentData:
+    document = GoogleDriveFileDocument(
+        id=doc_id,
+        source_updated_at=datetime(2025, 1, updated_day, tzinfo=UTC),
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={"processed_content": text},
+        metadata={
+            "file_id": doc_id,
+            "file_name": f"{doc_id}.txt",
+            "source_created_at": "2025-01-01T00:00:00+00:00",
+            "source_modified_at": "2025-01-02T00:00:00+00:00",
+        },
+    )
+    return PreparedDocumentData(
+        document=document,
+        chunks=[],
+        content_hash=document.get_content_hash(),
+        references={},
+        referrers={},
+        referrer_updates=[],
+        referrer_score=0.0,
+    )
+
+
+@pytest.fixture
+def db():
+    pool, conn = create_mock_db_pool()
+    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
+    conn.copy_records_to_table = AsyncMock()
+    with patch(
+        "src.ingest.utils.PermissionsService.batch_upsert_document_permissions", AsyncMock()
+    ):
+        yield pool, conn
+
+
+class TestBatchPostgresWriteBulkCopy:
+    """Test that large document batches are COPYed into a staging table and merged once."""
+
+    async def test_small_batch_uses_executemany(self, db):
+        pool, conn = db
+
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "10"}):
+            await batch_postgres_write([_prepared("doc_1", "a", 1)], pool)
+
+        conn.executemany.assert_awaited_once()
+        conn.copy_records_to_table.assert_not_called()
+
+    async def test_large_batch_keeps_last_record_per_document(self, db):
+        pool, conn = db
+        prepared_docs = [
+            _prepared("doc_1", "first", 3),
+            _prepared("doc_2", "only", 1),
+            _prepared("doc_1", "last", 2),
+        ]
+
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "2"}):
+            await batch_postgres_write(prepared_docs, pool, backfill_id="backfill-1")
+
+        conn.executemany.assert_not_called()
+
+        # A single INSERT can't touch a row twice; the last record wins, as with executemany
+        copied = conn.copy_records_to_table.await_args.kwargs["records"]
+        assert sorted((record[0], record[1]) for record in copied) == [
+            ("doc_1", "last"),
+            ("doc_2", "only"),
+        ]
+        assert {record[11] for record in copied} == {"backfill-1"}
+
+    async def test_merge_matches_executemany_conflict_handling(self, db):
+        pool, conn = db
+
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "10"}):
+            await batch_postgres_write([_prepared("doc_1", "a", 1)], pool)
+        executemany_sql = conn.executemany.await_args.args[0]
+
+        with patch.dict("os.environ", {"POSTGRES_BULK_COPY_MIN_ROWS": "1"}):
+            await batch_postgres_write([_prepared("doc_1", "a", 1)], pool)
+        merge_sql = conn.execute.await_args_list[-1].args[0]
+
+        assert "FROM documents_staging" in merge_sql
+        conflict_clause = executemany_sql[executemany_sql.index("ON CONFLICT") :]
+        assert conflict_clause in merge_sql
+        # Re-indexing (including force_reprocess) always overwrites, so there is no
+        # source_updated_at guard, unlike the ingest_artifact merge
+        assert "source_updated_at <" not in merge_sql
@@ -7,13 +7,18 @@ all chunks from scratch.
 """
 
 import uuid
-from unittest.mock import MagicMock
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from connectors.base import BaseChunk, assign_chunk_keys
+from connectors.google_drive.google_drive_file_document import GoogleDriveFileDocument
+from connectors.notion.notion_page_document import NotionPageDocument
 from connectors.slack.slack_channel_document import (
     SlackChannelChunk,
     SlackChannelDocument,
 )
-from src.ingest.utils import compute_chunk_diff
+from src.ingest.utils import compute_chunk_diff, prepare_documents_batch
 
 
 class TestDeterministicChunkIds:
@@ -463,3 +468,143 @@ class TestSlackDocumentChunkGeneration:
         assert len(set(deterministic_ids)) == len(deterministic_ids), (
             "All deterministic IDs should be unique"
         )
+
+
+def _make_drive_document(paragraphs: list[str], modified_at: str) -> GoogleDriveFileDocument:
+    return GoogleDriveFileDocument(
+        id="drive_file_1",
+        source_updated_at=datetime.now(UTC),
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={"processed_content": "\n\n".join(paragraphs)},
+        metadata={
+            "file_id": "file_1",
+            "file_name": "Design doc",
+            "source_created_at": "2025-01-01T00:00:00+00:00",
+            "source_modified_at": modified_at,
+        },
+    )
+
+
+def _indexed_chunk_hashes(chunks: Sequence[BaseChunk]) -> dict[str, str]:
+    """What Turbopuffer holds for a document after indexing these chunks."""
+    assign_chunk_keys(chunks)
+    return {str(chunk.get_deterministic_id()): chunk.get_content_hash() for chunk in chunks}
+
+
+class TestChunkKeysForAllConnectors:
+    """Test that documents without source anchors still get stable chunk IDs."""
+
+    def test_assign_chunk_keys_falls_back_to_content_and_dedupes(self):
+        document = _make_drive_document(["same text"], "2025-01-02T00:00:00+00:00")
+        chunks = [document.to_embedding_chunks()[0] for _ in range(2)]
+
+        assign_chunk_keys(chunks)
+
+        keys = [chunk.get_chunk_key() for chunk in chunks]
+        assert keys[0] is not None and keys[0].startswith("content:")
+        assert keys[1] == f"{keys[0]}#1"
+        assert chunks[0].get_deterministic_id() != chunks[1].get_deterministic_id()
+
+    def test_notion_sections_are_anchored_to_blocks(self):
+        def notion_page(first_block_text: str) -> NotionPageDocument:
+            return NotionPageDocument(
+                id="notion_page_1",
+                source_updated_at=datetime.now(UTC),
+                permission_policy="tenant",
+                permission_allowed_tokens=None,
+                raw_data={
+                    "page_id": "page_1",
+                    "page_title": "Roadmap",
+                    "blocks": [
+                        {"block_id": "b1", "block_type": "heading_1", "content": "Goals"},
+                        {"block_id": "b2", "block_type": "paragraph", "content": first_block_text},
+                        {"block_id": "b3", "block_type": "heading_1", "content": "Risks"},
+                        {"block_id": "b4", "block_type": "paragraph", "content": "Hiring"},
+                    ],
+                },
+            )
+
+        existing = _indexed_chunk_hashes(notion_page("Ship search").to_embedding_chunks())
+        diff = compute_chunk_diff(notion_page("Ship search v2").to_embedding_chunks(), existing)
+
+        # The edited section keeps its ID and is updated in place
+        assert len(diff.changed_chunks) == 1
+        assert len(diff.new_chunks) == 0
+        assert len(diff.deleted_chunk_ids) == 0
+
+
+class TestIncrementalIndexingLargeDocument:
+    """Test that editing one section of a large Drive document only re-embeds that section."""
+
+    async def test_editing_one_paragraph_embeds_one_chunk(self):
+        paragraphs = [
+            f"Paragraph {i:04d}. " + "lorem ipsum dolor sit amet " * 20 for i in range(400)
+        ]
+        original = _make_drive_document(paragraphs, "2025-01-02T00:00:00+00:00")
+        original_chunks = original.to_embedding_chunks()
+        assert len(original_chunks) > 20
+        existing_hashes = _indexed_chunk_hashes(original_chunks)
+
+        # Same-length edit to one paragraph; the file's modified time changes too
+        edited_paragraphs = list(paragraphs)
+        edited_paragraphs[200] = edited_paragraphs[200].replace("lorem", "LOREM", 1)
+        edited = _make_drive_document(edited_paragraphs, "2025-01-03T00:00:00+00:00")
+
+        turbopuffer_client = MagicMock()
+        turbopuffer_client.get_existing_chunk_hashes_bulk = AsyncMock(
+            return_value={edited.id: existing_hashes}
+        )
+        with (
+            patch("src.ingest.utils.get_turbopuffer_client", return_value=turbopuffer_client),
+            patch("src.ingest.utils.fetch_existing_document_states", AsyncMock(return_value={})),
+            patch("src.ingest.utils.calculate_referrers_batch", AsyncMock(return_value={})),
+            patch("src.ingest.utils.prepare_referrer_updates", AsyncMock(return_value=[])),
+        ):
+            prepared_docs, chunks_to_embed, _ = await prepare_documents_batch(
+                [edited], MagicMock(), "tenant123"
+            )
+
+        assert len(chunks_to_embed) == 1
+        assert "Paragraph 0200. LOREM" in chunks_to_embed[0].get_content()
+        chunk_diff = prepared_docs[0].chunk_diff
+        assert chunk_diff is not None
+        assert len(chunk_diff.unchanged_chunk_ids) == len(original_chunks) - 1
+        assert len(chunk_diff.deleted_chunk_ids) == 1
+
+    async def test_inserting_a_paragraph_keeps_the_other_chunks(self):
+        paragraphs = [
+            f"Paragraph {i:04d}. " + "lorem ipsum dolor sit amet " * 20 for i in range(400)
+        ]
+        original = _make_drive_document(paragraphs, "2025-01-02T00:00:00+00:00")
+        original_chunks = original.to_embedding_chunks()
+        existing_hashes = _indexed_chunk_hashes(original_chunks)
+
+        # Inserting a paragraph adds a chunk, so every chunk's "[Part i of N]" changes
+        inserted = "Inserted paragraph. " + "new words here " * 300
+        edited = _make_drive_document(
+            [*paragraphs[:390], inserted, *paragraphs[390:]], "2025-01-03T00:00:00+00:00"
+        )
+        edited_chunks = edited.to_embedding_chunks()
+        assert len(edited_chunks) == len(original_chunks) + 1
+
+        turbopuffer_client = MagicMock()
+        turbopuffer_client.get_existing_chunk_hashes_bulk = AsyncMock(
+            return_value={edited.id: existing_hashes}
+        )
+        with (
+            patch("src.ingest.utils.get_turbopuffer_client", return_value=turbopuffer_client),
+            patch("src.ingest.utils.fetch_existing_document_states", AsyncMock(return_value={})),
+            patch("src.ingest.utils.calculate_referrers_batch", AsyncMock(return_value={})),
+            patch("src.ingest.utils.prepare_referrer_updates", AsyncMock(return_value=[])),
+        ):
+            prepared_docs, chunks_to_embed, _ = await prepare_documents_batch(
+                [edited], MagicMock(), "tenant123"
+            )
+
+        # Only the chunks around the new paragraph are embedded
+        assert len(chunks_to_embed) == 2
+        assert any("Inserted paragraph." in chunk.get_content() for chunk in chunks_to_embed)
+        chunk_diff = prepared_docs[0].chunk_diff
+        assert chunk_diff is not None
+        assert len(chunk_diff.unchanged_chunk_ids) == len(original_chunks) - 1
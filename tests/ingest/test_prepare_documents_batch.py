@@ -0,0 +1,140 @@
+"""Tests for the set-based pre-index lookups in prepare_documents_batch."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from connectors.google_drive.google_drive_file_document import GoogleDriveFileDocument
+from src.ingest.utils import prepare_documents_batch
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
+
+
+def _make_document(doc_id: str, text: str) -> GoogleDriveFileDocument:
+    return GoogleDriveFileDocument(
+        id=doc_id,
+        source_updated_at=datetime.now(UTC),
+        permission_policy="tenant",
+        permission_allowed_tokens=None,
+        raw_data={"processed_content": text},
+        metadata={
+            "file_id": doc_id,
+            "file_name": f"{doc_id}.txt",
+            "source_created_at": "2025-01-01T00:00:00+00:00",
+            "source_modified_at": "2025-01-02T00:00:00+00:00",
+        },
+    )
+
+
+@pytest.fixture
+def documents() -> list[GoogleDriveFileDocument]:
+    return [_make_document("doc_a", "Alpha design notes"), _make_document("doc_b", "Beta plan")]
+
+
+@pytest.fixture
+def turbopuffer_client():
+    client = MagicMock()
+    client.get_existing_chunk_hashes_bulk = AsyncMock(return_value={})
+    with patch("src.ingest.utils.get_turbopuffer_client", return_value=client):
+        yield client
+
+
+def _mock_pool(existing_rows: list[dict], referrer_rows: list[dict]):
+    """A pool answering the existing-state and referrers queries by their SQL."""
+    pool, conn = create_mock_db_pool()
+
+    async def fetch(query, *args):
+        if "content_hash, referenced_docs FROM documents" in query:
+            return [row for row in existing_rows if row["id"] in args[0]]
+        if "referenced_docs ?| $1" in query:
+            return referrer_rows
+        raise AssertionError(f"Unexpected query: {query}")
+
+    conn.fetch = AsyncMock(side_effect=fetch)
+    return pool, conn
+
+
+class TestPrepareDocumentsBatch:
+    """Test skipping, forcing and the batched round trips."""
+
+    async def test_unchanged_documents_are_skipped(self, documents, turbopuffer_client):
+        existing_rows = [
+            {"id": doc.id, "content_hash": doc.get_content_hash(), "referenced_docs": {}}
+            for doc in documents
+        ]
+        pool, conn = _mock_pool(existing_rows, [])
+
+        with patch("src.ingest.utils.prepare_referrer_updates", AsyncMock(return_value=[])):
+            prepared, chunks, embedding_data = await prepare_documents_batch(
+                documents, pool, "tenant123"
+            )
+
+        assert prepared == []
+        assert chunks == []
+        assert embedding_data == []
+        # Only the existing-state lookup runs when nothing needs indexing
+        conn.fetch.assert_awaited_once()
+        turbopuffer_client.get_existing_chunk_hashes_bulk.assert_not_called()
+
+    async def test_force_reprocess_indexes_unchanged_documents(self, documents, turbopuffer_client):
+        existing_rows = [
+            {"id": doc.id, "content_hash": doc.get_content_hash(), "referenced_docs": {}}
+            for doc in documents
+        ]
+        pool, _ = _mock_pool(existing_rows, [])
+
+        with patch("src.ingest.utils.prepare_referrer_updates", AsyncMock(return_value=[])):
+            prepared, chunks, _ = await prepare_documents_batch(
+                documents, pool, "tenant123", force_reprocess=True
+            )
+
+        assert [doc_data.document.id for doc_data in prepared] == ["doc_a", "doc_b"]
+        assert all(doc_data.chunk_diff is None for doc_data in prepared)
+        assert len(chunks) == sum(len(doc_data.chunks) for doc_data in prepared)
+        # Forced documents are fully re-embedded, so no chunk hashes are looked up
+        turbopuffer_client.get_existing_chunk_hashes_bulk.assert_awaited_once_with("tenant123", [])
+
+    async def test_one_round_trip_per_lookup_for_the_whole_batch(
+        self, documents, turbopuffer_client
+    ):
+        doc_a, doc_b = documents
+        existing_rows = [
+            {"id": "doc_a", "content_hash": "stale", "referenced_docs": {"r_old": 2}},
+        ]
+        referrer_rows = [
+            {"reference_id": "r_linker", "referenced_docs": {doc_a.get_reference_id(): 91}},
+        ]
+        pool, conn = _mock_pool(existing_rows, referrer_rows)
+        prepare_referrer_updates = AsyncMock(return_value=[])
+
+        with patch("src.ingest.utils.prepare_referrer_updates", prepare_referrer_updates):
+            prepared, chunks, embedding_data = await prepare_documents_batch(
+                documents, pool, "tenant123"
+            )
+
+        # One existing-state query and one referrers query, however many documents
+        assert conn.fetch.await_count == 2
+        turbopuffer_client.get_existing_chunk_hashes_bulk.assert_awaited_once_with(
+            "tenant123", ["doc_a", "doc_b"]
+        )
+
+        by_id = {doc_data.document.id: doc_data for doc_data in prepared}
+        assert by_id["doc_a"].referrers == {"r_linker": 91}
+        assert by_id["doc_a"].referrer_score == 2
+        assert by_id["doc_b"].referrers == {}
+        assert by_id["doc_b"].content_hash == doc_b.get_content_hash()
+
+        # Each document's stored referenced_docs feed its referrer updates
+        old_referenced_docs = {
+            call.kwargs["reference_id"]: call.kwargs["old_referenced_docs"]
+            for call in prepare_referrer_updates.await_args_list
+        }
+        assert old_referenced_docs == {
+            doc_a.get_reference_id(): {"r_old": 2},
+            doc_b.get_reference_id(): {},
+        }
+
+        # Embedding data maps each document back to its slice of the chunk list
+        assert [data.doc_id for data in embedding_data] == ["doc_a", "doc_b"]
+        assert embedding_data[1].chunk_start_idx == embedding_data[0].chunk_count
+        assert len(chunks) == sum(data.chunk_count for data in embedding_data)
@@ -0,0 +1,74 @@
+"""Tests for set-based channel-day message fetching in SlackTransformer."""
+
+from unittest.mock import AsyncMock
+
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
+
+from connectors.slack.slack_transformer import SlackTransformer
+
+# 2025-01-01 00:00:00 UTC and 2025-01-02 00:00:00 UTC
+JAN_1 = 1735689600
+JAN_2 = 1735776000
+
+
+def _message(window_index: int | None, ts: float, thread_ts: float | None = None) -> dict:
+    content = {"type": "message", "ts": f"{ts:.6f}", "user": "U1", "text": "hi"}
+    if thread_ts is not None:
+        content["thread_ts"] = f"{thread_ts:.6f}"
+    row: dict = {"content": content, "metadata": {}}
+    if window_index is not None:
+        row["window_index"] = window_index
+    return row
+
+
+class TestFetchChannelDaysMessages:
+    """Test that all channel-days are fetched with two queries and grouped correctly."""
+
+    async def test_groups_day_messages_and_thread_replies(self):
+        channel_days = [
+            {"channel_id": "C1", "date": "2025-01-01"},
+            {"channel_id": "C2", "date": "2025-01-02"},
+            {"channel_id": "C3", "date": "2025-01-01"},
+        ]
+        c1_root = _message(1, JAN_1 + 10)
+        c1_reply_same_day = _message(1, JAN_1 + 20, thread_ts=JAN_1 + 10)
+        c2_root = _message(2, JAN_2 + 5, thread_ts=JAN_2 + 5)
+        late_c1_reply = _message(None, JAN_2 + 30, thread_ts=JAN_1 + 10)
+        c2_reply = _message(None, JAN_2 + 40, thread_ts=JAN_2 + 5)
+
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(
+            side_effect=[
+                [c1_root, c2_root, c1_reply_same_day],
+                [_message(None, JAN_1 + 20, thread_ts=JAN_1 + 10), late_c1_reply, c2_reply],
+            ]
+        )
+
+        results = await SlackTransformer()._fetch_channel_days_messages(channel_days, pool)
+
+        assert conn.fetch.call_count == 2
+        window_query_args = conn.fetch.call_args_list[0].args
+        assert window_query_args[1] == ["C1", "C2", "C3"]
+        assert window_query_args[2] == [JAN_1, JAN_2, JAN_1]
+        assert window_query_args[3] == [JAN_2, JAN_2 + 86400, JAN_2]
+        assert set(conn.fetch.call_args_list[1].args[1]) == {
+            c1_root["content"]["ts"],
+            c2_root["content"]["ts"],
+        }
+
+        assert results[0][:2] == [c1_root, c1_reply_same_day]
+        assert results[0][3] == late_c1_reply
+        assert len(results[0]) == 4
+        assert results[1] == [c2_root, c2_reply]
+        assert results[2] == []
+
+    async def test_skips_reply_query_without_thread_roots(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(return_value=[])
+
+        results = await SlackTransformer()._fetch_channel_days_messages(
+            [{"channel_id": "C1", "date": "2025-01-01"}], pool
+        )
+
+        assert results == [[]]
+        assert conn.fetch.call_count == 1
@@ -0,0 +1,142 @@
+"""Tests for the per-tenant Slack directory cache."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+from tests.ingest.pruners.mock_utils import create_mock_db_pool
+
+from connectors.slack.slack_directory_cache import SlackDirectory, SlackDirectoryCache
+
+
+def _artifact(entity: str, entity_id: str, content: dict, updated_day: int = 1) -> dict:
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "content": {"id": entity_id, **content},
+        "source_updated_at": datetime(2025, 1, updated_day, tzinfo=UTC),
+    }
+
+
+USERS = [
+    _artifact("slack_user", "U1", {"profile": {"display_name": "alice", "email": "a@x.com"}}),
+    _artifact("slack_user", "U2", {"name": "bob", "profile": {"email": "b@x.com"}}),
+]
+CHANNELS = [
+    _artifact("slack_channel", "C1", {"name": "general"}),
+    _artifact("slack_channel", "D1", {"is_im": True, "members": ["U1", "U2"]}),
+]
+TEAMS = [_artifact("slack_team", "T1", {"domain": "acme"})]
+
+
+class TestSlackDirectory:
+    """Test building lookup maps from directory artifacts."""
+
+    def test_apply_artifacts_builds_maps_and_cursor(self):
+        directory = SlackDirectory()
+        directory.apply_artifacts([*USERS, *CHANNELS, *TEAMS])
+
+        assert directory.user_map == {"U1": "alice", "U2": "bob"}
+        assert directory.channel_map == {"C1": "general", "D1": "D1"}
+        assert directory.dm_participants_map == {"D1": ["U1", "U2"]}
+        assert set(directory.team_metadata) == {"T1"}
+        assert directory.last_seen == datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class TestSlackDirectoryCache:
+    """Test loading, incremental refresh, targeted fetches and eviction."""
+
+    async def test_full_load_then_incremental_refresh(self):
+        pool, conn = create_mock_db_pool()
+        renamed = _artifact("slack_user", "U2", {"profile": {"display_name": "robert"}}, 2)
+        conn.fetch = AsyncMock(side_effect=[[*USERS, *CHANNELS, *TEAMS], [renamed]])
+        cache = SlackDirectoryCache()
+
+        first = await cache.get_directory("tenant1", pool)
+        second = await cache.get_directory("tenant1", pool)
+
+        assert first is second
+        assert second.user_map["U2"] == "robert"
+        assert second.last_seen == datetime(2025, 1, 2, tzinfo=UTC)
+        refresh_query, _, cursor = conn.fetch.await_args_list[1].args
+        assert "source_updated_at >= $2" in refresh_query
+        assert cursor == datetime(2025, 1, 1, tzinfo=UTC)
+
+    async def test_targeted_fetch_only_loads_needed_ids(self):
+        pool, conn = create_mock_db_pool()
+
+        async def fetch(query, *args):
+            if "entity = 'slack_channel'" in query:
+                return [c for c in CHANNELS if c["entity_id"] in args[0]]
+            if "entity = 'slack_user'" in query:
+                return [u for u in USERS if u["entity_id"] in args[0]]
+            if "entity = 'slack_team'" in query:
+                return TEAMS
+            raise AssertionError(f"Unexpected query: {query}")
+
+        conn.fetch = AsyncMock(side_effect=fetch)
+        cache = SlackDirectoryCache(targeted_max_ids=10)
+
+        directory = await cache.get_directory("tenant1", pool, user_ids=set(), channel_ids={"D1"})
+
+        assert not directory.complete
+        assert set(directory.channels_metadata) == {"D1"}
+        # DM participants are fetched so permission tokens can be built
+        assert set(directory.users_metadata) == {"U1", "U2"}
+        assert set(directory.team_metadata) == {"T1"}
+
+    async def test_stale_targeted_directory_is_refetched(self):
+        pool, conn = create_mock_db_pool()
+        renamed = _artifact("slack_channel", "C1", {"name": "announcements"})
+        channel_results = [[CHANNELS[0]], [renamed]]
+
+        async def fetch(query, *args):
+            if "entity = 'slack_channel'" in query:
+                return channel_results.pop(0)
+            if "entity = 'slack_team'" in query:
+                return TEAMS
+            raise AssertionError(f"Unexpected query: {query}")
+
+        conn.fetch = AsyncMock(side_effect=fetch)
+        cache = SlackDirectoryCache(targeted_max_ids=10, full_reload_seconds=60)
+
+        first = await cache.get_directory("tenant1", pool, user_ids=set(), channel_ids={"C1"})
+        first.loaded_at -= 61
+        second = await cache.get_directory("tenant1", pool, user_ids=set(), channel_ids={"C1"})
+
+        assert second is not first
+        assert second.channel_map == {"C1": "announcements"}
+
+    async def test_large_needed_set_triggers_full_load(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(return_value=[*USERS, *CHANNELS, *TEAMS])
+        cache = SlackDirectoryCache(targeted_max_ids=1)
+
+        directory = await cache.get_directory(
+            "tenant1", pool, user_ids={"U1", "U2"}, channel_ids={"C1"}
+        )
+
+        assert directory.complete
+        conn.fetch.assert_awaited_once()
+
+    async def test_evicts_least_recently_used_tenants(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(return_value=[*USERS, *CHANNELS, *TEAMS])
+        cache = SlackDirectoryCache(max_entries=5)
+
+        await cache.get_directory("tenant1", pool)
+        await cache.get_directory("tenant2", pool)
+
+        assert list(cache._directories) == ["tenant2"]
+
+    async def test_eviction_keeps_held_locks(self):
+        pool, conn = create_mock_db_pool()
+        conn.fetch = AsyncMock(return_value=[*USERS, *CHANNELS, *TEAMS])
+        cache = SlackDirectoryCache(max_entries=5)
+
+        await cache.get_directory("tenant1", pool)
+        tenant1_lock = cache._locks["tenant1"]
+        async with tenant1_lock:
+            await cache.get_directory("tenant2", pool)
+
+        assert list(cache._directories) == ["tenant2"]
+        assert cache._locks["tenant1"] is tenant1_lock
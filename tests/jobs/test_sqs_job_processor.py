@@ -0,0 +1,198 @@
+"""Tests for SQSJobProcessor message handling."""
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+from src.jobs.sqs_job_processor import SQSJobProcessor, SQSMessageMetadata
+
+
+def _make_message(i: int) -> dict[str, Any]:
+    return {
+        "MessageId": f"msg-{i}",
+        "ReceiptHandle": f"receipt-handle-{i}",
+        "Body": json.dumps({"job": i}),
+        "Attributes": {"ApproximateReceiveCount": "1"},
+    }
+
+
+def _make_sqs_client(batches: list[list[dict[str, Any]]]) -> MagicMock:
+    """SQS client mock that returns messages from `batches` in order, then empty receives."""
+    remaining = [list(batch) for batch in batches]
+
+    async def receive_messages(**kwargs: Any) -> list[dict[str, Any]]:
+        if remaining:
+            batch = remaining[0]
+            received, remaining[0] = (
+                batch[: kwargs["max_messages"]],
+                batch[kwargs["max_messages"] :],
+            )
+            if not remaining[0]:
+                remaining.pop(0)
+            return received
+        await asyncio.sleep(0.01)
+        return []
+
+    sqs_client = MagicMock()
+    sqs_client.receive_messages = AsyncMock(side_effect=receive_messages)
+    sqs_client.delete_message = AsyncMock(return_value=True)
+    sqs_client.change_message_visibility = AsyncMock(return_value=True)
+    return sqs_client
+
+
+class TestConcurrentProcessing:
+    """Test the max_concurrent_jobs > 1 mode."""
+
+    async def test_runs_up_to_n_jobs_concurrently_and_deletes_each(self):
+        messages = [_make_message(i) for i in range(6)]
+        sqs_client = _make_sqs_client([messages])
+        in_flight = 0
+        max_in_flight = 0
+        processed: list[int] = []
+
+        async def process(message_data: dict[str, Any], _metadata: SQSMessageMetadata) -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            processed.append(message_data["job"])
+            if len(processed) == len(messages):
+                processor.shutdown_event.set()
+
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=process,
+            max_concurrent_jobs=3,
+            sqs_client=sqs_client,
+        )
+
+        await asyncio.wait_for(processor.poll_and_process(), timeout=5)
+
+        assert sorted(processed) == list(range(6))
+        assert max_in_flight == 3
+        assert sqs_client.delete_message.await_count == 6
+        # Every receive is sized to the free slots, never more than 10
+        for call in sqs_client.receive_messages.await_args_list:
+            assert 1 <= call.kwargs["max_messages"] <= 3
+        assert processor.in_progress_messages == {}
+
+    async def test_failed_job_is_not_deleted(self):
+        sqs_client = _make_sqs_client([[_make_message(0), _make_message(1)]])
+        done = 0
+
+        async def process(message_data: dict[str, Any], _metadata: SQSMessageMetadata) -> None:
+            nonlocal done
+            done += 1
+            if done == 2:
+                processor.shutdown_event.set()
+            if message_data["job"] == 0:
+                raise RuntimeError("boom")
+
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=process,
+            max_concurrent_jobs=2,
+            sqs_client=sqs_client,
+        )
+
+        await asyncio.wait_for(processor.poll_and_process(), timeout=5)
+
+        sqs_client.delete_message.assert_awaited_once()
+        assert sqs_client.delete_message.await_args.args[1] == "receipt-handle-1"
+
+
+class TestSequentialProcessing:
+    """Test the default one-job-at-a-time mode."""
+
+    async def test_processes_messages_one_at_a_time(self):
+        sqs_client = _make_sqs_client([[_make_message(0)], [_make_message(1)]])
+        in_flight = 0
+        max_in_flight = 0
+        processed: list[int] = []
+
+        async def process(message_data: dict[str, Any], _metadata: SQSMessageMetadata) -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            processed.append(message_data["job"])
+            if len(processed) == 2:
+                processor.shutdown_event.set()
+
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=process,
+            sqs_client=sqs_client,
+        )
+
+        await asyncio.wait_for(processor.poll_and_process(), timeout=5)
+
+        assert processed == [0, 1]
+        assert max_in_flight == 1
+        assert sqs_client.delete_message.await_count == 2
+
+
+class TestVisibilityHeartbeat:
+    """Test visibility timeout heartbeats for long-running jobs."""
+
+    async def test_heartbeat_extends_visibility_while_job_runs(self):
+        sqs_client = _make_sqs_client([])
+
+        async def slow_process(_data: dict[str, Any], _metadata: SQSMessageMetadata) -> None:
+            await asyncio.sleep(0.12)
+
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=slow_process,
+            visibility_timeout_seconds=60,
+            heartbeat_interval_seconds=0.05,
+            sqs_client=sqs_client,
+        )
+
+        assert await processor.process_message(_make_message(0)) is True
+
+        assert sqs_client.change_message_visibility.await_count == 2
+        for call in sqs_client.change_message_visibility.await_args_list:
+            assert call.args[1:] == ("receipt-handle-0", 60)
+
+        # The heartbeat stops as soon as the job finishes
+        await asyncio.sleep(0.1)
+        assert sqs_client.change_message_visibility.await_count == 2
+
+    async def test_heartbeat_stops_before_visibility_extension_exception_handling(self):
+        from src.jobs.exceptions import ExtendVisibilityException
+
+        sqs_client = _make_sqs_client([])
+
+        async def rate_limited_process(
+            _data: dict[str, Any], _metadata: SQSMessageMetadata
+        ) -> None:
+            await asyncio.sleep(0.07)
+            raise ExtendVisibilityException(visibility_timeout_seconds=600, message="rate limited")
+
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=rate_limited_process,
+            visibility_timeout_seconds=60,
+            heartbeat_interval_seconds=0.05,
+            sqs_client=sqs_client,
+        )
+
+        assert await processor.process_message(_make_message(0)) is False
+
+        # One heartbeat, then the requested extension is the last visibility change
+        timeouts = [call.args[2] for call in sqs_client.change_message_visibility.await_args_list]
+        assert timeouts == [60, 600]
+
+    def test_default_heartbeat_interval_is_a_third_of_visibility_timeout(self):
+        processor = SQSJobProcessor(
+            queue_arn="arn:aws:sqs:us-east-1:123456789012:test-queue",
+            process_function=AsyncMock(),
+            visibility_timeout_seconds=120,
+            sqs_client=MagicMock(),
+        )
+
+        assert processor.heartbeat_interval_seconds == 40
@@ -0,0 +1,83 @@
+"""Tests for token accounting in the advanced search agent loop."""
+
+from unittest.mock import AsyncMock, patch
+
+from src.mcp.api import agent
+from src.utils import token_counting
+
+TURNS = 30
+PAYLOAD_WORDS = 10_000
+
+
+class CountingEncoding:
+    """Stand-in tiktoken encoding that records how much text it encodes."""
+
+    def __init__(self) -> None:
+        self.encoded_chars = 0
+
+    def encode(self, text: str) -> list[str]:
+        self.encoded_chars += len(text)
+        return text.split()
+
+
+async def _run_agent(monkeypatch) -> tuple[list[dict], CountingEncoding, int]:
+    """Run the agent loop for TURNS tool-calling turns against a fake LLM and tool."""
+    monkeypatch.setenv("DISABLE_LANGFUSE_TRACING", "true")
+    encoding = CountingEncoding()
+    turns = 0
+
+    async def fake_think(*args, **kwargs):
+        nonlocal turns
+        turns += 1
+        if turns > TURNS:
+            return {"decision": "finish", "final_answer": "done"}, [], f"resp_{turns}"
+        tool_call = {
+            "name": "get_document",
+            "parameters": {"document_id": f"doc_{turns}"},
+            "call_id": f"call_{turns}",
+        }
+        return {"decision": "continue"}, [tool_call], f"resp_{turns}"
+
+    payload = {"status": "success", "content": "word " * PAYLOAD_WORDS}
+    with (
+        patch.object(agent, "_initialize_mcp_tools", AsyncMock()),
+        patch.object(agent, "_agent_think", side_effect=fake_think),
+        patch.object(agent, "_execute_tool", AsyncMock(return_value=payload)),
+        patch("src.utils.tracing.get_tracing_enabled", return_value=False),
+        patch.object(token_counting, "_get_encoding_for_model", return_value=encoding),
+    ):
+        events = [
+            event
+            async for event in agent.stream_advanced_search_answer(
+                query="what changed?",
+                system_prompt="You are a helpful agent",
+                context=AsyncMock(),
+                disable_citations=True,
+            )
+        ]
+    payload_chars = len(agent.format_tool_response_message("call_1", payload)["output"])
+    return events, encoding, payload_chars
+
+
+class TestAgentTokenAccounting:
+    """Test that the loop tokenizes each message once instead of the whole history per turn."""
+
+    async def test_tool_outputs_are_tokenized_once(self, monkeypatch):
+        events, encoding, payload_chars = await _run_agent(monkeypatch)
+
+        assert events[-1]["type"] == "final_answer"
+        tool_results = [event for event in events if event["type"] == "tool_result"]
+        assert len(tool_results) == TURNS
+        # Re-tokenizing the history every turn would encode ~TURNS / 2 times as much text
+        assert encoding.encoded_chars < TURNS * payload_chars * 1.1
+
+    async def test_context_usage_reflects_history(self, monkeypatch):
+        events, _, _ = await _run_agent(monkeypatch)
+
+        usage = [
+            event["data"]["context_usage_percent"]
+            for event in events
+            if event["type"] == "agent_decision"
+        ]
+        assert usage == sorted(usage)
+        assert usage[-1] > usage[0]
@@ -11,7 +11,9 @@ from fastmcp.server.context import Context
 from fastmcp.server.middleware import MiddlewareContext
 from httpx import Response
 
+from src.mcp.middleware import org_context
 from src.mcp.middleware.permissions import PermissionsMiddleware
+from src.mcp.utils import workos_identity
 
 
 class SimpleAccessToken:
@@ -34,6 +36,33 @@ def create_jwt_token(payload: dict[str, Any]) -> str:
     return jwt.encode(payload, "secret", algorithm="HS256")
 
 
+@pytest.fixture(autouse=True)
+def clear_identity_caches():
+    """Keep cached WorkOS and tenant lookups from leaking between tests."""
+    caches = [
+        workos_identity._user_email_cache,
+        workos_identity._user_organization_cache,
+        org_context._org_tenant_cache,
+    ]
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture
+def workos_client():
+    """Stub the API key and shared HTTP client used for WorkOS lookups."""
+    client = Mock()
+    client.get = AsyncMock()
+    with (
+        patch("src.mcp.utils.workos_identity.get_config_value", return_value="test_api_key"),
+        patch("src.mcp.utils.workos_identity.get_workos_http_client", return_value=client),
+    ):
+        yield client
+
+
 @pytest.fixture
 def middleware():
     """Create PermissionsMiddleware instance."""
@@ -213,23 +242,35 @@ class TestWorkOSEmailExtraction:
     """Test WorkOS email extraction via API."""
 
     @pytest.mark.asyncio
-    async def test_workos_email_extraction_success(self, middleware):
+    async def test_workos_email_extraction_success(self, middleware, workos_client):
         """Test successful WorkOS email extraction."""
         claims = {"sub": "workos_user_123"}
 
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
         mock_response.json.return_value = {"email": "workos@example.com"}
+        workos_client.get.return_value = mock_response
 
-        with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value="test_api_key"),
-            patch("httpx.AsyncClient") as mock_client,
-        ):
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+        result = await middleware._fetch_workos_email(claims)
 
-            result = await middleware._fetch_workos_email(claims)
+        assert result == "workos@example.com"
+        workos_client.get.assert_awaited_once()
+        assert workos_client.get.await_args.args == ("/users/workos_user_123",)
 
-            assert result == "workos@example.com"
+    @pytest.mark.asyncio
+    async def test_workos_email_extraction_is_cached(self, middleware, workos_client):
+        """Test that repeated lookups for the same user hit WorkOS once."""
+        claims = {"sub": "workos_user_123"}
+
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"email": "workos@example.com"}
+        workos_client.get.return_value = mock_response
+
+        assert await middleware._fetch_workos_email(claims) == "workos@example.com"
+        assert await middleware._fetch_workos_email(claims) == "workos@example.com"
+
+        workos_client.get.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_workos_email_extraction_no_user_id(self, middleware):
@@ -241,78 +282,84 @@ class TestWorkOSEmailExtraction:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_workos_email_extraction_no_api_key(self, middleware):
+    async def test_workos_email_extraction_no_api_key(self, middleware, workos_client):
         """Test WorkOS email extraction when API key not configured."""
         claims = {"sub": "workos_user_123"}
 
         with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value=None),
+            patch("src.mcp.utils.workos_identity.get_config_value", return_value=None),
             patch("src.mcp.middleware.permissions.logger") as mock_logger,
         ):
             result = await middleware._fetch_workos_email(claims)
 
             assert result is None
+            workos_client.get.assert_not_called()
             mock_logger.warning.assert_called_with(
-                "PermissionsMiddleware - WORKOS_API_KEY not configured for email lookup"
+                "PermissionsMiddleware - Error calling WorkOS user API: "
+                "WORKOS_API_KEY not configured"
             )
 
     @pytest.mark.asyncio
-    async def test_workos_email_extraction_api_error(self, middleware):
+    async def test_workos_email_extraction_api_error(self, middleware, workos_client):
         """Test WorkOS email extraction when API returns error."""
         claims = {"sub": "workos_user_123"}
 
         mock_response = Mock(spec=Response)
-        mock_response.status_code = 404
-        mock_response.text = "User not found"
+        mock_response.status_code = 500
+        mock_response.text = "Internal error"
+        workos_client.get.return_value = mock_response
 
-        with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value="test_api_key"),
-            patch("httpx.AsyncClient") as mock_client,
-            patch("src.mcp.middleware.permissions.logger") as mock_logger,
-        ):
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+        with patch("src.mcp.middleware.permissions.logger") as mock_logger:
             result = await middleware._fetch_workos_email(claims)
 
             assert result is None
             mock_logger.warning.assert_called_with(
-                "PermissionsMiddleware - WorkOS user API error: 404 User not found"
+                "PermissionsMiddleware - Error calling WorkOS user API: "
+                "WorkOS API error: 500 Internal error"
             )
 
     @pytest.mark.asyncio
-    async def test_workos_email_extraction_no_email_in_response(self, middleware):
+    async def test_workos_email_extraction_unknown_user(self, middleware, workos_client):
+        """Test WorkOS email extraction when the user doesn't exist."""
+        claims = {"sub": "workos_user_123"}
+
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 404
+        mock_response.text = "User not found"
+        workos_client.get.return_value = mock_response
+
+        with patch("src.mcp.middleware.permissions.logger") as mock_logger:
+            result = await middleware._fetch_workos_email(claims)
+
+            assert result is None
+            mock_logger.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_workos_email_extraction_no_email_in_response(self, middleware, workos_client):
         """Test WorkOS email extraction when user has no email."""
         claims = {"sub": "workos_user_123"}
 
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
         mock_response.json.return_value = {"id": "workos_user_123"}  # No email
+        workos_client.get.return_value = mock_response
 
-        with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value="test_api_key"),
-            patch("httpx.AsyncClient") as mock_client,
-            patch("src.mcp.middleware.permissions.logger") as mock_logger,
-        ):
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+        with patch("src.mcp.utils.workos_identity.logger") as mock_logger:
             result = await middleware._fetch_workos_email(claims)
 
             assert result is None
             mock_logger.debug.assert_called_with(
-                "PermissionsMiddleware - User has no email in WorkOS"
+                "User has no email in WorkOS", user_id="workos_user_123"
             )
 
     @pytest.mark.asyncio
-    async def test_workos_email_extraction_http_exception(self, middleware):
+    async def test_workos_email_extraction_http_exception(self, middleware, workos_client):
         """Test WorkOS email extraction when HTTP request fails."""
         claims = {"sub": "workos_user_123"}
 
-        with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value="test_api_key"),
-            patch("httpx.AsyncClient") as mock_client,
-            patch("src.mcp.middleware.permissions.logger") as mock_logger,
-        ):
-            mock_client.return_value.__aenter__.return_value.get.side_effect = Exception(
-                "Network error"
-            )
+        workos_client.get.side_effect = Exception("Network error")
+
+        with patch("src.mcp.middleware.permissions.logger") as mock_logger:
             result = await middleware._fetch_workos_email(claims)
 
             assert result is None
@@ -380,7 +427,13 @@ class TestIntegrationScenarios:
 
     @pytest.mark.asyncio
     async def test_complete_workos_flow(
-        self, middleware, middleware_context, mock_call_next, mock_context, monkeypatch
+        self,
+        middleware,
+        middleware_context,
+        mock_call_next,
+        mock_context,
+        monkeypatch,
+        workos_client,
     ):
         """Test complete flow with WorkOS user lookup."""
         payload = {"sub": "workos_user_456", "tenant_id": "tn_workos"}
@@ -393,13 +446,9 @@ class TestIntegrationScenarios:
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
         mock_response.json.return_value = {"email": "user@workos.com"}
+        workos_client.get.return_value = mock_response
 
-        with (
-            patch("src.mcp.middleware.permissions.get_config_value", return_value="workos_key"),
-            patch("httpx.AsyncClient") as mock_client,
-            patch("src.mcp.middleware.permissions.make_email_permission_token") as mock_make_token,
-        ):
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
+        with patch("src.mcp.middleware.permissions.make_email_permission_token") as mock_make_token:
             mock_make_token.return_value = "e:user@workos.com"
 
             result = await middleware.on_call_tool(middleware_context, mock_call_next)
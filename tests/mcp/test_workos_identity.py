@@ -0,0 +1,186 @@
+"""Tests for cached WorkOS identity lookups."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.mcp.utils import workos_identity
+from src.mcp.utils.workos_identity import (
+    IdentityCache,
+    WorkOSLookupError,
+    get_workos_user_email,
+    get_workos_user_organization_id,
+)
+
+
+class _WorkOSStub(httpx.AsyncBaseTransport):
+    """Local WorkOS user management API that counts requests per path."""
+
+    def __init__(self, users: dict[str, dict]) -> None:
+        self.users = users
+        self.requests: Counter[str] = Counter()
+        self.fail = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Yield so concurrent lookups overlap with the request in flight
+        await asyncio.sleep(0.01)
+        path = request.url.path.removeprefix("/user_management")
+        user_id = request.url.params.get("user_id") or path.rsplit("/", 1)[-1]
+        self.requests[f"{path}?{user_id}" if "user_id" in request.url.params else path] += 1
+        if self.fail:
+            return httpx.Response(500, text="unavailable")
+
+        user = self.users.get(user_id)
+        if path == "/organization_memberships":
+            orgs = [{"organization_id": user["org_id"]}] if user else []
+            return httpx.Response(200, json={"data": orgs})
+        if user is None:
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"id": user_id, "email": user.get("email")})
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def workos(monkeypatch: pytest.MonkeyPatch):
+    """Point the WorkOS lookups at a local stub with fresh caches and a fake clock."""
+    monkeypatch.setenv("WORKOS_API_KEY", "key")
+    stub = _WorkOSStub(
+        {
+            "user_1": {"org_id": "org_1", "email": "one@example.com"},
+            "user_2": {"org_id": "org_1", "email": None},
+        }
+    )
+    client = httpx.AsyncClient(transport=stub, base_url=workos_identity.WORKOS_BASE_URL)
+    clock = _Clock()
+    with (
+        patch.object(workos_identity, "_http_client", client),
+        patch.object(workos_identity, "time", clock),
+        patch.object(
+            workos_identity,
+            "_user_organization_cache",
+            IdentityCache("orgs", ttl_seconds=300, negative_ttl_seconds=30),
+        ),
+        patch.object(
+            workos_identity,
+            "_user_email_cache",
+            IdentityCache("emails", ttl_seconds=300, negative_ttl_seconds=30),
+        ),
+    ):
+        yield stub, clock
+
+
+class TestWorkOSIdentityLookups:
+    """Test that each identity hits WorkOS once per TTL window."""
+
+    async def test_one_upstream_call_per_identity_per_ttl(self, workos):
+        stub, clock = workos
+
+        for _ in range(3):
+            results = await asyncio.gather(
+                *(get_workos_user_organization_id("user_1") for _ in range(20)),
+                *(get_workos_user_email("user_1") for _ in range(20)),
+            )
+            assert set(results) == {"org_1", "one@example.com"}
+        assert stub.requests == {
+            "/organization_memberships?user_1": 1,
+            "/users/user_1": 1,
+        }
+
+        clock.now += 301
+        assert await get_workos_user_email("user_1") == "one@example.com"
+        assert stub.requests["/users/user_1"] == 2
+
+    async def test_misses_are_cached_for_negative_ttl(self, workos):
+        stub, clock = workos
+
+        for _ in range(5):
+            assert await get_workos_user_organization_id("unknown") is None
+            assert await get_workos_user_email("user_2") is None
+            assert await get_workos_user_email("unknown") is None
+        assert stub.requests["/organization_memberships?unknown"] == 1
+        assert stub.requests["/users/user_2"] == 1
+        assert stub.requests["/users/unknown"] == 1
+
+        clock.now += 31
+        assert await get_workos_user_organization_id("unknown") is None
+        assert stub.requests["/organization_memberships?unknown"] == 2
+
+    async def test_errors_are_not_cached(self, workos):
+        stub, _ = workos
+        stub.fail = True
+
+        for _ in range(2):
+            with pytest.raises(WorkOSLookupError):
+                await get_workos_user_email("user_1")
+        assert stub.requests["/users/user_1"] == 2
+
+        stub.fail = False
+        assert await get_workos_user_email("user_1") == "one@example.com"
+
+
+class TestIdentityCache:
+    """Test the cache's bound and single-flight behavior."""
+
+    async def test_evicts_least_recently_used(self):
+        cache: IdentityCache[str] = IdentityCache("test", ttl_seconds=60, max_entries=2)
+        load = AsyncMock(side_effect=lambda: "value")
+
+        await cache.get_or_load("a", load)
+        await cache.get_or_load("b", load)
+        await cache.get_or_load("a", load)
+        await cache.get_or_load("c", load)
+        await cache.get_or_load("a", load)
+        await cache.get_or_load("b", load)
+
+        # b was evicted when c was added, so it is the only reload
+        assert load.call_count == 4
+        assert cache.get_stats()["entries"] == 2
+
+    async def test_cancelled_caller_does_not_cancel_shared_load(self):
+        cache: IdentityCache[str] = IdentityCache("test", ttl_seconds=60)
+        release = asyncio.Event()
+
+        async def load() -> str:
+            await release.wait()
+            return "value"
+
+        first = asyncio.create_task(cache.get_or_load("key", load))
+        second = asyncio.create_task(cache.get_or_load("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "value"
+        assert cache.get_stats()["loads"] == 1
+
+
+class TestOrgTenantResolution:
+    """Test that OrgContextMiddleware caches org to tenant lookups."""
+
+    async def test_control_db_queried_once_per_org(self):
+        from src.mcp.middleware import org_context
+
+        resolve = AsyncMock(return_value="tn_1")
+        with (
+            patch.object(org_context, "_org_tenant_cache", IdentityCache("t", ttl_seconds=60)),
+            patch.object(org_context, "_resolve_workos_org_to_tenant_id", resolve),
+            patch.object(org_context, "_tenant_db_manager", MagicMock(get_control_db=AsyncMock())),
+        ):
+            results = await asyncio.gather(
+                *(org_context._get_tenant_id_for_workos_org("org_1") for _ in range(10))
+            )
+
+        assert results == ["tn_1"] * 10
+        assert resolve.await_count == 1
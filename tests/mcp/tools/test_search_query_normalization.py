@@ -0,0 +1,69 @@
+"""Tests that the search tools query their backends with the cache-key query text."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from fastmcp.server.context import Context
+from tests.utils.test_search_cache import FakeRedis
+
+from src.mcp.tools.keyword_search import perform_keyword_search
+from src.mcp.tools.semantic_search import perform_semantic_search
+
+
+@pytest.fixture
+def context():
+    context = Mock(spec=Context)
+    context.get_state.side_effect = lambda key: {"tenant_id": "tenant123"}.get(key)
+    return context
+
+
+@pytest.fixture
+def fake_redis():
+    redis_client = FakeRedis()
+    with (
+        patch.dict("os.environ", {"SEARCH_CACHE_ENABLED": "true"}),
+        patch("src.utils.search_cache.get_redis_client", AsyncMock(return_value=redis_client)),
+    ):
+        yield redis_client
+
+
+class TestSearchQueryNormalization:
+    """Test that queries sharing a candidates cache entry send the same text to the backend."""
+
+    async def test_semantic_search_embeds_normalized_query(self, context, fake_redis):
+        openai_client = MagicMock()
+        openai_client.create_embedding = AsyncMock(return_value=[0.1, 0.2])
+        turbopuffer_client = MagicMock()
+        turbopuffer_client.warm_cache = AsyncMock()
+        turbopuffer_client.query_chunks = AsyncMock(return_value=[])
+
+        with (
+            patch("src.mcp.tools.semantic_search.get_openai_client", return_value=openai_client),
+            patch(
+                "src.mcp.tools.semantic_search.get_turbopuffer_client",
+                return_value=turbopuffer_client,
+            ),
+        ):
+            await perform_semantic_search(context, "  rate   limits\n")
+            await perform_semantic_search(context, "rate limits")
+
+        # The second query hits the candidates entry the first one stored
+        openai_client.create_embedding.assert_awaited_once_with("rate limits")
+
+    async def test_keyword_search_sends_normalized_query(self, context, fake_redis):
+        opensearch_client = MagicMock()
+        opensearch_client.keyword_search = AsyncMock(return_value=[])
+
+        @asynccontextmanager
+        async def acquire_opensearch(_context):
+            yield opensearch_client, "index"
+
+        with patch(
+            "src.mcp.tools.keyword_search.acquire_opensearch_from_context", acquire_opensearch
+        ):
+            await perform_keyword_search(context, "  rate   limits\n")
+            await perform_keyword_search(context, "rate limits")
+
+        opensearch_client.keyword_search.assert_awaited_once()
+        assert opensearch_client.keyword_search.await_args.kwargs["query"] == "rate limits"
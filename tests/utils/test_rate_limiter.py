@@ -0,0 +1,42 @@
+"""Tests for rate limiting utilities."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.rate_limiter import TokenBucket
+
+
+class TestTokenBucket:
+    """Test the per-process token bucket."""
+
+    def test_rejects_non_positive_capacity(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    async def test_acquire_within_capacity_does_not_wait(self):
+        bucket = TokenBucket(capacity=100, period_seconds=60)
+
+        start = time.monotonic()
+        await bucket.acquire(60)
+        await bucket.acquire(40)
+
+        assert time.monotonic() - start < 0.1
+
+    async def test_acquire_waits_for_refill(self):
+        bucket = TokenBucket(capacity=10, period_seconds=1)
+        await bucket.acquire(10)
+
+        with patch("src.utils.rate_limiter.asyncio.sleep", wraps=asyncio.sleep) as mock_sleep:
+            await bucket.acquire(5)
+
+        # 5 tokens at 10 tokens/sec should need roughly half a second of refill
+        waited = sum(call.args[0] for call in mock_sleep.call_args_list)
+        assert 0.3 < waited < 0.6
+
+    async def test_oversized_request_is_clamped(self):
+        bucket = TokenBucket(capacity=10, period_seconds=60)
+
+        await asyncio.wait_for(bucket.acquire(1000), timeout=1)
@@ -0,0 +1,90 @@
+"""Tests for the tenant-scoped search cache."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.search_cache import (
+    TenantSearchCache,
+    invalidate_tenant_search_cache,
+    normalize_search_query,
+)
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def setex(self, key: str, ttl_seconds: int, value: str) -> None:
+        self.data[key] = value
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.fixture
+def fake_redis():
+    redis_client = FakeRedis()
+    with (
+        patch.dict("os.environ", {"SEARCH_CACHE_ENABLED": "true"}),
+        patch("src.utils.search_cache.get_redis_client", AsyncMock(return_value=redis_client)),
+    ):
+        yield redis_client
+
+
+class TestTenantSearchCache:
+    """Test caching, key isolation and per-tenant invalidation."""
+
+    async def test_disabled_by_default(self):
+        with patch.dict("os.environ", {}, clear=True):
+            assert await TenantSearchCache.open("tenant1", "semantic") is None
+
+    async def test_round_trip(self, fake_redis):
+        cache = await TenantSearchCache.open("tenant1", "semantic")
+        assert cache is not None
+
+        assert await cache.get("results", query="q", limit=10) is None
+        await cache.set("results", {"results": [], "count": 0}, 60, query="q", limit=10)
+        assert await cache.get("results", query="q", limit=10) == {"results": [], "count": 0}
+
+    async def test_keys_are_scoped_by_tenant_layer_and_parts(self, fake_redis):
+        cache = await TenantSearchCache.open("tenant1", "semantic")
+        other_tenant = await TenantSearchCache.open("tenant2", "semantic")
+        assert cache is not None and other_tenant is not None
+
+        await cache.set("results", ["a"], 60, query="q", permission_principal_token="u1")
+
+        assert await cache.get("results", query="q", permission_principal_token="u2") is None
+        assert await cache.get("candidates", query="q", permission_principal_token="u1") is None
+        assert await other_tenant.get("results", query="q", permission_principal_token="u1") is None
+
+    async def test_invalidation_bumps_generation(self, fake_redis):
+        cache = await TenantSearchCache.open("tenant1", "keyword")
+        assert cache is not None
+        await cache.set("candidates", ["a"], 60, query="q")
+
+        await invalidate_tenant_search_cache("tenant1")
+
+        fresh_cache = await TenantSearchCache.open("tenant1", "keyword")
+        assert fresh_cache is not None
+        assert fresh_cache.generation == cache.generation + 1
+        assert await fresh_cache.get("candidates", query="q") is None
+
+    async def test_redis_failure_disables_cache(self):
+        with (
+            patch.dict("os.environ", {"SEARCH_CACHE_ENABLED": "true"}),
+            patch(
+                "src.utils.search_cache.get_redis_client",
+                AsyncMock(side_effect=ConnectionError("down")),
+            ),
+        ):
+            assert await TenantSearchCache.open("tenant1", "semantic") is None
+
+    def test_normalize_search_query_collapses_whitespace(self):
+        assert normalize_search_query("  api   rate\nlimit ") == "api rate limit"
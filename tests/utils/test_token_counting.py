@@ -0,0 +1,69 @@
+"""Tests for token counting utilities."""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.utils import token_counting
+from src.utils.token_counting import ConversationTokenCounter, count_messages_tokens
+
+
+class WordEncoding:
+    """Stand-in tiktoken encoding with one token per word."""
+
+    def encode(self, text: str) -> list[str]:
+        return text.split()
+
+
+@pytest.fixture
+def word_encoding():
+    with patch.object(token_counting, "_get_encoding_for_model", return_value=WordEncoding()):
+        yield
+
+
+class TestEncodingCache:
+    """Test that encodings are looked up once per model."""
+
+    def test_unknown_model_falls_back_once(self):
+        token_counting._get_encoding_for_model.cache_clear()
+        encoding = MagicMock()
+        try:
+            with (
+                patch.object(
+                    token_counting.tiktoken, "encoding_for_model", side_effect=KeyError("gpt-x")
+                ) as mock_for_model,
+                patch.object(token_counting.tiktoken, "get_encoding", return_value=encoding),
+            ):
+                assert token_counting._get_encoding_for_model("gpt-x") is encoding
+                assert token_counting._get_encoding_for_model("gpt-x") is encoding
+            assert mock_for_model.call_count == 1
+        finally:
+            token_counting._get_encoding_for_model.cache_clear()
+
+
+class TestConversationTokenCounter:
+    """Test that the running count matches a full recount."""
+
+    def test_total_matches_count_messages_tokens(self, word_encoding):
+        messages: list[dict[str, Any]] = [
+            {"role": "system", "content": "You are a helpful agent"},
+            {"role": "user", "content": [{"type": "input_text", "text": "find the doc"}]},
+        ]
+        counter = ConversationTokenCounter("gpt-5", messages)
+        assert counter.total == count_messages_tokens(messages, "gpt-5")
+
+        tool_output = {"type": "function_call_output", "call_id": "call_1", "output": "a b c d"}
+        messages.append(tool_output)
+        counter.append(tool_output, counter.count(tool_output))
+        assert counter.total == count_messages_tokens(messages, "gpt-5")
+        assert len(counter) == 3
+
+    def test_update_after_truncation(self, word_encoding):
+        messages = [{"type": "function_call_output", "call_id": "c", "output": "word " * 1000}]
+        counter = ConversationTokenCounter("gpt-5", messages)
+
+        messages[0]["output"] = "truncated"
+        counter.update(0, messages[0])
+
+        assert counter.total == count_messages_tokens(messages, "gpt-5")
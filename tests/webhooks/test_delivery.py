@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import pytest
@@ -91,3 +92,40 @@ async def test_send_single_webhook_retries_with_backoff(monkeypatch):
     assert len(calls) == 3
     assert sleep_calls == [1.0, 2.0]
     assert responses == []
+
+
+@pytest.mark.asyncio
+async def test_send_single_webhook_holds_concurrency_limit_per_attempt(monkeypatch):
+    concurrency_limit = asyncio.Semaphore(1)
+    locked_during_post: list[bool] = []
+    locked_during_sleep: list[bool] = []
+
+    class DummyClient:
+        async def post(self, url, json, headers):
+            locked_during_post.append(concurrency_limit.locked())
+            return DummyResponse(500)
+
+    async def fake_sleep(delay: float):
+        locked_during_sleep.append(concurrency_limit.locked())
+
+    monkeypatch.setattr("src.webhooks.delivery.asyncio.sleep", fake_sleep)
+
+    subscription = WebhookSubscription("sub-3", "https://example.com/webhook", "secret")
+    payload = {
+        "tenant_id": "tenant-123",
+        "data": {"document_id": "doc-456", "source": "github"},
+    }
+
+    await send_single_webhook(
+        subscription,
+        payload,
+        max_attempts=3,
+        base_backoff_seconds=1.0,
+        client=DummyClient(),  # type: ignore[arg-type]
+        concurrency_limit=concurrency_limit,
+    )
+
+    # A failing endpoint gives its slot back while it backs off
+    assert locked_during_post == [True, True, True]
+    assert locked_during_sleep == [False, False]
+    assert not concurrency_limit.locked()
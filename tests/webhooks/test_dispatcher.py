@@ -0,0 +1,133 @@
+"""Tests for batched webhook fan-out in WebhookDispatcher."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.webhooks.delivery import WebhookSubscription
+from src.webhooks.dispatcher import WebhookDispatcher
+
+
+def _subscriptions() -> list[WebhookSubscription]:
+    return [
+        WebhookSubscription("sub-1", "https://example.com/each", "secret"),
+        WebhookSubscription("sub-2", "https://example.com/batch", "secret", batch_deliveries=True),
+    ]
+
+
+class TestWebhookDispatcher:
+    """Test subscription caching, batching and the delivery concurrency cap."""
+
+    async def test_batches_documents_per_subscription(self):
+        dispatcher = WebhookDispatcher(max_batch_size=2)
+        mock_fetch = AsyncMock(return_value=_subscriptions())
+        mock_send = AsyncMock()
+
+        with (
+            patch("src.webhooks.dispatcher.get_active_webhook_subscriptions", mock_fetch),
+            patch("src.webhooks.dispatcher.send_single_webhook", mock_send),
+        ):
+            await dispatcher.enqueue(
+                "tenant-1", ["doc-1", "doc-2", "doc-1", "doc-3"], "github", MagicMock()
+            )
+            await dispatcher.aclose()
+
+        # Subscriptions are fetched once and reused for both batches
+        assert mock_fetch.call_count == 1
+
+        per_document = [c.args[1] for c in mock_send.call_args_list if c.args[0].id == "sub-1"]
+        assert sorted(p["data"]["document_id"] for p in per_document) == ["doc-1", "doc-2", "doc-3"]
+        assert all(p["event"] == "document.changed" for p in per_document)
+
+        batched = [c.args[1] for c in mock_send.call_args_list if c.args[0].id == "sub-2"]
+        assert sorted([d["document_id"] for d in p["data"]["documents"]] for p in batched) == [
+            ["doc-1", "doc-2"],
+            ["doc-3"],
+        ]
+        assert all(p["event"] == "documents.changed" for p in batched)
+
+        # All deliveries share one client
+        assert len({id(c.kwargs["client"]) for c in mock_send.call_args_list}) == 1
+
+    async def test_refetches_subscriptions_after_ttl(self):
+        dispatcher = WebhookDispatcher(subscription_cache_ttl_seconds=0)
+        mock_fetch = AsyncMock(return_value=[])
+
+        with patch("src.webhooks.dispatcher.get_active_webhook_subscriptions", mock_fetch):
+            await dispatcher.enqueue("tenant-1", ["doc-1"], "github", MagicMock())
+            await dispatcher.enqueue("tenant-1", ["doc-2"], "github", MagicMock())
+            await dispatcher.aclose()
+
+        assert mock_fetch.call_count == 2
+
+    async def test_fetch_failure_is_not_cached(self):
+        dispatcher = WebhookDispatcher()
+        mock_fetch = AsyncMock(side_effect=[RuntimeError("db down"), _subscriptions()])
+        mock_send = AsyncMock()
+
+        with (
+            patch("src.webhooks.dispatcher.get_active_webhook_subscriptions", mock_fetch),
+            patch("src.webhooks.dispatcher.send_single_webhook", mock_send),
+        ):
+            await dispatcher.enqueue("tenant-1", ["doc-1"], "github", MagicMock())
+            await dispatcher._queue.join()
+            await dispatcher.enqueue("tenant-1", ["doc-2"], "github", MagicMock())
+            await dispatcher.aclose()
+
+        assert mock_fetch.call_count == 2
+        assert mock_send.call_count == 2
+
+    async def test_caps_concurrent_deliveries(self):
+        dispatcher = WebhookDispatcher(max_concurrent_deliveries=2)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def send(subscription, payload, client, concurrency_limit):
+            nonlocal in_flight, max_in_flight
+            async with concurrency_limit:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+
+        with (
+            patch(
+                "src.webhooks.dispatcher.get_active_webhook_subscriptions",
+                AsyncMock(return_value=_subscriptions()[:1]),
+            ),
+            patch("src.webhooks.dispatcher.send_single_webhook", AsyncMock(side_effect=send)),
+        ):
+            await dispatcher.enqueue(
+                "tenant-1", [f"doc-{i}" for i in range(10)], "github", MagicMock()
+            )
+            await dispatcher.aclose()
+
+        assert max_in_flight == 2
+
+    async def test_enqueue_drops_batches_when_queue_stays_full(self):
+        dispatcher = WebhookDispatcher(
+            max_queue_size=1, max_batch_size=1, num_workers=1, enqueue_timeout_seconds=0.05
+        )
+        delivery_started = asyncio.Event()
+        release_delivery = asyncio.Event()
+
+        async def deliver(batch):
+            delivery_started.set()
+            await release_delivery.wait()
+
+        with patch.object(dispatcher, "_deliver_batch", AsyncMock(side_effect=deliver)) as mock:
+            # The only worker is stuck on doc-1, and doc-2 fills the queue
+            await dispatcher.enqueue("tenant-1", ["doc-1"], "github", MagicMock())
+            await delivery_started.wait()
+            await dispatcher.enqueue("tenant-1", ["doc-2"], "github", MagicMock())
+
+            # Returns after the enqueue timeout instead of blocking the index job
+            await asyncio.wait_for(
+                dispatcher.enqueue("tenant-1", ["doc-3", "doc-4"], "github", MagicMock()),
+                timeout=1,
+            )
+
+            release_delivery.set()
+            await dispatcher.aclose()
+
+        delivered = [call.args[0].document_ids for call in mock.call_args_list]
+        assert delivered == [["doc-1"], ["doc-2"]]